@@ -0,0 +1,142 @@
+"""
+Benchmark de concurrence : moteur par threads vs moteur asyncio.
+
+Pour 1, 10 et 50 transferts simultanés dans un même processus (serveur
+HTTP local, plages supportées), mesure le débit agrégé, la mémoire
+résidente maximale et le nombre maximal de threads. Chaque mesure tourne
+dans un processus neuf pour que les pics de mémoire ne se cumulent pas.
+
+Usage : python benchmarks/bench_concurrency.py [--size-mb 32] [--counts 1,10,50]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from time import perf_counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "python"))
+
+from local_server import LocalServer
+
+
+def peak_rss_mb() -> float:
+    """Mémoire résidente maximale du processus (Mo)"""
+    try:
+        import resource
+        # ru_maxrss : Kio sous Linux, octets sous macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1024 ** 2
+    except ImportError:
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage",
+                )
+            ]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+        )
+        return counters.PeakWorkingSetSize / 1024 ** 2
+
+
+def run_child(engine: str, count: int, size: int, url: str):
+    """Mesure dans le processus courant ; imprime une ligne JSON"""
+    import asyncio
+    from transfer import probe, SegmentedDownloader, MAX_CONNECTIONS
+    from aio_transfer import AsyncSegmentedDownloader, get_runtime
+    from http_pool import get_session, pool_size
+
+    session = get_session(pool_size(count, MAX_CONNECTIONS))
+    workdir = tempfile.mkdtemp(prefix="bench_concurrency_")
+    peak_threads = threading.active_count()
+    sampling = True
+
+    def sample():
+        nonlocal peak_threads
+        while sampling:
+            peak_threads = max(peak_threads, threading.active_count())
+            time.sleep(0.05)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = perf_counter()
+    try:
+        probes = [probe(session, f"{url}?n={i}") for i in range(count)]
+        if engine == "threads":
+            def one(i):
+                remote, response = probes[i]
+                tmp_file = os.path.join(workdir, f"{i}.part")
+                assert SegmentedDownloader(session, remote.url, tmp_file).run(remote, response)
+
+            workers = [threading.Thread(target=one, args=(i,)) for i in range(count)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        else:
+            downloaders = [
+                AsyncSegmentedDownloader(session, remote.url, os.path.join(workdir, f"{i}.part"))
+                for i, (remote, _) in enumerate(probes)
+            ]
+
+            async def all_transfers():
+                results = await asyncio.gather(*(d.run_async(remote) for d, (remote, _) in zip(downloaders, probes)))
+                assert all(results)
+
+            get_runtime().run(all_transfers())
+        elapsed = perf_counter() - start
+    finally:
+        sampling = False
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps({
+        "mb_s": count * size / elapsed / 1024 ** 2,
+        "rss_mb": peak_rss_mb(),
+        "threads": peak_threads,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=32, help="taille de chaque transfert")
+    parser.add_argument("--counts", default="1,10,50")
+    parser.add_argument("--child", nargs=3, metavar=("ENGINE", "COUNT", "URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+
+    if args.child:
+        engine, count, url = args.child
+        run_child(engine, int(count), size, url)
+        return
+
+    counts = [int(c) for c in args.counts.split(",")]
+    with LocalServer(size) as url:
+        print(f"{args.size_mb} Mo par transfert depuis {url}")
+        print(f"{'moteur':<8} {'transferts':>10} {'Mo/s':>10} {'RSS max (Mo)':>14} {'threads max':>12}")
+        for count in counts:
+            for engine in ("threads", "async"):
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--size-mb", str(args.size_mb),
+                     "--child", engine, str(count), url],
+                    capture_output=True, text=True, check=True,
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                print(f"{engine:<8} {count:>10} {result['mb_s']:>10.1f} {result['rss_mb']:>14.1f} {result['threads']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark du canal de contrôle : fichiers de contrôle testés à chaque bloc
+(ancien DownloadController) vs événements en mémoire.
+
+Mesure, sur un serveur HTTP local :
+- les appels stat() par Go transféré (os.path.exists des fichiers .pause
+  et .stop) ;
+- la latence entre la demande d'arrêt et le retour du moteur (workers
+  arrêtés, écritures vidées), par le canal en mémoire et par le fichier
+  .stop relu à fréquence fixe.
+
+Usage : python benchmarks/bench_control.py [--size-mb 512] [--runs 3]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from time import perf_counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "python"))
+
+from local_server import LocalServer
+
+import download_manager
+from download_manager import DownloadController
+from transfer import probe
+from aio_transfer import create_downloader
+from http_pool import get_session
+
+
+class FileController:
+    """Ancien contrôleur : chaque test est un os.path.exists"""
+
+    def __init__(self, control_dir: str, download_id: str):
+        self.pause_file = os.path.join(control_dir, f"{download_id}.pause")
+        self.stop_file = os.path.join(control_dir, f"{download_id}.stop")
+
+    def is_paused(self) -> bool:
+        return os.path.exists(self.pause_file)
+
+    def is_stopped(self) -> bool:
+        return os.path.exists(self.stop_file)
+
+    def wait_resumed(self, timeout: float) -> bool:
+        time.sleep(timeout)
+        return not self.is_paused()
+
+    def stop(self):
+        with open(self.stop_file, "w") as f:
+            f.write("stopped")
+
+    def close(self):
+        pass
+
+
+class StatCounter:
+    """Compte les appels os.stat (os.path.exists passe par là)"""
+
+    def __init__(self):
+        self.count = 0
+        self._stat = os.stat
+
+    def __enter__(self):
+        def counting_stat(*args, **kwargs):
+            self.count += 1
+            return self._stat(*args, **kwargs)
+
+        os.stat = counting_stat
+        return self
+
+    def __exit__(self, *exc):
+        os.stat = self._stat
+
+
+def make_controller(kind: str, control_base: str, download_id: str):
+    if kind == "fichiers":
+        return FileController(download_manager.get_control_dir(control_base), download_id)
+    return DownloadController(download_id, control_base)
+
+
+def write_stop_file(controller):
+    with open(controller.stop_file, "w") as f:
+        f.write("stopped")
+
+
+def transfer(session, url: str, workdir: str, controller, stop_after: float = None, stop=None):
+    """Transfert complet (ou arrêté par `stop(controller)` après `stop_after` s) ; retourne (durée, latence d'arrêt)"""
+    remote, response = probe(session, url)
+    # Dossier neuf : pas de reprise depuis le .part d'une mesure précédente
+    tmp_file = os.path.join(tempfile.mkdtemp(dir=workdir), "bench.part")
+    engine = create_downloader(session, remote.url, tmp_file, controller=controller)
+    requested = []
+
+    def stop_later():
+        time.sleep(stop_after)
+        requested.append(perf_counter())
+        stop(controller)
+
+    if stop_after is not None:
+        threading.Thread(target=stop_later, daemon=True).start()
+    start = perf_counter()
+    engine.run(remote, response)
+    end = perf_counter()
+    controller.close()
+    return end - start, (end - requested[0]) if requested else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--runs", type=int, default=3, help="mesures de latence d'arrêt par canal")
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+    session = get_session(40)
+    workdir = tempfile.mkdtemp(prefix="bench_control_")
+
+    try:
+        with LocalServer(size) as url:
+            print(f"{args.size_mb} Mo depuis {url}")
+            print(f"{'contrôleur':<12} {'stat/Go':>12} {'Mo/s':>8}")
+            for kind in ("fichiers", "événements"):
+                controller = make_controller(kind, workdir, "bench")
+                with StatCounter() as counter:
+                    elapsed, _ = transfer(session, url, workdir, controller)
+                print(f"{kind:<12} {counter.count * 1024 / args.size_mb:>12.0f} {args.size_mb / elapsed:>8.1f}")
+
+        # Serveur bridé : le transfert est encore en cours quand l'arrêt est demandé
+        with LocalServer(size, rate=2 * 1024 * 1024) as url:
+            print(f"\n{'canal d’arrêt':<18} {'latence moyenne (ms)':>22} {'max (ms)':>10}")
+            channels = [
+                ("fichiers", "fichiers", FileController.stop),
+                ("événements", "événements", DownloadController.stop),
+                ("fichier .stop", "événements", write_stop_file),
+            ]
+            for name, kind, stop in channels:
+                latencies = []
+                for run in range(args.runs):
+                    download_id = f"bench{run}"
+                    controller = make_controller(kind, workdir, download_id)
+                    _, latency = transfer(session, url, workdir, controller, stop_after=1.5, stop=stop)
+                    latencies.append(latency * 1000)
+                    control_dir = download_manager.get_control_dir(workdir)
+                    for file_name in os.listdir(control_dir):
+                        if file_name.startswith(download_id):
+                            os.remove(os.path.join(control_dir, file_name))
+                print(f"{name:<18} {sum(latencies) / len(latencies):>22.0f} {max(latencies):>10.0f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
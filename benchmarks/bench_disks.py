@@ -0,0 +1,35 @@
+"""
+Profil d'écriture de plusieurs dossiers (un par volume à comparer).
+
+Même mesure que `download_manager.py bench_disk` : écriture séquentielle
+avec fsync final, puis création de petits fichiers avec fsync chacun.
+N'importe quel dossier accessible en écriture convient (points de montage
+Linux, lecteurs Windows...).
+
+Usage : python benchmarks/bench_disks.py DOSSIER [DOSSIER...] [--seq-mb 256] [--small-files 500]
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "python"))
+
+from disks import DiskInventory, benchmark_volume, SEQ_SIZE_MB, SMALL_FILES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--seq-mb", type=int, default=SEQ_SIZE_MB)
+    parser.add_argument("--small-files", type=int, default=SMALL_FILES)
+    args = parser.parse_args()
+
+    print(f"{'dossier':<30} {'volume':<20} {'séquentiel (Mo/s)':>18} {'petits fichiers/s':>18}")
+    for path in args.paths:
+        profile = benchmark_volume(path, args.seq_mb, args.small_files)
+        print(f"{path:<30} {DiskInventory.volume_of(path):<20} {profile['seq_write_mb_s']:>18.1f} {profile['small_files_per_s']:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark du flux d'événements : coût pour les threads de transfert.
+
+`--threads` producteurs (un par fichier d'un dossier GoFile) déposent un
+événement de progression toutes les `--interval-ms` pendant `--seconds`,
+vers une sortie qui met `--sink-ms` millisecondes par ligne (pipe plein,
+Electron occupé). Compare :
+- direct : écriture dans le thread producteur sous un verrou (ancien
+  DownloadStatus.emit) ;
+- émetteur : EventEmitter (events.py), regroupement à RATE_HZ.
+Mesure les événements déposés, les lignes écrites et le temps de dépôt
+par événement côté producteur (moyen et maximal).
+
+Usage : python benchmarks/bench_events.py [--threads 8] [--seconds 3] [--sink-ms 5] [--interval-ms 1]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "python"))
+
+from events import EventEmitter
+
+
+def produce(post, stream: str, stop: threading.Event, interval: float, costs: list):
+    downloaded = 0
+    count, spent, worst = 0, 0.0, 0.0
+    while not stop.is_set():
+        downloaded += 65536
+        event = {"type": "progress", "downloaded": downloaded, "total": 1 << 40, "speed": 10.0, "timestamp": time.time()}
+        start = perf_counter()
+        post(event, "bench", stream)
+        elapsed = perf_counter() - start
+        count += 1
+        spent += elapsed
+        worst = max(worst, elapsed)
+        time.sleep(interval)
+    costs.append((count, spent, worst))
+
+
+def run(name: str, threads: int, seconds: float, sink_ms: float, interval_ms: float):
+    lines = []
+
+    def sink(event):
+        json.dumps(event)
+        time.sleep(sink_ms / 1000)
+        lines.append(event)
+
+    if name == "direct":
+        lock = threading.Lock()
+
+        def post(event, job, stream):
+            with lock:
+                sink(event)
+        emitter = None
+    else:
+        emitter = EventEmitter(sink)
+        post = emitter.post
+
+    stop = threading.Event()
+    costs = []
+    workers = [threading.Thread(target=produce, args=(post, f"s{i}", stop, interval_ms / 1000, costs)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    if emitter:
+        emitter.close()
+
+    posted = sum(count for count, _, _ in costs)
+    mean_us = sum(spent for _, spent, _ in costs) / posted * 1e6 if posted else 0.0
+    worst_ms = max(worst for _, _, worst in costs) * 1000
+    print(f"{name:<10} {posted:>12} {len(lines):>10} {mean_us:>14.1f} {worst_ms:>14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--sink-ms", type=float, default=5.0)
+    parser.add_argument("--interval-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'déposés':>12} {'écrits':>10} {'dépôt (µs)':>14} {'pire (ms)':>14}")
+    for name in ("direct", "émetteur"):
+        run(name, args.threads, args.seconds, args.sink_ms, args.interval_ms)
+
+
+if __name__ == "__main__":
+    main()
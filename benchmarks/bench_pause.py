@@ -0,0 +1,140 @@
+"""
+Benchmark de la pause : coût de N téléchargements en pause, délai de reprise.
+
+N téléchargements segmentés tournent dans le même processus contre un
+serveur local bridé. Après la mise en pause de tous, mesure :
+- les connexions TCP encore ouvertes vers le serveur et les threads du
+  processus ;
+- les octets reçus pendant la pause (doit rester à 0) ;
+puis, à la reprise, le délai jusqu'aux premiers octets reçus de chaque
+téléchargement, et vérifie le contenu des fichiers terminés. Tous les
+téléchargements visent le même hôte : au-delà de sa limite de connexions
+(host_limits.py), les derniers attendent un créneau avant leurs premiers
+octets.
+
+Une des URL est rendue invalide pendant la pause : la reprise passe par
+la fonction `resolve` du moteur (comme un lien BuzzHeavier expiré).
+
+Usage : python benchmarks/bench_pause.py [--downloads 10] [--size-mb 64] [--pause 5]
+"""
+
+import os
+import sys
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+from time import perf_counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "python"))
+
+from local_server import LocalServer, expected_bytes
+
+from download_manager import DownloadController
+from transfer import probe
+from aio_transfer import create_downloader
+from http_pool import get_session
+
+DEAD_URL = "http://127.0.0.1:9/expire"
+
+
+def open_connections(port: int) -> int:
+    """Connexions TCP établies vers `port` (Linux : /proc/net/tcp)"""
+    count = 0
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table, "r") as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    remote_port = int(fields[2].split(":")[1], 16)
+                    if remote_port == port and fields[3] == "01":
+                        count += 1
+        except OSError:
+            pass
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--downloads", type=int, default=10)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--pause", type=float, default=5.0, help="durée de la pause (s)")
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+    session = get_session(64)
+    workdir = tempfile.mkdtemp(prefix="bench_pause_")
+
+    try:
+        with LocalServer(size, rate=1024 * 1024) as url:
+            port = int(url.split(":")[2].split("/")[0])
+            engines, controllers, threads, results = [], [], [], {}
+            for index in range(args.downloads):
+                controller = DownloadController(f"bench{index}", workdir)
+                remote, response = probe(session, url)
+                tmp_file = os.path.join(workdir, f"{index}.part")
+                engine = create_downloader(
+                    session, remote.url, tmp_file, controller=controller,
+                    resolve=lambda: (url, {}),
+                )
+                thread = threading.Thread(
+                    target=lambda i=index, e=engine, r=remote, resp=response: results.__setitem__(i, e.run(r, resp)),
+                    daemon=True,
+                )
+                engines.append(engine)
+                controllers.append(controller)
+                threads.append(thread)
+                thread.start()
+
+            time.sleep(2)
+            baseline_threads = threading.active_count()
+            print(f"{args.downloads} téléchargements : {open_connections(port)} connexion(s), {baseline_threads} thread(s)")
+
+            start = perf_counter()
+            for controller in controllers:
+                controller.pause()
+            # Le bloc en cours de lecture sur chaque connexion est écrit avant la fermeture
+            while open_connections(port) and perf_counter() - start < 5:
+                time.sleep(0.05)
+            received = sum(engine.downloaded for engine in engines)
+            print(f"En pause (après {perf_counter() - start:.2f} s) : {open_connections(port)} connexion(s), "
+                  f"{threading.active_count()} thread(s)")
+            # Lien expiré pendant la pause : la reprise doit résoudre de nouveau la source
+            engines[0].url = DEAD_URL
+            time.sleep(args.pause)
+            print(f"Octets reçus pendant la pause : {sum(engine.downloaded for engine in engines) - received}")
+
+            before = [engine.downloaded for engine in engines]
+            start = perf_counter()
+            for controller in controllers:
+                controller.resume()
+            delays = [None] * len(engines)
+            while any(delay is None for delay in delays) and perf_counter() - start < 30:
+                for index, engine in enumerate(engines):
+                    if delays[index] is None and engine.downloaded > before[index]:
+                        delays[index] = perf_counter() - start
+                time.sleep(0.005)
+            measured = [delay * 1000 for delay in delays if delay is not None]
+            print(f"Reprise : premiers octets après {sum(measured) / len(measured):.0f} ms en moyenne "
+                  f"(max {max(measured):.0f} ms), URL résolue de nouveau : {engines[0].url == url}")
+
+            for thread in threads:
+                thread.join()
+            for controller in controllers:
+                controller.close()
+
+        digest = hashlib.sha256(expected_bytes(0, size)).hexdigest()
+        identical = 0
+        for index in range(args.downloads):
+            with open(os.path.join(workdir, f"{index}.part"), "rb") as f:
+                identical += hashlib.sha256(f.read()).hexdigest() == digest
+        print(f"Fichiers complets et identiques : {identical}/{args.downloads} ({list(results.values()).count(True)} terminés)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
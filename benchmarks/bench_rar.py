@@ -0,0 +1,137 @@
+"""
+Benchmark de l'extraction RAR : un processus par membre contre un seul.
+
+Génère `--files` fichiers compressibles de `--file-kb` Kio, les range dans
+une archive RAR solide (`rar a -s`, WinRAR ou rar en ligne de commande
+requis) puis compare :
+- membre par membre : rarfile.extract pour chaque fichier (ancienne
+  boucle de download_manager.py), qui relance UnRAR et redécompresse le
+  flux solide depuis le début à chaque appel ;
+- un seul processus : archive_process.ArchiveProcess (UnRAR ou 7-Zip).
+Mesure la durée et le débit en fichiers/s, vérifie les fichiers extraits
+et la progression finale. `--archive` réutilise une archive existante ;
+`--old-limit` borne le nombre de membres de la première méthode (durée
+extrapolée au-delà).
+
+Usage : python benchmarks/bench_rar.py [--files 2000] [--file-kb 64] [--old-limit 200]
+        [--rar CHEMIN] [--tool CHEMIN] [--archive FICHIER.rar]
+"""
+
+import os
+import sys
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "python"))
+
+import rarfile
+from archive_process import ArchiveProcess, SUCCESS_CODES
+from download_manager import find_unrar, find_7zip
+
+WINRAR = (r"C:\Program Files\WinRAR\Rar.exe", r"C:\Program Files (x86)\WinRAR\Rar.exe")
+
+
+def find_rar() -> str:
+    for path in WINRAR:
+        if os.path.exists(path):
+            return path
+    return shutil.which("rar")
+
+
+def make_archive(rar: str, workdir: str, files: int, file_kb: int) -> str:
+    """Archive solide de fichiers texte pseudo-aléatoires (compressibles, comme des données de jeu)"""
+    source = os.path.join(workdir, "source")
+    words = [f"mot{index:04d}" for index in range(512)]
+    rng = random.Random(0)
+    for index in range(files):
+        folder = os.path.join(source, f"dossier{index // 500:03d}")
+        os.makedirs(folder, exist_ok=True)
+        text = " ".join(rng.choice(words) for _ in range(file_kb * 1024 // 8))
+        with open(os.path.join(folder, f"fichier{index:05d}.txt"), "w") as f:
+            f.write(text[:file_kb * 1024])
+    archive = os.path.join(workdir, "solide.rar")
+    subprocess.run([rar, "a", "-s", "-m3", "-ep1", "-r", "-idq", archive, os.path.join(source, "*")], check=True)
+    shutil.rmtree(source)
+    return archive
+
+
+def extracted(destination: str):
+    count, size = 0, 0
+    for root, _, names in os.walk(destination):
+        for name in names:
+            count += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return count, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--file-kb", type=int, default=64)
+    parser.add_argument("--old-limit", type=int, default=200, help="membres extraits un par un (0 : tous)")
+    parser.add_argument("--rar", default=None, help="rar/Rar.exe pour créer l'archive")
+    parser.add_argument("--tool", default=None, help="UnRAR ou 7z pour l'extraction (défaut : celui de l'application)")
+    parser.add_argument("--archive", default=None, help="archive existante à la place de l'archive générée")
+    args = parser.parse_args()
+
+    tool = args.tool or find_unrar() or shutil.which("unrar") or find_7zip()
+    if not tool:
+        sys.exit("UnRAR ou 7-Zip introuvable (--tool)")
+    workdir = tempfile.mkdtemp(prefix="bench_rar_")
+    try:
+        archive = args.archive
+        if not archive:
+            rar = args.rar or find_rar()
+            if not rar:
+                sys.exit("rar introuvable pour générer l'archive (--rar ou --archive)")
+            start = perf_counter()
+            archive = make_archive(rar, workdir, args.files, args.file_kb)
+            print(f"Archive solide : {os.path.getsize(archive) / 1048576:.1f} Mo en {perf_counter() - start:.1f} s")
+
+        rarfile.UNRAR_TOOL = tool
+        with rarfile.RarFile(archive) as rf:
+            members = [m for m in rf.infolist() if not m.is_dir()]
+        sizes = {m.filename: m.file_size for m in members}
+        total_bytes = sum(sizes.values())
+        print(f"{len(members)} fichiers, {total_bytes / 1048576:.1f} Mo décompressés, outil : {tool}")
+        print(f"{'méthode':<22} {'membres':>8} {'durée (s)':>10} {'fichiers/s':>11} {'estimé total (s)':>17}")
+
+        # Ancienne boucle : un processus UnRAR par membre
+        subset = members[:args.old_limit] if args.old_limit else members
+        destination = os.path.join(workdir, "membre")
+        start = perf_counter()
+        with rarfile.RarFile(archive) as rf:
+            for member in subset:
+                rf.extract(member, destination)
+        elapsed = perf_counter() - start
+        estimate = elapsed * len(members) / len(subset) if subset else 0.0
+        print(f"{'membre par membre':<22} {len(subset):>8} {elapsed:>10.1f} {len(subset) / elapsed:>11.1f} {estimate:>17.1f}")
+        shutil.rmtree(destination, ignore_errors=True)
+
+        # Un seul processus pour toute l'archive
+        destination = os.path.join(workdir, "processus")
+        os.makedirs(destination)
+        extraction = ArchiveProcess(tool, archive, destination, sizes)
+        start = perf_counter()
+        extraction.start()
+        code = None
+        while code is None:
+            code = extraction.wait(0.25)
+        elapsed = perf_counter() - start
+        print(f"{'un seul processus':<22} {len(members):>8} {elapsed:>10.1f} {len(members) / elapsed:>11.1f} {elapsed:>17.1f}")
+
+        count, size = extracted(destination)
+        ok = code in SUCCESS_CODES and count == len(members) and size == total_bytes
+        print(f"Vérification : code {code}, {count} fichiers, {size} octets, "
+              f"progression {extraction.files_done}/{extraction.total_files} ({extraction.fraction:.0%}) : "
+              f"{'ok' if ok else 'ERREUR'}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Microbenchmark du chemin de réception : CPU client par Go.
+
+Compare, contre un serveur HTTP local :
+- avant : iter_content 8 Kio (ancien GoFile) et 1 Mio (ancien BuzzHeavier/PixelDrain),
+  avec les deux `stat` de DownloadController par morceau ;
+- après : readinto dans un tampon réutilisé, taille adaptative (buffers.py),
+  avec les mêmes vérifications par lecture.
+
+Usage : python benchmarks/bench_receive.py [--size-mb 1024]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "python"))
+
+import requests
+
+from buffers import BUFFERS, AdaptiveChunkSizer, raw_stream, release_if_consumed
+from local_server import LocalServer
+
+CONTROL_DIR = tempfile.mkdtemp(prefix="bench_control_")
+PAUSE_FILE = os.path.join(CONTROL_DIR, "bench.pause")
+STOP_FILE = os.path.join(CONTROL_DIR, "bench.stop")
+
+
+def controller_checks():
+    """Équivalent de is_stopped() + is_paused() de DownloadController"""
+    return os.path.exists(STOP_FILE) or os.path.exists(PAUSE_FILE)
+
+
+def receive_iter_content(session, url, chunk_size):
+    with session.get(url, stream=True, headers={"Accept-Encoding": "identity"}) as response, \
+            open(os.devnull, "wb", buffering=0) as sink:
+        received = 0
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if controller_checks():
+                break
+            if chunk:
+                sink.write(chunk)
+                received += len(chunk)
+        return received
+
+
+def receive_readinto(session, url):
+    with session.get(url, stream=True, headers={"Accept-Encoding": "identity"}) as response, \
+            open(os.devnull, "wb", buffering=0) as sink:
+        fp = raw_stream(response)
+        buffer = BUFFERS.acquire()
+        view = memoryview(buffer)
+        sizer = AdaptiveChunkSizer()
+        received = 0
+        try:
+            while True:
+                if controller_checks():
+                    break
+                start = perf_counter()
+                count = fp.readinto(view[:sizer.size])
+                if not count:
+                    break
+                sizer.update(count, perf_counter() - start)
+                sink.write(view[:count])
+                received += count
+            release_if_consumed(response, fp)
+        finally:
+            BUFFERS.release(buffer)
+        return received
+
+
+def measure(label, func, size):
+    cpu_start = time.process_time()
+    wall_start = perf_counter()
+    received = func()
+    cpu = time.process_time() - cpu_start
+    wall = perf_counter() - wall_start
+    assert received == size, f"{label}: {received} != {size}"
+    gb = size / 1024 ** 3
+    print(f"{label:<32} {cpu / gb:8.2f} s CPU/Go {size / wall / 1024 ** 2:10.1f} Mo/s")
+    return cpu / gb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+
+    with LocalServer(size) as url:
+        session = requests.Session()
+        print(f"Transfert de {args.size_mb} Mo depuis {url}")
+        before_8k = measure("avant: iter_content 8 Kio", lambda: receive_iter_content(session, url, 8192), size)
+        before_1m = measure("avant: iter_content 1 Mio", lambda: receive_iter_content(session, url, 1024 * 1024), size)
+        after = measure("après: readinto adaptatif", lambda: receive_readinto(session, url), size)
+        print(f"Gain CPU: x{before_8k / after:.1f} vs 8 Kio, x{before_1m / after:.1f} vs 1 Mio")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark du chien de garde : connexions à moitié mortes.
+
+Le serveur local bloque une requête de plage sur `--stall-every` après
+256 Kio, en silence ou en ne livrant plus qu'un octet par seconde. Pour
+chaque moteur et chaque mode de blocage, mesure la durée du transfert,
+les blocages détectés par type et vérifie le contenu du fichier. Seules
+les plages bloquées sont redemandées : les octets reçus au total restent
+égaux à la taille du fichier.
+
+Les délais sont raccourcis (`--read-timeout`, `--window`) pour que le
+benchmark reste court ; l'application garde ceux de stall_watch.py.
+
+Usage : python benchmarks/bench_stalls.py [--size-mb 64] [--stall-every 3] [--read-timeout 2] [--window 4]
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import argparse
+import tempfile
+from time import perf_counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "python"))
+
+from local_server import LocalServer, expected_bytes
+
+import stall_watch
+from transfer import probe, SegmentedDownloader
+from aio_transfer import AsyncSegmentedDownloader
+from http_pool import get_session
+
+
+class Reporter:
+    """Garde les derniers compteurs de blocage publiés"""
+
+    def __init__(self):
+        self.stalls = {}
+
+    def progress(self, downloaded, total, speed, io=None, stalls=None):
+        self.stalls = stalls or {}
+
+    def paused(self):
+        pass
+
+    def resumed(self):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--stall-every", type=int, default=3)
+    parser.add_argument("--read-timeout", type=float, default=2.0)
+    parser.add_argument("--window", type=float, default=4.0)
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+    stall_watch.READ_TIMEOUT = args.read_timeout
+    stall_watch.STALL_WINDOW = args.window
+
+    session = get_session(16)
+    digest = hashlib.sha256(expected_bytes(0, size)).hexdigest()
+    workdir = tempfile.mkdtemp(prefix="bench_stalls_")
+    print(f"{'moteur':<8} {'blocage':<8} {'durée (s)':>10} {'reçu (Mo)':>10} {'blocages':>40} {'fichier':>8}")
+    try:
+        for mode in ("silent", "trickle"):
+            with LocalServer(size, rate=4 * 1024 * 1024, stall_every=args.stall_every, stall_mode=mode) as url:
+                for name, engine_class in (("threads", SegmentedDownloader), ("async", AsyncSegmentedDownloader)):
+                    tmp_file = os.path.join(workdir, f"{mode}-{name}.part")
+                    reporter = Reporter()
+                    start = perf_counter()
+                    remote, response = probe(session, f"{url}?{mode}-{name}")
+                    engine = engine_class(session, remote.url, tmp_file, reporter=reporter)
+                    engine.run(remote, response)
+                    elapsed = perf_counter() - start
+                    with open(tmp_file, "rb") as f:
+                        identical = hashlib.sha256(f.read()).hexdigest() == digest
+                    stalls = engine.stalls.snapshot()
+                    counts = ", ".join(f"{kind} {count}" for kind, count in stalls.items())
+                    received = sum(mirror.received for mirror in engine.mirrors) / 1048576
+                    print(f"{name:<8} {mode:<8} {elapsed:>10.1f} {received:>10.1f} {counts:>40} {'ok' if identical else 'ERREUR':>8}")
+                    os.remove(tmp_file)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark du démarrage à froid de download_manager.py, commande par commande.
+
+Pour chaque commande légère : durée médiane d'un processus complet
+(interpréteur + imports + commande), lancé directement
+(`download_manager.py`, recompilé à chaque fois) et via `launcher.py`
+(bytecode en cache), puis les modules les plus coûteux d'après
+`python -X importtime`. La ligne « download (imports) » charge en plus ce
+que les commandes de téléchargement importent au premier usage
+(requests, moteur de transfert, rarfile).
+
+Usage : python benchmarks/bench_startup.py [--runs 15] [--top 8]
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from time import perf_counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PYTHON_DIR = os.path.normpath(os.path.join(HERE, "..", "python"))
+
+HEAVY_IMPORTS = (
+    "import sys; sys.argv = ['download_manager.py']; import download_manager as d; "
+    "d.aio_transfer.ENGINE; d.http_pool.get_session; d.zipfile.ZipFile; d.rarfile.UNRAR_TOOL"
+)
+
+
+def commands(control_dir: str):
+    return [
+        ("detect_type", ["detect_type", "https://gofile.io/d/abc"]),
+        ("pause", ["pause", "bench", control_dir]),
+        ("resume", ["resume", "bench", control_dir]),
+        ("set_bandwidth", ["set_bandwidth", "0", control_dir]),
+        ("get_disks", ["get_disks"]),
+    ]
+
+
+def run(args, env) -> float:
+    start = perf_counter()
+    subprocess.run([sys.executable] + args, cwd=PYTHON_DIR, env=env, capture_output=True, check=True)
+    return (perf_counter() - start) * 1000
+
+
+def median_ms(args, env, runs: int) -> float:
+    run(args, env)  # premier lancement : écrit le bytecode
+    return statistics.median(run(args, env) for _ in range(runs))
+
+
+def import_report(args, env, top: int):
+    """(module, cumul en ms) des `top` imports les plus longs"""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=PYTHON_DIR, env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Modules de premier niveau seulement (les sous-imports sont inclus dans le cumul)
+        if name.startswith(" ") and not name.startswith("  "):
+            rows.append((name.strip(), int(cumulative) / 1000))
+    return sorted(rows, key=lambda row: -row[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--top", type=int, default=8, help="imports affichés par commande")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    control_dir = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        baseline = median_ms(["-c", "pass"], env, args.runs)
+        print(f"Interpréteur seul : {baseline:.0f} ms\n")
+        print(f"{'commande':<20} {'direct (ms)':>12} {'lanceur (ms)':>13}")
+        for name, argv in commands(control_dir):
+            direct = median_ms(["download_manager.py"] + argv, env, args.runs)
+            launcher = median_ms(["launcher.py"] + argv, env, args.runs)
+            print(f"{name:<20} {direct:>12.0f} {launcher:>13.0f}")
+        heavy = median_ms(["-c", HEAVY_IMPORTS], env, args.runs)
+        print(f"{'download (imports)':<20} {'':>12} {heavy:>13.0f}")
+
+        print("\nImports les plus coûteux (cumul, ms)")
+        for name, argv in commands(control_dir)[:1] + [("download (imports)", None)]:
+            report = import_report(["launcher.py"] + argv if argv else ["-c", HEAVY_IMPORTS], env, args.top)
+            print(f"  {name}: " + ", ".join(f"{module} {ms:.1f}" for module, ms in report))
+    finally:
+        shutil.rmtree(control_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
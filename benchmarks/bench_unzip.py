@@ -0,0 +1,131 @@
+"""
+Benchmark de l'extraction ZIP parallèle.
+
+Génère une arborescence de jeu synthétique (quelques gros paquets de
+données, beaucoup de petits fichiers de configuration et de textures,
+compressibles comme des données de jeu) dans un ZIP deflate, puis
+compare :
+- zipfile : zip_ref.extract membre par membre (ancienne boucle de
+  download_manager.py) ;
+- zip_parallel.ParallelZipExtractor avec 1, 4 et 16 workers (`--workers`).
+Mesure la durée et le débit décompressé, vérifie l'arborescence obtenue.
+
+Usage : python benchmarks/bench_unzip.py [--size-mb 512] [--workers 1,4,16] [--archive FICHIER.zip]
+"""
+
+import os
+import sys
+import random
+import shutil
+import hashlib
+import zipfile
+import argparse
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "python"))
+
+from zip_parallel import ParallelZipExtractor
+
+
+def game_data(rng: random.Random, size: int) -> bytes:
+    """Données compressibles (~3:1) : mots répétés et octets aléatoires mêlés"""
+    words = [f"mesh{index:04d}".encode() for index in range(1024)]
+    parts, length = [], 0
+    while length < size:
+        part = rng.randbytes(64) if rng.random() < 0.2 else b" ".join(rng.choices(words, k=32))
+        parts.append(part)
+        length += len(part)
+    return b"".join(parts)[:size]
+
+
+def make_archive(path: str, size_mb: int):
+    """Un quart en 4 gros paquets, le reste en fichiers de 16 Kio à 4 Mio"""
+    rng = random.Random(0)
+    total = size_mb * 1024 * 1024
+    block = game_data(rng, 8 * 1024 * 1024)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for index in range(4):
+            size = total // 16
+            data = (block * (size // len(block) + 1))[:size]
+            zf.writestr(f"Jeu/Paks/data{index}.pak", data[index:] + data[:index])
+        written, index = total // 4, 0
+        while written < total:
+            size = min(int(rng.paretovariate(1.2) * 16384), 4 * 1024 * 1024, total - written)
+            offset = rng.randrange(len(block) - size)
+            zf.writestr(f"Jeu/Content/dossier{index // 200:03d}/asset{index:05d}.uasset", block[offset:offset + size])
+            written += size
+            index += 1
+
+
+def tree_digest(root: str):
+    digest, count = hashlib.sha256(), 0
+    for folder, dirs, names in sorted(os.walk(root)):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(folder, name)
+            digest.update(os.path.relpath(path, root).encode())
+            with open(path, "rb") as f:
+                digest.update(f.read())
+            count += 1
+    return count, digest.hexdigest()
+
+
+def settle():
+    """Écritures précédentes vidées sur le disque avant chaque mesure"""
+    if hasattr(os, "sync"):
+        os.sync()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--workers", default="1,4,16")
+    parser.add_argument("--archive", default=None, help="archive existante à la place de l'archive générée")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_unzip_")
+    try:
+        archive = args.archive
+        if not archive:
+            archive = os.path.join(workdir, "jeu.zip")
+            start = perf_counter()
+            make_archive(archive, args.size_mb)
+            print(f"Archive : {os.path.getsize(archive) / 1048576:.1f} Mo en {perf_counter() - start:.1f} s")
+        with zipfile.ZipFile(archive) as zf:
+            members = zf.infolist()
+        total = sum(m.file_size for m in members)
+        print(f"{len(members)} fichiers, {total / 1048576:.1f} Mo décompressés, {os.cpu_count()} cœur(s)")
+        print(f"{'méthode':<16} {'durée (s)':>10} {'Mo/s':>8} {'identique':>10}")
+
+        destination = os.path.join(workdir, "zipfile")
+        settle()
+        start = perf_counter()
+        with zipfile.ZipFile(archive) as zf:
+            for member in members:
+                zf.extract(member, destination)
+        elapsed = perf_counter() - start
+        expected = tree_digest(destination)
+        shutil.rmtree(destination)
+        print(f"{'zipfile':<16} {elapsed:>10.2f} {total / 1048576 / elapsed:>8.0f} {'-':>10}")
+
+        for workers in (int(value) for value in args.workers.split(",")):
+            destination = os.path.join(workdir, f"parallele{workers}")
+            extraction = ParallelZipExtractor(archive, destination, workers=workers)
+            settle()
+            start = perf_counter()
+            extraction.start()
+            done = None
+            while done is None:
+                done = extraction.wait(0.25)
+            elapsed = perf_counter() - start
+            same = done and tree_digest(destination) == expected
+            shutil.rmtree(destination)
+            label = f"{workers} worker(s)"
+            print(f"{label:<16} {elapsed:>10.2f} {total / 1048576 / elapsed:>8.0f} {str(same):>10}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmark du moteur d'extraction ZIP (zip_engine.py) contre zipfile.extract.
+
+Génère une arborescence de jeu dans un ZIP deflate dont le répertoire
+central est mélangé (`--order shuffled`, comme une archive mise à jour
+ou produite par certains outils) ou dans l'ordre du fichier (`sorted`),
+puis compare sur deux stockages :
+- ssd : lectures directes sur le fichier (cache du système compris) ;
+- hdd : lectures de l'archive passées par un modèle de disque dur, une
+  seule tête : `--seek-ms` par lecture qui ne suit pas la précédente
+  (saut en avant de moins de READ_AHEAD compris, lu au passage), puis
+  `--hdd-mb` Mo/s.
+Méthodes :
+- zipfile : zip_ref.extract dans l'ordre d'infolist() ;
+- moteur : zip_engine.extract_all (ordre des offsets, tampon de
+  BUFFER_SIZE, lectures positionnelles, taille finale réservée) ;
+- moteur xN : ParallelZipExtractor avec `--workers` workers.
+Mesure la durée et le nombre de déplacements de tête, vérifie
+l'arborescence obtenue.
+
+Usage : python benchmarks/bench_zip_engine.py [--size-mb 256] [--order shuffled] [--seek-ms 8]
+        [--hdd-mb 150] [--workers 4]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import zipfile
+import argparse
+import tempfile
+import threading
+from time import perf_counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "python"))
+
+from bench_unzip import make_archive, tree_digest, settle
+
+import zip_engine
+import zip_parallel
+from zip_engine import ZipReader, BUFFER_SIZE, plan
+
+
+READ_AHEAD = 64 * 1024
+
+
+class Disk:
+    """Une tête de lecture : déplacement facturé si la lecture ne suit pas la précédente"""
+
+    def __init__(self, seek_ms: float, mb_per_s: float):
+        self.seek = seek_ms / 1000
+        self.rate = mb_per_s * 1024 * 1024
+        self.seeks = 0
+        self._end = None
+        self._lock = threading.Lock()
+
+    def charge(self, offset: int, size: int):
+        with self._lock:
+            delay = size / self.rate
+            if self._end is None or not 0 <= offset - self._end < READ_AHEAD:
+                self.seeks += 1
+                delay += self.seek
+            self._end = offset + size
+            time.sleep(delay)
+
+
+class ThrottledFile:
+    """Fichier de l'archive vu par zipfile, au travers du modèle de disque"""
+
+    def __init__(self, path: str, disk: Disk):
+        self.f = open(path, "rb", buffering=0)
+        self.disk = disk
+
+    def seek(self, offset, whence=0):
+        return self.f.seek(offset, whence)
+
+    def tell(self):
+        return self.f.tell()
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        position = self.f.tell()
+        data = self.f.read(size)
+        if data:
+            self.disk.charge(position, len(data))
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+def throttled_reader(disk: Disk):
+    class ThrottledReader(ZipReader):
+        def read_into(self, view, offset):
+            count = super().read_into(view, offset)
+            if count:
+                disk.charge(offset, count)
+            return count
+    return ThrottledReader
+
+
+def shuffle_directory(path: str, source: str):
+    """Recopie `source` avec un répertoire central dans un ordre aléatoire (données inchangées)"""
+    rng = random.Random(1)
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(path, "w") as zout:
+        infos = zin.infolist()
+        for info in infos:
+            zout.writestr(info, zin.read(info), compress_type=info.compress_type, compresslevel=1)
+        rng.shuffle(zout.filelist)
+
+
+def run_zipfile(archive: str, destination: str, disk):
+    source = ThrottledFile(archive, disk) if disk else archive
+    with zipfile.ZipFile(source) as zf:
+        for member in zf.infolist():
+            zf.extract(member, destination)
+
+
+def run_engine(archive: str, destination: str, disk):
+    if not disk:
+        with zipfile.ZipFile(archive) as zf:
+            members = zf.infolist()
+        zip_engine.extract_all(archive, members, destination)
+        return
+    with zipfile.ZipFile(archive) as zf:
+        members = zf.infolist()
+    buffer = bytearray(BUFFER_SIZE)
+    with throttled_reader(disk)(archive) as reader:
+        for member, path in plan(members, destination):
+            if member.is_dir():
+                os.makedirs(path, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            reader.extract(member, path, buffer, lambda count: None)
+
+
+def run_parallel(archive: str, destination: str, disk, workers: int):
+    original = zip_parallel.ZipReader
+    if disk:
+        zip_parallel.ZipReader = throttled_reader(disk)
+    try:
+        extraction = zip_parallel.ParallelZipExtractor(archive, destination, workers=workers)
+        extraction.start()
+        while extraction.wait(0.25) is None:
+            pass
+    finally:
+        zip_parallel.ZipReader = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--order", choices=("shuffled", "sorted"), default="shuffled")
+    parser.add_argument("--seek-ms", type=float, default=8.0)
+    parser.add_argument("--hdd-mb", type=float, default=150.0)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_zip_engine_")
+    try:
+        archive = os.path.join(workdir, "jeu.zip")
+        make_archive(archive, args.size_mb)
+        if args.order == "shuffled":
+            shuffled = os.path.join(workdir, "melange.zip")
+            shuffle_directory(shuffled, archive)
+            os.replace(shuffled, archive)
+        with zipfile.ZipFile(archive) as zf:
+            members = zf.infolist()
+        total = sum(m.file_size for m in members)
+        print(f"Archive : {os.path.getsize(archive) / 1048576:.1f} Mo, {len(members)} fichiers, "
+              f"{total / 1048576:.1f} Mo décompressés, répertoire central {args.order}")
+        print(f"{'stockage':<9} {'méthode':<12} {'durée (s)':>10} {'Mo/s':>8} {'déplacements':>13} {'identique':>10}")
+
+        expected = None
+        methods = [
+            ("zipfile", run_zipfile),
+            ("moteur", run_engine),
+            (f"moteur x{args.workers}", lambda a, d, disk: run_parallel(a, d, disk, args.workers)),
+        ]
+        for storage in ("ssd", "hdd"):
+            for name, run in methods:
+                destination = os.path.join(workdir, "sortie")
+                disk = Disk(args.seek_ms, args.hdd_mb) if storage == "hdd" else None
+                settle()
+                start = perf_counter()
+                run(archive, destination, disk)
+                elapsed = perf_counter() - start
+                digest = tree_digest(destination)
+                expected = expected or digest
+                shutil.rmtree(destination)
+                seeks = disk.seeks if disk else "-"
+                print(f"{storage:<9} {name:<12} {elapsed:>10.2f} {total / 1048576 / elapsed:>8.0f} "
+                      f"{seeks:>13} {str(digest == expected):>10}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
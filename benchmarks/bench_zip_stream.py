@@ -0,0 +1,152 @@
+"""
+Benchmark de l'extraction ZIP au fil du téléchargement.
+
+Génère un ZIP d'arborescence de jeu (`--files` fichiers, moitié
+compressibles, moitié aléatoires, `--file-kb` Kio en moyenne), le sert
+depuis le serveur local bridé à `--rate-mb` Mo/s par connexion, puis
+compare la durée jusqu'à l'arborescence extraite :
+- téléchargement puis extraction : moteur segmenté habituel, puis
+  zipfile.extract membre par membre (ancien enchaînement) ;
+- au fil de l'eau : moteur en mode `sequential` et
+  zip_stream.StreamingZipExtractor, répertoire central vérifié à la fin.
+Vérifie que les deux arborescences sont identiques à la source et
+affiche la part des membres extraits pendant le téléchargement.
+`--descriptor` écrit les membres avec descripteur de données (bit 3).
+
+Usage : python benchmarks/bench_zip_stream.py [--files 400] [--file-kb 512] [--rate-mb 8]
+        [--connections 8] [--descriptor]
+"""
+
+import os
+import sys
+import random
+import shutil
+import hashlib
+import zipfile
+import argparse
+import tempfile
+from time import perf_counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "python"))
+
+from local_server import LocalServer
+
+from transfer import probe
+from aio_transfer import create_downloader
+from http_pool import get_session, pool_size
+from zip_stream import StreamingZipExtractor
+
+
+class Unseekable:
+    """Sortie sans seek : zipfile écrit alors des descripteurs de données"""
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, data):
+        return self.f.write(data)
+
+    def tell(self):
+        return self.f.tell()
+
+    def flush(self):
+        self.f.flush()
+
+
+def make_zip(path: str, files: int, file_kb: int, descriptor: bool):
+    rng = random.Random(0)
+    words = [f"texture{index:03d}".encode() for index in range(256)]
+    with open(path, "wb") as raw:
+        target = Unseekable(raw) if descriptor else raw
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            for index in range(files):
+                size = rng.randint(file_kb * 512, file_kb * 1536)
+                if index % 2:
+                    data = rng.randbytes(size)
+                else:
+                    data = b" ".join(rng.choice(words) for _ in range(size // 11))[:size]
+                zf.writestr(f"Jeu/Data/pack{index // 50:02d}/fichier{index:04d}.dat", data)
+
+
+def tree_digest(root: str):
+    digest, count = hashlib.sha256(), 0
+    for folder, dirs, names in sorted(os.walk(root)):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(folder, name)
+            digest.update(os.path.relpath(path, root).encode())
+            with open(path, "rb") as f:
+                digest.update(f.read())
+            count += 1
+    return count, digest.hexdigest()
+
+
+def download(session, url: str, tmp_file: str, connections: int, sequential: bool):
+    remote, response = probe(session, url)
+    engine = create_downloader(session, remote.url, tmp_file, connections=connections, sequential=sequential)
+    return engine, remote, response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--file-kb", type=int, default=512)
+    parser.add_argument("--rate-mb", type=float, default=8.0, help="débit par connexion (Mo/s)")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--descriptor", action="store_true", help="membres avec descripteur de données")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_zip_stream_")
+    session = get_session(pool_size(1, args.connections))
+    try:
+        archive = os.path.join(workdir, "jeu.zip")
+        make_zip(archive, args.files, args.file_kb, args.descriptor)
+        reference = os.path.join(workdir, "reference")
+        with zipfile.ZipFile(archive) as zf:
+            zf.extractall(reference)
+        expected = tree_digest(reference)
+        print(f"Archive : {os.path.getsize(archive) / 1048576:.1f} Mo, {expected[0]} fichiers, "
+              f"{args.rate_mb:g} Mo/s x {args.connections} connexions")
+        print(f"{'méthode':<26} {'téléchargé (s)':>15} {'extrait (s)':>12} {'au fil (%)':>11} {'identique':>10}")
+
+        with LocalServer(0, rate=int(args.rate_mb * 1024 * 1024), source=archive) as url:
+            # Téléchargement puis extraction
+            destination = os.path.join(workdir, "apres")
+            tmp_file = os.path.join(workdir, "apres.zip.part")
+            start = perf_counter()
+            engine, remote, response = download(session, url, tmp_file, args.connections, False)
+            engine.run(remote, response)
+            downloaded = perf_counter() - start
+            with zipfile.ZipFile(tmp_file) as zf:
+                for member in zf.infolist():
+                    zf.extract(member, destination)
+            elapsed = perf_counter() - start
+            same = tree_digest(destination) == expected
+            print(f"{'téléchargement + zipfile':<26} {downloaded:>15.1f} {elapsed:>12.1f} {0:>11.0f} {str(same):>10}")
+
+            # Au fil de l'eau
+            destination = os.path.join(workdir, "fil")
+            tmp_file = os.path.join(workdir, "fil.zip.part")
+            start = perf_counter()
+            engine, remote, response = download(session, url, tmp_file, args.connections, True)
+            extractor = StreamingZipExtractor(tmp_file, destination, engine.available)
+            extractor.start()
+            completed = False
+            try:
+                completed = engine.run(remote, response)
+            finally:
+                downloaded = perf_counter() - start
+                streamed = len(extractor.extracted)
+                ok = extractor.finish(completed)
+            elapsed = perf_counter() - start
+            same = ok and tree_digest(destination) == expected
+            share = streamed / expected[0] * 100 if expected[0] else 0.0
+            label = "au fil de l'eau"
+            print(f"{label:<26} {downloaded:>15.1f} {elapsed:>12.1f} {share:>11.0f} {str(same):>10}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Serveur HTTP local pour les benchmarks (processus séparé).
+
+Sert un contenu déterministe de `size` octets sur n'importe quel chemin,
+avec support de `Range` (206 + Content-Range), pour que le CPU mesuré côté
+client ne comprenne pas celui du serveur.
+
+`stall_every` simule des connexions à moitié mortes : une requête de
+plage sur `stall_every` se bloque après STALL_AFTER octets, en silence
+(`stall_mode="silent"`) ou en ne livrant plus qu'un octet par seconde
+(`"trickle"`).
+
+`source` : fichier servi à la place du contenu déterministe (même nom
+dans Content-Disposition).
+"""
+
+import os
+import re
+import socket
+import time
+import threading
+import multiprocessing
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BLOCK_SIZE = 1024 * 1024
+RANGE_RE = re.compile(r"bytes=(\d+)-(\d*)")
+STALL_AFTER = 256 * 1024
+STALL_LIMIT = 600      # Secondes avant qu'une connexion bloquée se ferme d'elle-même
+
+
+def pattern_block() -> bytes:
+    """Bloc répété pour former le contenu servi"""
+    return bytes((i * 31 + 7) % 251 for i in range(BLOCK_SIZE))
+
+
+def expected_bytes(start: int, end: int) -> bytes:
+    """Contenu attendu pour [start, end[ (vérifications des benchmarks)"""
+    block = pattern_block()
+    out = bytearray()
+    pos = start
+    while pos < end:
+        offset = pos % BLOCK_SIZE
+        take = min(BLOCK_SIZE - offset, end - pos)
+        out += block[offset:offset + take]
+        pos += take
+    return bytes(out)
+
+
+def _make_handler(size: int, ranges: bool, rate: int, stall_every: int = 0, stall_mode: str = "silent",
+                  source: str = None):
+    block = memoryview(pattern_block() * 2)
+    content, filename = None, "bench.bin"
+    if source:
+        with open(source, "rb") as f:
+            content = memoryview(f.read())
+        size, filename = len(content), os.path.basename(source)
+    counter = {"requests": 0}
+    counter_lock = threading.Lock()
+
+    def should_stall(start: int, end: int) -> bool:
+        # Les sondes (bytes=0-0) ne se bloquent jamais
+        if not stall_every or end - start <= STALL_AFTER:
+            return False
+        with counter_lock:
+            counter["requests"] += 1
+            return counter["requests"] % stall_every == 0
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def handle(self):
+            # Connexions keep-alive fermées par le client en fin de benchmark
+            try:
+                super().handle()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def do_GET(self):
+            start, end = 0, size
+            match = RANGE_RE.match(self.headers.get("Range", ""))
+            if ranges and match:
+                start = int(match.group(1))
+                end = int(match.group(2)) + 1 if match.group(2) else size
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+            else:
+                self.send_response(200)
+            self.send_header("Accept-Ranges", "bytes" if ranges else "none")
+            self.send_header("Content-Length", str(end - start))
+            self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+            self.end_headers()
+
+            pos = start
+            window_start = time.perf_counter()
+            sent_in_window = 0
+            stall_at = start + STALL_AFTER if should_stall(start, end) else None
+            try:
+                while pos < end:
+                    if pos == stall_at:
+                        self._stall(block, pos, end)
+                        return
+                    offset = pos % BLOCK_SIZE
+                    take = min(BLOCK_SIZE, end - pos)
+                    if stall_at is not None and pos < stall_at:
+                        take = min(take, stall_at - pos)
+                    if content is not None:
+                        self.wfile.write(content[pos:pos + take])
+                    else:
+                        self.wfile.write(block[offset:offset + take])
+                    pos += take
+                    if rate:
+                        # Débit limité par connexion (simulation d'hébergeur)
+                        sent_in_window += take
+                        expected = sent_in_window / rate
+                        elapsed = time.perf_counter() - window_start
+                        if expected > elapsed:
+                            time.sleep(expected - elapsed)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def _stall(self, block, pos: int, end: int):
+            self.wfile.flush()
+            self.close_connection = True
+            deadline = time.time() + STALL_LIMIT
+            while time.time() < deadline and pos < end:
+                time.sleep(1)
+                if stall_mode == "trickle":
+                    offset = pos % BLOCK_SIZE
+                    self.wfile.write(block[offset:offset + 1])
+                    self.wfile.flush()
+                    pos += 1
+
+    return Handler
+
+
+def _serve(port: int, size: int, ranges: bool, rate: int, stall_every: int, stall_mode: str, source: str):
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(size, ranges, rate, stall_every, stall_mode, source))
+    server.daemon_threads = True
+    server.serve_forever()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """Lance le serveur dans un processus séparé (`with LocalServer(...) as url`)"""
+
+    def __init__(self, size: int, ranges: bool = True, rate: int = 0, stall_every: int = 0, stall_mode: str = "silent",
+                 source: str = None):
+        self.size = os.path.getsize(source) if source else size
+        self.source = source
+        self.ranges = ranges
+        self.rate = rate
+        self.stall_every = stall_every
+        self.stall_mode = stall_mode
+        self.port = _free_port()
+        self.process = None
+
+    def __enter__(self) -> str:
+        self.process = multiprocessing.Process(
+            target=_serve, args=(self.port, self.size, self.ranges, self.rate, self.stall_every, self.stall_mode, self.source),
+            daemon=True,
+        )
+        self.process.start()
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.2):
+                    break
+            except OSError:
+                time.sleep(0.05)
+        return f"http://127.0.0.1:{self.port}/{os.path.basename(self.source) if self.source else 'bench.bin'}"
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join()
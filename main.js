@@ -9,6 +9,7 @@ const yauzl = require('yauzl');
 const WebTorrent = require('webtorrent');
 const { spawn } = require('child_process');
 const { createShortcut } = require('./utils/shortcut');
+const { DownloadDaemon } = require('./utils/download-daemon');
 const config = require('./config');
 
 let mainWindow;
@@ -22,6 +23,8 @@ const activeDownloads = new Map(); // Map<downloadId, downloadInfo>
 const downloadProcesses = new Map(); // Map<downloadId, { type, process, cancelToken }>
 let downloadHistory = []; // Historique des téléchargements (terminés, annulés, erreurs)
 let downloadIdCounter = 0;
+// Version du schéma des événements de download_manager.py comprise ici
+const PYTHON_EVENT_SCHEMA = 1;
 
 // Chemin pour sauvegarder l'historique
 const HISTORY_FILE = path.join(app.getPath('userData'), 'download-history.json');
@@ -103,6 +106,15 @@ function getPythonExecutable() {
 const pythonExe = getPythonExecutable();
 console.log('[Python] Exécutable Python utilisé:', pythonExe);
 
+// Démon download_manager.py serve (via launcher.py), lancé au premier téléchargement puis réutilisé
+let downloadDaemon = null;
+function getDownloadDaemon() {
+  if (!downloadDaemon) {
+    downloadDaemon = new DownloadDaemon(pythonExe, getPythonScriptPath('launcher.py'), app.getPath('userData'));
+  }
+  return downloadDaemon;
+}
+
 // Fonction pour obtenir le chemin du script Python
 function getPythonScriptPath(scriptName) {
   // En développement - chercher dans python/
@@ -237,6 +249,9 @@ app.whenReady().then(() => {
 // Sauvegarder l'historique avant de quitter
 app.on('before-quit', () => {
   saveDownloadHistory();
+  if (downloadDaemon) {
+    downloadDaemon.stop();
+  }
 });
 
 app.on('window-all-closed', () => {
@@ -315,6 +330,8 @@ ipcMain.handle('get-games', async () => {
         id: `game-${index}`,
         title: game.title,
         downloadLink: downloadLink,
+        // Tous les liens du catalogue : download_manager.py les utilise comme miroirs
+        mirrors: Array.isArray(game.dl) ? game.dl.filter(Boolean) : [],
         imageUrl: game.image || '',
         description: game.description || '',
         isMultiplayer: game.online || false,
@@ -371,6 +388,8 @@ ipcMain.handle('install-game', async (event, game) => {
       id: downloadId,
       gameTitle: game.title,
       gameDir: gameDir,
+      // Taille annoncée par le catalogue : sert à l'ETA de la file d'attente Python
+      size: game.size || '',
       status: 'starting',
       progress: 0,
       message: 'Démarrage...',
@@ -393,7 +412,7 @@ ipcMain.handle('install-game', async (event, game) => {
     // Lancer le téléchargement en arrière-plan (non bloquant)
     const downloadPromise = isTorrent
       ? downloadTorrent(downloadLink, gameDir, game.title, event, downloadId)
-      : downloadAndExtractZip(downloadLink, gameDir, game.title, event, downloadId);
+      : downloadAndExtractZip(downloadLink, gameDir, game.title, event, downloadId, game.mirrors || []);
 
     // Ne pas attendre la fin du téléchargement, retourner immédiatement
     downloadPromise.then(result => {
@@ -559,6 +578,109 @@ ipcMain.handle('get-active-downloads', async () => {
   return Array.from(activeDownloads.values());
 });
 
+// File d'attente du démon Python : état, position et ETA de chaque téléchargement
+ipcMain.handle('get-download-queue', async () => {
+  try {
+    const daemon = getDownloadDaemon();
+    if (!daemon.socket) {
+      return { success: true, jobs: [] };
+    }
+    const queue = await daemon.command('queue');
+    return { success: true, jobs: queue.jobs, maxDownloads: queue.max_downloads, maxExtractions: queue.max_extractions };
+  } catch (error) {
+    return { success: false, error: error.message, jobs: [] };
+  }
+});
+
+// Priorité d'un téléchargement (plus grand = plus prioritaire, peut suspendre un téléchargement moins prioritaire)
+ipcMain.handle('set-download-priority', async (event, downloadId, priority) => {
+  try {
+    await getDownloadDaemon().command('set_priority', { download_id: downloadId, priority });
+    return { success: true };
+  } catch (error) {
+    return { success: false, error: error.message };
+  }
+});
+
+// Limites de la file : téléchargements et extractions simultanés
+ipcMain.handle('set-download-limits', async (event, maxDownloads, maxExtractions) => {
+  try {
+    await getDownloadDaemon().start();
+    await getDownloadDaemon().command('set_queue_limits', { max_downloads: maxDownloads, max_extractions: maxExtractions });
+    return { success: true };
+  } catch (error) {
+    return { success: false, error: error.message };
+  }
+});
+
+// Disques disponibles : espace libre et profil de débit mesuré (inventaire en cache côté démon)
+ipcMain.handle('get-disks', async () => {
+  try {
+    const daemon = getDownloadDaemon();
+    await daemon.start();
+    const { drives } = await daemon.command('get_disks');
+    return { success: true, drives };
+  } catch (error) {
+    return { success: false, error: error.message, drives: [] };
+  }
+});
+
+// Disque conseillé : le plus rapide qui a la place pour la taille décompressée du jeu
+ipcMain.handle('suggest-install-drive', async (event, size) => {
+  try {
+    const daemon = getDownloadDaemon();
+    await daemon.start();
+    const { suggested, drives } = await daemon.command('suggest_disk', { size });
+    return { success: true, suggested, drives };
+  } catch (error) {
+    return { success: false, error: error.message };
+  }
+});
+
+// Mesure d'écriture d'un dossier (quelques secondes) : processus séparé pour ne pas occuper le démon
+ipcMain.handle('benchmark-disk', async (event, dirPath) => {
+  return new Promise((resolve) => {
+    const proc = spawn(pythonExe, [getPythonScriptPath('launcher.py'), 'bench_disk', dirPath, app.getPath('userData')], {
+      windowsHide: true
+    });
+    let output = '';
+    proc.stdout.on('data', (data) => {
+      output += data.toString();
+    });
+    proc.on('error', (error) => resolve({ success: false, error: error.message }));
+    proc.on('close', () => {
+      try {
+        const result = JSON.parse(output.trim().split('\n').pop());
+        resolve(result.error ? { success: false, error: result.error } : { success: true, profile: result });
+      } catch (e) {
+        resolve({ success: false, error: `Mesure du disque impossible: ${e.message}` });
+      }
+    });
+  });
+});
+
+// Téléchargements interrompus (crash, fermeture brutale) relevés par le démon au démarrage
+ipcMain.handle('get-interrupted-downloads', async () => {
+  try {
+    const daemon = getDownloadDaemon();
+    await daemon.start();
+    const { jobs } = await daemon.command('interrupted');
+    return { success: true, jobs };
+  } catch (error) {
+    return { success: false, error: error.message, jobs: [] };
+  }
+});
+
+// Oublier un téléchargement interrompu (l'utilisateur ne le reprendra pas)
+ipcMain.handle('dismiss-interrupted-download', async (event, downloadId) => {
+  try {
+    await getDownloadDaemon().command('forget', { download_id: downloadId });
+    return { success: true };
+  } catch (error) {
+    return { success: false, error: error.message };
+  }
+});
+
 // Obtenir l'historique des téléchargements
 ipcMain.handle('get-download-history', async () => {
   return downloadHistory;
@@ -588,6 +710,14 @@ ipcMain.handle('cancel-download', async (event, downloadId) => {
         // Tuer le processus Python
         processInfo.process.kill();
         console.log(`[Cancel] Processus Python arrêté pour ${downloadId}`);
+      } else if (processInfo.type === 'python-daemon') {
+        // Le démon arrête le transfert et supprime les fichiers partiels
+        try {
+          await getDownloadDaemon().command('stop', { download_id: processInfo.pythonDownloadId });
+        } catch (err) {
+          console.warn(`[Cancel] Démon Python injoignable: ${err.message}`);
+        }
+        console.log(`[Cancel] Téléchargement Python arrêté pour ${downloadId}`);
       } else if (processInfo.type === 'axios' && processInfo.cancelToken) {
         // Annuler la requête axios
         processInfo.cancelToken.cancel('Téléchargement annulé par l\'utilisateur');
@@ -881,7 +1011,7 @@ async function followRedirects(url, maxRedirects = 10) {
 }
 
 // Télécharger et extraire un fichier ZIP
-async function downloadAndExtractZip(url, destinationDir, gameTitle, event, downloadId = null) {
+async function downloadAndExtractZip(url, destinationDir, gameTitle, event, downloadId = null, mirrors = []) {
   try {
     const updateProgress = (status, progress, message = null, service = null) => {
       const update = {
@@ -931,7 +1061,7 @@ async function downloadAndExtractZip(url, destinationDir, gameTitle, event, down
       updateProgress('downloading-with-python', 0, `Téléchargement via ${serviceName}...`, serviceName);
 
       // Utiliser le script Python pour télécharger
-      return await downloadWithPython(realUrl, destinationDir, gameTitle, event, downloadId);
+      return await downloadWithPython(realUrl, destinationDir, gameTitle, event, downloadId, mirrors.filter(m => m !== url));
     }
 
     // Si c'est un lien direct ZIP, continuer avec le téléchargement axios normal
@@ -990,7 +1120,7 @@ async function downloadAndExtractZip(url, destinationDir, gameTitle, event, down
       updateProgress('downloading-with-python', 0, `Téléchargement via ${detectedService.name}...`, detectedService.name);
 
       // Utiliser le script Python pour télécharger
-      return await downloadWithPython(realUrl, destinationDir, gameTitle, event, downloadId);
+      return await downloadWithPython(realUrl, destinationDir, gameTitle, event, downloadId, mirrors.filter(m => m !== url));
     }
 
     // Vérifier que ce n'est pas du HTML même si le Content-Type dit autre chose
@@ -1242,7 +1372,7 @@ function extractZip(zipPath, destinationDir, event, gameTitle, downloadId = null
 }
 
 // Télécharger avec le script Python (pour Gofile, Mega, etc.)
-async function downloadWithPython(url, destinationDir, gameTitle, event, downloadId = null) {
+async function downloadWithPython(url, destinationDir, gameTitle, event, downloadId = null, mirrors = []) {
   return new Promise((resolve, reject) => {
     try {
       // Détecter si c'est un lien gofile
@@ -1251,6 +1381,7 @@ async function downloadWithPython(url, destinationDir, gameTitle, event, downloa
       // Si c'est gofile, utiliser gofile-downloader.py
       let script;
       let scriptArgs;
+      let pythonDownloadId = null;
 
       if (isGofile) {
         // Utiliser gofile-downloader.py pour gofile
@@ -1281,11 +1412,12 @@ async function downloadWithPython(url, destinationDir, gameTitle, event, downloa
         console.log('[Gofile Download] Nom du jeu:', cleanGameName);
         console.log('[Gofile Download] Téléchargement dans: c:/sroff-game/' + cleanGameName);
       } else {
-        // Pour les autres services, utiliser download_manager.py
-        script = getPythonScriptPath('download_manager.py');
-        const pythonDownloadId = downloadId || `dl_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
+        // Pour les autres services, utiliser download_manager.py (via son lanceur : bytecode en cache)
+        script = getPythonScriptPath('launcher.py');
+        pythonDownloadId = downloadId || `dl_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
         const userDataPath = app.getPath('userData');
-        scriptArgs = [script, 'download', url, destinationDir, pythonDownloadId, userDataPath];
+        // Les autres liens du catalogue suivent en miroirs (le lien principal est écarté côté Python)
+        scriptArgs = [script, 'download', url, destinationDir, pythonDownloadId, userDataPath, ...mirrors];
       }
 
       // Fonction helper pour mettre à jour la progression
@@ -1319,64 +1451,28 @@ async function downloadWithPython(url, destinationDir, gameTitle, event, downloa
         console.log('[Python Download] Destination:', destinationDir);
       }
 
-      const proc = spawn(pythonExe, scriptArgs, {
-        windowsHide: true
-      });
-
-      // Stocker le processus Python
-      if (downloadId) {
-        downloadProcesses.set(downloadId, {
-          type: 'python',
-          process: proc
-        });
-      }
-
       let lastProgress = 0;
       let lastMessage = '';
 
-      proc.stdout.on('data', (data) => {
-        const lines = data.toString().split('\n').filter(line => line.trim());
-        for (const line of lines) {
-          if (isGofile) {
-            // Pour gofile-downloader.py, les messages sont en texte brut
-            // Essayer d'extraire des informations de progression depuis les messages
-            console.log('[Gofile Download] Output:', line);
-
-            // Détecter les messages de progression (ex: "Downloading file.zip: 50%")
-            const progressMatch = line.match(/(\d+(?:\.\d+)?)\s*%/i);
-            if (progressMatch) {
-              lastProgress = parseFloat(progressMatch[1]);
-              updateProgress('downloading-with-python', lastProgress, line);
-            } else if (line.toLowerCase().includes('downloading') || line.toLowerCase().includes('extraction')) {
-              // Mettre à jour le message même sans pourcentage
-              lastMessage = line;
-              updateProgress('downloading-with-python', lastProgress, lastMessage);
-            }
-          } else {
-            // Pour download_manager.py, les messages sont en JSON
-            try {
-              const status = JSON.parse(line);
-              if (status.progress !== undefined) {
-                lastProgress = status.progress;
-              }
-              if (status.message) {
-                lastMessage = status.message;
-              }
-
-              updateProgress('downloading-with-python', status.progress || lastProgress, status.message || lastMessage);
-            } catch (e) {
-              // Ignorer les lignes non-JSON
-              console.log('[Python Download] Output:', line);
-            }
-          }
+      // Statut JSON de download_manager.py (sortie du processus ou événement du démon)
+      let schemaWarned = false;
+      const handleStatus = (status) => {
+        // Schéma des événements (python/events.py) : les champs lus ici restent stables d'une version à l'autre
+        if (status.v > PYTHON_EVENT_SCHEMA && !schemaWarned) {
+          schemaWarned = true;
+          console.warn(`[Python Download] Schéma d'événements v${status.v} plus récent que v${PYTHON_EVENT_SCHEMA}`);
+        }
+        if (status.progress !== undefined) {
+          lastProgress = status.progress;
+        }
+        if (status.message) {
+          lastMessage = status.message;
         }
-      });
 
-      proc.stderr.on('data', (data) => {
-        console.error('[Python Download] Error:', data.toString());
-      });
+        updateProgress('downloading-with-python', status.progress || lastProgress, status.message || lastMessage);
+      };
 
-      proc.on('close', (code) => {
+      const onFinished = (code) => {
         if (code === 0) {
           // Pour gofile, les fichiers sont téléchargés dans c:/sroff-game/lenomdujeux
           let finalDestinationDir = destinationDir;
@@ -1478,11 +1574,93 @@ async function downloadWithPython(url, destinationDir, gameTitle, event, downloa
         } else {
           reject(new Error(`Erreur lors du téléchargement Python (code ${code})`));
         }
-      });
+      };
 
-      proc.on('error', (err) => {
-        reject(new Error(`Impossible de lancer le script Python: ${err.message}`));
-      });
+      // Un processus Python par téléchargement (gofile-downloader.py, ou repli si le démon est indisponible)
+      const runProcess = () => {
+        const proc = spawn(pythonExe, scriptArgs, {
+          windowsHide: true
+        });
+
+        // Stocker le processus Python
+        if (downloadId) {
+          downloadProcesses.set(downloadId, {
+            type: 'python',
+            process: proc
+          });
+        }
+
+        // Un événement peut arriver coupé entre deux blocs : seules les lignes complètes sont lues
+        let stdoutBuffer = '';
+        proc.stdout.setEncoding('utf8');
+        proc.stdout.on('data', (data) => {
+          stdoutBuffer += data;
+          const lines = stdoutBuffer.split('\n');
+          stdoutBuffer = lines.pop();
+          for (const line of lines.filter(line => line.trim())) {
+            if (isGofile) {
+              // Pour gofile-downloader.py, les messages sont en texte brut
+              // Essayer d'extraire des informations de progression depuis les messages
+              console.log('[Gofile Download] Output:', line);
+
+              // Détecter les messages de progression (ex: "Downloading file.zip: 50%")
+              const progressMatch = line.match(/(\d+(?:\.\d+)?)\s*%/i);
+              if (progressMatch) {
+                lastProgress = parseFloat(progressMatch[1]);
+                updateProgress('downloading-with-python', lastProgress, line);
+              } else if (line.toLowerCase().includes('downloading') || line.toLowerCase().includes('extraction')) {
+                // Mettre à jour le message même sans pourcentage
+                lastMessage = line;
+                updateProgress('downloading-with-python', lastProgress, lastMessage);
+              }
+            } else {
+              // Pour download_manager.py, les messages sont en JSON
+              try {
+                handleStatus(JSON.parse(line));
+              } catch (e) {
+                // Ignorer les lignes non-JSON
+                console.log('[Python Download] Output:', line);
+              }
+            }
+          }
+        });
+
+        proc.stderr.on('data', (data) => {
+          console.error('[Python Download] Error:', data.toString());
+        });
+
+        proc.on('close', onFinished);
+
+        proc.on('error', (err) => {
+          reject(new Error(`Impossible de lancer le script Python: ${err.message}`));
+        });
+      };
+
+      if (isGofile) {
+        runProcess();
+        return;
+      }
+
+      // download_manager.py : le démon possède le téléchargement, les statuts arrivent par la socket
+      if (downloadId) {
+        downloadProcesses.set(downloadId, {
+          type: 'python-daemon',
+          pythonDownloadId
+        });
+      }
+      const downloadInfo = (downloadId && activeDownloads.get(downloadId)) || {};
+      getDownloadDaemon()
+        .download(pythonDownloadId, { url, destination: destinationDir, mirrors, size: downloadInfo.size || '', title: gameTitle }, handleStatus)
+        .then((result) => {
+          if (result.error) {
+            console.error('[Python Download] Error:', result.error);
+          }
+          onFinished(result.success ? 0 : 1);
+        })
+        .catch((err) => {
+          console.warn(`[Python Download] Démon indisponible (${err.message}), lancement d'un processus dédié`);
+          runProcess();
+        });
     } catch (error) {
       reject(error);
     }
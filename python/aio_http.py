@@ -0,0 +1,388 @@
+"""
+Client HTTP/1.1 minimal sur asyncio (BufferedProtocol).
+
+Juste ce qu'il faut au moteur asynchrone (aio_transfer.py) : requêtes
+GET, redirections, corps à Content-Length ou `chunked`, connexions
+keep-alive réutilisées par hôte, TLS vérifié avec les certificats de
+certifi (comme requests). Le Python embarqué ne fournit ni aiohttp ni
+httpx ; un autre client peut être branché s'il expose la même interface
+(`get(url, headers)` -> réponse avec `status_code`, `headers`, `url`,
+`readinto`, `release`, `close`).
+
+Requêtes, connexions et handshakes TLS sont comptés dans http_pool.stats,
+avec ceux de la session requests (un seul rapport par téléchargement).
+
+Les délais de connexion, de premier octet et de lecture sont ceux de
+stall_watch.py ; un délai dépassé lève StallError avec la phase en cause.
+"""
+
+import ssl
+import asyncio
+from typing import Optional, Dict, List, Tuple
+from urllib.parse import urlsplit, urljoin
+
+import certifi
+from requests.structures import CaseInsensitiveDict
+
+from http_pool import stats
+from stall_watch import deadline, timed_out
+
+STREAM_LIMIT = 1024 * 1024      # Tampon de réception d'une connexion
+MAX_REDIRECTS = 10
+MAX_IDLE_PER_HOST = 32
+
+_Key = Tuple[str, str, int]
+
+
+async def _within(awaitable, kind: str):
+    """`awaitable` borné au délai de la phase `kind` ; StallError au-delà"""
+    try:
+        return await asyncio.wait_for(awaitable, deadline(kind))
+    except asyncio.TimeoutError as e:
+        raise timed_out(kind) from e
+
+
+class _Connection(asyncio.BufferedProtocol):
+    """
+    Connexion lue via BufferedProtocol : la boucle reçoit directement dans
+    un tampon fixe, d'où le corps est recopié une seule fois vers le tampon
+    du pool (aucun objet bytes par lecture, contrairement à StreamReader).
+    La lecture du socket est suspendue tant que le tampon est plein.
+    """
+
+    def __init__(self, size: int = STREAM_LIMIT):
+        self.transport: Optional[asyncio.Transport] = None
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        self._eof = False
+        self._error: Optional[BaseException] = None
+        self._paused = False
+        self._waiter: Optional[asyncio.Future] = None
+
+    # Rappels de la boucle
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        pending = self._end - self._start
+        if self._end == len(self._buffer) and self._start:
+            # Octets non lus ramenés en tête
+            self._view[:pending] = self._view[self._start:self._end]
+            self._start, self._end = 0, pending
+        elif not pending:
+            self._start = self._end = 0
+        if self._end == len(self._buffer):
+            # Transport qui ignore pause_reading() : le tampon grandit
+            self._buffer = self._buffer + bytearray(len(self._buffer))
+            self._view = memoryview(self._buffer)
+        return self._view[self._end:]
+
+    def buffer_updated(self, nbytes: int):
+        self._end += nbytes
+        if self._end - self._start >= len(self._buffer) and not self._paused:
+            self._paused = True
+            self.transport.pause_reading()
+        self._wake()
+
+    def eof_received(self):
+        self._eof = True
+        self._wake()
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self._eof = True
+        self._error = exc
+        self._wake()
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    # Lecture
+
+    async def _wait_for_data(self):
+        if self._error is not None:
+            raise self._error
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def _consume(self, count: int) -> bytes:
+        data = bytes(self._view[self._start:self._start + count])
+        self._skip(count)
+        return data
+
+    def _skip(self, count: int):
+        self._start += count
+        if self._start == self._end:
+            self._start = self._end = 0
+        if self._paused and self._end - self._start < len(self._buffer):
+            self._paused = False
+            self.transport.resume_reading()
+
+    async def readinto(self, view: memoryview) -> int:
+        """Copie dans `view` les octets reçus (au moins 1) ; 0 à EOF"""
+        while self._start == self._end:
+            if self._eof:
+                if self._error is not None:
+                    raise self._error
+                return 0
+            await self._wait_for_data()
+        count = min(len(view), self._end - self._start)
+        view[:count] = self._view[self._start:self._start + count]
+        self._skip(count)
+        return count
+
+    async def readline(self) -> bytes:
+        """Ligne terminée par b"\\n" ; ce qui reste (éventuellement b"") à EOF"""
+        while True:
+            index = self._buffer.find(b"\n", self._start, self._end)
+            if index >= 0:
+                return self._consume(index + 1 - self._start)
+            if self._eof:
+                if self._error is not None:
+                    raise self._error
+                return self._consume(self._end - self._start)
+            if self._end - self._start >= STREAM_LIMIT:
+                raise ConnectionError("Ligne d'en-tête trop longue")
+            await self._wait_for_data()
+
+    async def readexactly(self, count: int) -> bytes:
+        while self._end - self._start < count:
+            if self._eof:
+                if self._error is not None:
+                    raise self._error
+                raise asyncio.IncompleteReadError(self._consume(self._end - self._start), count)
+            await self._wait_for_data()
+        return self._consume(count)
+
+    def at_eof(self) -> bool:
+        return self._eof and self._start == self._end
+
+    # Écriture et fermeture
+
+    def write(self, data: bytes):
+        # Requêtes de quelques centaines d'octets : pas de contrôle de flux en écriture
+        self.transport.write(data)
+
+    def get_extra_info(self, name: str, default=None):
+        return self.transport.get_extra_info(name, default)
+
+    def is_closing(self) -> bool:
+        return self.transport is None or self.transport.is_closing()
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+
+class AsyncResponse:
+    """Réponse dont le corps est lu à la demande"""
+
+    def __init__(self, client: "AsyncHTTPClient", key: _Key, url: str, conn: _Connection):
+        self.client = client
+        self.key = key
+        self.url = url
+        self.status_code = 0
+        self.headers: CaseInsensitiveDict = CaseInsensitiveDict()
+        self._conn: Optional[_Connection] = conn
+        self._remaining: Optional[int] = None   # None : jusqu'à la fermeture
+        self._chunked = False
+        self._chunk_left = 0
+        self._done = False
+        self._keep_alive = True
+
+    async def _read_head(self):
+        line = await _within(self._conn.readline(), "ttfb")
+        if not line:
+            raise ConnectionError("Connexion fermée avant la réponse")
+        parts = line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise ConnectionError(f"Réponse HTTP invalide: {line[:80]!r}")
+        self.status_code = int(parts[1])
+        version = parts[0]
+        while True:
+            line = await _within(self._conn.readline(), "ttfb")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip(), value.strip()
+            if name in self.headers:
+                self.headers[name] = f"{self.headers[name]}, {value}"
+            else:
+                self.headers[name] = value
+
+        connection = self.headers.get("Connection", "").lower()
+        self._keep_alive = "close" not in connection and (version != "HTTP/1.0" or "keep-alive" in connection)
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            self._chunked = True
+        elif "Content-Length" in self.headers:
+            self._remaining = int(self.headers["Content-Length"])
+        else:
+            self._keep_alive = False
+        if self.status_code in (204, 304) or self._remaining == 0:
+            self._remaining = 0
+            self._done = True
+
+    async def readinto(self, view: memoryview) -> int:
+        """Copie dans `view` les octets disponibles (au moins 1) ; 0 en fin de corps"""
+        if self._done or not len(view):
+            return 0
+        limit = len(view)
+        if self._chunked:
+            if self._chunk_left == 0:
+                await self._next_chunk()
+                if self._done:
+                    return 0
+            limit = min(limit, self._chunk_left)
+        elif self._remaining is not None:
+            limit = min(limit, self._remaining)
+
+        count = await _within(self._conn.readinto(view[:limit]), "read")
+        if not count:
+            if self._remaining is None and not self._chunked:
+                self._done = True
+                return 0
+            raise ConnectionError("Connexion fermée avant la fin du corps")
+        if self._chunked:
+            self._chunk_left -= count
+            if self._chunk_left == 0:
+                await _within(self._conn.readexactly(2), "read")
+        elif self._remaining is not None:
+            self._remaining -= count
+            if self._remaining == 0:
+                self._done = True
+        return count
+
+    async def _next_chunk(self):
+        line = await _within(self._conn.readline(), "read")
+        size = int(line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            # Fin : en-têtes de fin éventuels puis ligne vide
+            while line not in (b"\r\n", b"\n", b""):
+                line = await _within(self._conn.readline(), "read")
+            self._done = True
+        self._chunk_left = size
+
+    async def drain(self, limit: int = 64 * 1024):
+        """Lit un petit corps restant (redirections) pour garder la connexion"""
+        if self._remaining is not None and self._remaining > limit:
+            self.close()
+            return
+        buffer = memoryview(bytearray(limit))
+        while not self._done:
+            if not await self.readinto(buffer):
+                break
+        self.release()
+
+    def release(self):
+        """Rend la connexion au pool si le corps a été lu entièrement, sinon la ferme"""
+        if self._conn is None:
+            return
+        if self._done and self._keep_alive:
+            self.client._put(self.key, self._conn)
+        else:
+            self._conn.close()
+        self._conn = None
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class AsyncHTTPClient:
+    """Connexions keep-alive par (schéma, hôte, port)"""
+
+    def __init__(self):
+        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
+        self._idle: Dict[_Key, List[_Connection]] = {}
+        self.connections = 0
+        self.requests = 0
+
+    def _put(self, key: _Key, conn: _Connection):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < MAX_IDLE_PER_HOST and not conn.is_closing():
+            idle.append(conn)
+        else:
+            conn.close()
+
+    async def _connect(self, key: _Key):
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            # Une connexion fermée par le serveur a reçu EOF entre-temps
+            if not conn.is_closing() and not conn.at_eof():
+                return conn, True
+            conn.close()
+        scheme, host, port = key
+        ssl_context = self.ssl_context if scheme == "https" else None
+        _, conn = await _within(
+            asyncio.get_running_loop().create_connection(
+                _Connection, host, port, ssl=ssl_context,
+                server_hostname=host if ssl_context else None),
+            "connect",
+        )
+        self.connections += 1
+        stats.connection_opened(host)
+        if ssl_context is not None:
+            ssl_object = conn.get_extra_info("ssl_object")
+            stats.tls_established(bool(ssl_object and ssl_object.session_reused))
+        return conn, False
+
+    async def _send(self, url: str, headers: Dict[str, str]) -> AsyncResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Schéma non supporté: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+
+        lines = [f"GET {target} HTTP/1.1", f"Host: {host}"]
+        lines += [f"{name}: {value}" for name, value in headers.items() if name.lower() != "host"]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        for attempt in range(2):
+            conn, reused = await self._connect(key)
+            response = AsyncResponse(self, key, url, conn)
+            try:
+                conn.write(request)
+                await response._read_head()
+                self.requests += 1
+                stats.request_sent(key[1])
+                return response
+            except (ConnectionError, asyncio.IncompleteReadError):
+                response.close()
+                # Connexion keep-alive fermée côté serveur : une seule nouvelle tentative
+                if not reused or attempt:
+                    raise
+            except BaseException:
+                response.close()
+                raise
+        raise ConnectionError("Connexion impossible")
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> AsyncResponse:
+        """GET en suivant les redirections ; le corps reste à lire"""
+        headers = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._send(url, headers)
+            location = response.headers.get("Location")
+            if response.status_code not in (301, 302, 303, 307, 308) or not location:
+                return response
+            await response.drain()
+            url = urljoin(url, location)
+        raise ConnectionError(f"Trop de redirections: {url}")
+
+    def close(self):
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+        self._idle.clear()
@@ -0,0 +1,394 @@
+"""
+Moteur de transfert asynchrone.
+
+Toutes les connexions de tous les téléchargements du processus sont des
+coroutines d'une même boucle asyncio (AsyncRuntime, un seul thread), au
+lieu d'un thread par connexion. Le découpage en segments, le vol de
+travail, le journal de reprise, les créneaux par hôte et le seau à
+jetons sont ceux de SegmentedDownloader ; seuls la réception (aio_http)
+et l'écriture (petit pool de threads disque partagé) changent.
+
+Le moteur par threads reste le moteur par défaut : mesuré plus rapide
+(benchmarks/bench_concurrency.py), il est aussi utilisé d'office pour
+les serveurs sans support des plages (la réponse requests de la sonde est
+déjà ouverte). SROFF_ENGINE=async active ce moteur.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from time import perf_counter
+from typing import Optional, Dict, Any
+
+import requests
+
+from aio_http import AsyncHTTPClient
+from buffers import BUFFERS
+from transfer import (
+    SegmentedDownloader, RemoteFile, Segment, Mirror, TransferError, RemoteChanged,
+    SEGMENT_RETRIES,
+)
+from write_behind import WriteBehind, WriteError, WRITE_BUFFER_SIZE
+import host_limits
+
+ENGINE = os.getenv("SROFF_ENGINE", "threads")
+DISK_THREADS = 2
+FLUSH_INTERVAL = 0.5      # Un tampon partiel part à l'écriture au bout de 0,5 s
+SLOT_POLL = 0.2
+
+DISK_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=DISK_THREADS, thread_name_prefix="disk")
+
+
+class AsyncRuntime:
+    """Boucle d'événements partagée par tous les téléchargements du processus"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.client = AsyncHTTPClient()
+        self._thread = threading.Thread(target=self._run, name="aio-loop", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Planifie `coro` dans la boucle (depuis n'importe quel thread)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro):
+        """Exécute `coro` dans la boucle et attend son résultat"""
+        return self.submit(coro).result()
+
+
+_runtime: Optional[AsyncRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> AsyncRuntime:
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = AsyncRuntime()
+        return _runtime
+
+
+class AsyncWriteBehind:
+    """
+    Équivalent asynchrone de WriteBehind : les tampons sont écrits par
+    DISK_EXECUTOR, les coroutines n'attendent que si la mémoire en
+    attente dépasse `max_bytes`.
+    """
+
+    def __init__(self, part, max_bytes: int = WRITE_BUFFER_SIZE, on_error=None):
+        self.part = part
+        self.max_bytes = max(max_bytes, 2 * BUFFERS.buffer_size)
+        self.on_error = on_error
+        self._queued_bytes = 0
+        self._depth = 0
+        self._error: Optional[BaseException] = None
+        self._changed: Optional[asyncio.Event] = None
+
+        self.max_depth = 0
+        self.stalls = 0
+        self.stall_time = 0.0
+        self.write_time = 0.0
+
+    def _event(self) -> asyncio.Event:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def _check(self):
+        if self._error is not None:
+            raise WriteError(f"Écriture du fichier partiel impossible: {self._error}") from self._error
+
+    async def submit(self, offset: int, buffer, count: int, pooled: bool = True):
+        size = len(buffer)
+        try:
+            if self._queued_bytes + size > self.max_bytes and self._error is None:
+                self.stalls += 1
+                start = perf_counter()
+                while self._queued_bytes + size > self.max_bytes and self._error is None:
+                    self._event().clear()
+                    await self._event().wait()
+                self.stall_time += perf_counter() - start
+            self._check()
+        except BaseException:
+            if pooled:
+                BUFFERS.release(buffer)
+            raise
+        self._enqueue(offset, buffer, count, pooled)
+
+    def submit_nowait(self, offset: int, buffer, count: int, pooled: bool = True):
+        """
+        Comme submit, sans attendre ni lever : pour un `finally`, où une
+        exception remplacerait celle en cours (CancelledError compris).
+        Après une erreur d'écriture, le tampon est simplement rendu au pool.
+        """
+        if self._error is not None:
+            if pooled:
+                BUFFERS.release(buffer)
+            return
+        try:
+            self._enqueue(offset, buffer, count, pooled)
+        except RuntimeError:
+            # Exécuteur arrêté (fin du processus) : rien ne sera plus écrit
+            if pooled:
+                BUFFERS.release(buffer)
+
+    def _enqueue(self, offset: int, buffer, count: int, pooled: bool):
+        size = len(buffer)
+        future = asyncio.get_running_loop().run_in_executor(DISK_EXECUTOR, self._write, offset, buffer, count)
+        self._queued_bytes += size
+        self._depth += 1
+        self.max_depth = max(self.max_depth, self._depth)
+        future.add_done_callback(lambda f: self._done(f, buffer, size, pooled))
+
+    def _write(self, offset: int, buffer, count: int) -> float:
+        start = perf_counter()
+        self.part.write_at(offset, memoryview(buffer)[:count])
+        return perf_counter() - start
+
+    def _done(self, future: asyncio.Future, buffer, size: int, pooled: bool):
+        self._queued_bytes -= size
+        self._depth -= 1
+        error = future.exception()
+        if error is not None:
+            if self._error is None:
+                self._error = error
+                logging.error(f"Écriture du fichier partiel impossible: {error}")
+                if self.on_error:
+                    self.on_error(error)
+        else:
+            self.write_time += future.result()
+        if pooled:
+            BUFFERS.release(buffer)
+        self._event().set()
+
+    async def close(self):
+        """Attend la fin des écritures en cours"""
+        while self._depth:
+            self._event().clear()
+            await self._event().wait()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._depth,
+            "queue_max_depth": self.max_depth,
+            "queued_mb": round(self._queued_bytes / 1048576, 1),
+            "stalls": self.stalls,
+            "stall_seconds": round(self.stall_time, 3),
+            "write_seconds": round(self.write_time, 3),
+        }
+
+
+class AsyncSegmentedDownloader(SegmentedDownloader):
+    """SegmentedDownloader dont les connexions sont des coroutines de AsyncRuntime"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client: Optional[AsyncHTTPClient] = None
+        self._pending_checkpoint: Optional[asyncio.Future] = None
+
+    def _make_writer(self):
+        return AsyncWriteBehind(self.part, on_error=self._fail)
+
+    def _transfer(self, remote: RemoteFile, response: Optional[requests.Response] = None) -> bool:
+        if not (remote.accept_ranges and remote.size > 0):
+            # Flux unique : la réponse requests de la sonde est lue par le moteur par threads
+            self.writer = WriteBehind(self.part, on_error=self._fail)
+            return super()._transfer(remote, response)
+        if response is not None:
+            response.close()
+        # Pendant une pause (voir SegmentedDownloader.run), la boucle ne garde rien de ce téléchargement
+        return get_runtime().run(self.run_async(remote))
+
+    async def run_async(self, remote: RemoteFile) -> bool:
+        """Transfert segmenté ; à exécuter dans la boucle de get_runtime()"""
+        loop = asyncio.get_running_loop()
+        self.client = get_runtime().client
+        self._setup(remote)
+
+        # Préallocation et lecture du journal hors de la boucle
+        self.segments = await loop.run_in_executor(DISK_EXECUTOR, self._plan_segments, remote)
+        self.downloaded = self.resumed
+        count = self._connections_per_mirror()
+        tasks = [
+            asyncio.ensure_future(self._worker_async(mirror))
+            for mirror in self.mirrors
+            for _ in range(count)
+        ]
+        try:
+            state = self._monitor_state()
+            while True:
+                _, pending = await asyncio.wait(tasks, timeout=0.1)
+                if not pending or not self._monitor_step(state, self._schedule_checkpoint):
+                    break
+        finally:
+            self._halt.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.writer.close()
+            logging.info(f"Écriture différée: {self.writer.stats()}")
+            if len(self.mirrors) > 1:
+                logging.info(f"Miroirs: {self.mirror_stats()}")
+            if self._pending_checkpoint is not None:
+                await self._pending_checkpoint
+            await loop.run_in_executor(DISK_EXECUTOR, self._checkpoint)
+            self.part.close()
+        return self._result()
+
+    def _schedule_checkpoint(self):
+        # fsync hors de la boucle ; un point de reprise à la fois
+        if self._pending_checkpoint is None or self._pending_checkpoint.done():
+            self._pending_checkpoint = asyncio.get_running_loop().run_in_executor(DISK_EXECUTOR, self._checkpoint)
+
+    # ---------- connexions ----------
+
+    async def _acquire_slot(self, mirror: Mirror) -> Optional[host_limits.Slot]:
+        while True:
+            slot = mirror.limiter.try_acquire()
+            if slot is not None or self._is_stopped() or mirror.dropped:
+                if slot is not None and mirror.dropped:
+                    slot.release()
+                    return None
+                return slot
+            await asyncio.sleep(SLOT_POLL)
+
+    async def _worker_async(self, mirror: Mirror):
+        try:
+            while not self._is_stopped() and not mirror.dropped:
+                slot = await self._acquire_slot(mirror)
+                if slot is None:
+                    return
+                try:
+                    seg = self._next_segment()
+                    if seg is None:
+                        return
+                    try:
+                        await self._fetch_segment_async(seg, slot, mirror)
+                    finally:
+                        with self._lock:
+                            seg.active = False
+                finally:
+                    slot.release()
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            self._fail(e)
+
+    async def _fetch_segment_async(self, seg: Segment, slot: host_limits.Slot, mirror: Mirror):
+        """Voir SegmentedDownloader._fetch_segment"""
+        attempt = 0
+        while seg.remaining > 0 and not self._is_stopped():
+            before = seg.pos
+            try:
+                await self._stream_range_async(seg, slot, mirror)
+                error = TransferError("Connexion fermée avant la fin du segment")
+            except RemoteChanged as e:
+                self._fail(e)
+                return
+            except TransferError as e:
+                self._drop_mirror(mirror, str(e), e)
+                return
+            except (OSError, asyncio.IncompleteReadError) as e:
+                self._network_error(mirror, e)
+                error = e
+            if seg.remaining == 0 or self._is_stopped() or not slot.held or mirror.dropped:
+                return
+            if seg.pos > before:
+                attempt = 0
+            attempt += 1
+            if attempt > SEGMENT_RETRIES:
+                self._drop_mirror(mirror, str(error), error)
+                return
+            await asyncio.sleep(self._retry_delay(seg, error, attempt))
+
+    def _request_headers(self, mirror: Mirror) -> Dict[str, str]:
+        """En-têtes de la session requests (dont cookies) + en-têtes de la source"""
+        headers = {name: value for name, value in self.session.headers.items() if value is not None}
+        headers.update(mirror.headers)
+        cookie = requests.cookies.get_cookie_header(self.session.cookies, requests.Request("GET", mirror.url).prepare())
+        if cookie:
+            headers["Cookie"] = cookie
+        return headers
+
+    async def _stream_range_async(self, seg: Segment, slot: host_limits.Slot, mirror: Mirror):
+        headers = self._request_headers(mirror)
+        headers["Range"] = f"bytes={seg.pos}-{seg.end - 1}"
+        validator = self.journal.if_range() if mirror.primary else None
+        if validator:
+            headers["If-Range"] = validator
+        response = await self.client.get(mirror.url, headers)
+        try:
+            self._check_range(response, seg, mirror, validator)
+            await self._receive_async(response, seg, slot, mirror)
+        finally:
+            # Corps lu jusqu'au bout : connexion rendue au pool, sinon fermée
+            response.release()
+
+    async def _receive_async(self, response, seg: Segment, slot: host_limits.Slot, mirror: Mirror):
+        """
+        Remplit des tampons du pool et les confie à l'écrivain quand ils
+        sont pleins (ou au bout de FLUSH_INTERVAL). `seg.pos` avance à la
+        réception : un tampon entamé est toujours écrit, même sur erreur.
+        Lève StallError si la connexion se bloque (voir stall_watch.py).
+        """
+        # check() est appelé par run_async, dans la boucle : fermer la réponse y est sûr
+        watch = self._watch(response.close)
+        buffer = None
+        filled = 0
+        offset = 0
+        started = 0.0
+        try:
+            while True:
+                if self._is_stopped() or mirror.dropped or mirror.limiter.shed(slot):
+                    return
+                with self._lock:
+                    remaining = seg.end - seg.pos
+                if remaining <= 0:
+                    return
+                if buffer is None:
+                    buffer = BUFFERS.acquire()
+                    filled = 0
+                    offset = seg.pos
+                    started = perf_counter()
+
+                size = min(remaining, len(buffer) - filled)
+                count = await response.readinto(memoryview(buffer)[filled:filled + size])
+                if not count:
+                    return
+                watch.record(count)
+                if self.bandwidth:
+                    wait = self.bandwidth.reserve(count)
+                    if wait > 0:
+                        with watch.idle():
+                            await asyncio.sleep(wait)
+                filled += count
+                self._advance(seg, count, mirror)
+                mirror.limiter.record(count)
+
+                if filled == len(buffer) or perf_counter() - started >= FLUSH_INTERVAL:
+                    pending, buffer = buffer, None
+                    with watch.idle():
+                        await self.writer.submit(offset, pending, filled)
+        except OSError as e:
+            if watch.error is not None:
+                raise watch.error from e
+            raise
+        finally:
+            self._unwatch(watch)
+            if buffer is not None:
+                if filled:
+                    self.writer.submit_nowait(offset, buffer, filled)
+                else:
+                    BUFFERS.release(buffer)
+
+
+def create_downloader(*args, **kwargs) -> SegmentedDownloader:
+    """Moteur choisi par SROFF_ENGINE (`threads` par défaut, `async` sur demande)"""
+    if ENGINE == "async":
+        return AsyncSegmentedDownloader(*args, **kwargs)
+    return SegmentedDownloader(*args, **kwargs)
@@ -0,0 +1,226 @@
+"""
+Extraction d'une archive RAR par un seul processus UnRAR (ou 7-Zip).
+
+rarfile.extract lance l'outil externe une fois par membre : dans une
+archive solide, chaque appel décompresse de nouveau le flux depuis le
+début (coût quadratique, des heures pour 20 000 fichiers). ArchiveProcess
+lance l'outil une fois pour toute l'archive et lit sa sortie au fil de
+l'eau :
+- UnRAR : "Extracting  <nom>" puis "OK" par fichier, pourcentage de
+  l'archive entre les deux ;
+- 7-Zip (-bb1 -bsp1) : "- <nom>" au début de chaque fichier, pourcentage
+  de l'archive.
+La progression retient le plus avancé de ce pourcentage et de la part
+des octets des fichiers terminés (tailles lues par rarfile dans les
+en-têtes, sans processus).
+
+Pause : le processus est suspendu (SIGSTOP, NtSuspendProcess sous
+Windows) et ne consomme plus ni CPU ni disque. Arrêt : il est tué et le
+fichier en cours d'écriture, incomplet, est supprimé.
+
+Archives en plusieurs volumes (volume_sets.py) : avec `next_volume`,
+UnRAR est lancé avec -vp et demande chaque volume suivant ; la réponse
+(continuer ou abandonner) attend que ce volume soit téléchargé.
+`volume_opened` est appelé à chaque volume ouvert ("Extracting from").
+"""
+
+import os
+import re
+import sys
+import signal
+import logging
+import threading
+import subprocess
+from typing import Optional, Dict, List, Callable
+
+# Codes de sortie acceptés (1 : avertissement non bloquant pour les deux outils)
+SUCCESS_CODES = (0, 1)
+
+_PERCENT = re.compile(r"(\d{1,3})%")
+_UNRAR_FILE = re.compile(r"^(?:Extracting|Creating)\s+(?!from )(.+?)(?:\s+\d{1,3}%)?(\s+OK)?\s*$")
+_UNRAR_DONE = re.compile(r"^\s*OK\s*$")
+_UNRAR_VOLUME = re.compile(r"^Extracting from (.+?)\s*$")
+_UNRAR_ASK_VOLUME = re.compile(r"Insert disk with (.+?)\s*$")
+_SEVENZIP_FILE = re.compile(r"^(?:\d{1,3}% (?:\d+ )?)?- (.+?)\s*$")
+
+
+def is_sevenzip(tool: str) -> bool:
+    return os.path.basename(tool).lower().startswith("7z")
+
+
+def command(tool: str, archive: str, destination: str, ask_volumes: bool = False) -> List[str]:
+    """
+    Ligne de commande d'extraction complète, sans question (écrasement, mot de passe) ;
+    `ask_volumes` : UnRAR demande chaque volume suivant (-vp, incompatible avec -y)
+    """
+    if is_sevenzip(tool):
+        return [tool, "x", "-y", "-aoa", "-bb1", "-bsp1", "-bse1", f"-o{destination}", archive]
+    answers = ["-vp"] if ask_volumes else ["-y"]
+    return [tool, "x", *answers, "-o+", "-p-", archive, os.path.join(destination, "")]
+
+
+class ArchiveProcess:
+    """Processus d'extraction d'une archive entière ; `sizes` : nom -> taille des fichiers"""
+
+    def __init__(self, tool: str, archive: str, destination: str, sizes: Dict[str, int],
+                 next_volume: Optional[Callable[[str], bool]] = None,
+                 volume_opened: Optional[Callable[[str], None]] = None):
+        self.tool = tool
+        self.archive = archive
+        self.destination = destination
+        self.next_volume = next_volume if not is_sevenzip(tool) else None
+        self.volume_opened = volume_opened
+        self.sizes = {self._key(name): size for name, size in sizes.items()}
+        self.total_files = len(self.sizes)
+        self.total_bytes = sum(self.sizes.values())
+        self.files_done = 0
+        self.bytes_done = 0
+        self.percent = 0
+        self.current: Optional[str] = None
+        self.suspended = False
+        self.output: List[str] = []  # Dernières lignes, pour le diagnostic d'un échec
+        self._proc: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return name.replace("\\", "/").strip("/")
+
+    def start(self):
+        flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        self._proc = subprocess.Popen(
+            command(self.tool, self.archive, self.destination, self.next_volume is not None),
+            stdin=subprocess.PIPE if self.next_volume else subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            creationflags=flags,
+        )
+        self._reader = threading.Thread(target=self._read, name="archive-output", daemon=True)
+        self._reader.start()
+        logging.info(f"Extraction par {os.path.basename(self.tool)}: {self.archive} ({self.total_files} fichiers)")
+
+    # ---------- sortie de l'outil ----------
+
+    def _read(self):
+        """Découpe la sortie sur \\n, \\r et \\b : les pourcentages sont réécrits sur place"""
+        encoding = "oem" if sys.platform == "win32" else "utf-8"
+        pending = b""
+        while True:
+            chunk = self._proc.stdout.read1(4096)
+            if not chunk:
+                break
+            pending += chunk
+            tokens = re.split(rb"[\r\n\b]", pending)
+            pending = tokens.pop()
+            for token in tokens:
+                if token.strip():
+                    self._parse(token.decode(encoding, "replace"))
+        if pending.strip():
+            self._parse(pending.decode(encoding, "replace"))
+
+    def _parse(self, token: str):
+        sevenzip = is_sevenzip(self.tool)
+        if not sevenzip and self._parse_volume(token):
+            return
+        with self._lock:
+            self.output = (self.output + [token.strip()])[-20:]
+            match = (_SEVENZIP_FILE if sevenzip else _UNRAR_FILE).match(token)
+            if match:
+                name = self._key(match.group(1))
+                # 7-Zip n'annonce que le début d'un fichier (et le répète avec le pourcentage) :
+                # le précédent est terminé quand le nom change
+                if sevenzip and name != self.current:
+                    self._finish_current()
+                self.current = name
+                if not sevenzip and match.group(2):
+                    self._finish_current()
+            elif not sevenzip and _UNRAR_DONE.match(token):
+                self._finish_current()
+            for percent in _PERCENT.findall(token):
+                self.percent = max(self.percent, min(int(percent), 100))
+
+    def _parse_volume(self, token: str) -> bool:
+        """Changement de volume d'UnRAR ; les rappels sont appelés hors verrou (attente possible)"""
+        match = _UNRAR_VOLUME.match(token)
+        if match:
+            if self.volume_opened:
+                self.volume_opened(match.group(1))
+            return True
+        match = _UNRAR_ASK_VOLUME.search(token)
+        if match and self.next_volume:
+            answer = b"C\n" if self.next_volume(match.group(1)) else b"Q\n"
+            try:
+                self._proc.stdin.write(answer)
+                self._proc.stdin.flush()
+            except OSError:
+                pass
+            return True
+        return False
+
+    def _finish_current(self):
+        if self.current is not None and self.current in self.sizes:
+            self.files_done += 1
+            self.bytes_done += self.sizes[self.current]
+        self.current = None
+
+    # ---------- état ----------
+
+    @property
+    def fraction(self) -> float:
+        """Avancement de 0 à 1"""
+        with self._lock:
+            by_bytes = self.bytes_done / self.total_bytes if self.total_bytes else 0.0
+            return max(by_bytes, self.percent / 100)
+
+    def wait(self, timeout: float) -> Optional[int]:
+        """Code de sortie, ou None si l'outil tourne encore après `timeout` s"""
+        try:
+            code = self._proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            return None
+        self._reader.join()
+        with self._lock:
+            if code in SUCCESS_CODES:
+                self._finish_current()
+        return code
+
+    def error(self) -> str:
+        with self._lock:
+            return " | ".join(self.output[-3:])
+
+    # ---------- pause / arrêt ----------
+
+    def _signal_suspend(self, suspend: bool):
+        if sys.platform == "win32":
+            import ctypes
+            ntdll = ctypes.windll.ntdll
+            (ntdll.NtSuspendProcess if suspend else ntdll.NtResumeProcess)(int(self._proc._handle))
+        else:
+            os.kill(self._proc.pid, signal.SIGSTOP if suspend else signal.SIGCONT)
+
+    def suspend(self):
+        if not self.suspended and self._proc.poll() is None:
+            self._signal_suspend(True)
+            self.suspended = True
+
+    def resume(self):
+        if self.suspended:
+            if self._proc.poll() is None:
+                self._signal_suspend(False)
+            self.suspended = False
+
+    def terminate(self):
+        """Tue l'outil (même suspendu) et supprime le fichier qu'il écrivait"""
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self.resume()
+        self._proc.wait()
+        self._reader.join()
+        with self._lock:
+            current, self.current = self.current, None
+        if current:
+            path = os.path.join(self.destination, current)
+            try:
+                if os.path.isfile(path):
+                    os.remove(path)
+            except OSError as e:
+                logging.warning(f"Fichier partiel non supprimé: {path}: {e}")
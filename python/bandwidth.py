@@ -0,0 +1,279 @@
+"""
+Planificateur de bande passante global (seau à jetons).
+
+Chaque processus `download_manager.py download` publie l'état de ses
+téléchargements dans `<dossier de contrôle>/bandwidth/<id>.json`
+(poids, priorité, débit mesuré, battement de cœur). Le plafond global et
+les réglages modifiés à chaud sont dans `bandwidth/limits.json`.
+
+Toutes les REFRESH_INTERVAL secondes, chaque processus relit ces fichiers
+et calcule la même répartition : priorité stricte entre niveaux, partage
+pondéré (remplissage par niveaux) à l'intérieur d'un niveau, le débit
+non consommé par un téléchargement étant redistribué aux autres. Les
+threads d'un téléchargement partagent un même seau à jetons.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Optional, Dict, Any, List
+
+REFRESH_INTERVAL = 1.0
+HEARTBEAT_TIMEOUT = 5.0       # Au-delà, un téléchargement est ignoré
+STALE_TIMEOUT = 60.0          # Au-delà, son fichier est supprimé
+MIN_RATE = 64 * 1024          # Débit plancher d'un téléchargement actif
+LIMITS_FILE = "limits.json"
+
+
+def _write_json(path: str, data: Dict[str, Any]):
+    """Écriture atomique (les autres processus ne lisent jamais un fichier partiel)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def water_fill(capacity: float, entries: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Partage `capacity` au prorata des poids, sans donner à une entrée plus
+    que sa demande ; le surplus est redistribué aux autres.
+    """
+    rates: Dict[str, float] = {}
+    active = [e for e in entries if e["weight"] > 0]
+    while active and capacity > 0:
+        total_weight = sum(e["weight"] for e in active)
+        share = capacity / total_weight
+        satisfied = [e for e in active if e["demand"] <= share * e["weight"]]
+        if not satisfied:
+            for e in active:
+                rates[e["id"]] = share * e["weight"]
+            return rates
+        for e in satisfied:
+            rates[e["id"]] = e["demand"]
+            capacity -= e["demand"]
+            active.remove(e)
+    for e in active:
+        rates.setdefault(e["id"], 0.0)
+    return rates
+
+
+def allocate(cap: float, entries: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Répartition du plafond : niveaux de priorité décroissants, puis water_fill"""
+    rates: Dict[str, float] = {}
+    remaining = cap
+    for priority in sorted({e["priority"] for e in entries}, reverse=True):
+        group = [e for e in entries if e["priority"] == priority]
+        group_rates = water_fill(remaining, group)
+        remaining -= sum(group_rates.values())
+        rates.update(group_rates)
+    # Un téléchargement actif n'est jamais totalement affamé
+    return {download_id: max(rate, MIN_RATE) for download_id, rate in rates.items()}
+
+
+class TokenBucket:
+    """Seau à jetons thread-safe ; un débit de 0 signifie illimité"""
+
+    def __init__(self, rate: float = 0):
+        self.rate = rate
+        self.tokens = 0.0
+        self.consumed = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate:
+            burst = max(self.rate * 0.25, 256 * 1024)
+            self.tokens = min(burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, count: int) -> float:
+        """Compte `count` octets reçus ; retourne l'attente (s) pour rester sous le débit"""
+        with self._lock:
+            self.consumed += count
+            if not self.rate:
+                return 0.0
+            self._refill()
+            self.tokens -= count
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def consume(self, count: int):
+        """Comme reserve(), en bloquant le thread appelant"""
+        wait = self.reserve(count)
+        if wait > 0:
+            time.sleep(wait)
+
+    def take_consumed(self) -> int:
+        with self._lock:
+            consumed, self.consumed = self.consumed, 0
+            return consumed
+
+
+class BandwidthScheduler:
+    """Coordonne les seaux à jetons des téléchargements de tous les processus"""
+
+    def __init__(self, control_dir: str):
+        self.state_dir = os.path.join(control_dir, "bandwidth")
+        os.makedirs(self.state_dir, exist_ok=True)
+        self.cap = 0.0
+        self._local: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # register() (thread appelant) et _loop rafraîchissent : un seul à la fois,
+        # ils écrivent les mêmes fichiers d'état par le même nom temporaire
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_refresh = time.monotonic()
+
+    # ---------- enregistrement ----------
+
+    def register(self, download_id: str, weight: float = 1.0, priority: int = 0) -> TokenBucket:
+        """Inscrit un téléchargement et retourne son seau à jetons"""
+        bucket = TokenBucket()
+        with self._lock:
+            self._local[download_id] = {
+                "bucket": bucket,
+                "weight": weight,
+                "priority": priority,
+                "allocated": 0.0,
+                "measured": 0.0,
+            }
+        self.refresh()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="bandwidth", daemon=True)
+            self._thread.start()
+        return bucket
+
+    def unregister(self, download_id: str):
+        with self._lock:
+            self._local.pop(download_id, None)
+        try:
+            os.remove(self._state_path(download_id))
+        except OSError:
+            pass
+
+    def close(self):
+        self._stop.set()
+        for download_id in list(self._local):
+            self.unregister(download_id)
+
+    # ---------- réglages à chaud (commande set_bandwidth) ----------
+
+    @staticmethod
+    def update_limits(control_dir: str, cap: Optional[float] = None, download_id: Optional[str] = None,
+                      weight: Optional[float] = None, priority: Optional[int] = None):
+        """Modifie le plafond global et/ou le poids et la priorité d'un téléchargement"""
+        state_dir = os.path.join(control_dir, "bandwidth")
+        os.makedirs(state_dir, exist_ok=True)
+        path = os.path.join(state_dir, LIMITS_FILE)
+        limits = _read_json(path) or {}
+        if cap is not None:
+            limits["cap"] = max(0.0, cap)
+        if download_id:
+            override = limits.setdefault("overrides", {}).setdefault(download_id, {})
+            if weight is not None:
+                override["weight"] = weight
+            if priority is not None:
+                override["priority"] = priority
+        _write_json(path, limits)
+
+    # ---------- synchronisation ----------
+
+    def _state_path(self, download_id: str) -> str:
+        return os.path.join(self.state_dir, f"{download_id}.json")
+
+    def _loop(self):
+        while not self._stop.wait(REFRESH_INTERVAL):
+            try:
+                self.refresh()
+            except Exception as e:
+                logging.debug(f"Bande passante: rafraîchissement impossible: {e}")
+
+    def refresh(self):
+        """Publie l'état local, relit celui des autres processus et répartit le plafond"""
+        with self._refresh_lock:
+            self._refresh()
+
+    def _refresh(self):
+        now = time.monotonic()
+        elapsed = max(now - self._last_refresh, 1e-3)
+        self._last_refresh = now
+
+        limits = _read_json(os.path.join(self.state_dir, LIMITS_FILE)) or {}
+        self.cap = float(limits.get("cap", 0) or 0)
+        overrides = limits.get("overrides", {})
+
+        with self._lock:
+            local = dict(self._local)
+        for download_id, entry in local.items():
+            override = overrides.get(download_id, {})
+            entry["weight"] = float(override.get("weight", entry["weight"]))
+            entry["priority"] = int(override.get("priority", entry["priority"]))
+            entry["measured"] = entry["bucket"].take_consumed() / elapsed
+            # Un téléchargement qui n'utilise pas sa part ne la réclame plus
+            if entry["allocated"] and entry["measured"] < 0.9 * entry["allocated"]:
+                demand = max(entry["measured"] * 1.2, MIN_RATE)
+            else:
+                demand = None
+            _write_json(self._state_path(download_id), {
+                "pid": os.getpid(),
+                "weight": entry["weight"],
+                "priority": entry["priority"],
+                "demand": demand,
+                "measured": entry["measured"],
+                "heartbeat": time.time(),
+            })
+
+        if not self.cap:
+            for entry in local.values():
+                entry["allocated"] = 0.0
+                entry["bucket"].set_rate(0)
+            return
+
+        rates = allocate(self.cap, self._read_entries())
+        for download_id, entry in local.items():
+            entry["allocated"] = rates.get(download_id, MIN_RATE)
+            entry["bucket"].set_rate(entry["allocated"])
+
+    def _read_entries(self) -> List[Dict[str, Any]]:
+        entries = []
+        wall = time.time()
+        for name in os.listdir(self.state_dir):
+            if not name.endswith(".json") or name == LIMITS_FILE:
+                continue
+            path = os.path.join(self.state_dir, name)
+            state = _read_json(path)
+            if not state:
+                continue
+            age = wall - state.get("heartbeat", 0)
+            if age > STALE_TIMEOUT:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            if age > HEARTBEAT_TIMEOUT:
+                continue
+            demand = state.get("demand")
+            entries.append({
+                "id": name[:-len(".json")],
+                "weight": float(state.get("weight", 1.0)),
+                "priority": int(state.get("priority", 0)),
+                "demand": float("inf") if demand is None else float(demand),
+            })
+        return entries
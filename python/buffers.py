@@ -0,0 +1,82 @@
+"""
+Chemin de réception sans allocation.
+
+Les octets sont lus avec `readinto` directement dans des tampons
+réutilisables au lieu de créer un objet `bytes` par morceau
+(`iter_content`). La taille de lecture s'adapte au débit mesuré :
+une lecture doit durer entre READ_TARGET_LOW et READ_TARGET_HIGH
+secondes, ce qui garde pause/stop réactifs à bas débit et limite le
+nombre d'itérations Python à haut débit.
+"""
+
+import threading
+from typing import Optional, List
+
+MIN_READ_SIZE = 64 * 1024
+MAX_READ_SIZE = 4 * 1024 * 1024
+INITIAL_READ_SIZE = 256 * 1024
+READ_TARGET_LOW = 0.05    # Lecture plus rapide : on double la taille
+READ_TARGET_HIGH = 0.25   # Lecture plus lente : on divise par deux
+
+
+class BufferPool:
+    """Réserve de tampons de MAX_READ_SIZE partagée entre les connexions"""
+
+    def __init__(self, buffer_size: int = MAX_READ_SIZE, max_idle: int = 16):
+        self.buffer_size = buffer_size
+        self.max_idle = max_idle
+        self._idle: List[bytearray] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bytearray:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return bytearray(self.buffer_size)
+
+    def release(self, buffer: bytearray):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(buffer)
+
+
+BUFFERS = BufferPool()
+
+
+class AdaptiveChunkSizer:
+    """Ajuste la taille de lecture d'une connexion selon son débit"""
+
+    def __init__(self, size: int = INITIAL_READ_SIZE):
+        self.size = size
+
+    def update(self, count: int, elapsed: float):
+        # Une lecture partielle (fin de flux) ne dit rien du débit
+        if count < self.size:
+            return
+        if elapsed < READ_TARGET_LOW and self.size < MAX_READ_SIZE:
+            self.size = min(MAX_READ_SIZE, self.size * 2)
+        elif elapsed > READ_TARGET_HIGH and self.size > MIN_READ_SIZE:
+            self.size = max(MIN_READ_SIZE, self.size // 2)
+
+
+def raw_stream(response) -> Optional[object]:
+    """
+    Retourne le flux `http.client` sous-jacent d'une réponse requests s'il
+    peut être lu octet pour octet avec `readinto` (pas de compression),
+    None sinon (on retombe alors sur `iter_content`).
+    """
+    if response.headers.get("Content-Encoding", "identity").lower() not in ("", "identity"):
+        return None
+    fp = getattr(response.raw, "_fp", None)
+    if fp is None or not hasattr(fp, "readinto"):
+        return None
+    return fp
+
+
+def release_if_consumed(response, fp):
+    """
+    Rend la connexion au pool si le corps a été lu entièrement.
+    Sinon requests fermera la connexion à la sortie du `with`.
+    """
+    if fp.isclosed():
+        response.raw.release_conn()
@@ -0,0 +1,135 @@
+"""
+Serveur de commandes du démon `download_manager.py serve`.
+
+Protocole : une ligne JSON par message sur une connexion TCP locale
+(127.0.0.1, port choisi par le système, annoncé sur la sortie standard
+avec un jeton à joindre à chaque commande).
+
+    -> {"token": "...", "id": 1, "cmd": "pause", "download_id": "dl_1"}
+    <- {"reply": 1, "ok": true}
+    <- {"reply": 2, "ok": false, "error": "..."}
+
+La commande `subscribe` fait de la connexion l'abonné unique aux
+événements ({"event": "status" | "done", "download_id": ..., ...}) ; un
+nouvel abonné remplace le précédent. Les événements émis sans abonné
+sont gardés (EVENT_BACKLOG au plus) et envoyés à l'abonnement.
+"""
+
+import json
+import socket
+import logging
+import secrets
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, Callable
+
+EVENT_BACKLOG = 1000
+
+
+class CommandServer:
+    """Commandes JSON sur 127.0.0.1 ; `handlers` : nom -> fonction(paramètres) -> dict"""
+
+    def __init__(self, handlers: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None):
+        self.handlers = dict(handlers or {})
+        self.token = secrets.token_hex(16)
+        self._sock = socket.create_server(("127.0.0.1", 0))
+        self.port = self._sock.getsockname()[1]
+        # accept() bloqué ne se réveille pas toujours quand la socket est fermée
+        self._sock.settimeout(0.5)
+        self._subscriber: Optional[socket.socket] = None
+        self._backlog = deque(maxlen=EVENT_BACKLOG)
+        self._send_lock = threading.Lock()
+        self._closed = threading.Event()
+
+    def serve_forever(self):
+        """Accepte les connexions jusqu'à close() ou la commande `shutdown`"""
+        while not self._closed.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            conn.settimeout(None)
+            threading.Thread(target=self._handle, args=(conn,), name="command", daemon=True).start()
+
+    def close(self):
+        self._closed.set()
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        with self._send_lock:
+            if self._subscriber:
+                self._subscriber.close()
+                self._subscriber = None
+
+    # ---------- événements ----------
+
+    def publish(self, event: Dict[str, Any]):
+        """Envoie `event` à l'abonné (ou le garde jusqu'au prochain abonnement)"""
+        line = (json.dumps(event) + "\n").encode("utf-8")
+        with self._send_lock:
+            if self._subscriber is None:
+                self._backlog.append(line)
+                return
+            try:
+                self._subscriber.sendall(line)
+            except OSError as e:
+                logging.warning(f"Abonné perdu: {e}")
+                self._subscriber = None
+                self._backlog.append(line)
+
+    def _subscribe(self, conn: socket.socket):
+        with self._send_lock:
+            self._subscriber = conn
+            while self._backlog:
+                conn.sendall(self._backlog.popleft())
+
+    # ---------- commandes ----------
+
+    def _handle(self, conn: socket.socket):
+        try:
+            with conn.makefile("rb") as lines:
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    self._send(conn, self._dispatch(conn, line))
+                    if self._closed.is_set():
+                        break
+        except OSError:
+            pass
+        finally:
+            with self._send_lock:
+                if self._subscriber is conn:
+                    self._subscriber = None
+            conn.close()
+
+    def _dispatch(self, conn: socket.socket, line: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"reply": None, "ok": False, "error": "JSON invalide"}
+        reply = {"reply": request.get("id")}
+        if not secrets.compare_digest(str(request.get("token", "")), self.token):
+            return {**reply, "ok": False, "error": "jeton invalide"}
+        command = request.get("cmd")
+        try:
+            if command == "subscribe":
+                self._subscribe(conn)
+                result = None
+            elif command == "shutdown":
+                self.close()
+                result = None
+            elif command in self.handlers:
+                result = self.handlers[command](request)
+            else:
+                return {**reply, "ok": False, "error": f"Commande inconnue: {command}"}
+        except Exception as e:
+            logging.exception(f"Commande {command} en échec")
+            return {**reply, "ok": False, "error": str(e)}
+        return {**reply, "ok": True, **(result or {})}
+
+    def _send(self, conn: socket.socket, message: Dict[str, Any]):
+        with self._send_lock:
+            conn.sendall((json.dumps(message) + "\n").encode("utf-8"))
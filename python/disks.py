@@ -0,0 +1,220 @@
+"""
+Inventaire des volumes et profil de débit pour le choix du disque d'installation.
+
+DiskInventory garde la liste des volumes en mémoire (et dans `disks.json`,
+dossier de contrôle) : sous Windows, l'ensemble des lettres présentes est
+lu en un appel (GetLogicalDrives) et l'inventaire n'est reconstruit que
+s'il change ; l'espace libre est relu au plus toutes les FREE_SPACE_TTL
+secondes. Ailleurs, les volumes sont les points de montage de
+/proc/mounts (systèmes de fichiers réels).
+
+benchmark_volume mesure, dans un dossier temporaire de n'importe quel
+répertoire :
+- l'écriture séquentielle (SEQ_SIZE_MB par blocs de 1 Mio, fsync final),
+  proche de l'écriture d'une archive téléchargée ;
+- la création de petits fichiers (SMALL_FILES fichiers de 16 Kio, fsync
+  chacun), proche de l'extraction d'un jeu.
+
+Les résultats sont conservés par volume ; suggest() propose le volume
+le plus rapide ayant la place pour la taille décompressée du jeu.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import tempfile
+import threading
+from time import perf_counter
+from typing import Optional, Dict, Any, List
+
+DISKS_FILE = "disks.json"
+FREE_SPACE_TTL = 5.0
+SEQ_SIZE_MB = 256
+SMALL_FILES = 500
+SMALL_FILE_SIZE = 16 * 1024
+MIN_FREE_GB = 5.0  # Marge gardée après installation (comme check_disk_space_requirements)
+
+# Systèmes de fichiers virtuels ignorés sous Linux
+PSEUDO_FS = {
+    "proc", "sysfs", "devtmpfs", "devpts", "tmpfs", "cgroup", "cgroup2", "securityfs", "pstore", "bpf",
+    "debugfs", "tracefs", "configfs", "fusectl", "mqueue", "hugetlbfs", "autofs", "binfmt_misc",
+    "overlay", "squashfs", "nsfs", "rpc_pipefs", "ramfs", "efivarfs",
+}
+
+
+def _drive_mask() -> Optional[int]:
+    """Bits des lettres de lecteur présentes (Windows), None ailleurs"""
+    if sys.platform != "win32":
+        return None
+    import ctypes
+    return ctypes.windll.kernel32.GetLogicalDrives()
+
+
+def list_volumes() -> List[str]:
+    """Racines des volumes montés"""
+    mask = _drive_mask()
+    if mask is not None:
+        return [f"{chr(ord('A') + bit)}:\\" for bit in range(26) if mask & (1 << bit)]
+    volumes = []
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3 and fields[2] not in PSEUDO_FS:
+                    volumes.append(fields[1].replace("\\040", " "))
+    except OSError:
+        volumes.append(os.path.abspath(os.sep))
+    return sorted(set(volumes))
+
+
+def benchmark_volume(path: str, seq_size_mb: int = SEQ_SIZE_MB, small_files: int = SMALL_FILES) -> Dict[str, Any]:
+    """Débit d'écriture séquentielle (Mo/s) et petits fichiers (fichiers/s) dans `path`"""
+    workdir = tempfile.mkdtemp(prefix=".sroff_bench_", dir=path)
+    try:
+        block = os.urandom(1024 * 1024)
+        target = os.path.join(workdir, "sequential.bin")
+        start = perf_counter()
+        with open(target, "wb", buffering=0) as f:
+            for _ in range(seq_size_mb):
+                f.write(block)
+            os.fsync(f.fileno())
+        seq_seconds = perf_counter() - start
+        os.remove(target)
+
+        payload = block[:SMALL_FILE_SIZE]
+        start = perf_counter()
+        for index in range(small_files):
+            with open(os.path.join(workdir, f"{index}.dat"), "wb", buffering=0) as f:
+                f.write(payload)
+                os.fsync(f.fileno())
+        small_seconds = perf_counter() - start
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "seq_write_mb_s": round(seq_size_mb / seq_seconds, 1) if seq_seconds else 0.0,
+        "small_files_per_s": round(small_files / small_seconds, 1) if small_seconds else 0.0,
+        "seq_size_mb": seq_size_mb,
+        "small_files": small_files,
+        "measured": time.time(),
+    }
+
+
+class DiskInventory:
+    """Volumes connus, espace libre récent et profils de débit enregistrés"""
+
+    def __init__(self, control_dir: Optional[str] = None):
+        self.path = os.path.join(control_dir, DISKS_FILE) if control_dir else None
+        self._lock = threading.Lock()
+        self._mask = None
+        self._volumes: Dict[str, Dict[str, Any]] = {}
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._profiles_mtime = None
+        self._load()
+
+    def _load(self):
+        """Relit les profils si le fichier a changé (mesure faite par un autre processus)"""
+        if not self.path:
+            return
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self._profiles_mtime:
+                return
+            self._profiles_mtime = mtime
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._profiles.update({volume: entry for volume, entry in data.get("profiles", {}).items() if isinstance(entry, dict)})
+        except (OSError, ValueError):
+            pass
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"profiles": self._profiles}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Profils de disques non enregistrés: {e}")
+
+    def refresh(self, force: bool = False):
+        """Reconstruit la liste si les volumes ont changé ; relit l'espace libre s'il est périmé"""
+        with self._lock:
+            self._load()
+            mask = _drive_mask()
+            if force or mask is None or mask != self._mask or not self._volumes:
+                self._mask = mask
+                volumes = list_volumes()
+                self._volumes = {volume: self._volumes.get(volume, {}) for volume in volumes}
+            now = time.time()
+            for volume, state in self._volumes.items():
+                if force or now - state.get("checked", 0) > FREE_SPACE_TTL:
+                    try:
+                        usage = shutil.disk_usage(volume)
+                        state.update(free=usage.free, total=usage.total, checked=now)
+                    except OSError:
+                        # Lecteur vide (CD, lecteur de cartes) : ignoré jusqu'au prochain changement
+                        state.update(free=0, total=0, checked=now)
+
+    def volumes(self) -> List[Dict[str, Any]]:
+        """Volumes utilisables : {drive, free_gb, total_gb, profile}"""
+        self.refresh()
+        with self._lock:
+            return [
+                {
+                    "drive": volume,
+                    "free_gb": round(state["free"] / (1024 ** 3), 2),
+                    "total_gb": round(state["total"] / (1024 ** 3), 2),
+                    "profile": self._profiles.get(volume),
+                }
+                for volume, state in self._volumes.items() if state.get("total")
+            ]
+
+    @staticmethod
+    def volume_of(path: str) -> str:
+        """Racine du volume qui contient `path` (lettre de lecteur ou point de montage)"""
+        path = os.path.abspath(path)
+        drive = os.path.splitdrive(path)[0]
+        if drive:
+            return drive.upper() + os.sep
+        while not os.path.ismount(path):
+            path = os.path.dirname(path)
+        return path
+
+    def benchmark(self, path: str, seq_size_mb: int = SEQ_SIZE_MB, small_files: int = SMALL_FILES) -> Dict[str, Any]:
+        """Mesure le volume de `path` (dans `path` même) et enregistre son profil"""
+        volume = self.volume_of(path)
+        logging.info(f"Mesure du disque {volume} ({path})")
+        profile = benchmark_volume(path, seq_size_mb, small_files)
+        profile["path"] = path
+        with self._lock:
+            self._load()
+            self._profiles[volume] = profile
+            self._save()
+        return {"drive": volume, **profile}
+
+    def suggest(self, required_bytes: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Volume conseillé pour une installation de `required_bytes` octets (+ MIN_FREE_GB) :
+        le plus rapide en écriture séquentielle parmi les volumes mesurés, puis le plus
+        rapide en petits fichiers ; à défaut de mesure, celui qui a le plus de place.
+        """
+        needed_gb = required_bytes / (1024 ** 3) + MIN_FREE_GB
+        fitting = [volume for volume in self.volumes() if volume["free_gb"] >= needed_gb]
+        if not fitting:
+            return None
+
+        def rank(volume):
+            profile = volume["profile"] or {}
+            return (
+                bool(profile),
+                profile.get("seq_write_mb_s", 0.0),
+                profile.get("small_files_per_s", 0.0),
+                volume["free_gb"],
+            )
+
+        return max(fitting, key=rank)
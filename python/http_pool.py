@@ -0,0 +1,182 @@
+"""
+Sessions HTTP partagées pour tous les hébergeurs.
+
+Une seule `requests.Session` par processus, avec un pool de connexions
+keep-alive par hôte dimensionné sur le nombre de workers de l'appelant
+(pool_size). Les certificats sont ceux de certifi, comme requests. Les nouvelles
+connexions TLS reprennent la session TLS précédente du même hôte
+(pas de handshake complet). Des compteurs permettent de vérifier le gain.
+"""
+
+import ssl
+import logging
+import threading
+from typing import Dict, Any
+
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_POOL_SIZE = 10
+SPARE_CONNECTIONS = 1   # Appels d'API (jeton, listes de dossiers) à côté des transferts
+
+
+class PoolStats:
+    """Compteurs de réutilisation des connexions (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self.tls_resumed = 0
+        self.hosts: Dict[str, Dict[str, int]] = {}
+
+    def _host(self, host: str) -> Dict[str, int]:
+        return self.hosts.setdefault(host, {"requests": 0, "connections": 0})
+
+    def request_sent(self, host: str):
+        with self._lock:
+            self.requests += 1
+            self._host(host)["requests"] += 1
+
+    def connection_opened(self, host: str):
+        with self._lock:
+            self.connections += 1
+            self._host(host)["connections"] += 1
+
+    def tls_established(self, resumed: bool):
+        with self._lock:
+            self.tls_handshakes += 1
+            if resumed:
+                self.tls_resumed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections": self.connections,
+                "reused": max(0, self.requests - self.connections),
+                "tls_handshakes": self.tls_handshakes,
+                "tls_resumed": self.tls_resumed,
+                "hosts": {host: dict(counts) for host, counts in self.hosts.items()},
+            }
+
+
+stats = PoolStats()
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """Contexte TLS qui réutilise la dernière session TLS de chaque hôte"""
+
+    def __init__(self, protocol=None):
+        super().__init__()
+        self._sessions: Dict[str, ssl.SSLSession] = {}
+
+    def remember(self, hostname: str, ssl_sock):
+        """Mémorise la session TLS d'un socket (tickets TLS 1.3 compris)"""
+        session = getattr(ssl_sock, "session", None)
+        if hostname and session is not None:
+            self._sessions[hostname] = session
+
+    def wrap_socket(self, sock, server_hostname=None, **kwargs):
+        cached = self._sessions.get(server_hostname)
+        if cached is not None and "session" not in kwargs:
+            kwargs["session"] = cached
+        # Un serveur qui refuse la session fait simplement un handshake complet
+        ssl_sock = super().wrap_socket(sock, server_hostname=server_hostname, **kwargs)
+        self.remember(server_hostname, ssl_sock)
+        stats.tls_established(ssl_sock.session_reused)
+        return ssl_sock
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        stats.connection_opened(self.host)
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        stats.connection_opened(self.host)
+        super().connect()
+
+    def close(self):
+        # Le ticket TLS 1.3 n'arrive qu'après le handshake : le relire avant fermeture
+        if isinstance(self.ssl_context, _ResumingSSLContext) and self.sock is not None:
+            self.ssl_context.remember(self.host, self.sock)
+        super().close()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """Adaptateur keep-alive : pools comptés et reprise de session TLS"""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self.ssl_context = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        # Magasin du système écarté : le Python embarqué n'en a pas toujours un à jour
+        self.ssl_context.load_verify_locations(cafile=certifi.where())
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs["ssl_context"] = self.ssl_context
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        stats.request_sent(requests.utils.urlparse(request.url).hostname or "")
+        return super().send(request, **kwargs)
+
+
+def pool_size(workers: int, connections: int) -> int:
+    """
+    Connexions par hôte pour `workers` téléchargements parallèles qui se
+    partagent `connections` créneaux de transfert (host_limits) : la sonde
+    de chaque worker et les appels d'API en plus.
+    """
+    return connections + workers + SPARE_CONNECTIONS
+
+
+_session = None
+_pool_size = 0
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Retourne la session partagée du processus.
+    Le pool est agrandi si un appelant demande plus de connexions par hôte.
+    """
+    global _session, _pool_size
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        if pool_size > _pool_size:
+            adapter = PooledAdapter(pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _pool_size = pool_size
+            logging.info(f"Pool HTTP: {pool_size} connexion(s) par hôte")
+        return _session
+
+
+def report() -> Dict[str, Any]:
+    """Compteurs de connexions, journalisés pour comparaison"""
+    snapshot = stats.snapshot()
+    logging.info(
+        f"Connexions HTTP: {snapshot['requests']} requête(s), {snapshot['connections']} connexion(s) ouvertes, "
+        f"{snapshot['reused']} réutilisée(s), {snapshot['tls_resumed']}/{snapshot['tls_handshakes']} session(s) TLS reprises"
+    )
+    return snapshot
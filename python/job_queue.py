@@ -0,0 +1,291 @@
+"""
+File d'attente des téléchargements du démon (`download_manager.py serve`).
+
+Au plus MAX_DOWNLOADS téléchargements et MAX_EXTRACTIONS extractions
+tournent en même temps ; les autres attendent, classés par priorité
+décroissante puis par ordre d'arrivée. Un téléchargement qui passe à
+l'extraction libère sa place de téléchargement, et la redemande ensuite.
+
+Préemption : quand un travail en attente a une priorité strictement
+supérieure à celle d'un téléchargement en cours et que toutes les places
+sont prises, le moins prioritaire (le plus récent à égalité) est mis en
+pause et repasse en file ; il reprend dès qu'une place se libère.
+
+snapshot() donne l'état de la file (position, progression, ETA). L'ETA
+d'un travail en attente est estimée en simulant l'attribution des places
+à partir de l'ETA des téléchargements en cours, de la taille annoncée
+(`size`) des travaux en attente et du débit moyen par téléchargement.
+"""
+
+import os
+import re
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Callable
+
+MAX_DOWNLOADS = int(os.getenv("SROFF_MAX_DOWNLOADS", "2"))
+MAX_EXTRACTIONS = int(os.getenv("SROFF_MAX_EXTRACTIONS", "1"))
+
+QUEUED = "queued"
+DOWNLOADING = "downloading"
+PREEMPTED = "preempted"
+WAITING_EXTRACTION = "waiting_extraction"
+EXTRACTING = "extracting"
+
+_SIZE_UNITS = {"": 1, "o": 1, "b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+
+def parse_size(value) -> int:
+    """Taille du catalogue ("12.5 GB", "800 Mo", 1234) en octets ; 0 si illisible"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.match(r"^\s*([\d.,]+)\s*([kmgt]?)(?:i?[bo])?\s*$", str(value or ""), re.IGNORECASE)
+    if not match:
+        return 0
+    try:
+        return int(float(match.group(1).replace(",", ".")) * _SIZE_UNITS[match.group(2).lower()])
+    except ValueError:
+        return 0
+
+
+class QueueEntry:
+    """Un travail de la file ; `controller` expose pause(), resume() et is_stopped()"""
+
+    def __init__(self, download_id: str, controller, start: Callable[[], None], priority: int, size: int, seq: int):
+        self.download_id = download_id
+        self.controller = controller
+        self.start = start
+        self.priority = priority
+        self.size = size
+        self.seq = seq
+        self.state = QUEUED
+        self.downloaded = 0
+        self.total = size
+        self.speed = 0.0
+        self.notified = None  # (état, position en file) du dernier statut envoyé
+
+    def remaining_time(self) -> Optional[float]:
+        if self.state != DOWNLOADING:
+            return None
+        if self.speed > 0 and self.total:
+            return max(0.0, (self.total - self.downloaded) / self.speed)
+        return None
+
+
+class JobQueue:
+    """Ordonnanceur des téléchargements et extractions d'un processus"""
+
+    def __init__(self, max_downloads: int = MAX_DOWNLOADS, max_extractions: int = MAX_EXTRACTIONS,
+                 on_change: Optional[Callable[[QueueEntry], None]] = None):
+        self.max_downloads = max(1, max_downloads)
+        self.max_extractions = max(1, max_extractions)
+        self.on_change = on_change
+        self._entries: Dict[str, QueueEntry] = {}
+        self._extractions = 0
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    # ---------- travaux ----------
+
+    def submit(self, download_id: str, controller, start: Callable[[], None], priority: int = 0, size: int = 0):
+        """Ajoute un travail ; `start` lance le téléchargement (appelé quand une place se libère)"""
+        with self._cond:
+            if download_id in self._entries:
+                raise ValueError(f"Téléchargement déjà en file: {download_id}")
+            self._seq += 1
+            self._entries[download_id] = QueueEntry(download_id, controller, start, priority, size, self._seq)
+            self._schedule()
+
+    def cancel(self, download_id: str) -> bool:
+        """Retire un travail pas encore lancé ; False s'il tourne déjà (l'arrêter via son contrôleur)"""
+        with self._cond:
+            entry = self._entries.get(download_id)
+            if entry is None or entry.state != QUEUED:
+                return False
+            del self._entries[download_id]
+            self._schedule()
+            return True
+
+    def finished(self, download_id: str):
+        """Le travail est terminé (succès, erreur ou arrêt) : sa place passe au suivant"""
+        with self._cond:
+            self._entries.pop(download_id, None)
+            self._cond.notify_all()
+            self._schedule()
+
+    def set_priority(self, download_id: str, priority: int):
+        with self._cond:
+            entry = self._entries.get(download_id)
+            if entry is None:
+                return
+            entry.priority = priority
+            self._schedule()
+
+    def set_limits(self, max_downloads: Optional[int] = None, max_extractions: Optional[int] = None):
+        with self._cond:
+            if max_downloads is not None:
+                self.max_downloads = max(1, max_downloads)
+            if max_extractions is not None:
+                self.max_extractions = max(1, max_extractions)
+            self._cond.notify_all()
+            self._schedule()
+
+    def update(self, download_id: str, downloaded: int, total: int, speed: float):
+        """Progression rapportée par le téléchargement (sert aux ETA)"""
+        entry = self._entries.get(download_id)
+        if entry is not None:
+            entry.downloaded, entry.total, entry.speed = downloaded, total or entry.size, speed
+
+    @contextmanager
+    def extracting(self, download_id: str, is_stopped: Callable[[], bool]):
+        """
+        Une extraction du travail : rend sa place de téléchargement et
+        attend une place d'extraction (ou l'arrêt du travail). Un travail
+        à plusieurs archives (GoFile) prend une place par extraction et
+        reprend ensuite une place de téléchargement, ou repasse en file
+        (en pause) si toutes sont prises.
+        """
+        with self._cond:
+            entry = self._entries.get(download_id)
+            if entry is not None and entry.state == DOWNLOADING:
+                entry.state = WAITING_EXTRACTION
+                self._schedule()
+                self._notify(entry)
+            while self._extractions >= self.max_extractions and not is_stopped():
+                self._cond.wait(0.5)
+            self._extractions += 1
+            if entry is not None:
+                entry.state = EXTRACTING
+                self._notify(entry)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._extractions -= 1
+                self._cond.notify_all()
+                if entry is not None and self._entries.get(download_id) is entry and not is_stopped():
+                    self._reclaim(entry)
+
+    # ---------- ordonnancement ----------
+
+    def _waiting(self) -> List[QueueEntry]:
+        waiting = [e for e in self._entries.values() if e.state in (QUEUED, PREEMPTED)]
+        return sorted(waiting, key=lambda e: (-e.priority, e.seq))
+
+    def _schedule(self):
+        """Attribue les places libres, puis préempte si un travail en attente est plus prioritaire"""
+        waiting = self._waiting()
+        active = [e for e in self._entries.values() if e.state == DOWNLOADING]
+        while waiting and len(active) < self.max_downloads:
+            entry = waiting.pop(0)
+            self._launch(entry)
+            active.append(entry)
+        while waiting and active:
+            victim = min(active, key=lambda e: (e.priority, -e.seq))
+            if waiting[0].priority <= victim.priority:
+                break
+            logging.info(f"File: {victim.download_id} mis en pause au profit de {waiting[0].download_id}")
+            victim.controller.pause()
+            victim.state = PREEMPTED
+            victim.speed = 0.0
+            active.remove(victim)
+            self._notify(victim)
+            entry = waiting.pop(0)
+            self._launch(entry)
+            active.append(entry)
+            waiting = sorted(waiting + [victim], key=lambda e: (-e.priority, e.seq))
+        for entry in waiting:
+            self._notify(entry)
+
+    def _launch(self, entry: QueueEntry):
+        previous, entry.state = entry.state, DOWNLOADING
+        if previous == PREEMPTED:
+            entry.controller.resume()
+        else:
+            entry.start()
+        self._notify(entry)
+
+    def _reclaim(self, entry: QueueEntry):
+        """Retour d'extraction : le travail peut encore télécharger (archives suivantes)"""
+        active = sum(1 for e in self._entries.values() if e.state == DOWNLOADING)
+        if active < self.max_downloads:
+            entry.state = DOWNLOADING
+        else:
+            entry.controller.pause()
+            entry.state = PREEMPTED
+            entry.speed = 0.0
+        self._notify(entry)
+        self._schedule()
+
+    def _notify(self, entry: QueueEntry):
+        key = (entry.state, self.position(entry.download_id) if entry.state == QUEUED else None)
+        if entry.notified == key:
+            return
+        entry.notified = key
+        if self.on_change:
+            try:
+                self.on_change(entry)
+            except Exception as e:
+                logging.debug(f"File: notification impossible: {e}")
+
+    # ---------- état ----------
+
+    def state(self, download_id: str) -> Optional[str]:
+        entry = self._entries.get(download_id)
+        return entry.state if entry else None
+
+    def position(self, download_id: str) -> Optional[int]:
+        """Rang (1 = prochain) d'un travail en attente ; None s'il tourne"""
+        for index, entry in enumerate(self._waiting()):
+            if entry.download_id == download_id:
+                return index + 1
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """État de la file pour l'interface : travaux en cours puis en attente, avec ETA"""
+        with self._cond:
+            active = sorted(
+                (e for e in self._entries.values() if e.state not in (QUEUED, PREEMPTED)),
+                key=lambda e: (-e.priority, e.seq),
+            )
+            waiting = self._waiting()
+            speeds = [e.speed for e in active if e.state == DOWNLOADING and e.speed > 0]
+            rate = sum(speeds) / len(speeds) if speeds else 0.0
+
+            # Instants (depuis maintenant) où chaque place de téléchargement se libère
+            slots = [e.remaining_time() for e in active if e.state == DOWNLOADING]
+            slots = [float("inf") if s is None else s for s in slots]
+            slots += [0.0] * max(0, self.max_downloads - len(slots))
+            jobs = []
+            for entry in active:
+                jobs.append(self._describe(entry, None, 0.0 if entry.state == DOWNLOADING else None, entry.remaining_time()))
+            for index, entry in enumerate(waiting):
+                slots.sort()
+                start = slots[0]
+                left = max(0, (entry.total or entry.size) - entry.downloaded)
+                duration = left / rate if rate > 0 and left else float("inf")
+                slots[0] = start + duration
+                jobs.append(self._describe(entry, index + 1, start, start + duration))
+            return {
+                "max_downloads": self.max_downloads,
+                "max_extractions": self.max_extractions,
+                "jobs": jobs,
+            }
+
+    @staticmethod
+    def _describe(entry: QueueEntry, position: Optional[int], eta_start: Optional[float], eta: Optional[float]) -> Dict[str, Any]:
+        def finite(value):
+            return round(value, 1) if value is not None and value != float("inf") else None
+
+        return {
+            "download_id": entry.download_id,
+            "state": entry.state,
+            "priority": entry.priority,
+            "position": position,
+            "downloaded": entry.downloaded,
+            "total": entry.total,
+            "speed": entry.speed,
+            "eta_start": finite(eta_start),
+            "eta": finite(eta),
+        }
@@ -0,0 +1,279 @@
+"""
+Base SQLite des téléchargements du démon (`<dossier de contrôle>/jobs.db`).
+
+Tables :
+    jobs        un téléchargement : URL, destination, paramètres (JSON),
+                état courant, progression, horodatages, issue
+    job_events  transitions d'état horodatées (durées d'attente, de
+                pause, d'extraction...)
+    segments    plages d'octets écrites et synchronisées de chaque `.part`
+    urls        URL résolue pour chaque URL source (redirections, miroirs)
+
+Mode WAL : les lectures (historique, téléchargements actifs) ne bloquent
+pas l'écriture. Les écritures passent par un thread unique qui les
+regroupe dans une transaction toutes les BATCH_INTERVAL secondes ; la
+progression et les plages ne gardent que leur dernière valeur d'un lot
+à l'autre.
+
+Après un crash, les travaux restés dans un état non terminal sont marqués
+`interrupted` au démarrage suivant (recover) et peuvent être relancés :
+les plages déjà écrites sont reprises depuis le journal du `.part`.
+"""
+
+import json
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+SCHEMA_VERSION = 1
+BATCH_INTERVAL = 1.0
+DONE = "done"
+INTERRUPTED = "interrupted"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    destination TEXT,
+    params TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL,
+    outcome TEXT,
+    error TEXT,
+    downloaded INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs(finished DESC) WHERE finished IS NOT NULL;
+CREATE TABLE IF NOT EXISTS job_events (
+    job_id TEXT NOT NULL,
+    at REAL NOT NULL,
+    state TEXT NOT NULL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS job_events_job ON job_events(job_id, at);
+CREATE TABLE IF NOT EXISTS segments (
+    job_id TEXT NOT NULL,
+    tmp_file TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    PRIMARY KEY (job_id, tmp_file, start)
+);
+CREATE TABLE IF NOT EXISTS urls (
+    job_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    resolved TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (job_id, source)
+);
+"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    # En WAL, NORMAL garde la base cohérente après un crash (seul le dernier lot peut manquer)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class JobStore:
+    """Base des téléchargements ; méthodes d'écriture non bloquantes (thread d'écriture)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = _connect(path)
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._reader = _connect(path)
+        self._read_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._ops: "queue.Queue" = queue.Queue()
+        # Dernière valeur seulement : écrasée tant que le lot n'est pas parti
+        self._progress: Dict[str, Tuple[int, int]] = {}
+        self._segments: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        self._pending_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="job-store", daemon=True)
+        self._writer.start()
+
+    # ---------- écriture ----------
+
+    def add_job(self, job_id: str, url: str, destination: str, params: Dict[str, Any], priority: int = 0):
+        """Nouveau travail (ou relance d'un identifiant existant)"""
+        now = time.time()
+        self._ops.put((
+            "INSERT INTO jobs (id, url, destination, params, priority, state, created, updated) "
+            "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET url=excluded.url, destination=excluded.destination, "
+            "params=excluded.params, priority=excluded.priority, state='queued', outcome=NULL, error=NULL, "
+            "finished=NULL, updated=excluded.updated",
+            (job_id, url, destination, json.dumps(params), priority, now, now),
+        ))
+        self._event(job_id, "queued")
+
+    def set_state(self, job_id: str, state: str, detail: Optional[str] = None):
+        now = time.time()
+        self._ops.put((
+            "UPDATE jobs SET state=?, updated=?, started=COALESCE(started, CASE WHEN ?='downloading' THEN ? END) "
+            "WHERE id=?",
+            (state, now, state, now, job_id),
+        ))
+        self._event(job_id, state, detail)
+
+    def set_priority(self, job_id: str, priority: int):
+        self._ops.put(("UPDATE jobs SET priority=? WHERE id=?", (priority, job_id)))
+
+    def progress(self, job_id: str, downloaded: int, total: int):
+        with self._pending_lock:
+            self._progress[job_id] = (downloaded, total)
+
+    def checkpoint(self, job_id: str, tmp_file: str, ranges: List[Tuple[int, int]],
+                   source: Optional[str] = None, resolved: Optional[str] = None):
+        """Plages synchronisées d'un `.part` et URL résolue (appelé à chaque point de reprise)"""
+        with self._pending_lock:
+            self._segments[(job_id, tmp_file)] = list(ranges)
+        if source and resolved:
+            self._ops.put((
+                "INSERT INTO urls (job_id, source, resolved, updated) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(job_id, source) DO UPDATE SET resolved=excluded.resolved, updated=excluded.updated "
+                "WHERE resolved IS NOT excluded.resolved",
+                (job_id, source, resolved, time.time()),
+            ))
+
+    def finish(self, job_id: str, result: Dict[str, Any]):
+        """Issue finale : success / cancelled / error"""
+        if result.get("success"):
+            outcome = "success"
+        elif result.get("cancelled"):
+            outcome = "cancelled"
+        else:
+            outcome = "error"
+        now = time.time()
+        self._ops.put((
+            "UPDATE jobs SET state=?, outcome=?, error=?, finished=?, updated=? WHERE id=?",
+            (DONE, outcome, result.get("error"), now, now, job_id),
+        ))
+        # Plages inutiles une fois le fichier complet ou supprimé
+        with self._pending_lock:
+            for key in [k for k in self._segments if k[0] == job_id]:
+                del self._segments[key]
+        self._ops.put(("DELETE FROM segments WHERE job_id=?", (job_id,)))
+        self._event(job_id, DONE, outcome)
+
+    def forget(self, job_id: str):
+        for table, column in (("jobs", "id"), ("job_events", "job_id"), ("segments", "job_id"), ("urls", "job_id")):
+            self._ops.put((f"DELETE FROM {table} WHERE {column}=?", (job_id,)))
+
+    def _event(self, job_id: str, state: str, detail: Optional[str] = None):
+        self._ops.put((
+            "INSERT INTO job_events (job_id, at, state, detail) VALUES (?, ?, ?, ?)",
+            (job_id, time.time(), state, detail),
+        ))
+
+    def _write_loop(self):
+        while not self._closed.is_set():
+            self._closed.wait(BATCH_INTERVAL)
+            try:
+                self._write_batch()
+            except sqlite3.Error as e:
+                logging.warning(f"Base des téléchargements: écriture impossible: {e}")
+
+    def _write_batch(self):
+        ops = []
+        while True:
+            try:
+                ops.append(self._ops.get_nowait())
+            except queue.Empty:
+                break
+        with self._pending_lock:
+            progress, self._progress = self._progress, {}
+            segments, self._segments = self._segments, {}
+        if not (ops or progress or segments):
+            return
+        with self._write_lock, self._conn:
+            for sql, params in ops:
+                self._conn.execute(sql, params)
+            self._conn.executemany(
+                "UPDATE jobs SET downloaded=?, total=? WHERE id=?",
+                [(downloaded, total, job_id) for job_id, (downloaded, total) in progress.items()],
+            )
+            for (job_id, tmp_file), ranges in segments.items():
+                self._conn.execute("DELETE FROM segments WHERE job_id=? AND tmp_file=?", (job_id, tmp_file))
+                self._conn.executemany(
+                    "INSERT INTO segments (job_id, tmp_file, start, end) VALUES (?, ?, ?, ?)",
+                    [(job_id, tmp_file, start, end) for start, end in ranges],
+                )
+
+    def flush(self):
+        """Écrit immédiatement les opérations en attente"""
+        self._write_batch()
+
+    def close(self):
+        self._closed.set()
+        self._writer.join(BATCH_INTERVAL * 2)
+        try:
+            self._write_batch()
+        finally:
+            self._conn.close()
+            self._reader.close()
+
+    # ---------- lecture ----------
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._read_lock:
+            rows = self._reader.execute(sql, params).fetchall()
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            if "params" in job:
+                job["params"] = json.loads(job["params"] or "{}")
+            jobs.append(job)
+        return jobs
+
+    def recover(self) -> List[Dict[str, Any]]:
+        """Au démarrage : marque `interrupted` les travaux non terminés et les retourne"""
+        now = time.time()
+        with self._write_lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, state FROM jobs WHERE state NOT IN (?, ?)", (DONE, INTERRUPTED)
+            ).fetchall()
+            for row in rows:
+                self._conn.execute("UPDATE jobs SET state=?, updated=? WHERE id=?", (INTERRUPTED, now, row["id"]))
+                self._conn.execute(
+                    "INSERT INTO job_events (job_id, at, state, detail) VALUES (?, ?, ?, ?)",
+                    (row["id"], now, INTERRUPTED, row["state"]),
+                )
+        return self.interrupted()
+
+    def interrupted(self) -> List[Dict[str, Any]]:
+        return self._query("SELECT * FROM jobs WHERE state=? ORDER BY updated DESC", (INTERRUPTED,))
+
+    def active(self) -> List[Dict[str, Any]]:
+        return self._query("SELECT * FROM jobs WHERE state NOT IN (?, ?) ORDER BY created", (DONE, INTERRUPTED))
+
+    def history(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT * FROM jobs WHERE finished IS NOT NULL ORDER BY finished DESC LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+
+    def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Un travail avec ses transitions, plages et URL résolues"""
+        jobs = self._query("SELECT * FROM jobs WHERE id=?", (job_id,))
+        if not jobs:
+            return None
+        job = jobs[0]
+        job["events"] = self._query("SELECT at, state, detail FROM job_events WHERE job_id=? ORDER BY at", (job_id,))
+        job["segments"] = self._query("SELECT tmp_file, start, end FROM segments WHERE job_id=? ORDER BY tmp_file, start", (job_id,))
+        job["urls"] = self._query("SELECT source, resolved, updated FROM urls WHERE job_id=?", (job_id,))
+        return job
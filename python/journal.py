@@ -0,0 +1,162 @@
+"""
+Journal de reprise des téléchargements.
+
+Un fichier `<nom>.part.journal` est écrit à côté du `.part`. Il contient
+les plages d'octets déjà écrites sur disque, les validateurs HTTP
+(ETag / Last-Modified / taille) et l'URL résolue, ce qui permet de
+reprendre après une nouvelle tentative, un crash ou un relancement de
+`download <url> <dest> <id>` sans retélécharger les octets vérifiés.
+"""
+
+import os
+import json
+import logging
+from typing import Optional, Dict, Any, List, Tuple
+
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_VERSION = 1
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Fusionne des plages [start, end[ qui se chevauchent ou se touchent"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(r for r in ranges if r[1] > r[0]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(ranges: List[Tuple[int, int]], size: int) -> List[Tuple[int, int]]:
+    """Complément des plages terminées dans [0, size["""
+    missing = []
+    cursor = 0
+    for start, end in merge_ranges(ranges):
+        if start > cursor:
+            missing.append((cursor, min(start, size)))
+        cursor = max(cursor, end)
+    if cursor < size:
+        missing.append((cursor, size))
+    return missing
+
+
+class ResumeJournal:
+    """Journal JSON associé à un fichier `.part`"""
+
+    def __init__(self, tmp_file: str):
+        self.tmp_file = tmp_file
+        self.path = tmp_file + JOURNAL_SUFFIX
+        self.source = None
+        self.url = None
+        self.size = 0
+        self.etag = None
+        self.last_modified = None
+        self.ranges: List[Tuple[int, int]] = []
+
+    # ---------- lecture ----------
+
+    def load(self) -> bool:
+        """Charge le journal existant ; False s'il est absent ou illisible"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != JOURNAL_VERSION:
+                return False
+            self.source = data.get("source")
+            self.url = data.get("url")
+            self.size = int(data.get("size", 0))
+            self.etag = data.get("etag")
+            self.last_modified = data.get("last_modified")
+            self.ranges = merge_ranges([tuple(r) for r in data.get("ranges", [])])
+            return True
+        except (OSError, ValueError, TypeError):
+            return False
+
+    @classmethod
+    def find(cls, directory: str, source: str) -> Optional["ResumeJournal"]:
+        """Cherche dans `directory` un journal ouvert pour l'URL `source`"""
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return None
+        for name in names:
+            if not name.endswith(".part" + JOURNAL_SUFFIX):
+                continue
+            journal = cls(os.path.join(directory, name[:-len(JOURNAL_SUFFIX)]))
+            if journal.load() and journal.source == source and os.path.exists(journal.tmp_file):
+                return journal
+        return None
+
+    # ---------- validation ----------
+
+    def matches(self, remote) -> bool:
+        """Vérifie que le fichier distant est toujours celui du journal"""
+        if not remote.size or remote.size != self.size:
+            return False
+        etag = remote.headers.get("ETag")
+        if self.etag and etag and self.etag != etag:
+            return False
+        last_modified = remote.headers.get("Last-Modified")
+        if self.last_modified and last_modified and self.last_modified != last_modified:
+            return False
+        try:
+            return os.path.getsize(self.tmp_file) == self.size
+        except OSError:
+            return False
+
+    def if_range(self) -> Optional[str]:
+        """Validateur à envoyer dans If-Range (ETag fort de préférence)"""
+        if self.etag and not self.etag.startswith("W/"):
+            return self.etag
+        return self.last_modified
+
+    # ---------- écriture ----------
+
+    def reset(self, remote, source: Optional[str] = None):
+        """Repart d'un journal vide pour `remote`"""
+        self.source = source
+        self.url = remote.url
+        self.size = remote.size
+        self.etag = remote.headers.get("ETag")
+        self.last_modified = remote.headers.get("Last-Modified")
+        self.ranges = []
+
+    @property
+    def completed(self) -> int:
+        return sum(end - start for start, end in self.ranges)
+
+    def missing(self) -> List[Tuple[int, int]]:
+        return missing_ranges(self.ranges, self.size)
+
+    def save(self, ranges: Optional[List[Tuple[int, int]]] = None):
+        """
+        Écrit le journal de façon atomique.
+        Les plages passées doivent déjà être synchronisées sur disque.
+        """
+        if ranges is not None:
+            self.ranges = merge_ranges(list(self.ranges) + list(ranges))
+        data: Dict[str, Any] = {
+            "version": JOURNAL_VERSION,
+            "source": self.source,
+            "url": self.url,
+            "size": self.size,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "ranges": [list(r) for r in self.ranges],
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Journal de reprise non écrit: {e}")
+
+    def delete(self):
+        for path in (self.path, self.path + ".tmp"):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError:
+                pass
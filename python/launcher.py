@@ -0,0 +1,25 @@
+"""
+Lanceur de download_manager.py (mêmes arguments).
+
+Un script lancé directement est recompilé à chaque démarrage : Python ne
+met jamais en cache le bytecode du module principal. Importé depuis ce
+lanceur, download_manager (et les modules qu'il charge) est relu depuis
+__pycache__. Si le dossier de l'application n'est pas accessible en
+écriture (Program Files), le cache va dans le dossier temporaire de
+l'utilisateur.
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+if not sys.dont_write_bytecode and not os.access(HERE, os.W_OK):
+    import tempfile
+    sys.pycache_prefix = os.path.join(tempfile.gettempdir(), "frostapp_pycache")
+
+import download_manager
+
+if __name__ == "__main__":
+    download_manager.main()
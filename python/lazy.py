@@ -0,0 +1,46 @@
+"""
+Imports différés pour les commandes légères de download_manager.py.
+
+requests, rarfile et le moteur de transfert coûtent plusieurs centaines de
+millisecondes à importer ; detect_type, pause, stop... n'en ont pas
+besoin. LazyModule n'importe le module qu'au premier accès à un de ses
+attributs (requests.get, transfer.probe, except requests.RequestException...).
+"""
+
+import importlib
+import threading
+from typing import Optional, Callable, Any
+
+
+class LazyModule:
+    """Module importé au premier accès ; `setup(module)` est appelé une fois après l'import"""
+
+    def __init__(self, name: str, setup: Optional[Callable[[Any], None]] = None):
+        self._name = name
+        self._setup = setup
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        # Premier accès possible depuis plusieurs threads (démon, pool GoFile)
+        with self._lock:
+            if self._module is None:
+                module = importlib.import_module(self._name)
+                if self._setup:
+                    self._setup(module)
+                self._module = module
+        return self._module
+
+    def __getattr__(self, attr: str):
+        module = self._module or self._load()
+        return getattr(module, attr)
+
+    def __setattr__(self, attr: str, value):
+        if attr.startswith("_"):
+            object.__setattr__(self, attr, value)
+        else:
+            setattr(self._module or self._load(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "importé" if self._module is not None else "différé"
+        return f"<LazyModule {self._name} ({state})>"
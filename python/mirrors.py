@@ -0,0 +1,65 @@
+"""
+Vérification des miroirs d'un fichier avant de répartir les plages.
+
+Un miroir n'est retenu que s'il sert exactement les mêmes octets que
+l'URL principale : support des plages, même taille, et même empreinte
+SHA-256 sur SAMPLE_COUNT échantillons répartis dans le fichier (début,
+fin et points intermédiaires).
+"""
+
+import hashlib
+import logging
+from typing import Optional, List
+
+from transfer import Mirror, RemoteFile, TransferError, probe, REQUEST_TIMEOUT
+
+SAMPLE_COUNT = 4
+SAMPLE_SIZE = 256 * 1024
+
+
+def sample_offsets(size: int) -> List[int]:
+    """Offsets des échantillons, répartis régulièrement de 0 à la fin"""
+    if size <= SAMPLE_SIZE:
+        return [0]
+    last = size - SAMPLE_SIZE
+    return sorted({last * i // (SAMPLE_COUNT - 1) for i in range(SAMPLE_COUNT)})
+
+
+def sample_digest(session, mirror: Mirror, size: int) -> str:
+    """Empreinte des échantillons servis par `mirror`"""
+    digest = hashlib.sha256()
+    for offset in sample_offsets(size):
+        end = min(size, offset + SAMPLE_SIZE)
+        headers = dict(mirror.headers)
+        headers["Range"] = f"bytes={offset}-{end - 1}"
+        response = session.get(mirror.url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code != 206 or len(response.content) != end - offset:
+            raise TransferError(f"Échantillon {offset}-{end - 1} refusé: code {response.status_code}")
+        digest.update(response.content)
+    return digest.hexdigest()
+
+
+def verify_mirrors(session, primary: Mirror, remote: RemoteFile, candidates: List[Mirror]) -> List[Mirror]:
+    """Retourne les miroirs de `candidates` identiques au fichier principal"""
+    if not remote.accept_ranges or not candidates:
+        return []
+    reference: Optional[str] = None
+    verified = []
+    for mirror in candidates:
+        try:
+            mirror_remote, _ = probe(session, mirror.url, mirror.headers)
+            if not mirror_remote.accept_ranges:
+                raise TransferError("pas de support des plages")
+            if mirror_remote.size != remote.size:
+                raise TransferError(f"taille {mirror_remote.size} au lieu de {remote.size}")
+            mirror.url = mirror_remote.url or mirror.url
+            if reference is None:
+                reference = sample_digest(session, primary, remote.size)
+            if sample_digest(session, mirror, remote.size) != reference:
+                raise TransferError("contenu différent")
+        except Exception as e:
+            logging.warning(f"Miroir {mirror.host} écarté: {e}")
+            continue
+        logging.info(f"Miroir {mirror.host} vérifié")
+        verified.append(mirror)
+    return verified
@@ -0,0 +1,122 @@
+"""
+Fichier `.part` préalloué à écritures positionnelles.
+
+La taille finale est réservée dès l'ouverture :
+- Linux : `posix_fallocate` (blocs réservés d'un seul tenant) ;
+- Windows : fichier creux NTFS (FSCTL_SET_SPARSE), sans quoi agrandir
+  le fichier ou écrire loin de la fin force NTFS à remplir de zéros ;
+- ailleurs, ou si le système de fichiers refuse : `ftruncate` (creux).
+
+Chaque connexion écrit à son offset absolu (`os.pwrite`) sur un
+descripteur partagé, et les plages écrites sont suivies pour le journal
+de reprise.
+"""
+
+import os
+import errno
+import threading
+from typing import List, Tuple, Dict
+
+from journal import merge_ranges
+
+O_BINARY = getattr(os, "O_BINARY", 0)
+FSCTL_SET_SPARSE = 0x000900C4
+
+
+def _set_sparse(fd: int) -> bool:
+    """Marque le fichier comme creux (NTFS) ; False si impossible"""
+    try:
+        import ctypes
+        import msvcrt
+        from ctypes import wintypes
+    except ImportError:
+        return False
+    handle = msvcrt.get_osfhandle(fd)
+    returned = wintypes.DWORD(0)
+    ok = ctypes.windll.kernel32.DeviceIoControl(
+        wintypes.HANDLE(handle), FSCTL_SET_SPARSE, None, 0, None, 0, ctypes.byref(returned), None
+    )
+    return bool(ok)
+
+
+def _extend(fd: int, size: int):
+    """Porte le fichier à `size` octets en réservant l'espace si possible"""
+    if size <= 0:
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError as e:
+            # Espace réellement insuffisant : inutile de continuer en creux
+            if e.errno == errno.ENOSPC:
+                raise
+    if os.name == "nt" and _set_sparse(fd):
+        # Écrire le dernier octet d'un fichier creux n'alloue que ce bloc
+        os.lseek(fd, size - 1, os.SEEK_SET)
+        os.write(fd, b"\0")
+        return
+    os.ftruncate(fd, size)
+
+
+class PartFile:
+    """Descripteur partagé par toutes les connexions d'un téléchargement"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = -1
+        # Windows n'a pas os.pwrite : seek + write sous verrou
+        self._seek_lock = None if hasattr(os, "pwrite") else threading.Lock()
+        self._lock = threading.Lock()
+        self._ranges: Dict[int, int] = {}   # fin -> début des plages écrites
+
+    def open(self, size: int, reserve: bool = True):
+        """
+        Ouvre le fichier. `reserve` : le (re)crée à la taille `size` ;
+        sinon le fichier existant (reprise) est ouvert tel quel.
+        """
+        flags = os.O_RDWR | O_BINARY
+        if reserve:
+            flags |= os.O_CREAT | os.O_TRUNC
+        self.fd = os.open(self.path, flags, 0o666)
+        if reserve:
+            try:
+                _extend(self.fd, size)
+            except OSError:
+                self.close()
+                raise
+
+    def write_at(self, offset: int, data):
+        """Écrit tout `data` à `offset` (écritures partielles comprises)"""
+        view = memoryview(data)
+        end = offset + len(view)
+        position = offset
+        while view:
+            if self._seek_lock is None:
+                written = os.pwrite(self.fd, view, position)
+            else:
+                with self._seek_lock:
+                    os.lseek(self.fd, position, os.SEEK_SET)
+                    written = os.write(self.fd, view)
+            view = view[written:]
+            position += written
+        self._record(offset, end)
+
+    def _record(self, start: int, end: int):
+        # Une connexion écrit séquentiellement : sa plage s'allonge par la fin
+        with self._lock:
+            begin = self._ranges.pop(start, start)
+            self._ranges[end] = begin
+
+    def ranges(self) -> List[Tuple[int, int]]:
+        """Plages [start, end[ écrites depuis l'ouverture"""
+        with self._lock:
+            return merge_ranges([(start, end) for end, start in self._ranges.items()])
+
+    def sync(self):
+        os.fsync(self.fd)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
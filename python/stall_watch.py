@@ -0,0 +1,138 @@
+"""
+Chien de garde des connexions de transfert.
+
+Chaque phase d'une requête a son propre délai :
+- CONNECT_TIMEOUT : établissement de la connexion (TCP + TLS) ;
+- TTFB_TIMEOUT : de l'envoi de la requête aux en-têtes de la réponse ;
+- READ_TIMEOUT : silence maximal pendant la lecture du corps.
+
+Une connexion à moitié morte ne se tait pas toujours : elle peut livrer
+un filet d'octets qui déjoue le délai de lecture. ConnectionWatch compte
+donc les octets reçus par fenêtre de STALL_WINDOW secondes passées à
+lire le socket ; sous STALL_MIN_BYTES, la boucle de suivi du moteur
+ferme la connexion, même au milieu d'une lecture bloquante. Le temps
+passé hors lecture (seau à jetons, pause, écriture disque en retard) ne
+compte pas.
+
+Une connexion bloquée lève StallError : le moteur relance la plage
+restante du segment (`Range` depuis `seg.pos`), pas le fichier entier.
+Un blocage à la connexion ou avant les en-têtes met en cause l'hôte et
+réduit ses créneaux (host_limits.py) ; un blocage en cours de lecture ne
+concerne que la connexion.
+
+Les blocages sont comptés par type (StallCounters) et publiés avec la
+progression.
+"""
+
+import threading
+from time import perf_counter
+from typing import Dict, Optional, Callable
+
+CONNECT_TIMEOUT = 10
+TTFB_TIMEOUT = 30
+READ_TIMEOUT = 20
+STALL_WINDOW = 30.0                # Secondes de lecture par fenêtre
+STALL_MIN_BYTES = 64 * 1024        # Octets minimum par fenêtre (~2 Kio/s)
+
+KINDS = ("connect", "ttfb", "read", "slow")
+HOST_KINDS = ("connect", "ttfb")   # Blocages imputés à l'hôte
+MESSAGES = {
+    "connect": "Connexion impossible en {} s",
+    "ttfb": "Pas de réponse en {} s",
+    "read": "Aucun octet reçu en {} s",
+}
+
+
+class StallError(ConnectionError):
+    """Connexion bloquée ; `kind` : phase en cause (voir KINDS)"""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+    @property
+    def host_side(self) -> bool:
+        return self.kind in HOST_KINDS
+
+
+def deadline(kind: str) -> float:
+    """Délai de la phase `kind` (lu à chaque appel : réglable à chaud)"""
+    return {"connect": CONNECT_TIMEOUT, "ttfb": TTFB_TIMEOUT, "read": READ_TIMEOUT}[kind]
+
+
+def timed_out(kind: str) -> StallError:
+    """Erreur d'une phase `kind` qui a dépassé son délai"""
+    return StallError(kind, MESSAGES[kind].format(deadline(kind)))
+
+
+class StallCounters:
+    """Blocages d'un téléchargement, par type (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(KINDS, 0)
+
+    def record(self, kind: str):
+        with self._lock:
+            self._counts[kind] = self._counts.get(kind, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            counts = dict(self._counts)
+        counts["total"] = sum(counts.values())
+        return counts
+
+
+class ConnectionWatch:
+    """
+    Débit d'une connexion par fenêtre de temps passé à lire.
+
+    Le lecteur appelle record() après chaque lecture et encadre ses
+    attentes hors réseau par `with watch.idle():`. La boucle de suivi du
+    moteur appelle check() : une fenêtre trop maigre appelle `abort`, qui
+    ferme la connexion (une lecture bloquante en cours se termine), et
+    `error` indique au lecteur pourquoi sa lecture a échoué.
+    """
+
+    __slots__ = ("abort", "window", "min_bytes", "error", "_start", "_bytes", "_excluded", "_idle_since")
+
+    def __init__(self, abort: Callable[[], None], window: Optional[float] = None, min_bytes: Optional[int] = None):
+        self.abort = abort
+        self.window = STALL_WINDOW if window is None else window
+        self.min_bytes = STALL_MIN_BYTES if min_bytes is None else min_bytes
+        self.error: Optional[StallError] = None
+        self._start = perf_counter()
+        self._bytes = 0
+        self._excluded = 0.0
+        self._idle_since: Optional[float] = None
+
+    def record(self, count: int):
+        self._bytes += count
+
+    def idle(self) -> "ConnectionWatch":
+        return self
+
+    def __enter__(self):
+        self._idle_since = perf_counter()
+
+    def __exit__(self, *exc):
+        self._excluded += perf_counter() - self._idle_since
+        self._idle_since = None
+
+    def check(self, now: float) -> bool:
+        """True si la connexion vient d'être abandonnée (appel depuis la boucle de suivi)"""
+        if self.error is not None or self._idle_since is not None:
+            return False
+        elapsed = now - self._start - self._excluded
+        if elapsed < self.window:
+            return False
+        received, self._bytes = self._bytes, 0
+        self._start, self._excluded = now, 0.0
+        if received >= self.min_bytes:
+            return False
+        self.error = StallError("slow", f"Connexion bloquée: {received} octets en {elapsed:.0f} s de lecture")
+        try:
+            self.abort()
+        except OSError:
+            pass
+        return True
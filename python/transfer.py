@@ -0,0 +1,929 @@
+"""
+Moteur de téléchargement segmenté partagé par tous les hébergeurs
+(BuzzHeavier, PixelDrain, GoFile).
+
+Le fichier distant est sondé avec une requête `Range: bytes=0-0` :
+- 206 + Content-Range : le fichier est découpé en plages téléchargées en
+  parallèle sur plusieurs connexions, dans un seul `.part` préalloué ;
+- 200 : le serveur ignore les plages, on retombe sur un flux unique.
+
+Quand les plages sont supportées, la progression est consignée dans un
+journal de reprise (voir journal.py) : une nouvelle tentative ou un
+relancement ne retélécharge que les plages manquantes.
+
+Les octets sont écrits à leur offset absolu dans un `.part` préalloué
+(voir part_file.py), par un thread écrivain dédié (voir write_behind.py).
+
+Le nombre de connexions simultanées est réglé par hôte (voir
+host_limits.py) : chaque connexion occupe un créneau de l'hôte.
+
+En mode segmenté, une pause suspend le transfert : connexions fermées,
+tampons écrits, point de reprise consigné, threads de connexion
+terminés. La reprise repart des plages du journal avec `Range`, après
+avoir revérifié l'URL (ou l'avoir résolue de nouveau si elle a expiré).
+
+Chaque connexion est surveillée (voir stall_watch.py) : délais séparés
+de connexion, de premier octet et de lecture, débit minimum par
+fenêtre. Une connexion bloquée est fermée et seule sa plage restante
+est redemandée.
+
+En mode `sequential` (extraction d'un ZIP pendant son téléchargement,
+voir zip_stream.py), les segments sont courts et attribués dans l'ordre
+du fichier : le début complet du `.part` (available) avance en continu.
+"""
+
+import re
+import time
+import socket
+import logging
+import threading
+import http.client
+from time import perf_counter
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+import requests
+
+import host_limits
+from journal import ResumeJournal, merge_ranges
+from part_file import PartFile
+from write_behind import WriteBehind
+from buffers import BUFFERS, AdaptiveChunkSizer, raw_stream, release_if_consumed
+from stall_watch import (
+    ConnectionWatch, StallCounters, StallError, deadline, timed_out, CONNECT_TIMEOUT, TTFB_TIMEOUT,
+)
+
+# ==================== CONFIGURATION ====================
+DEFAULT_CONNECTIONS = host_limits.DEFAULT_LIMIT
+MAX_CONNECTIONS = host_limits.MAX_LIMIT     # Threads par téléchargement (créneaux par hôte)
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024   # Pas de segment plus petit que 8 Mo
+STREAM_SEGMENT_SIZE = 16 * 1024 * 1024  # Segments ordonnés du mode `sequential`
+STREAM_MIN_SEGMENT = 1024 * 1024
+CHUNK_SIZE = 1024 * 1024            # Lecture par iter_content (flux compressé)
+SEGMENT_RETRIES = 5
+REQUEST_TIMEOUT = (CONNECT_TIMEOUT, TTFB_TIMEOUT)  # (connexion, en-têtes) ; corps : READ_TIMEOUT
+JOURNAL_INTERVAL = 2.0               # Secondes entre deux points de reprise
+MIRROR_CHECK_INTERVAL = 10.0         # Secondes entre deux comparaisons de miroirs
+MIRROR_SLOW_RATIO = 0.15             # Sous 15 % du meilleur miroir : abandonné
+
+CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+class TransferError(Exception):
+    """Erreur irrécupérable pendant un transfert"""
+
+
+class RemoteChanged(TransferError):
+    """Le fichier distant n'est plus celui du journal (200 en réponse à If-Range)"""
+
+
+class DownloadAborted(Exception):
+    """Transfert interrompu volontairement (espace disque, etc.)"""
+
+
+class RemoteFile:
+    """Informations obtenues lors du sondage d'un fichier distant"""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str]):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.size = 0
+        self.accept_ranges = False
+
+        content_range = headers.get("Content-Range", "")
+        match = CONTENT_RANGE_RE.match(content_range)
+        if status_code == 206 and match and match.group(3) != "*":
+            self.size = int(match.group(3))
+            self.accept_ranges = True
+        else:
+            self.size = int(headers.get("Content-Length", 0) or 0)
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code in (200, 206)
+
+    @property
+    def content_disposition(self) -> str:
+        return self.headers.get("content-disposition", "")
+
+
+def is_valid_response(status_code: int, part_size: int) -> bool:
+    """
+    Valide le code HTTP selon l'état du téléchargement partiel
+    (même règle que Downloader._is_valid_response dans gofile-downloader.py).
+    """
+    if status_code in (403, 404, 405, 500):
+        return False
+    if part_size == 0:
+        return status_code in (200, 206)
+    if part_size > 0:
+        return status_code == 206
+    return False
+
+
+def range_headers(headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """
+    Copie des en-têtes adaptée aux requêtes Range.
+    La compression est désactivée : les plages doivent porter sur les
+    octets réels du fichier, pas sur un flux gzip.
+    """
+    result = dict(headers or {})
+    result["Accept-Encoding"] = "identity"
+    return result
+
+
+def probe(session, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[RemoteFile, Optional[requests.Response]]:
+    """
+    Sonde un fichier distant.
+
+    Returns:
+        (remote, response) : `response` est le flux ouvert à réutiliser
+        quand le serveur a répondu 200 (pas de support des plages),
+        None sinon.
+    """
+    probe_headers = range_headers(headers)
+    probe_headers["Range"] = "bytes=0-0"
+    response = session.get(url, headers=probe_headers, stream=True, timeout=REQUEST_TIMEOUT)
+    remote = RemoteFile(response.url or url, response.status_code, response.headers)
+
+    if remote.accept_ranges:
+        response.close()
+        return remote, None
+    if not remote.ok:
+        response.close()
+        return remote, None
+    return remote, response
+
+
+def shutdown_connection(response: requests.Response):
+    """Coupe le socket de `response` : une lecture bloquée dans un autre thread se termine"""
+    connection = response.raw.connection
+    sock = connection.sock if connection is not None else None
+    if sock is not None:
+        sock.shutdown(socket.SHUT_RDWR)
+
+
+class Segment:
+    """Plage d'octets [start, end[ ; `pos` avance au fil de l'écriture"""
+
+    __slots__ = ("start", "end", "pos", "active")
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+        self.pos = start
+        self.active = False
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.end - self.pos)
+
+
+class Mirror:
+    """
+    Une source du fichier : URL résolue, en-têtes et créneaux de son hôte.
+    Un miroir abandonné (erreurs répétées, trop lent) ne prend plus de
+    segments ; les autres récupèrent son travail par vol de travail.
+    """
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None, primary: bool = False):
+        self.url = url
+        self.headers = range_headers(headers)
+        self.primary = primary
+        self.limiter: Optional[host_limits.HostLimiter] = None
+        self.dropped = False
+        self.received = 0
+        self.checked = 0    # `received` lors de la dernière comparaison
+
+    @property
+    def host(self) -> str:
+        return requests.utils.urlparse(self.url).hostname or ""
+
+
+def split_ranges(size: int, connections: int) -> List[Segment]:
+    """Découpe `size` octets en au plus `connections` segments"""
+    count = max(1, min(connections, size // MIN_SEGMENT_SIZE))
+    step = size // count
+    segments = []
+    for i in range(count):
+        start = i * step
+        end = size if i == count - 1 else start + step
+        segments.append(Segment(start, end))
+    return segments
+
+
+def split_sequential(ranges: List[Tuple[int, int]], connections: int) -> List[Segment]:
+    """
+    Découpe les plages [start, end[ en segments d'au plus STREAM_SEGMENT_SIZE, dans
+    l'ordre du fichier. Plus courts pour un petit fichier : le début complet n'avance
+    qu'avec le plus ancien segment en cours, le retard reste de l'ordre de
+    `connections` segments (un huitième du fichier au plus)
+    """
+    total = sum(end - start for start, end in ranges)
+    step = max(STREAM_MIN_SEGMENT, min(STREAM_SEGMENT_SIZE, total // (8 * max(1, connections))))
+    segments = []
+    for start, end in ranges:
+        for offset in range(start, end, step):
+            segments.append(Segment(offset, min(end, offset + step)))
+    return segments
+
+
+class SegmentedDownloader:
+    """
+    Télécharge une URL vers un fichier `.part` sur plusieurs connexions.
+
+    `reporter` est un objet optionnel exposant :
+        reserve(needed)                     -> appelé une fois avant de réserver
+                                               `needed` octets sur le disque
+        progress(downloaded, total, speed, io, stalls)
+                                            -> appelé chaque seconde ;
+                                               `io` : métriques d'écriture,
+                                               `stalls` : connexions bloquées
+                                               par type (stall_watch.py)
+        paused() / resumed()                -> transitions de pause
+        checkpoint(journal)                 -> optionnel, après chaque point de
+                                               reprise (journal.ResumeJournal)
+    Il peut lever DownloadAborted pour interrompre le transfert.
+
+    `controller` est un objet optionnel exposant is_paused(), is_stopped()
+    et wait_resumed(timeout) ; les deux premiers sont appelés à chaque
+    bloc reçu et doivent se limiter à lire un drapeau.
+
+    `bandwidth` est un seau à jetons optionnel (bandwidth.TokenBucket)
+    partagé par toutes les connexions du téléchargement.
+
+    `connections` borne le nombre de connexions de ce téléchargement par
+    source ; le nombre effectif est celui qu'autorise le HostLimiter de
+    l'hôte.
+
+    `mirrors` : autres sources vérifiées du même fichier (voir mirrors.py).
+    Les plages sont alors réparties entre l'URL principale et les miroirs.
+
+    `resolve` : fonction optionnelle qui résout de nouveau la source et
+    retourne (url, en-têtes), appelée à la reprise après une pause si
+    l'URL ne sert plus le fichier du journal (lien temporaire expiré).
+
+    `sequential` : segments courts attribués dans l'ordre du fichier, pour
+    que le début du `.part` soit complet au plus tôt (voir available et
+    zip_stream.py).
+    """
+
+    def __init__(self, session, url: str, tmp_file: str, headers: Optional[Dict[str, str]] = None,
+                 controller=None, reporter=None, connections: int = MAX_CONNECTIONS,
+                 source: Optional[str] = None, bandwidth=None, mirrors: Optional[List[Mirror]] = None,
+                 resolve: Optional[Callable[[], Tuple[str, Dict[str, str]]]] = None,
+                 sequential: bool = False):
+        self.session = session
+        self.url = url
+        self.tmp_file = tmp_file
+        self.headers = range_headers(headers)
+        self.controller = controller
+        self.reporter = reporter
+        self.connections = max(1, connections)
+        self.source = source
+        self.bandwidth = bandwidth
+        self.limiter: Optional[host_limits.HostLimiter] = None
+        self.mirrors: List[Mirror] = list(mirrors or [])
+        self.resolve = resolve
+        self.sequential = sequential
+        self.journal = ResumeJournal(tmp_file)
+        self.part = PartFile(tmp_file)
+        self.writer = self._make_writer()
+
+        self.total = 0
+        self.downloaded = 0
+        self.resumed = 0
+        self.segments: List[Segment] = []
+        self.stalls = StallCounters()
+        self._watches = set()
+
+        self._lock = threading.Lock()
+        self._halt = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._suspended = False
+
+    def _make_writer(self):
+        return WriteBehind(self.part, on_error=self._fail)
+
+    # ---------- contrôle ----------
+
+    def _is_stopped(self) -> bool:
+        return self._halt.is_set() or bool(self.controller and self.controller.is_stopped())
+
+    def _wait_if_paused(self, watch: ConnectionWatch):
+        # En mode segmenté, la pause suspend tout le transfert (voir _suspend)
+        if self.segments or not (self.controller and self.controller.is_paused()):
+            return
+        # La pause ne compte pas dans la fenêtre de débit de la connexion
+        with watch.idle():
+            while self.controller.is_paused() and not self._is_stopped():
+                self.controller.wait_resumed(0.5)
+
+    def _watch(self, abort: Callable[[], None]) -> ConnectionWatch:
+        """Place une connexion sous la surveillance de la boucle de suivi"""
+        watch = ConnectionWatch(abort)
+        with self._lock:
+            self._watches.add(watch)
+        return watch
+
+    def _unwatch(self, watch: ConnectionWatch):
+        with self._lock:
+            self._watches.discard(watch)
+
+    def _check_watches(self):
+        """Coupe les connexions dont la fenêtre de débit est trop maigre (voir stall_watch.py)"""
+        now = perf_counter()
+        with self._lock:
+            watches = list(self._watches)
+        for watch in watches:
+            watch.check(now)
+
+    # ---------- point d'entrée ----------
+
+    def run(self, remote: RemoteFile, response: Optional[requests.Response] = None) -> bool:
+        """
+        Lance le transfert (et le reprend après chaque pause).
+
+        Returns:
+            True si le fichier est complet, False si arrêté par le contrôleur.
+        Raises:
+            DownloadAborted, TransferError ou l'exception réseau d'origine.
+        """
+        restarted = False
+        while True:
+            try:
+                complete = self._transfer(remote, response)
+            except RemoteChanged as e:
+                # Une seule fois : un fichier qui change à chaque passage ne se télécharge pas
+                if restarted:
+                    raise
+                restarted = True
+                remote, response = self._restart(e)
+                continue
+            if not self._suspended:
+                return complete
+            remote = self._resume_after_pause()
+            if remote is None:
+                return False
+            response = None
+
+    def _restart(self, reason: RemoteChanged) -> Tuple[RemoteFile, Optional[requests.Response]]:
+        """Fichier distant modifié : journal et `.part` repartent de zéro, d'après une nouvelle sonde"""
+        logging.warning(f"{reason}: téléchargement repris depuis le début")
+        self.journal.delete()
+        self.resumed = 0
+        self._halt.clear()
+        self._error = None
+        self.writer = self._make_writer()
+        remote, response = probe(self.session, self.url, self.headers)
+        if not remote.ok:
+            raise TransferError(f"Erreur: code {remote.status_code}")
+        return remote, response
+
+    def _transfer(self, remote: RemoteFile, response: Optional[requests.Response] = None) -> bool:
+        """Un passage du transfert, jusqu'à la fin, l'arrêt ou une pause (voir run)"""
+        self._setup(remote)
+
+        segmented = remote.accept_ranges and remote.size > 0
+        if segmented:
+            if response is not None:
+                response.close()
+            self.segments = self._plan_segments(remote)
+            self.downloaded = self.resumed
+            # Les threads sans créneau attendent que l'hôte en accorde un
+            count = self._connections_per_mirror()
+            workers = [
+                threading.Thread(target=self._worker, args=(mirror,), name=f"segment-{mirror.host}-{i}", daemon=True)
+                for mirror in self.mirrors
+                for i in range(count)
+            ]
+        else:
+            logging.info("Serveur sans support des plages: flux unique")
+            self.journal.delete()
+            try:
+                self._reserve(remote.size)
+            except BaseException:
+                if response is not None:
+                    response.close()
+                raise
+            workers = [threading.Thread(target=self._single_stream, args=(response,), name="stream", daemon=True)]
+
+        self.writer.start()
+        for worker in workers:
+            worker.start()
+        try:
+            self._monitor(workers)
+        finally:
+            self._halt.set()
+            for worker in workers:
+                worker.join()
+            # Les tampons déjà reçus sont écrits avant le dernier point de reprise
+            self.writer.close()
+            logging.info(f"Écriture différée: {self.writer.stats()}")
+            if len(self.mirrors) > 1:
+                logging.info(f"Miroirs: {self.mirror_stats()}")
+            if segmented:
+                self._checkpoint()
+            self.part.close()
+        return self._result()
+
+    def _setup(self, remote: RemoteFile):
+        """Taille, URL finale et sources (principale + miroirs) avec leurs créneaux"""
+        self.total = remote.size
+        if remote.url:
+            self.url = remote.url
+        primary = Mirror(self.url, self.headers, primary=True)
+        self.mirrors = [primary] + [m for m in self.mirrors if not m.primary]
+        # Après redirection (ex. BuzzHeavier -> trashbytes) : l'hôte qui sert les octets
+        for mirror in self.mirrors:
+            mirror.limiter = host_limits.get_limiter(mirror.host)
+        self.limiter = primary.limiter
+
+    def _connections_per_mirror(self) -> int:
+        count = min(self.connections, max(len(self.segments), self.total // MIN_SEGMENT_SIZE, 1))
+        sources = ", ".join(f"{m.limiter.limit} sur {m.host}" for m in self.mirrors)
+        logging.info(f"Transfert segmenté: connexion(s) {sources} (jusqu'à {count} par source) pour {self.total} octets")
+        return count
+
+    def _result(self) -> bool:
+        """Issue du transfert une fois les workers terminés (voir run)"""
+        if self._error is not None:
+            raise self._error
+        if self._suspended or (self.controller and self.controller.is_stopped()):
+            return False
+        if self.total and self.downloaded < self.total:
+            raise TransferError(f"Transfert incomplet: {self.downloaded}/{self.total} octets")
+        self.journal.delete()
+        return True
+
+    def _monitor(self, workers: List[threading.Thread]):
+        """Boucle de suivi : progression, pause et fin des workers"""
+        state = self._monitor_state()
+        while any(w.is_alive() for w in workers):
+            time.sleep(0.1)
+            if not self._monitor_step(state, self._checkpoint):
+                return
+
+    def _monitor_state(self) -> Dict[str, Any]:
+        start_time = perf_counter()
+        return {"start": start_time, "update": start_time, "checkpoint": start_time, "mirrors": start_time, "paused": False}
+
+    def _monitor_step(self, state: Dict[str, Any], checkpoint) -> bool:
+        """
+        Un tour de suivi (toutes les 0,1 s) : transitions de pause, point de
+        reprise via `checkpoint`, progression. False si le transfert s'arrête.
+        """
+        if self._error is not None or self._is_stopped():
+            return False
+        self._check_watches()
+
+        paused = bool(self.controller and self.controller.is_paused())
+        if paused and self.segments:
+            self._suspend()
+            return False
+        if self.reporter and paused != state["paused"]:
+            self.reporter.paused() if paused else self.reporter.resumed()
+        state["paused"] = paused
+
+        current_time = perf_counter()
+        if self.segments and current_time - state["checkpoint"] >= JOURNAL_INTERVAL:
+            checkpoint()
+            state["checkpoint"] = current_time
+
+        if len(self.mirrors) > 1 and not paused and current_time - state["mirrors"] >= MIRROR_CHECK_INTERVAL:
+            self._check_mirrors(current_time - state["mirrors"])
+            state["mirrors"] = current_time
+
+        if self.reporter and not paused and current_time - state["update"] >= 1:
+            elapsed = current_time - state["start"]
+            speed = (self.downloaded - self.resumed) / elapsed if elapsed > 0 else 0
+            self.reporter.progress(self.downloaded, self.total, speed, self.writer.stats(), self.stalls.snapshot())
+            state["update"] = current_time
+        return True
+
+    # ---------- pause ----------
+
+    def _suspend(self):
+        """
+        Pause en mode segmenté : le passage en cours se termine (connexions
+        fermées, tampons écrits, point de reprise aux octets près) au lieu
+        de garder des réponses ouvertes que l'hôte finirait par couper.
+        """
+        self._suspended = True
+        if self.reporter:
+            self.reporter.paused()
+
+    def _resume_after_pause(self) -> Optional[RemoteFile]:
+        """Attend la reprise sans connexion ni thread de transfert ; None si arrêté entre-temps"""
+        logging.info(f"Pause: connexions fermées à {self.downloaded}/{self.total} octets")
+        while self.controller.is_paused():
+            if self.controller.is_stopped():
+                return None
+            self.controller.wait_resumed(0.5)
+        if self.controller.is_stopped():
+            return None
+
+        self._suspended = False
+        self._halt.clear()
+        self._error = None
+        self.writer = self._make_writer()
+        remote = self._reconnect()
+        if self.reporter:
+            self.reporter.resumed()
+        return remote
+
+    def _reconnect(self) -> RemoteFile:
+        """Sonde l'URL résolue ; si elle ne sert plus le fichier du journal, résout de nouveau la source"""
+        try:
+            remote, response = probe(self.session, self.url, self.headers)
+            if response is not None:
+                response.close()
+            if remote.accept_ranges and self.journal.matches(remote):
+                return remote
+            reason = f"code {remote.status_code}"
+        except requests.RequestException as e:
+            remote, reason = None, str(e)
+        if self.resolve is None:
+            if remote is None or not remote.ok:
+                raise TransferError(f"Reprise impossible: {reason}")
+            return remote
+
+        logging.info(f"Reprise: URL expirée ({reason}), nouvelle résolution de la source")
+        self.url, headers = self.resolve()
+        self.headers = range_headers(headers)
+        remote, response = probe(self.session, self.url, self.headers)
+        if response is not None:
+            response.close()
+        if not remote.ok:
+            raise TransferError(f"Reprise impossible: code {remote.status_code}")
+        return remote
+
+    # ---------- miroirs ----------
+
+    def _check_mirrors(self, interval: float):
+        """Abandonne les miroirs nettement plus lents que le meilleur"""
+        with self._lock:
+            remaining = self.total - self.downloaded
+            rates = {}
+            for mirror in self.mirrors:
+                rates[mirror] = (mirror.received - mirror.checked) / interval
+                mirror.checked = mirror.received
+        live = [m for m in self.mirrors if not m.dropped]
+        # En fin de transfert, un miroir inactif manque de travail, pas de débit
+        if len(live) < 2 or remaining < len(live) * 2 * MIN_SEGMENT_SIZE:
+            return
+        best = max(rates[m] for m in live)
+        for mirror in live:
+            if rates[mirror] < MIRROR_SLOW_RATIO * best:
+                self._drop_mirror(mirror, f"trop lent ({rates[mirror] / 1048576:.2f} Mo/s)")
+
+    def _drop_mirror(self, mirror: Mirror, reason: str, error: Optional[BaseException] = None):
+        """Retire `mirror` ; relance `error` s'il n'y a plus d'autre source"""
+        with self._lock:
+            others = [m for m in self.mirrors if m is not mirror and not m.dropped]
+            if others:
+                mirror.dropped = True
+        if not others:
+            if error is not None:
+                raise error
+            return
+        logging.warning(f"Miroir {mirror.host} abandonné: {reason}")
+
+    def mirror_stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {"host": m.host, "mb": round(m.received / 1048576, 1), "dropped": m.dropped}
+                for m in self.mirrors
+            ]
+
+    def _check_space(self, needed: int):
+        """Vérification unique de l'espace disque, déléguée au reporter"""
+        if self.reporter and hasattr(self.reporter, "reserve"):
+            self.reporter.reserve(needed)
+
+    def _reserve(self, size: int):
+        """Vérifie l'espace disque puis crée le `.part` à sa taille finale"""
+        self._check_space(size)
+        try:
+            self.part.open(size, reserve=True)
+        except OSError as e:
+            raise DownloadAborted(f"Réservation de {size} octets impossible: {e}")
+
+    # ---------- reprise ----------
+
+    def _plan_segments(self, remote: RemoteFile) -> List[Segment]:
+        """Segments à télécharger : plages manquantes du journal, ou fichier entier"""
+        journal = self.journal
+        if journal.load() and journal.matches(remote):
+            self.resumed = journal.completed
+            logging.info(f"Reprise: {self.resumed}/{remote.size} octets déjà présents")
+            missing = journal.missing()
+            if self.sequential:
+                segments = split_sequential(missing, self._parallel_connections())
+            else:
+                segments = [Segment(start, end) for start, end in missing]
+            # Fichier creux : les plages manquantes ne sont peut-être pas encore allouées
+            self._check_space(remote.size - self.resumed)
+            self.part.open(remote.size, reserve=False)
+        else:
+            journal.reset(remote, self.source)
+            self._reserve(remote.size)
+            if self.sequential:
+                segments = split_sequential([(0, remote.size)], self._parallel_connections())
+            else:
+                segments = split_ranges(remote.size, self._parallel_connections())
+        journal.url = remote.url
+        journal.save()
+        return segments
+
+    def _parallel_connections(self) -> int:
+        """Connexions simultanées possibles, toutes sources confondues"""
+        limit = sum(mirror.limiter.limit for mirror in self.mirrors)
+        return min(self.connections * len(self.mirrors), limit)
+
+    def available(self) -> int:
+        """Octets écrits sans trou depuis le début du `.part` (reprise comprise)"""
+        ranges = merge_ranges(list(self.journal.ranges) + self.part.ranges())
+        if ranges and ranges[0][0] == 0:
+            return ranges[0][1]
+        return 0
+
+    def _checkpoint(self):
+        """Synchronise le `.part` sur disque puis consigne les plages écrites"""
+        written = self.part.ranges()
+        try:
+            self.part.sync()
+        except OSError as e:
+            logging.warning(f"Synchronisation du fichier partiel impossible: {e}")
+            return
+        self.journal.save(written)
+        if self.reporter and hasattr(self.reporter, "checkpoint"):
+            self.reporter.checkpoint(self.journal)
+
+    # ---------- mode segmenté ----------
+
+    def _next_segment(self) -> Optional[Segment]:
+        """
+        Attribue un segment libre, ou à défaut coupe en deux le segment
+        actif qui a le plus de travail restant (vol de travail).
+        """
+        with self._lock:
+            for seg in self.segments:
+                if not seg.active and seg.remaining > 0:
+                    seg.active = True
+                    return seg
+
+            busiest = max(self.segments, key=lambda s: s.remaining, default=None)
+            if busiest is None or busiest.remaining < 2 * MIN_SEGMENT_SIZE:
+                return None
+            middle = busiest.pos + busiest.remaining // 2
+            stolen = Segment(middle, busiest.end)
+            stolen.active = True
+            busiest.end = middle
+            self.segments.append(stolen)
+            return stolen
+
+    def _worker(self, mirror: Mirror):
+        try:
+            while not self._is_stopped() and not mirror.dropped:
+                slot = mirror.limiter.acquire(self._is_stopped)
+                if slot is None:
+                    return
+                try:
+                    seg = self._next_segment()
+                    if seg is None:
+                        return
+                    try:
+                        self._fetch_segment(seg, slot, mirror)
+                    finally:
+                        with self._lock:
+                            seg.active = False
+                finally:
+                    slot.release()
+        except BaseException as e:
+            self._fail(e)
+
+    def _fetch_segment(self, seg: Segment, slot: host_limits.Slot, mirror: Mirror):
+        """
+        Télécharge un segment depuis `mirror`, en reprenant à `seg.pos`
+        après une erreur. S'arrête si le créneau est repris par l'hôte ou
+        si le miroir est abandonné ; le reste du segment est alors laissé
+        à une autre connexion.
+        """
+        attempt = 0
+        while seg.remaining > 0 and not self._is_stopped():
+            before = seg.pos
+            try:
+                self._stream_range(seg, slot, mirror)
+                error = TransferError("Connexion fermée avant la fin du segment")
+            except RemoteChanged as e:
+                # Tout le transfert repart de zéro (voir run)
+                self._fail(e)
+                return
+            except TransferError as e:
+                # Réponse inexploitable : inutile d'insister sur cette source
+                self._drop_mirror(mirror, str(e), e)
+                return
+            # WriteError (disque) n'est pas interceptée : elle arrête le transfert sans toucher à l'hôte
+            except (requests.RequestException, OSError, http.client.HTTPException) as e:
+                # Lecture brute (readinto) : ssl.SSLError, IncompleteRead... sans enveloppe requests
+                self._network_error(mirror, e)
+                error = e
+            if seg.remaining == 0 or self._is_stopped() or not slot.held or mirror.dropped:
+                return
+            # Une connexion qui a fait avancer le segment remet le compteur à zéro
+            if seg.pos > before:
+                attempt = 0
+            attempt += 1
+            if attempt > SEGMENT_RETRIES:
+                # Avec d'autres miroirs, seul celui-ci est abandonné
+                self._drop_mirror(mirror, str(error), error)
+                return
+            wait_time = self._retry_delay(seg, error, attempt)
+            time.sleep(wait_time)
+
+    def _network_error(self, mirror: Mirror, error: BaseException):
+        """Erreur réseau sur une connexion de `mirror` : l'hôte perd des créneaux sauf blocage isolé"""
+        if not isinstance(error, StallError) or error.host_side:
+            mirror.limiter.failed(error)
+
+    def _retry_delay(self, seg: Segment, error: BaseException, attempt: int) -> float:
+        """
+        Délai avant de redemander le reste de `seg`. Une connexion bloquée
+        est relancée aussitôt la première fois : c'est la connexion qui est
+        en cause, pas la charge du serveur.
+        """
+        stalled = isinstance(error, StallError)
+        if stalled:
+            self.stalls.record(error.kind)
+        wait_time = 0 if stalled and attempt == 1 else min(2 ** attempt, 30)
+        logging.warning(f"Segment {seg.pos}-{seg.end}: {error} (tentative {attempt}/{SEGMENT_RETRIES}, attente {wait_time}s)")
+        return wait_time
+
+    def _get(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """GET en flux avec les délais de connexion et de premier octet, puis le délai de lecture du corps"""
+        try:
+            response = self.session.get(url, headers=headers, stream=True, timeout=(deadline("connect"), deadline("ttfb")))
+        except requests.ConnectTimeout as e:
+            raise timed_out("connect") from e
+        except requests.ReadTimeout as e:
+            raise timed_out("ttfb") from e
+        connection = response.raw.connection
+        if connection is not None and connection.sock is not None:
+            connection.sock.settimeout(deadline("read"))
+        return response
+
+    def _stream_range(self, seg: Segment, slot: host_limits.Slot, mirror: Mirror):
+        headers = dict(mirror.headers)
+        headers["Range"] = f"bytes={seg.pos}-{seg.end - 1}"
+        # Les validateurs du journal sont ceux de l'URL principale
+        validator = self.journal.if_range() if mirror.primary else None
+        if validator:
+            # Si le fichier a changé, le serveur renvoie 200 au lieu de 206
+            headers["If-Range"] = validator
+        with self._get(mirror.url, headers) as response:
+            self._check_range(response, seg, mirror, validator)
+            self._receive(response, seg, slot, mirror)
+
+    def _check_range(self, response, seg: Segment, mirror: Mirror, validator: Optional[str]):
+        """
+        Valide la réponse à une requête de plage. Un 200 n'est accepté que
+        pour un fichier en un seul segment, sans reprise : sous If-Range, il
+        signale un fichier modifié (RemoteChanged) ; sinon, un serveur qui
+        ignore Range écrirait le début du fichier dans un autre segment.
+        """
+        if response.status_code in (429, 503):
+            mirror.limiter.throttled(response.status_code)
+        if response.status_code == 200 and validator:
+            raise RemoteChanged("Fichier distant modifié depuis le point de reprise")
+        if response.status_code == 200 and len(self.segments) > 1:
+            raise TransferError("Plage ignorée par le serveur: code 200")
+        if not is_valid_response(response.status_code, seg.pos):
+            raise TransferError(f"Plage refusée: code {response.status_code}")
+        if response.status_code == 206:
+            match = CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+            if not match or int(match.group(1)) != seg.pos:
+                raise TransferError(f"Content-Range inattendu: {response.headers.get('Content-Range')}")
+
+    # ---------- mode flux unique ----------
+
+    def _single_stream(self, response: Optional[requests.Response]):
+        try:
+            if response is None:
+                response = self._get(self.url, self.headers)
+            with response:
+                if response.status_code != 200:
+                    raise TransferError(f"Erreur: code {response.status_code}")
+                self._receive(response)
+        except BaseException as e:
+            self._fail(e)
+
+    # ---------- réception ----------
+
+    def _receive(self, response: requests.Response, seg: Optional[Segment] = None,
+                 slot: Optional[host_limits.Slot] = None, mirror: Optional[Mirror] = None):
+        """
+        Lit le corps de `response` avec `readinto` dans des tampons du pool,
+        confiés à l'écrivain avec leur offset (`seg.pos`, ou 0 en flux
+        unique). En mode segmenté, s'arrête à `seg.end`, qui peut reculer
+        pendant la lecture (vol de travail), quand l'hôte reprend `slot` ou
+        quand `mirror` est abandonné. Lève StallError si la connexion se
+        bloque (voir stall_watch.py).
+        """
+        mirror = mirror or self.mirrors[0]
+        watch = self._watch(lambda: shutdown_connection(response))
+        try:
+            fp = raw_stream(response)
+            if fp is None:
+                self._receive_chunks(response, seg, slot, mirror, watch)
+            else:
+                self._receive_raw(response, fp, seg, slot, mirror, watch)
+        except (OSError, http.client.HTTPException) as e:
+            if watch.error is not None:
+                raise watch.error from e
+            if isinstance(e, TimeoutError):
+                raise timed_out("read") from e
+            raise
+        finally:
+            self._unwatch(watch)
+        # Connexion coupée par le chien de garde entre deux lectures
+        if watch.error is not None:
+            raise watch.error
+
+    def _receive_raw(self, response: requests.Response, fp, seg: Optional[Segment],
+                     slot: Optional[host_limits.Slot], mirror: Mirror, watch: ConnectionWatch):
+        sizer = AdaptiveChunkSizer()
+        buffer = None
+        try:
+            while True:
+                self._wait_if_paused(watch)
+                if self._is_stopped() or mirror.dropped or (slot is not None and mirror.limiter.shed(slot)):
+                    return
+                size = sizer.size
+                if seg is not None:
+                    with self._lock:
+                        remaining = seg.end - seg.pos
+                    if remaining <= 0:
+                        break
+                    size = min(size, remaining)
+
+                if buffer is None:
+                    buffer = BUFFERS.acquire()
+                start = perf_counter()
+                count = fp.readinto(memoryview(buffer)[:size])
+                if not count:
+                    break
+                watch.record(count)
+                if self.bandwidth:
+                    with watch.idle():
+                        self.bandwidth.consume(count)
+                # L'attente du seau à jetons compte : à bas débit, les lectures rapetissent
+                sizer.update(count, perf_counter() - start)
+                # Le tampon appartient désormais à l'écrivain
+                with watch.idle():
+                    self.writer.submit(seg.pos if seg is not None else self.downloaded, buffer, count)
+                buffer = None
+                self._advance(seg, count, mirror)
+                mirror.limiter.record(count)
+            release_if_consumed(response, fp)
+        finally:
+            if buffer is not None:
+                BUFFERS.release(buffer)
+
+    def _receive_chunks(self, response: requests.Response, seg: Optional[Segment],
+                        slot: Optional[host_limits.Slot], mirror: Mirror, watch: ConnectionWatch):
+        """Variante `iter_content` pour les flux compressés"""
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            self._wait_if_paused(watch)
+            if self._is_stopped() or mirror.dropped or (slot is not None and mirror.limiter.shed(slot)):
+                return
+            if not chunk:
+                continue
+            watch.record(len(chunk))
+            if seg is not None:
+                with self._lock:
+                    remaining = seg.end - seg.pos
+                if remaining <= 0:
+                    return
+                if len(chunk) > remaining:
+                    chunk = chunk[:remaining]
+            with watch.idle():
+                if self.bandwidth:
+                    self.bandwidth.consume(len(chunk))
+                self.writer.submit(seg.pos if seg is not None else self.downloaded, chunk, len(chunk), pooled=False)
+            self._advance(seg, len(chunk), mirror)
+            mirror.limiter.record(len(chunk))
+
+    def _advance(self, seg: Optional[Segment], count: int, mirror: Optional[Mirror] = None):
+        with self._lock:
+            if seg is not None:
+                seg.pos += count
+            if mirror is not None:
+                mirror.received += count
+            self.downloaded += count
+
+    def _fail(self, error: BaseException):
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._halt.set()
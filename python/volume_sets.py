@@ -0,0 +1,182 @@
+"""
+Archives en plusieurs volumes d'un dossier GoFile.
+
+Trois nommages sont reconnus parmi les fichiers du dossier :
+- `jeu.part1.rar`, `jeu.part2.rar`... (RAR 3 et suivants) ;
+- `jeu.rar`, `jeu.r00`, `jeu.r01`... (ancien nommage RAR) ;
+- `jeu.rar.001`, `jeu.zip.002`... (découpage brut, HJSplit / 7-Zip).
+
+Un jeu de volumes n'est extrait qu'une fois, par un seul thread, quand son
+dernier volume arrive. En option, SROFF_EARLY_EXTRACT=1 (EARLY_EXTRACT)
+démarre l'extraction dès le premier volume : UnRAR attend chaque volume
+suivant à sa demande, un découpage brut est réuni au fil de l'eau (les
+RAR extraits par 7-Zip attendent toujours le dernier volume). Pendant
+l'extraction, un volume est supprimé dès qu'il a été lu (UnRAR passe au
+suivant, ou la partie a été recopiée dans le fichier reconstitué).
+"""
+
+import os
+import re
+import logging
+import threading
+from typing import Optional, Dict, List, Tuple, Callable
+
+EARLY_EXTRACT = os.getenv("SROFF_EARLY_EXTRACT", "0") == "1"
+JOIN_CHUNK = 8 * 1024 * 1024
+
+_PART_RAR = re.compile(r"^(?P<base>.+)\.part(?P<index>\d+)\.rar$", re.IGNORECASE)
+_OLD_RAR = re.compile(r"^(?P<base>.+)\.(?:rar|r(?P<index>\d{2,3}))$", re.IGNORECASE)
+_SPLIT = re.compile(r"^(?P<base>.+)\.(?P<index>\d{3})$")
+
+
+def volume_of(filename: str) -> Optional[Tuple[str, str, int]]:
+    """(nommage, nom de base, position à partir de 0) si `filename` peut être un volume"""
+    match = _PART_RAR.match(filename)
+    if match:
+        return "part", match.group("base"), int(match.group("index")) - 1
+    match = _OLD_RAR.match(filename)
+    if match:
+        index = match.group("index")
+        return "old", match.group("base"), int(index) + 1 if index is not None else 0
+    match = _SPLIT.match(filename)
+    if match:
+        return "split", match.group("base"), int(match.group("index")) - 1
+    return None
+
+
+class VolumeSet:
+    """Volumes d'une archive, dans l'ordre ; suit leur arrivée et leur consommation"""
+
+    def __init__(self, naming: str, base: str, paths: List[str]):
+        self.naming = naming
+        self.base = base
+        self.paths = paths
+        self.folder = os.path.dirname(paths[0])
+        self.consumed = 0  # Volumes lus et supprimés (les premiers de la liste)
+        self._landed = set()
+        self._failed = False
+        self._started = False
+        self._cond = threading.Condition()
+
+    @property
+    def first(self) -> str:
+        return self.paths[0]
+
+    @property
+    def split(self) -> bool:
+        """Découpage brut : les parties sont recopiées bout à bout avant extraction"""
+        return self.naming == "split"
+
+    def land(self, path: str):
+        with self._cond:
+            self._landed.add(path)
+            self._cond.notify_all()
+
+    def fail(self):
+        """Un volume n'a pas pu être téléchargé : l'extraction en attente abandonne"""
+        with self._cond:
+            self._failed = True
+            self._cond.notify_all()
+
+    def complete(self) -> bool:
+        with self._cond:
+            return len(self._landed) == len(self.paths)
+
+    def should_start(self, early: bool) -> bool:
+        """Vrai une seule fois : au dernier volume arrivé, ou au premier si `early`"""
+        with self._cond:
+            if self._started or self._failed:
+                return False
+            if len(self._landed) == len(self.paths) or (early and self.first in self._landed):
+                self._started = True
+                return True
+            return False
+
+    def wait_for(self, path: str, stopped: Callable[[], bool]) -> bool:
+        """Attend l'arrivée du volume `path` ; False si un volume a échoué ou si l'arrêt est demandé"""
+        path = self._resolve(path)
+        if path is None:
+            return False
+        with self._cond:
+            while path not in self._landed:
+                if self._failed or stopped():
+                    return False
+                self._cond.wait(0.5)
+            return True
+
+    def _resolve(self, name: str) -> Optional[str]:
+        """Chemin du volume nommé `name` (UnRAR affiche le chemin qu'il a reconstruit)"""
+        base = os.path.basename(name.strip()).lower()
+        for path in self.paths:
+            if os.path.basename(path).lower() == base:
+                return path
+        return None
+
+    def opened(self, name: str):
+        """UnRAR lit le volume `name` : les précédents ne lui serviront plus"""
+        path = self._resolve(name)
+        if path is not None:
+            self.release(self.paths.index(path))
+
+    def release(self, count: Optional[int] = None):
+        """Supprime les `count` premiers volumes (tous par défaut)"""
+        count = len(self.paths) if count is None else count
+        for path in self.paths[self.consumed:count]:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                logging.warning(f"Volume non supprimé: {path}: {e}")
+        self.consumed = max(self.consumed, count)
+
+    def join(self, stopped: Callable[[], bool]) -> Optional[str]:
+        """
+        Découpage brut : recopie les parties dans l'ordre, au fil de leur arrivée,
+        dans le fichier reconstitué ; chaque partie est supprimée une fois recopiée
+        """
+        target = os.path.join(self.folder, self.base)
+        with open(target, "wb") as output:
+            for index, path in enumerate(self.paths):
+                if not self.wait_for(path, stopped):
+                    output.close()
+                    os.remove(target)
+                    return None
+                with open(path, "rb") as part:
+                    while True:
+                        chunk = part.read(JOIN_CHUNK)
+                        if not chunk:
+                            break
+                        output.write(chunk)
+                self.release(index + 1)
+        logging.info(f"Volumes réunis: {target} ({len(self.paths)} parties)")
+        return target
+
+
+def find_sets(files_info: List[Dict]) -> Dict[str, VolumeSet]:
+    """
+    Jeux de volumes complets (premier volume présent, positions sans trou) parmi
+    les fichiers du dossier. Réordonne `files_info` pour que les volumes d'un jeu
+    partent dans l'ordre. Renvoie chemin du volume -> jeu.
+    """
+    groups: Dict[Tuple[str, str, str], Dict[int, Dict]] = {}
+    for file_info in files_info:
+        volume = volume_of(file_info["filename"])
+        if volume:
+            naming, base, index = volume
+            groups.setdefault((file_info["path"], naming, base.lower()), {})[index] = file_info
+
+    sets: Dict[str, VolumeSet] = {}
+    for (folder, naming, _), volumes in groups.items():
+        if len(volumes) < 2 or sorted(volumes) != list(range(len(volumes))):
+            continue
+        ordered = [volumes[index] for index in range(len(volumes))]
+        base = volume_of(ordered[0]["filename"])[1]
+        volume_set = VolumeSet(naming, base, [os.path.join(folder, info["filename"]) for info in ordered])
+        for path in volume_set.paths:
+            sets[path] = volume_set
+        # Les emplacements du jeu dans la liste reçoivent ses volumes dans l'ordre
+        slots = [position for position, info in enumerate(files_info) if info in ordered]
+        for position, info in zip(slots, ordered):
+            files_info[position] = info
+        logging.info(f"Archive en {len(ordered)} volumes: {ordered[0]['filename']}")
+    return sets
@@ -0,0 +1,143 @@
+"""
+Écriture différée : la réception réseau ne touche plus au disque.
+
+Les connexions lisent dans des tampons du pool (buffers.BUFFERS) et les
+déposent dans une file bornée ; un thread écrivain unique les écrit à
+leur offset dans le `.part` puis rend les tampons au pool. Une écriture
+lente ne bloque donc plus la lecture du socket (ni la fenêtre TCP) tant
+que la file n'est pas pleine.
+
+La mémoire en attente est bornée par WRITE_BUFFER_SIZE (variable
+SROFF_WRITE_BUFFER_MB) : au-delà, les lecteurs attendent (contre-pression)
+et ce temps d'attente est mesuré.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Optional, Callable, Dict, Any
+
+from buffers import BUFFERS
+
+WRITE_BUFFER_SIZE = int(os.getenv("SROFF_WRITE_BUFFER_MB", "64")) * 1024 * 1024
+
+
+class WriteError(Exception):
+    """L'écrivain a échoué (disque plein, erreur d'E/S...) : rien à voir avec la connexion"""
+
+
+class WriteBehind:
+    """File bornée de tampons à écrire, vidée par un thread écrivain"""
+
+    def __init__(self, part, max_bytes: int = WRITE_BUFFER_SIZE,
+                 on_error: Optional[Callable[[BaseException], None]] = None):
+        self.part = part
+        # Au moins deux tampons, sinon lecture et écriture s'alternent
+        self.max_bytes = max(max_bytes, 2 * BUFFERS.buffer_size)
+        self.on_error = on_error
+        self._queue = deque()
+        self._queued_bytes = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="writer", daemon=True)
+
+        # Métriques
+        self.max_depth = 0
+        self.stalls = 0
+        self.stall_time = 0.0
+        self.write_time = 0.0
+        self.written = 0
+
+    def start(self):
+        self._thread.start()
+
+    # ---------- côté réseau ----------
+
+    def submit(self, offset: int, buffer, count: int, pooled: bool = True):
+        """
+        Confie `buffer[:count]` à l'écrivain (le tampon ne doit plus être
+        touché ; il retourne au pool après écriture s'il en vient).
+        Bloque tant que la file dépasse `max_bytes`.
+        """
+        # La mémoire retenue est la capacité du tampon, pas les octets lus
+        size = len(buffer)
+        with self._cond:
+            if self._queued_bytes + size > self.max_bytes and self._error is None:
+                self.stalls += 1
+                start = time.perf_counter()
+                while self._queued_bytes + size > self.max_bytes and self._error is None:
+                    self._cond.wait()
+                self.stall_time += time.perf_counter() - start
+            if self._error is not None:
+                if pooled:
+                    BUFFERS.release(buffer)
+                raise WriteError(f"Écriture du fichier partiel impossible: {self._error}") from self._error
+            self._queue.append((offset, buffer, count, pooled))
+            self._queued_bytes += size
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._cond.notify_all()
+
+    # ---------- côté disque ----------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                offset, buffer, count, pooled = self._queue[0]
+            try:
+                start = time.perf_counter()
+                self.part.write_at(offset, memoryview(buffer)[:count])
+                self.write_time += time.perf_counter() - start
+                self.written += count
+            except BaseException as e:
+                self._abort(e)
+                return
+            with self._cond:
+                # Retiré seulement après écriture : la mémoire reste comptée jusque-là
+                self._queue.popleft()
+                self._queued_bytes -= len(buffer)
+                self._cond.notify_all()
+            if pooled:
+                BUFFERS.release(buffer)
+
+    def _abort(self, error: BaseException):
+        logging.error(f"Écriture du fichier partiel impossible: {error}")
+        with self._cond:
+            self._error = error
+            while self._queue:
+                _, buffer, _, pooled = self._queue.popleft()
+                if pooled:
+                    BUFFERS.release(buffer)
+            self._queued_bytes = 0
+            self._cond.notify_all()
+        if self.on_error:
+            self.on_error(error)
+
+    def close(self):
+        """Vide la file puis arrête l'écrivain"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    # ---------- métriques ----------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            depth = len(self._queue)
+            queued = self._queued_bytes
+        return {
+            "queue_depth": depth,
+            "queue_max_depth": self.max_depth,
+            "queued_mb": round(queued / 1048576, 1),
+            "stalls": self.stalls,
+            "stall_seconds": round(self.stall_time, 3),
+            "write_seconds": round(self.write_time, 3),
+        }
@@ -0,0 +1,192 @@
+"""
+Moteur d'extraction ZIP (remplace zipfile.extract).
+
+zipfile.extract recopie chaque membre par petits blocs, nettoie le chemin
+à chaque appel et suit l'ordre d'infolist(), qui n'est pas toujours
+l'ordre du fichier : sur un disque dur, la tête de lecture fait des
+allers-retours. ZipReader :
+- ordonne les membres par offset d'en-tête local (lecture en avant) ;
+- lit par positions (os.preadv, sans déplacer de position partagée) sur
+  un seul descripteur, commun à tous les workers ;
+- recopie au travers d'un tampon réutilisable de BUFFER_SIZE par worker
+  (stocké : écrit directement depuis le tampon ; deflate : zlib) ;
+- donne sa taille finale au fichier avant de l'écrire (posix_fallocate,
+  ou ftruncate) : un seul agrandissement au lieu d'un par bloc ;
+- vérifie le CRC de chaque membre.
+Les chemins sont nettoyés une fois, au plan (zip_stream.target_path).
+Chiffrement et méthodes autres que stocké / deflate : zipfile (copie
+par ZipFile.open).
+"""
+
+import os
+import zlib
+import errno
+import struct
+import zipfile
+import threading
+from typing import Optional, List, Callable
+
+from zip_stream import LOCAL_HEADER, target_path
+
+BUFFER_SIZE = 4 * 1024 * 1024
+OUTPUT_LIMIT = 4 * BUFFER_SIZE   # Octets décompressés au plus par appel à zlib
+O_BINARY = getattr(os, "O_BINARY", 0)
+_LOCAL_LENGTHS = struct.Struct("<HH")  # longueurs du nom et du champ extra (offset 26)
+
+
+def presize(fd: int, size: int):
+    """Taille finale du fichier avant écriture (blocs réservés si possible)"""
+    if size <= 0:
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise
+    os.ftruncate(fd, size)
+
+
+def write_all(fd: int, data):
+    """os.write jusqu'au bout (écritures partielles comprises)"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+class ZipReader:
+    """Archive ouverte une fois ; lectures positionnelles partagées entre threads"""
+
+    def __init__(self, archive: str):
+        self.archive = archive
+        self.fd = os.open(archive, os.O_RDONLY | O_BINARY)
+        # Windows n'a pas os.preadv : seek + readinto sous verrou
+        self._seek_lock = None if hasattr(os, "preadv") else threading.Lock()
+        self._file = None if self._seek_lock is None else open(self.fd, "rb", buffering=0, closefd=False)
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._zip_lock = threading.Lock()
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read_into(self, view: memoryview, offset: int) -> int:
+        """Remplit `view` depuis `offset` ; moins d'octets seulement en fin de fichier"""
+        filled = 0
+        while filled < len(view):
+            if self._seek_lock is None:
+                count = os.preadv(self.fd, [view[filled:]], offset + filled)
+            else:
+                with self._seek_lock:
+                    self._file.seek(offset + filled)
+                    count = self._file.readinto(view[filled:])
+            if not count:
+                break
+            filled += count
+        return filled
+
+    def data_offset(self, member: zipfile.ZipInfo) -> int:
+        """Début des données : l'en-tête local peut avoir un champ extra différent du répertoire central"""
+        header = bytearray(zipfile.sizeFileHeader)
+        if self.read_into(memoryview(header), member.header_offset) < len(header) or header[:4] != LOCAL_HEADER:
+            raise zipfile.BadZipFile(f"En-tête local invalide: {member.filename}")
+        name_length, extra_length = _LOCAL_LENGTHS.unpack_from(header, 26)
+        return member.header_offset + zipfile.sizeFileHeader + name_length + extra_length
+
+    def _fallback(self, member: zipfile.ZipInfo, fd: int, progress: Callable[[int], None]):
+        """Membre chiffré ou compressé autrement : décompression par zipfile"""
+        with self._zip_lock:
+            if self._zip is None:
+                self._zip = zipfile.ZipFile(self.archive, "r")
+            source = self._zip.open(member)
+        with source:
+            while True:
+                chunk = source.read(64 * 1024)
+                if not chunk:
+                    break
+                write_all(fd, chunk)
+                progress(len(chunk))
+
+    def extract(self, member: zipfile.ZipInfo, path: str, buffer: bytearray,
+                progress: Callable[[int], None]):
+        """
+        Extrait `member` vers `path` (dossier déjà créé) au travers de `buffer`.
+        `progress(octets écrits)` est appelé après chaque bloc et peut lever une
+        exception pour interrompre ; le fichier incomplet est alors supprimé.
+        """
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_BINARY, 0o666)
+        try:
+            presize(fd, member.file_size)
+            if member.flag_bits & 0x1 or member.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                self._fallback(member, fd, progress)
+                return
+            view = memoryview(buffer)
+            position = self.data_offset(member)
+            remaining = member.compress_size
+            inflater = zlib.decompressobj(-15) if member.compress_type == zipfile.ZIP_DEFLATED else None
+            crc, written = 0, 0
+            while remaining:
+                count = self.read_into(view[:min(len(view), remaining)], position)
+                if not count:
+                    raise zipfile.BadZipFile(f"Archive tronquée: {member.filename}")
+                position += count
+                remaining -= count
+                chunk = view[:count]
+                while chunk:
+                    if inflater is None:
+                        data, chunk = chunk, None
+                    else:
+                        # Sortie bornée : un bloc de zéros se décompresse d'un facteur 1000
+                        data = inflater.decompress(chunk, OUTPUT_LIMIT)
+                        chunk = inflater.unconsumed_tail
+                    if data:
+                        write_all(fd, data)
+                        crc = zlib.crc32(data, crc)
+                        written += len(data)
+                        progress(len(data))
+            if crc != member.CRC or written != member.file_size:
+                raise zipfile.BadZipFile(f"CRC incorrect: {member.filename}")
+        except BaseException:
+            os.close(fd)
+            fd = -1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            raise
+        finally:
+            if fd >= 0:
+                os.close(fd)
+
+
+def plan(members: List[zipfile.ZipInfo], destination: str) -> List[tuple]:
+    """(membre, chemin de destination) dans l'ordre du fichier"""
+    ordered = sorted(members, key=lambda m: m.header_offset)
+    return [(member, target_path(destination, member.filename)) for member in ordered]
+
+
+def extract_all(archive: str, members: List[zipfile.ZipInfo], destination: str,
+                progress: Optional[Callable[[int], None]] = None):
+    """Extraction séquentielle de `members` (dossiers créés au passage)"""
+    buffer = bytearray(BUFFER_SIZE)
+    with ZipReader(archive) as reader:
+        for member, path in plan(members, destination):
+            if member.is_dir():
+                os.makedirs(path, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            reader.extract(member, path, buffer, progress or (lambda count: None))
@@ -0,0 +1,172 @@
+"""
+Extraction d'un ZIP sur plusieurs cœurs.
+
+zipfile.extract décompresse les membres l'un après l'autre, sur un seul
+thread. ParallelZipExtractor répartit les membres entre `workers`
+threads : zlib (décompression) et zlib.crc32 relâchent le GIL, les
+threads décompressent donc réellement en parallèle, sans le coût de
+processus séparés.
+- répartition par taille compressée (le plus gros membre restant au
+  worker le moins chargé) : les workers finissent ensemble ;
+- les workers lisent l'archive par positions sur un descripteur commun
+  (zip_engine.ZipReader), chacun dans l'ordre du fichier, avec son
+  propre tampon ;
+- les dossiers sont créés une seule fois, avant le démarrage ;
+- pause : les workers attendent entre deux blocs ; arrêt : ils
+  s'interrompent et les fichiers incomplets sont supprimés ;
+- progression en octets décompressés, tous workers confondus.
+
+SROFF_ZIP_WORKERS fixe le nombre de workers (défaut : un par cœur, au
+plus MAX_WORKERS). Sur disque dur, 1 garde une lecture en avant : à
+plusieurs, les lectures des workers s'entrecroisent et la tête saute
+(voir benchmarks/bench_zip_engine.py).
+"""
+
+import os
+import time
+import heapq
+import logging
+import zipfile
+import threading
+from typing import Optional, List
+
+from zip_stream import target_path
+from zip_engine import ZipReader, BUFFER_SIZE, plan
+
+MAX_WORKERS = 16
+
+
+def default_workers() -> int:
+    value = os.getenv("SROFF_ZIP_WORKERS")
+    if value:
+        return max(1, int(value))
+    return max(1, min(os.cpu_count() or 1, MAX_WORKERS))
+
+
+class ExtractionStopped(Exception):
+    """Arrêt demandé, ou autre worker en échec"""
+
+
+def partition(members: List[zipfile.ZipInfo], workers: int) -> List[List[zipfile.ZipInfo]]:
+    """Lots de membres de tailles compressées proches (plus gros d'abord, au lot le plus léger)"""
+    lots: List[List[zipfile.ZipInfo]] = [[] for _ in range(max(1, workers))]
+    loads = [(0, index) for index in range(len(lots))]
+    for member in sorted(members, key=lambda m: m.compress_size, reverse=True):
+        load, index = heapq.heappop(loads)
+        lots[index].append(member)
+        heapq.heappush(loads, (load + member.compress_size, index))
+    return [lot for lot in lots if lot]
+
+
+class ParallelZipExtractor:
+    """Extraction d'une archive entière par un pool de threads (API proche d'ArchiveProcess)"""
+
+    def __init__(self, archive: str, destination: str, controller=None, workers: Optional[int] = None):
+        self.archive = archive
+        self.destination = destination
+        self.controller = controller
+        self.workers = workers or default_workers()
+        with zipfile.ZipFile(archive, "r") as zip_ref:
+            infos = zip_ref.infolist()
+        self.folders = [m for m in infos if m.is_dir()]
+        self.members = [m for m in infos if not m.is_dir()]
+        self.total_files = len(self.members)
+        self.total_bytes = sum(m.file_size for m in self.members)
+        self.files_done = 0
+        self.bytes_done = 0
+        self.error: Optional[BaseException] = None
+        self._reader: Optional[ZipReader] = None
+        self._threads: List[threading.Thread] = []
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def _is_stopped(self) -> bool:
+        return self._cancel.is_set() or bool(self.controller and self.controller.is_stopped())
+
+    def _wait_if_paused(self):
+        while self.controller and self.controller.is_paused() and not self._is_stopped():
+            self.controller.wait_resumed(0.5)
+
+    def _prepare_folders(self):
+        """Crée tous les dossiers de l'arborescence en une passe"""
+        folders = {target_path(self.destination, m.filename) for m in self.folders}
+        folders.update(os.path.dirname(target_path(self.destination, m.filename)) for m in self.members)
+        for folder in sorted(folders):
+            os.makedirs(folder, exist_ok=True)
+
+    def start(self):
+        self._prepare_folders()
+        self._reader = ZipReader(self.archive)
+        lots = partition(self.members, self.workers)
+        self._threads = [
+            threading.Thread(target=self._worker, args=(plan(lot, self.destination),), name=f"unzip-{index}", daemon=True)
+            for index, lot in enumerate(lots)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logging.info(f"Extraction ZIP: {self.total_files} fichiers sur {len(self._threads)} thread(s)")
+
+    # ---------- workers ----------
+
+    def _worker(self, lot: List[tuple]):
+        buffer = bytearray(BUFFER_SIZE)
+        try:
+            for member, path in lot:
+                if self._is_stopped():
+                    return
+                # Fichier incomplet supprimé par ZipReader.extract (arrêt ou erreur)
+                self._reader.extract(member, path, buffer, self._progress)
+                with self._lock:
+                    self.files_done += 1
+        except ExtractionStopped:
+            pass
+        except BaseException as e:
+            with self._lock:
+                if self.error is None:
+                    self.error = e
+            self._cancel.set()
+
+    def _progress(self, count: int):
+        """Après chaque bloc écrit : pause, arrêt, avancement"""
+        self._wait_if_paused()
+        if self._is_stopped():
+            raise ExtractionStopped()
+        with self._lock:
+            self.bytes_done += count
+
+    # ---------- état ----------
+
+    @property
+    def fraction(self) -> float:
+        """Avancement de 0 à 1, en octets décompressés"""
+        with self._lock:
+            if not self.total_bytes:
+                return self.files_done / self.total_files if self.total_files else 1.0
+            return self.bytes_done / self.total_bytes
+
+    def wait(self, timeout: float) -> Optional[bool]:
+        """
+        True une fois tout extrait, False si arrêté ; None si les workers tournent
+        encore après `timeout` s. Lève l'erreur d'un worker.
+        """
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                return None
+        self._close()
+        if self.error is not None:
+            raise self.error
+        return self.files_done == self.total_files
+
+    def terminate(self):
+        """Arrête les workers (fichiers en cours supprimés)"""
+        self._cancel.set()
+        for thread in self._threads:
+            thread.join()
+        self._close()
+
+    def _close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
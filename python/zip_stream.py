@@ -0,0 +1,341 @@
+"""
+Extraction d'un ZIP pendant son téléchargement.
+
+Le moteur de transfert (transfer.py, mode `sequential`) attribue ses
+segments dans l'ordre du fichier : le début du `.part` est complet peu
+après sa réception (SegmentedDownloader.available). StreamingZipExtractor
+suit ce front dans un thread, lit les en-têtes locaux (PK\\x03\\x04) et
+décompresse chaque membre directement dans la destination. Les octets
+sont relus juste après leur écriture, depuis le cache du système : le
+ZIP n'est plus relu en entier après coup.
+
+- stocké (0) et deflate (8) ; taille inconnue à l'en-tête (bit 3,
+  descripteur de données) : la fin du flux deflate est trouvée par zlib,
+  puis le descripteur est lu (signature facultative, tailles ZIP64) ;
+- ZIP64 : tailles lues dans le champ extra 0x0001 ;
+- chiffrement, autre méthode, stocké sans taille, en-tête inattendu : la
+  lecture au fil de l'eau s'arrête là.
+À la fin du téléchargement, le répertoire central fait foi (reconcile) :
+tout membre absent, de taille ou de CRC différents est extrait par
+zip_engine depuis le fichier complet.
+
+SROFF_STREAM_ZIP=0 désactive l'extraction au fil de l'eau.
+"""
+
+import os
+import time
+import zlib
+import struct
+import logging
+import zipfile
+import threading
+from typing import Optional, Dict, Tuple, Callable
+
+STREAM_ZIP = os.getenv("SROFF_STREAM_ZIP", "1") != "0"
+READ_SIZE = 1024 * 1024
+OUTPUT_LIMIT = 16 * READ_SIZE   # Octets décompressés au plus par appel à zlib
+POLL_INTERVAL = 0.05
+
+LOCAL_HEADER = b"PK\x03\x04"
+DESCRIPTOR = b"PK\x07\x08"
+_LOCAL = struct.Struct("<HHHHHIIIHH")
+ZIP64_EXTRA = 0x0001
+FLAG_ENCRYPTED = 0x0001
+FLAG_DESCRIPTOR = 0x0008
+FLAG_UTF8 = 0x0800
+
+
+class StreamStopped(Exception):
+    """Lecture interrompue : arrêt demandé ou téléchargement inachevé"""
+
+
+class GrowingReader:
+    """Lecture séquentielle d'un fichier en cours d'écriture, jusqu'à `available()` octets"""
+
+    def __init__(self, path: str, available: Callable[[], int], finished: threading.Event,
+                 stopped: Callable[[], bool]):
+        self.path = path
+        self.available = available
+        self.finished = finished
+        self.stopped = stopped
+        self.position = 0
+        self._file = None
+        self._pending = b""
+
+    def _wait(self, needed: int) -> int:
+        """Attend que `needed` octets soient écrits ; moins si le téléchargement est fini"""
+        while True:
+            if self.stopped():
+                raise StreamStopped()
+            # Relu avant `available` : le dernier bloc est écrit quand `finished` est levé
+            finished = self.finished.is_set()
+            available = self.available()
+            if available >= needed or finished:
+                return available
+            time.sleep(POLL_INTERVAL)
+
+    def read(self, size: int) -> bytes:
+        """Jusqu'à `size` octets ; vide seulement à la fin des données"""
+        if self._pending:
+            data, self._pending = self._pending[:size], self._pending[size:]
+            self.position += len(data)
+            return data
+        available = self._wait(self.position + 1)
+        count = min(size, available - self.position)
+        if count <= 0:
+            return b""
+        if self._file is None:
+            # Sans tampon : une lecture anticipée garderait les zéros du `.part` préalloué
+            self._file = open(self.path, "rb", buffering=0)
+        self._file.seek(self.position)
+        data = self._file.read(count)
+        self.position += len(data)
+        return data
+
+    def read_exact(self, size: int) -> bytes:
+        parts, remaining = [], size
+        while remaining:
+            data = self.read(remaining)
+            if not data:
+                raise StreamStopped()
+            parts.append(data)
+            remaining -= len(data)
+        return b"".join(parts)
+
+    def unread(self, data: bytes):
+        """Rend des octets lus en trop (fin d'un flux deflate)"""
+        self._pending = data + self._pending
+        self.position -= len(data)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def target_path(destination: str, name: str) -> str:
+    """Chemin de `name` sous `destination`, nettoyé comme zipfile (lecteur, `..`, caractères Windows)"""
+    arcname = name.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    invalid = ("", os.path.curdir, os.path.pardir)
+    arcname = os.path.sep.join(part for part in arcname.split(os.path.sep) if part not in invalid)
+    if os.path.sep == "\\":
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.path.sep)
+    return os.path.join(destination, arcname)
+
+
+class StreamingZipExtractor:
+    """Thread d'extraction d'un ZIP qui suit le téléchargement de `path`"""
+
+    def __init__(self, path: str, destination: str, available: Callable[[], int], controller=None):
+        self.path = path
+        self.destination = destination
+        self.controller = controller
+        self.extracted: Dict[str, Tuple[int, int]] = {}  # nom -> (CRC, taille) vérifiés
+        self.bytes_out = 0
+        self.stopped_reason: Optional[str] = None
+        self._finished = threading.Event()
+        self._cancelled = threading.Event()
+        self._reader = GrowingReader(path, available, self._finished, self._is_stopped)
+        self._thread: Optional[threading.Thread] = None
+
+    def _is_stopped(self) -> bool:
+        return self._cancelled.is_set() or bool(self.controller and self.controller.is_stopped())
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="zip-stream", daemon=True)
+        self._thread.start()
+
+    # ---------- lecture au fil de l'eau ----------
+
+    def _run(self):
+        try:
+            while self._member():
+                pass
+        except StreamStopped:
+            self.stopped_reason = self.stopped_reason or "interrompu"
+        except Exception as e:
+            self.stopped_reason = f"erreur: {e}"
+            logging.warning(f"Extraction au fil de l'eau arrêtée: {e}")
+        finally:
+            self._reader.close()
+
+    def _stop(self, reason: str) -> bool:
+        self.stopped_reason = reason
+        return False
+
+    def _member(self) -> bool:
+        """Extrait le membre suivant ; False à la fin des en-têtes locaux ou sur un cas non géré"""
+        reader = self._reader
+        signature = reader.read(4)
+        if signature != LOCAL_HEADER:
+            # Répertoire central (ou fin des données) : tous les membres ont défilé
+            return self._stop("fin" if signature[:2] == b"PK" or not signature else "en-tête inattendu")
+        (_, flags, method, _, _, crc, compressed, size, name_length, extra_length) = _LOCAL.unpack(
+            reader.read_exact(_LOCAL.size)
+        )
+        raw_name = reader.read_exact(name_length)
+        extra = reader.read_exact(extra_length)
+        name = raw_name.decode("utf-8" if flags & FLAG_UTF8 else "cp437")
+        zip64 = False
+        if compressed == 0xFFFFFFFF or size == 0xFFFFFFFF:
+            zip64 = True
+            size, compressed = self._zip64_sizes(extra, size, compressed)
+
+        if flags & FLAG_ENCRYPTED:
+            return self._stop(f"{name}: chiffré")
+        if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            return self._stop(f"{name}: méthode {method}")
+        descriptor = bool(flags & FLAG_DESCRIPTOR)
+        if descriptor and method == zipfile.ZIP_STORED:
+            return self._stop(f"{name}: stocké sans taille")
+
+        path = target_path(self.destination, name)
+        if name.endswith("/"):
+            os.makedirs(path, exist_ok=True)
+            if compressed and not descriptor:
+                reader.read_exact(compressed)
+            return True
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            with open(path, "wb") as output:
+                if method == zipfile.ZIP_STORED:
+                    written, actual_crc = self._copy(output, compressed)
+                else:
+                    written, actual_crc = self._inflate(output, None if descriptor else compressed)
+            if descriptor:
+                crc, _, size = self._descriptor(zip64)
+        except BaseException:
+            # Membre incomplet : pas de fichier tronqué dans la destination
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            raise
+
+        if actual_crc != crc or written != size:
+            # Laissé au répertoire central (reconcile)
+            logging.warning(f"Extraction au fil de l'eau: {name} incohérent, repris à la fin")
+            os.remove(path)
+            return True
+        self.extracted[name] = (crc, size)
+        self.bytes_out += written
+        return True
+
+    @staticmethod
+    def _zip64_sizes(extra: bytes, size: int, compressed: int) -> Tuple[int, int]:
+        position = 0
+        while position + 4 <= len(extra):
+            header_id, length = struct.unpack_from("<HH", extra, position)
+            if header_id == ZIP64_EXTRA:
+                values = extra[position + 4:position + 4 + length]
+                offset = 0
+                if size == 0xFFFFFFFF:
+                    size = struct.unpack_from("<Q", values, offset)[0]
+                    offset += 8
+                if compressed == 0xFFFFFFFF:
+                    compressed = struct.unpack_from("<Q", values, offset)[0]
+                break
+            position += 4 + length
+        return size, compressed
+
+    def _copy(self, output, count: int) -> Tuple[int, int]:
+        crc, written = 0, 0
+        while written < count:
+            data = self._reader.read(min(READ_SIZE, count - written))
+            if not data:
+                raise StreamStopped()
+            output.write(data)
+            crc = zlib.crc32(data, crc)
+            written += len(data)
+        return written, crc
+
+    def _inflate(self, output, count: Optional[int]) -> Tuple[int, int]:
+        """Décompresse `count` octets, ou jusqu'à la fin du flux deflate si `count` est None"""
+        inflater = zlib.decompressobj(-15)
+        crc, written, consumed = 0, 0, 0
+        while not inflater.eof and (count is None or consumed < count):
+            size = READ_SIZE if count is None else min(READ_SIZE, count - consumed)
+            data = self._reader.read(size)
+            if not data:
+                raise StreamStopped()
+            consumed += len(data)
+            while data and not inflater.eof:
+                # Sortie bornée : un bloc de zéros se décompresse d'un facteur 1000
+                chunk = inflater.decompress(data, OUTPUT_LIMIT)
+                data = inflater.unconsumed_tail
+                if chunk:
+                    output.write(chunk)
+                    crc = zlib.crc32(chunk, crc)
+                    written += len(chunk)
+        chunk = inflater.flush()
+        if chunk:
+            output.write(chunk)
+            crc = zlib.crc32(chunk, crc)
+            written += len(chunk)
+        if inflater.unused_data:
+            self._reader.unread(inflater.unused_data)
+        return written, crc
+
+    def _descriptor(self, zip64: bool) -> Tuple[int, int, int]:
+        """(CRC, taille compressée, taille) du descripteur qui suit les données"""
+        head = self._reader.read_exact(4)
+        if head == DESCRIPTOR:
+            head = self._reader.read_exact(4)
+        crc = struct.unpack("<I", head)[0]
+        if zip64:
+            compressed, size = struct.unpack("<QQ", self._reader.read_exact(16))
+        else:
+            compressed, size = struct.unpack("<II", self._reader.read_exact(8))
+        return crc, compressed, size
+
+    # ---------- fin du téléchargement ----------
+
+    def finish(self, completed: bool) -> bool:
+        """
+        Téléchargement terminé (`completed`) ou abandonné : attend la fin de la
+        lecture, puis complète l'extraction d'après le répertoire central.
+        True si tous les membres sont extraits et vérifiés.
+        """
+        if not completed:
+            self._cancelled.set()
+        self._finished.set()
+        if self._thread is not None:
+            self._thread.join()
+        if not completed:
+            return False
+        logging.info(
+            f"Extraction au fil de l'eau: {len(self.extracted)} membre(s), "
+            f"{self.bytes_out / 1048576:.1f} Mo ({self.stopped_reason})"
+        )
+        try:
+            return self.reconcile()
+        except (zipfile.BadZipFile, OSError) as e:
+            logging.error(f"Répertoire central illisible: {e}")
+            return False
+
+    def reconcile(self) -> bool:
+        """Extrait depuis le fichier complet les membres manquants ou incohérents"""
+        from zip_engine import extract_all
+        with zipfile.ZipFile(self.path, "r") as zip_ref:
+            infos = zip_ref.infolist()
+        missing = [
+            member for member in infos
+            if member.is_dir() or self.extracted.get(member.filename) != (member.CRC, member.file_size)
+        ]
+
+        def progress(count: int):
+            if self._is_stopped():
+                raise StreamStopped()
+
+        try:
+            extract_all(self.path, missing, self.destination, progress)
+        except StreamStopped:
+            return False
+        count = sum(1 for member in missing if not member.is_dir())
+        if count:
+            logging.info(f"Répertoire central: {count} membre(s) extrait(s) après le téléchargement")
+        return True
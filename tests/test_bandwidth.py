@@ -0,0 +1,162 @@
+"""
+Répartition de la bande passante (bandwidth.py) : niveaux de priorité,
+partage pondéré, débit plancher, changement de plafond, seau à jetons.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "python"))
+
+import bandwidth
+from bandwidth import water_fill, allocate, TokenBucket, BandwidthScheduler, MIN_RATE
+
+MB = 1024 * 1024
+INF = float("inf")
+
+
+def entry(download_id: str, weight: float = 1.0, priority: int = 0, demand: float = INF):
+    return {"id": download_id, "weight": weight, "priority": priority, "demand": demand}
+
+
+# ---------- water_fill ----------
+
+def test_water_fill_shares_by_weight():
+    rates = water_fill(9 * MB, [entry("a", 1), entry("b", 2)])
+    assert rates == pytest.approx({"a": 3 * MB, "b": 6 * MB})
+
+
+def test_water_fill_redistributes_unused_share():
+    rates = water_fill(9 * MB, [entry("a", demand=1 * MB), entry("b"), entry("c")])
+    assert rates == pytest.approx({"a": 1 * MB, "b": 4 * MB, "c": 4 * MB})
+
+
+def test_water_fill_all_satisfied_leaves_surplus():
+    rates = water_fill(9 * MB, [entry("a", demand=1 * MB), entry("b", demand=2 * MB)])
+    assert rates == {"a": 1 * MB, "b": 2 * MB}
+
+
+def test_water_fill_ignores_zero_weight():
+    assert water_fill(4 * MB, [entry("a", 0), entry("b")]) == {"b": 4 * MB}
+
+
+# ---------- allocate ----------
+
+def test_allocate_strict_priority_with_floor():
+    rates = allocate(8 * MB, [entry("low"), entry("high", priority=1)])
+    assert rates == {"high": 8 * MB, "low": MIN_RATE}
+
+
+def test_allocate_lower_level_gets_what_higher_level_leaves():
+    rates = allocate(8 * MB, [
+        entry("high", priority=2, demand=2 * MB),
+        entry("mid1", priority=1),
+        entry("mid2", priority=1, weight=2),
+        entry("low", priority=0),
+    ])
+    assert rates == pytest.approx({"high": 2 * MB, "mid1": 2 * MB, "mid2": 4 * MB, "low": MIN_RATE})
+
+
+def test_allocate_floor_when_cap_is_tiny():
+    rates = allocate(MIN_RATE, [entry("a"), entry("b"), entry("c")])
+    assert rates == {"a": MIN_RATE, "b": MIN_RATE, "c": MIN_RATE}
+
+
+# ---------- seau à jetons ----------
+
+class Clock:
+    """Horloge manuelle remplaçant le module time de bandwidth"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept += seconds
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(bandwidth, "time", clock)
+    return clock
+
+
+def test_bucket_unlimited_never_waits(clock):
+    bucket = TokenBucket()
+    assert bucket.reserve(100 * MB) == 0.0
+    assert bucket.take_consumed() == 100 * MB
+    assert bucket.take_consumed() == 0
+
+
+def test_bucket_wait_matches_rate(clock):
+    bucket = TokenBucket(1 * MB)
+    # Seau vide au départ : 512 Kio à 1 Mio/s = 0,5 s
+    assert bucket.reserve(MB // 2) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.reserve(0) == pytest.approx(0.0)
+
+
+def test_bucket_burst_is_bounded(clock):
+    bucket = TokenBucket(1 * MB)
+    clock.now += 3600
+    # Rafale plafonnée à un quart de seconde de débit : le reste attend
+    assert bucket.reserve(MB // 4) == 0.0
+    assert bucket.reserve(MB // 4) == pytest.approx(0.25)
+
+
+def test_bucket_consume_sleeps(clock):
+    bucket = TokenBucket(2 * MB)
+    bucket.consume(MB)
+    assert clock.slept == pytest.approx(0.5)
+
+
+def test_bucket_rate_change_keeps_earned_tokens(clock):
+    bucket = TokenBucket(1 * MB)
+    clock.now += 0.1
+    bucket.set_rate(4 * MB)
+    # 0,1 s à l'ancien débit déjà acquis, le reste au nouveau
+    assert bucket.reserve(MB // 10 + MB) == pytest.approx(0.25)
+
+
+# ---------- plafond global ----------
+
+def test_scheduler_follows_cap_changes(tmp_path):
+    control_dir = str(tmp_path)
+    scheduler = BandwidthScheduler(control_dir)
+
+    def refresh(*buckets):
+        # Téléchargements qui consomment toute leur part : ils la réclament encore
+        for bucket in buckets:
+            bucket.reserve(1024 * MB)
+        scheduler.refresh()
+
+    try:
+        first = scheduler.register("a", weight=1)
+        second = scheduler.register("b", weight=3)
+        assert first.rate == 0 and second.rate == 0
+
+        BandwidthScheduler.update_limits(control_dir, cap=8 * MB)
+        refresh(first, second)
+        assert (first.rate, second.rate) == pytest.approx((2 * MB, 6 * MB))
+
+        BandwidthScheduler.update_limits(control_dir, download_id="a", priority=1)
+        refresh(first, second)
+        assert (first.rate, second.rate) == (8 * MB, MIN_RATE)
+
+        # Téléchargement prioritaire au ralenti : sa part revient aux autres
+        refresh(second)
+        assert first.rate == MIN_RATE and second.rate == pytest.approx(8 * MB - MIN_RATE)
+
+        BandwidthScheduler.update_limits(control_dir, cap=0)
+        refresh(first, second)
+        assert first.rate == 0 and second.rate == 0
+    finally:
+        scheduler.close()
@@ -0,0 +1,62 @@
+"""
+Ctrl+C pendant un lot (download_manager.py batch) : les travaux en cours
+sont suspendus, pas arrêtés. Le `.part`, son journal de reprise et la
+destination restent en place pour le lancement suivant.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import subprocess
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from local_server import LocalServer
+
+SIZE = 64 * 1024 * 1024
+
+
+def wait_for(predicate, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="SIGINT vers un processus enfant")
+def test_sigint_keeps_partial_download(tmp_path):
+    destination = tmp_path / "Jeu"
+    control_dir = tmp_path / "control"
+    control_dir.mkdir()
+    part = destination / "bench.bin.part"
+    journal = destination / "bench.bin.part.journal"
+
+    with LocalServer(SIZE, rate=1024 * 1024) as url:
+        manifest = tmp_path / "lot.json"
+        # `?pixeldrain.com` : lien direct traité comme PixelDrain
+        manifest.write_text(json.dumps([{"id": "jeu", "url": f"{url}?pixeldrain.com", "destination": str(destination)}]))
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "python", "download_manager.py"), "batch", str(manifest), str(control_dir)],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        try:
+            assert wait_for(journal.exists, 30), "journal de reprise jamais écrit"
+            process.send_signal(signal.SIGINT)
+            output, _ = process.communicate(timeout=30)
+        finally:
+            if process.poll() is None:
+                process.kill()
+
+    assert destination.is_dir()
+    assert part.exists() and 0 < part.stat().st_size
+    assert journal.exists()
+    summary = json.loads(output.strip().splitlines()[-1])
+    assert summary["event"] == "summary" and summary["interrupted"]
+    assert summary["jobs"][0]["outcome"] == "interrupted"
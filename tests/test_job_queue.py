@@ -0,0 +1,75 @@
+"""
+File d'attente du démon : un travail qui revient d'une extraction (GoFile,
+plusieurs archives) reprend une place de téléchargement ou attend en file,
+sans dépasser max_downloads.
+"""
+
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "python"))
+
+from job_queue import JobQueue, DOWNLOADING, PREEMPTED, EXTRACTING
+
+
+class Controller:
+    def __init__(self):
+        self.paused = False
+        self.stopped = False
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def is_stopped(self) -> bool:
+        return self.stopped
+
+
+def submit(queue: JobQueue, download_id: str) -> Controller:
+    controller = Controller()
+    queue.submit(download_id, controller, lambda: None)
+    return controller
+
+
+def downloading(queue: JobQueue) -> int:
+    return sum(1 for job in queue.snapshot()["jobs"] if job["state"] == DOWNLOADING)
+
+
+def test_extraction_hands_slot_over_and_waits_to_get_it_back():
+    queue = JobQueue(max_downloads=1)
+    first = submit(queue, "a")
+    submit(queue, "b")
+    assert queue.state("a") == DOWNLOADING
+
+    with queue.extracting("a", first.is_stopped):
+        assert queue.state("a") == EXTRACTING
+        assert queue.state("b") == DOWNLOADING
+
+    # Place prise par "b" : "a" attend en pause au lieu de télécharger en plus
+    assert queue.state("a") == PREEMPTED and first.paused
+    assert downloading(queue) == 1
+
+    queue.finished("b")
+    assert queue.state("a") == DOWNLOADING and not first.paused
+
+
+def test_extraction_gets_free_slot_back():
+    queue = JobQueue(max_downloads=2)
+    first = submit(queue, "a")
+    with queue.extracting("a", first.is_stopped):
+        pass
+    assert queue.state("a") == DOWNLOADING and not first.paused
+
+
+def test_stopped_job_does_not_queue_again():
+    queue = JobQueue(max_downloads=1)
+    first = submit(queue, "a")
+    submit(queue, "b")
+    with queue.extracting("a", first.is_stopped):
+        first.stopped = True
+    assert queue.state("a") == EXTRACTING and not first.paused
+    queue.finished("a")
+    assert downloading(queue) == 1
@@ -0,0 +1,156 @@
+"""
+Journal de reprise (journal.py) et décision de reprise du moteur segmenté :
+un ETag, une date ou une taille qui change fait repartir de zéro.
+"""
+
+import os
+import sys
+import json
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "python"))
+
+from journal import ResumeJournal, merge_ranges, missing_ranges, JOURNAL_VERSION
+from transfer import RemoteFile, SegmentedDownloader
+from http_pool import get_session
+
+SIZE = 1000
+URL = "http://example.invalid/jeu.bin"
+
+
+def remote(size: int = SIZE, etag: str = '"v1"', last_modified: str = "Mon, 01 Jan 2024 00:00:00 GMT") -> RemoteFile:
+    headers = {"Content-Length": str(size)}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return RemoteFile(URL, 200, headers)
+
+
+@pytest.fixture
+def tmp_file(tmp_path):
+    path = tmp_path / "jeu.bin.part"
+    path.write_bytes(bytes(SIZE))
+    return str(path)
+
+
+def saved_journal(tmp_file: str, ranges, **kwargs) -> ResumeJournal:
+    journal = ResumeJournal(tmp_file)
+    journal.reset(remote(**kwargs), URL)
+    journal.save(ranges)
+    return journal
+
+
+# ---------- plages ----------
+
+def test_merge_ranges_joins_overlapping_and_touching():
+    assert merge_ranges([(50, 60), (0, 10), (10, 20), (15, 30), (40, 40)]) == [(0, 30), (50, 60)]
+    assert merge_ranges([]) == []
+
+
+def test_missing_ranges_is_the_complement():
+    assert missing_ranges([(100, 200), (0, 50), (150, 300)], SIZE) == [(50, 100), (300, SIZE)]
+    assert missing_ranges([], SIZE) == [(0, SIZE)]
+    assert missing_ranges([(0, SIZE)], SIZE) == []
+
+
+# ---------- lecture / écriture ----------
+
+def test_save_load_round_trip(tmp_file):
+    saved_journal(tmp_file, [(200, 300), (0, 100), (100, 150)])
+    journal = ResumeJournal(tmp_file)
+    assert journal.load()
+    assert journal.ranges == [(0, 150), (200, 300)]
+    assert (journal.size, journal.etag, journal.source) == (SIZE, '"v1"', URL)
+    assert journal.completed == 250
+    assert journal.missing() == [(150, 200), (300, SIZE)]
+
+
+def test_save_is_atomic(tmp_file, monkeypatch):
+    saved_journal(tmp_file, [(0, 100)])
+    assert not os.path.exists(tmp_file + ".journal.tmp")
+
+    # Échec au remplacement : l'ancien journal reste lisible et intact
+    def fail(src, dst):
+        raise OSError("disque plein")
+    monkeypatch.setattr(os, "replace", fail)
+    journal = ResumeJournal(tmp_file)
+    assert journal.load()
+    journal.save([(0, SIZE)])
+    monkeypatch.undo()
+
+    reloaded = ResumeJournal(tmp_file)
+    assert reloaded.load() and reloaded.ranges == [(0, 100)]
+
+
+def test_load_rejects_missing_corrupt_or_other_version(tmp_file):
+    journal = ResumeJournal(tmp_file)
+    assert not journal.load()
+    with open(journal.path, "w") as f:
+        f.write("{ tronqué")
+    assert not journal.load()
+    with open(journal.path, "w") as f:
+        json.dump({"version": JOURNAL_VERSION + 1, "size": SIZE, "ranges": [[0, 10]]}, f)
+    assert not journal.load()
+
+
+# ---------- validation ----------
+
+def test_matches_same_remote(tmp_file):
+    assert saved_journal(tmp_file, [(0, 100)]).matches(remote())
+
+
+@pytest.mark.parametrize("changed", [
+    {"etag": '"v2"'},
+    {"last_modified": "Tue, 02 Jan 2024 00:00:00 GMT"},
+    {"size": SIZE + 1},
+    {"size": 0},
+])
+def test_matches_rejects_changed_remote(tmp_file, changed):
+    assert not saved_journal(tmp_file, [(0, 100)]).matches(remote(**changed))
+
+
+def test_matches_rejects_part_of_wrong_size(tmp_file):
+    journal = saved_journal(tmp_file, [(0, 100)])
+    with open(tmp_file, "ab") as f:
+        f.write(b"x")
+    assert not journal.matches(remote())
+
+
+def test_if_range_prefers_strong_etag(tmp_file):
+    assert saved_journal(tmp_file, []).if_range() == '"v1"'
+    weak = saved_journal(tmp_file, [], etag='W/"v1"')
+    assert weak.if_range() == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert saved_journal(tmp_file, [], etag=None, last_modified=None).if_range() is None
+
+
+# ---------- décision de reprise ----------
+
+def plan(tmp_file: str, current: RemoteFile) -> SegmentedDownloader:
+    engine = SegmentedDownloader(get_session(4), URL, tmp_file, connections=1)
+    engine.segments = engine._plan_segments(current)
+    engine.part.close()
+    return engine
+
+
+def test_plan_resumes_missing_ranges(tmp_file):
+    saved_journal(tmp_file, [(0, 400), (600, 700)])
+    engine = plan(tmp_file, remote())
+    assert engine.resumed == 500
+    assert [(s.start, s.end) for s in engine.segments] == [(400, 600), (700, SIZE)]
+
+
+@pytest.mark.parametrize("changed", [{"etag": '"v2"'}, {"size": 2 * SIZE}])
+def test_plan_resets_when_remote_changed(tmp_file, changed):
+    saved_journal(tmp_file, [(0, 400)])
+    current = remote(**changed)
+    engine = plan(tmp_file, current)
+    assert engine.resumed == 0
+    assert sum(s.end - s.start for s in engine.segments) == current.size
+
+    journal = ResumeJournal(tmp_file)
+    assert journal.load()
+    assert journal.ranges == [] and journal.size == current.size
+    assert journal.etag == current.headers["ETag"]
@@ -0,0 +1,101 @@
+"""
+Reprise d'un transfert segmenté quand le fichier distant change : un 200
+en réponse à If-Range ne doit pas être écrit dans le `.part` entamé.
+"""
+
+import os
+import re
+import sys
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "python"))
+
+from journal import ResumeJournal
+from transfer import SegmentedDownloader, probe
+from aio_transfer import AsyncSegmentedDownloader
+from http_pool import get_session
+
+SIZE = 4 * 1024 * 1024
+OLD = bytes(range(256)) * (SIZE // 256)
+NEW = bytes(255 - b for b in OLD)
+RANGE_RE = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+class ChangingServer:
+    """Fichier remplacé (ETag "new") après la première requête ; If-Range comparé à l'ETag courant"""
+
+    def __init__(self):
+        self.requests = 0
+        self.full_responses = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                etag, content = ('"old"', OLD) if server.requests == 1 else ('"new"', NEW)
+                match = RANGE_RE.match(self.headers.get("Range", ""))
+                if_range = self.headers.get("If-Range")
+                if match and (if_range is None or if_range == etag):
+                    start = int(match.group(1))
+                    end = int(match.group(2)) + 1 if match.group(2) else SIZE
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end - 1}/{SIZE}")
+                else:
+                    start, end = 0, SIZE
+                    server.full_responses += 1
+                    self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Length", str(end - start))
+                self.end_headers()
+                self.wfile.write(content[start:end])
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/jeu.bin"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def partial(tmp_path):
+    """`.part` à moitié rempli de l'ancien contenu, avec son journal (ETag "old")"""
+    part = tmp_path / "jeu.bin.part"
+    half = SIZE // 2
+    part.write_bytes(OLD[:half] + bytes(SIZE - half))
+    return str(part), half
+
+
+@pytest.mark.parametrize("engine_class", [SegmentedDownloader, AsyncSegmentedDownloader])
+def test_changed_file_restarts_from_scratch(partial, engine_class):
+    tmp_file, half = partial
+    session = get_session(8)
+    with ChangingServer() as server:
+        remote, response = probe(session, server.url)
+        assert response is None and remote.headers["ETag"] == '"old"'
+        journal = ResumeJournal(tmp_file)
+        journal.reset(remote)
+        journal.save([(0, half)])
+
+        engine = engine_class(session, server.url, tmp_file, connections=4)
+        assert engine.run(remote)
+        assert server.full_responses >= 1
+
+    with open(tmp_file, "rb") as f:
+        assert f.read() == NEW
+    assert not os.path.exists(tmp_file + ".journal")
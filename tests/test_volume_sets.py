@@ -0,0 +1,152 @@
+"""
+Archives en volumes d'un dossier GoFile (volume_sets.py) : reconnaissance
+des nommages, jeux complets, ordre de téléchargement, réunion d'un
+découpage brut et suppression des volumes consommés.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "python"))
+
+from volume_sets import volume_of, find_sets, VolumeSet
+
+
+def info(name: str, folder: str = "/jeux") -> dict:
+    return {"path": folder, "filename": name, "link": f"https://example.invalid/{name}"}
+
+
+def names(files_info) -> list:
+    return [f["filename"] for f in files_info]
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("Jeu.part1.rar", ("part", "Jeu", 0)),
+    ("Jeu.PART12.RAR", ("part", "Jeu", 11)),
+    ("Jeu.rar", ("old", "Jeu", 0)),
+    ("Jeu.r00", ("old", "Jeu", 1)),
+    ("Jeu.r101", ("old", "Jeu", 102)),
+    ("Jeu.zip.001", ("split", "Jeu.zip", 0)),
+    ("Jeu.7z.010", ("split", "Jeu.7z", 9)),
+    ("Jeu.zip", None),
+    ("Jeu.r0", None),
+    ("Jeu.zip.01", None),
+])
+def test_volume_of(filename, expected):
+    assert volume_of(filename) == expected
+
+
+@pytest.mark.parametrize("volumes", [
+    ["Jeu.part1.rar", "Jeu.part2.rar", "Jeu.part3.rar"],
+    ["Jeu.rar", "Jeu.r00", "Jeu.r01"],
+    ["Jeu.zip.001", "Jeu.zip.002", "Jeu.zip.003"],
+])
+def test_find_sets_each_naming(volumes):
+    files_info = [info(name) for name in volumes] + [info("lisezmoi.txt")]
+    sets = find_sets(files_info)
+    assert set(sets) == {os.path.join("/jeux", name) for name in volumes}
+    volume_set = sets[os.path.join("/jeux", volumes[0])]
+    assert volume_set.paths == [os.path.join("/jeux", name) for name in volumes]
+    assert volume_set.first == volume_set.paths[0]
+    assert volume_set.split == volumes[0].endswith(".001")
+
+
+@pytest.mark.parametrize("volumes", [
+    ["Jeu.part1.rar", "Jeu.part3.rar"],      # trou
+    ["Jeu.part2.rar", "Jeu.part3.rar"],      # premier volume absent
+    ["Jeu.r00", "Jeu.r01"],                  # .rar absent
+    ["Jeu.zip.001"],                         # une seule partie
+])
+def test_find_sets_skips_incomplete(volumes):
+    assert find_sets([info(name) for name in volumes]) == {}
+
+
+def test_find_sets_reorders_volumes_in_place():
+    files_info = [
+        info("Jeu.part3.rar"), info("bonus.zip"), info("Jeu.part1.rar"),
+        info("Jeu.part2.rar"), info("Autre.zip.002"), info("Autre.zip.001"),
+    ]
+    sets = find_sets(files_info)
+    # Les volumes d'un jeu gardent leurs emplacements, remplis dans l'ordre
+    assert names(files_info) == [
+        "Jeu.part1.rar", "bonus.zip", "Jeu.part2.rar",
+        "Jeu.part3.rar", "Autre.zip.001", "Autre.zip.002",
+    ]
+    assert len({id(s) for s in sets.values()}) == 2
+
+
+def test_find_sets_keeps_folders_apart():
+    files_info = [info("Jeu.part1.rar", "/a"), info("Jeu.part2.rar", "/b")]
+    assert find_sets(files_info) == {}
+
+
+# ---------- sur disque ----------
+
+def make_set(tmp_path, naming: str, base: str, contents) -> VolumeSet:
+    paths = []
+    for index, data in enumerate(contents):
+        path = tmp_path / f"{base}.{index + 1:03d}"
+        path.write_bytes(data)
+        paths.append(str(path))
+    return VolumeSet(naming, base, paths)
+
+
+def test_release_removes_leading_volumes(tmp_path):
+    volume_set = make_set(tmp_path, "part", "Jeu.rar", [b"a", b"b", b"c"])
+    volume_set.release(2)
+    assert [os.path.exists(p) for p in volume_set.paths] == [False, False, True]
+    assert volume_set.consumed == 2
+    # Jamais en arrière
+    volume_set.release(1)
+    assert volume_set.consumed == 2
+    volume_set.release()
+    assert not any(os.path.exists(p) for p in volume_set.paths)
+    assert volume_set.consumed == 3
+
+
+def test_opened_releases_previous_volumes(tmp_path):
+    volume_set = make_set(tmp_path, "part", "Jeu.rar", [b"a", b"b", b"c"])
+    volume_set.opened(f"  {volume_set.paths[2].upper()}\n")
+    assert [os.path.exists(p) for p in volume_set.paths] == [False, False, True]
+
+
+def test_join_follows_arrivals(tmp_path):
+    contents = [os.urandom(1000), os.urandom(10), os.urandom(500)]
+    volume_set = make_set(tmp_path, "split", "Jeu.zip", contents)
+    volume_set.land(volume_set.paths[0])
+
+    def land_rest():
+        for path in volume_set.paths[1:]:
+            volume_set.land(path)
+    timer = threading.Timer(0.2, land_rest)
+    timer.start()
+    target = volume_set.join(lambda: False)
+    timer.join()
+
+    assert target == str(tmp_path / "Jeu.zip")
+    with open(target, "rb") as f:
+        assert f.read() == b"".join(contents)
+    assert not any(os.path.exists(p) for p in volume_set.paths)
+
+
+def test_join_gives_up_on_failed_volume(tmp_path):
+    volume_set = make_set(tmp_path, "split", "Jeu.zip", [b"a", b"b"])
+    volume_set.land(volume_set.paths[0])
+    volume_set.fail()
+    assert volume_set.join(lambda: False) is None
+    assert not os.path.exists(tmp_path / "Jeu.zip")
+    assert not os.path.exists(volume_set.paths[0])
+    assert os.path.exists(volume_set.paths[1])
+
+
+def test_should_start_once(tmp_path):
+    volume_set = make_set(tmp_path, "part", "Jeu.rar", [b"a", b"b"])
+    volume_set.land(volume_set.paths[1])
+    assert not volume_set.should_start(early=True)
+    volume_set.land(volume_set.paths[0])
+    assert volume_set.should_start(early=False)
+    assert not volume_set.should_start(early=False)
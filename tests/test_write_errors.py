@@ -0,0 +1,41 @@
+"""
+Échec d'écriture du `.part` (disque plein) : le transfert s'arrête sur
+l'erreur disque, sans nouvelle tentative ni pénalité pour l'hôte.
+"""
+
+import os
+import sys
+import errno
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "python"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from local_server import LocalServer
+
+import host_limits
+from part_file import PartFile
+from transfer import SegmentedDownloader, probe
+from aio_transfer import AsyncSegmentedDownloader
+from http_pool import get_session
+
+
+@pytest.mark.parametrize("engine_class", [SegmentedDownloader, AsyncSegmentedDownloader])
+def test_disk_full_does_not_penalize_host(tmp_path, monkeypatch, engine_class):
+    def disk_full(self, offset, data):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(PartFile, "write_at", disk_full)
+    session = get_session(8)
+    with LocalServer(16 * 1024 * 1024) as url:
+        remote, _ = probe(session, url)
+        limiter = host_limits.get_limiter("127.0.0.1")
+        limit = limiter.limit
+        engine = engine_class(session, url, str(tmp_path / "jeu.bin.part"), connections=4)
+        with pytest.raises(OSError) as raised:
+            engine.run(remote)
+    assert raised.value.errno == errno.ENOSPC
+    assert limiter.limit == limit
+    assert not any(mirror.dropped for mirror in engine.mirrors)
@@ -0,0 +1,138 @@
+"""
+Extraction d'un ZIP au fil du téléchargement (zip_stream.py) : descripteurs
+de données, champs ZIP64, reprise par le répertoire central sur CRC
+incohérent, sortie bornée pour un membre très compressible.
+"""
+
+import io
+import os
+import sys
+import zlib
+import struct
+import zipfile
+import tracemalloc
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "python"))
+
+from zip_stream import StreamingZipExtractor, OUTPUT_LIMIT
+
+MB = 1024 * 1024
+MEMBERS = {
+    "lisezmoi.txt": b"Bonjour\n" * 1000,
+    "data/jeu.bin": os.urandom(3 * MB),
+    "data/niveaux.dat": bytes(range(256)) * 8192,
+}
+
+
+class Unseekable(io.RawIOBase):
+    """Flux sans seek : zipfile écrit alors un descripteur après chaque membre"""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.raw.write(data)
+
+
+def build(path, members=MEMBERS, seekable=True, force_zip64=False):
+    with open(path, "wb") as f:
+        with zipfile.ZipFile(f if seekable else Unseekable(f), "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in members.items():
+                compress = zipfile.ZIP_STORED if name.endswith(".txt") and seekable else zipfile.ZIP_DEFLATED
+                info = zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0))
+                info.compress_type = compress
+                with zf.open(info, "w", force_zip64=force_zip64) as member:
+                    member.write(data)
+
+
+def extract(path, destination) -> StreamingZipExtractor:
+    size = os.path.getsize(path)
+    extractor = StreamingZipExtractor(str(path), str(destination), lambda: size)
+    extractor.start()
+    assert extractor.finish(True)
+    return extractor
+
+
+def assert_extracted(destination, members=MEMBERS):
+    for name, data in members.items():
+        with open(os.path.join(destination, *name.split("/")), "rb") as f:
+            assert f.read() == data, name
+
+
+@pytest.mark.parametrize("seekable, force_zip64", [(True, False), (False, False), (True, True), (False, True)])
+def test_members_stream_out(tmp_path, seekable, force_zip64):
+    archive = tmp_path / "jeu.zip"
+    build(archive, seekable=seekable, force_zip64=force_zip64)
+    destination = tmp_path / "Jeu"
+    extractor = extract(archive, destination)
+    # Tous extraits pendant la lecture, aucun laissé au répertoire central
+    assert set(extractor.extracted) == set(MEMBERS)
+    assert extractor.stopped_reason == "fin"
+    assert_extracted(destination)
+
+
+def test_descriptor_flag_is_used(tmp_path):
+    archive = tmp_path / "jeu.zip"
+    build(archive, seekable=False, force_zip64=True)
+    with zipfile.ZipFile(archive) as zf:
+        assert all(info.flag_bits & 0x08 for info in zf.infolist())
+
+
+def test_crc_mismatch_falls_back_to_central_directory(tmp_path):
+    archive = tmp_path / "jeu.zip"
+    build(archive)
+    with zipfile.ZipFile(archive) as zf:
+        offset = zf.getinfo("data/jeu.bin").header_offset
+    with open(archive, "r+b") as f:
+        # CRC de l'en-tête local faussé ; le répertoire central reste juste
+        f.seek(offset + 14)
+        crc = struct.unpack("<I", f.read(4))[0]
+        f.seek(offset + 14)
+        f.write(struct.pack("<I", crc ^ 0xFFFFFFFF))
+
+    destination = tmp_path / "Jeu"
+    extractor = extract(archive, destination)
+    assert "data/jeu.bin" not in extractor.extracted
+    assert "data/niveaux.dat" in extractor.extracted
+    assert_extracted(destination)
+
+
+def test_unfinished_download_leaves_no_truncated_member(tmp_path):
+    archive = tmp_path / "jeu.zip"
+    build(archive)
+    with zipfile.ZipFile(archive) as zf:
+        cut = zf.getinfo("data/jeu.bin").header_offset + MB
+    destination = tmp_path / "Jeu"
+    extractor = StreamingZipExtractor(str(archive), str(destination), lambda: cut)
+    extractor.start()
+    assert not extractor.finish(False)
+    assert not os.path.exists(destination / "data" / "jeu.bin")
+
+
+def test_zero_run_output_is_bounded(tmp_path):
+    size = 128 * MB
+    archive = tmp_path / "zeros.zip"
+    block = bytes(MB)
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        with zf.open("zeros.bin", "w") as member:
+            for _ in range(size // MB):
+                member.write(block)
+    assert os.path.getsize(archive) < MB
+
+    destination = tmp_path / "Jeu"
+    tracemalloc.start()
+    try:
+        extractor = extract(archive, destination)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert extractor.extracted["zeros.bin"] == (zlib.crc32(bytes(size)), size)
+    assert os.path.getsize(destination / "zeros.bin") == size
+    # Sortie de zlib par tranches d'OUTPUT_LIMIT, jamais le membre entier
+    assert peak < 4 * OUTPUT_LIMIT < size
@@ -0,0 +1,172 @@
+const net = require('net');
+const { spawn } = require('child_process');
+
+/**
+ * Client du démon Python (download_manager.py serve) : un seul processus
+ * pour toute la session, commandes JSON (une ligne par message) sur une
+ * socket locale au lieu d'un interpréteur lancé par commande.
+ */
+class DownloadDaemon {
+  /**
+   * @param {string} pythonExe - Exécutable Python embarqué
+   * @param {string} scriptPath - Chemin de launcher.py (lanceur de download_manager.py)
+   * @param {string} controlDir - Dossier de contrôle (userData)
+   */
+  constructor(pythonExe, scriptPath, controlDir) {
+    this.pythonExe = pythonExe;
+    this.scriptPath = scriptPath;
+    this.controlDir = controlDir;
+    this.starting = null;
+    this.proc = null;
+    this.socket = null;
+    this.token = null;
+    this.nextId = 1;
+    this.pending = new Map(); // Map<id requête, { resolve, reject }>
+    this.downloads = new Map(); // Map<downloadId, { onStatus, resolve }>
+  }
+
+  /**
+   * Démarre le démon si besoin (une seule fois, les appels concurrents attendent le même démarrage)
+   */
+  start() {
+    if (!this.starting) {
+      this.starting = this._spawn().catch((err) => {
+        this._reset(err);
+        throw err;
+      });
+    }
+    return this.starting;
+  }
+
+  _spawn() {
+    return new Promise((resolve, reject) => {
+      const proc = spawn(this.pythonExe, [this.scriptPath, 'serve', this.controlDir], { windowsHide: true });
+      this.proc = proc;
+      let handshake = '';
+
+      const onData = (data) => {
+        handshake += data.toString();
+        const newline = handshake.indexOf('\n');
+        if (newline === -1) return;
+        proc.stdout.off('data', onData);
+        try {
+          const { port, token } = JSON.parse(handshake.slice(0, newline)).serve;
+          this.token = token;
+          this._connect(port).then(resolve, reject);
+        } catch (e) {
+          reject(new Error(`Démon Python: réponse de démarrage invalide (${e.message})`));
+        }
+      };
+
+      proc.stdout.on('data', onData);
+      proc.stderr.on('data', (data) => {
+        console.error('[Python Daemon]', data.toString());
+      });
+      proc.on('error', (err) => reject(new Error(`Impossible de lancer le démon Python: ${err.message}`)));
+      proc.on('close', (code) => {
+        const err = new Error(`Démon Python arrêté (code ${code})`);
+        reject(err);
+        this._reset(err);
+      });
+    });
+  }
+
+  _connect(port) {
+    return new Promise((resolve, reject) => {
+      const socket = net.createConnection({ host: '127.0.0.1', port }, () => {
+        this.socket = socket;
+        this.command('subscribe').then(resolve, reject);
+      });
+      let buffer = '';
+
+      socket.setEncoding('utf8');
+      socket.on('data', (chunk) => {
+        // Une ligne JSON peut arriver en plusieurs morceaux
+        buffer += chunk;
+        let newline;
+        while ((newline = buffer.indexOf('\n')) !== -1) {
+          const line = buffer.slice(0, newline);
+          buffer = buffer.slice(newline + 1);
+          if (line.trim()) this._dispatch(JSON.parse(line));
+        }
+      });
+      socket.on('error', reject);
+      socket.on('close', () => this._reset(new Error('Connexion au démon Python perdue')));
+    });
+  }
+
+  _dispatch(message) {
+    if (message.reply !== undefined) {
+      const request = this.pending.get(message.reply);
+      if (!request) return;
+      this.pending.delete(message.reply);
+      if (message.ok) {
+        request.resolve(message);
+      } else {
+        request.reject(new Error(message.error));
+      }
+      return;
+    }
+
+    const download = this.downloads.get(message.download_id);
+    if (!download) return;
+    if (message.event === 'done') {
+      this.downloads.delete(message.download_id);
+      download.resolve(message);
+    } else {
+      download.onStatus(message);
+    }
+  }
+
+  _reset(err) {
+    for (const request of this.pending.values()) request.reject(err);
+    // Un téléchargement en cours se termine en erreur (comme un processus qui meurt)
+    for (const download of this.downloads.values()) download.resolve({ success: false, error: err.message });
+    this.pending.clear();
+    this.downloads.clear();
+    if (this.socket) this.socket.destroy();
+    if (this.proc && this.proc.exitCode === null) this.proc.kill();
+    this.socket = null;
+    this.proc = null;
+    this.starting = null;
+  }
+
+  /**
+   * Envoie une commande et attend sa réponse ({ ok: true, ... })
+   */
+  command(cmd, params = {}) {
+    if (!this.socket) {
+      return Promise.reject(new Error('Démon Python non connecté'));
+    }
+    const id = this.nextId++;
+    return new Promise((resolve, reject) => {
+      this.pending.set(id, { resolve, reject });
+      this.socket.write(JSON.stringify({ ...params, token: this.token, id, cmd }) + '\n');
+    });
+  }
+
+  /**
+   * Lance un téléchargement ; `onStatus` reçoit chaque statut, la promesse le résultat final
+   */
+  async download(downloadId, params, onStatus) {
+    await this.start();
+    const done = new Promise((resolve) => {
+      this.downloads.set(downloadId, { onStatus, resolve });
+    });
+    try {
+      await this.command('download', { ...params, download_id: downloadId });
+    } catch (err) {
+      this.downloads.delete(downloadId);
+      throw err;
+    }
+    return done;
+  }
+
+  stop() {
+    if (this.socket) {
+      this.command('shutdown').catch(() => {});
+    }
+  }
+}
+
+module.exports = { DownloadDaemon };